@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Backfill canonical 'amount_ml' quantities into existing recipes
+
+Recipes created or loaded from now on store amount_ml next to each
+ingredient's original amount and units. This script adds it to recipes
+written before, so GET /api/recipes?units=oz|ml|cl does not have to parse
+their amounts on every request. The original amounts and units are not
+changed. Safe to run more than once.
+
+Usage:
+    # Show how many recipes would be updated
+    python3 add_amount_ml.py --dry-run
+
+    # Backfill in pages of 500 recipes
+    python3 add_amount_ml.py
+"""
+
+from datetime import datetime
+import mysql.connector
+from config import Config
+from api_core import parse_json_field
+from convert_ml_to_oz import DEFAULT_BATCH_SIZE, build_case_update, fetch_recipe_pages
+from units import with_amount_ml
+
+
+def backfill_amount_ml(cursor, conn, dry_run=False, batch_size=DEFAULT_BATCH_SIZE):
+    """Add amount_ml to every recipe ingredient, one UPDATE ... CASE per page. Returns the number of recipes updated."""
+    updated = 0
+    for page in fetch_recipe_pages(cursor, batch_size):
+        updates = []
+        for recipe in page:
+            ingredients = parse_json_field(recipe['ingredients'])
+            if ingredients is not None and not isinstance(ingredients, list):
+                print(f"  ⚠ Skipping recipe '{recipe['name']}' (ID: {recipe['id']}): Invalid JSON")
+                continue
+            backfilled = with_amount_ml(ingredients)
+            if backfilled != ingredients:
+                updates.append((recipe['id'], backfilled))
+
+        if updates and not dry_run:
+            cursor.execute(*build_case_update(updates, datetime.now()))
+            conn.commit()
+        updated += len(updates)
+        print(f"  ✓ Recipes up to ID {page[-1]['id']}: {len(updates)} updated")
+    return updated
+
+
+def add_amount_ml(dry_run=False, batch_size=DEFAULT_BATCH_SIZE):
+    """Backfill amount_ml into the recipes table"""
+    config = Config()
+
+    try:
+        conn = mysql.connector.connect(
+            host=config.MYSQL_HOST,
+            port=config.MYSQL_PORT,
+            user=config.MYSQL_USER,
+            password=config.MYSQL_PASSWORD,
+            database=config.MYSQL_DATABASE
+        )
+        cursor = conn.cursor(dictionary=True)
+
+        updated = backfill_amount_ml(cursor, conn, dry_run=dry_run, batch_size=batch_size)
+        if dry_run:
+            print(f"✓ {updated} recipes would be updated")
+        else:
+            print(f"✓ Added amount_ml to {updated} recipes")
+
+        cursor.close()
+        conn.close()
+
+    except mysql.connector.Error as e:
+        print(f"✗ Error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Backfill canonical amount_ml quantities into recipes')
+    parser.add_argument('--dry-run', action='store_true', help='Only count the recipes that would be updated')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f'Recipes per page and UPDATE (default: {DEFAULT_BATCH_SIZE})')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Backfilling amount_ml into recipes")
+    print("=" * 60)
+    add_amount_ml(dry_run=args.dry_run, batch_size=args.batch_size)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Add a unique normalized-name column to the ingredients table
+
+name_normalized is generated as LOWER(TRIM(name)) and indexed UNIQUE, so
+"Lime juice" and "Lime Juice " cannot both exist. The loaders and the API
+insert with INSERT ... ON DUPLICATE KEY UPDATE on this key.
+
+Existing duplicates must be merged first. For each group of ingredients
+with the same normalized name the lowest id is kept, it is marked on the
+bar shelf if any duplicate was, recipes referencing a duplicate's id are
+pointed at the kept id, and the duplicates are deleted.
+
+Usage:
+    # Show the duplicates that would be merged
+    python3 add_name_normalized_column.py --dry-run
+
+    # Merge duplicates and add the column and unique index
+    python3 add_name_normalized_column.py
+"""
+
+import json
+import mysql.connector
+from config import Config
+from api_core import normalize_name, parse_json_field
+
+# Binary collation: uniqueness is exactly LOWER(TRIM(name)), not the
+# table's accent-insensitive collation
+NORMALIZED_COLUMN = (
+    "name_normalized VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin "
+    "GENERATED ALWAYS AS (LOWER(TRIM(name))) STORED"
+)
+UNIQUE_INDEX = "uq_ingredients_name_normalized"
+
+
+def plan_dedupe(ingredients):
+    """
+    Group ingredient rows by normalized name.
+
+    Args:
+        ingredients: Rows with id, name and bar_shelf_availability
+
+    Returns:
+        Tuple of ({duplicate id: kept id}, ids of kept rows to mark on the bar shelf)
+    """
+    groups = {}
+    for row in sorted(ingredients, key=lambda row: row['id']):
+        groups.setdefault(normalize_name(row['name']), []).append(row)
+
+    remap = {}
+    mark_available = []
+    for rows in groups.values():
+        if len(rows) < 2:
+            continue
+        keeper = rows[0]
+        for duplicate in rows[1:]:
+            remap[duplicate['id']] = keeper['id']
+        if keeper.get('bar_shelf_availability') != 'Y' and any(
+                row.get('bar_shelf_availability') == 'Y' for row in rows[1:]):
+            mark_available.append(keeper['id'])
+    return remap, mark_available
+
+
+def remap_recipe_ingredients(ingredients, remap):
+    """
+    Point a recipe's ingredient entries at kept ids.
+
+    Returns:
+        The updated list, or None if nothing changed
+    """
+    changed = False
+    for entry in ingredients or []:
+        if isinstance(entry, dict) and entry.get('id') in remap:
+            entry['id'] = remap[entry['id']]
+            changed = True
+    return ingredients if changed else None
+
+
+def column_exists(cursor, database):
+    cursor.execute("""
+        SELECT COUNT(*) AS count
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = %s
+        AND TABLE_NAME = 'ingredients'
+        AND COLUMN_NAME = 'name_normalized'
+    """, (database,))
+    return cursor.fetchone()['count'] > 0
+
+
+def dedupe_ingredients(cursor, conn, dry_run=False):
+    """
+    Merge ingredients with the same normalized name.
+
+    Returns:
+        The number of duplicates removed, or None if a recipe's ingredients
+        could not be parsed (nothing is changed then)
+    """
+    cursor.execute("SELECT id, name, bar_shelf_availability FROM ingredients")
+    ingredients = cursor.fetchall()
+    remap, mark_available = plan_dedupe(ingredients)
+    if not remap:
+        print("✓ No duplicate ingredient names")
+        return 0
+
+    names = {row['id']: row['name'] for row in ingredients}
+    for duplicate_id, kept_id in sorted(remap.items(), key=lambda item: item[1]):
+        print(f"  - '{names[duplicate_id]}' (id {duplicate_id}) -> '{names[kept_id]}' (id {kept_id})")
+
+    cursor.execute("SELECT id, ingredients FROM recipes")
+    recipe_updates = []
+    unparsable = []
+    for recipe in cursor.fetchall():
+        ingredients = parse_json_field(recipe['ingredients'])
+        if ingredients is not None and not isinstance(ingredients, list):
+            unparsable.append(recipe['id'])
+            continue
+        updated = remap_recipe_ingredients(ingredients, remap)
+        if updated is not None:
+            recipe_updates.append((json.dumps(updated), recipe['id']))
+
+    print(f"{len(remap)} duplicates, {len(recipe_updates)} recipes to repoint")
+    if unparsable:
+        # Deleting the duplicates could leave these recipes pointing at removed ids
+        print(f"✗ Could not parse the ingredients of recipes {unparsable}; fix them and re-run. Nothing was changed.")
+        return None
+    if dry_run:
+        return len(remap)
+
+    try:
+        if recipe_updates:
+            cursor.executemany("UPDATE recipes SET ingredients = %s WHERE id = %s", recipe_updates)
+        if mark_available:
+            placeholders = ', '.join(['%s'] * len(mark_available))
+            cursor.execute(
+                f"UPDATE ingredients SET bar_shelf_availability = 'Y' WHERE id IN ({placeholders})",
+                mark_available
+            )
+        placeholders = ', '.join(['%s'] * len(remap))
+        cursor.execute(f"DELETE FROM ingredients WHERE id IN ({placeholders})", list(remap))
+        conn.commit()
+    except mysql.connector.Error:
+        conn.rollback()
+        raise
+
+    print(f"✓ Merged {len(remap)} duplicate ingredients")
+    return len(remap)
+
+
+def add_name_normalized_column(dry_run=False):
+    """Merge duplicate ingredient names, then add the unique name_normalized column"""
+    config = Config()
+
+    try:
+        conn = mysql.connector.connect(
+            host=config.MYSQL_HOST,
+            port=config.MYSQL_PORT,
+            user=config.MYSQL_USER,
+            password=config.MYSQL_PASSWORD,
+            database=config.MYSQL_DATABASE
+        )
+        cursor = conn.cursor(dictionary=True)
+
+        if column_exists(cursor, config.MYSQL_DATABASE):
+            print("✓ Column 'name_normalized' already exists in ingredients table")
+        else:
+            removed = dedupe_ingredients(cursor, conn, dry_run=dry_run)
+            if removed is None:
+                cursor.close()
+                conn.close()
+                return False
+            if not dry_run:
+                cursor.execute(f"""
+                    ALTER TABLE ingredients
+                    ADD COLUMN {NORMALIZED_COLUMN},
+                    ADD UNIQUE KEY {UNIQUE_INDEX} (name_normalized)
+                """)
+                print("✓ Added unique 'name_normalized' column to ingredients table")
+
+        cursor.close()
+        conn.close()
+
+    except mysql.connector.Error as e:
+        print(f"✗ Error: {e}")
+        return False
+
+    return True
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Add a unique normalized-name column to ingredients')
+    parser.add_argument('--dry-run', action='store_true', help='Only show the duplicates that would be merged')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Adding unique name_normalized column to ingredients table")
+    print("=" * 60)
+    add_name_normalized_column(dry_run=args.dry_run)
@@ -0,0 +1,524 @@
+"""
+Shared API logic for Neighborhood Sips
+Everything the API does that does not depend on the web framework or the
+database driver: SQL and parameter builders, row shaping, the bar shelf
+recipe filter, and image handling for create/update requests.
+
+Both the WSGI app (app.py, Flask + mysql-connector) and the ASGI app
+(asgi_app.py, Quart + aiomysql) build their responses from these functions,
+so the two serve identical results. Both drivers use %s placeholders.
+"""
+
+import os
+import re
+import io
+import json
+import base64
+import time
+from datetime import datetime
+from PIL import Image, UnidentifiedImageError
+from PIL.ImageOps import exif_transpose
+from image_utils import save_optimized_image
+from asset_manifest import upload_url
+from upload_store import allocate_upload_path, delete_upload, resolve_upload
+import metrics
+from units import DISPLAY_UNITS, normalize_unit, with_amount_ml
+
+# JSON columns of each table, parsed before responding
+JSON_FIELDS = {
+    'ingredients': ('tags', 'images'),
+    'recipes': ('tags', 'images', 'ingredients'),
+    'collections': ('tags', 'images', 'recipe_ids'),
+}
+
+# Fixed-shape point lookups (run as prepared statements by the WSGI app)
+SELECT_INGREDIENT = "SELECT * FROM ingredients WHERE id = %s"
+SELECT_INGREDIENT_IMAGES = "SELECT images FROM ingredients WHERE id = %s"
+SELECT_RECIPE = "SELECT * FROM recipes WHERE id = %s"
+SELECT_RECIPE_IMAGES = "SELECT images FROM recipes WHERE id = %s"
+SELECT_COLLECTION = "SELECT * FROM collections WHERE id = %s"
+SELECT_COLLECTION_IMAGES = "SELECT images FROM collections WHERE id = %s"
+UPDATE_INGREDIENT_BAR_SHELF = "UPDATE ingredients SET bar_shelf_availability = %s WHERE id = %s"
+
+DELETE_INGREDIENT = "DELETE FROM ingredients WHERE id = %s"
+DELETE_RECIPE = "DELETE FROM recipes WHERE id = %s"
+
+# Upsert on the unique name_normalized key: for an existing name nothing
+# changes, rowcount is 0 and lastrowid is the existing ingredient's id
+INSERT_INGREDIENT = """
+        INSERT INTO ingredients (name, description, category, tags, images, bar_shelf_availability, created_at, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+    """
+# Fails with a duplicate key error when renamed to another ingredient's
+# normalized name (see is_duplicate_key)
+UPDATE_INGREDIENT = """
+        UPDATE ingredients
+        SET name = %s, description = %s, category = %s, tags = %s, images = %s, bar_shelf_availability = %s, updated_at = %s
+        WHERE id = %s
+    """
+INSERT_RECIPE = """
+        INSERT INTO recipes (name, description, ingredients, instructions, tags, images, created_at, updated_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """
+UPDATE_RECIPE = """
+        UPDATE recipes
+        SET name = %s, description = %s, ingredients = %s, instructions = %s, tags = %s, images = %s, updated_at = %s
+        WHERE id = %s
+    """
+UPDATE_COLLECTION = """
+        UPDATE collections
+        SET name = %s, description = %s, recipe_ids = %s, tags = %s, images = %s, updated_at = %s
+        WHERE id = %s
+    """
+
+
+# ============= ROW SHAPING =============
+
+# Helper function to parse JSON field
+def parse_json_field(value):
+    """Parse JSON field from MySQL that could be str, bytes, bytearray, or already parsed"""
+    if value is None:
+        return None
+    # If already a list or dict, return as-is
+    if isinstance(value, (list, dict)):
+        return value
+    # If bytes or bytearray, decode to string first
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    # If string, parse as JSON
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except (json.JSONDecodeError, ValueError):
+            return value
+    # For any other type, return as-is
+    return value
+
+# Helper function to serialize document
+def serialize_doc(doc):
+    """Convert database row to dictionary with proper serialization"""
+    if doc is None:
+        return None
+    # Convert to dict if it's a tuple/list (from cursor)
+    if isinstance(doc, (tuple, list)):
+        return doc
+    # Handle datetime objects
+    result = {}
+    for key, value in doc.items():
+        if isinstance(value, datetime):
+            result[key] = value.isoformat()
+        elif isinstance(value, (bytes, bytearray)):
+            result[key] = value.decode('utf-8')
+        else:
+            result[key] = value
+    return result
+
+def parse_row(table, row):
+    """Parse the JSON columns of a row in place"""
+    for field in JSON_FIELDS[table]:
+        row[field] = parse_json_field(row.get(field))
+    return row
+
+def add_image_urls(upload_folder, doc):
+    """Add fingerprinted upload URLs (relative to the API root) matching doc['images']"""
+    images = doc.get('images') or []
+    doc['image_urls'] = [
+        upload_url(upload_folder, resolve_upload(upload_folder, img) or img)
+        if isinstance(img, str) else None
+        for img in images
+    ]
+    return doc
+
+
+# ============= LIST QUERIES =============
+
+def list_query(table, search='', tags=''):
+    """
+    Build the list query for ingredients or collections.
+
+    Search matches name or description; tags match any of the given tags.
+
+    Returns:
+        Tuple of (sql, params)
+    """
+    query = f"SELECT * FROM {table} WHERE 1=1"
+    params = []
+
+    if search:
+        query += " AND (name LIKE %s OR description LIKE %s)"
+        search_param = f"%{search}%"
+        params.extend([search_param, search_param])
+
+    if tags:
+        tag_list = [t.strip() for t in tags.split(',')]
+        # Check if any of the tags are in the JSON array
+        tag_conditions = []
+        for tag in tag_list:
+            tag_conditions.append("JSON_CONTAINS(tags, %s)")
+            params.append(json.dumps(tag))
+        query += f" AND ({' OR '.join(tag_conditions)})"
+
+    query += " ORDER BY name ASC"
+    return query, params
+
+def recipes_query(search='', tags=''):
+    """
+    Build the recipe list query.
+
+    Search matches the name or any ingredient; tags must all match (case-insensitive).
+
+    Returns:
+        Tuple of (sql, params)
+    """
+    query = "SELECT * FROM recipes WHERE 1=1"
+    params = []
+
+    if search:
+        query += " AND (name LIKE %s OR JSON_SEARCH(LOWER(ingredients), 'one', LOWER(%s)) IS NOT NULL)"
+        search_param = f"%{search}%"
+        params.extend([search_param, search_param])
+
+    if tags:
+        tag_list = [t.strip() for t in tags.split(',')]
+        tag_conditions = []
+        for tag in tag_list:
+            tag_conditions.append("JSON_CONTAINS(LOWER(tags), LOWER(%s))")
+            params.append(json.dumps(tag))
+        query += f" AND ({' AND '.join(tag_conditions)})"
+
+    query += " ORDER BY name ASC"
+    return query, params
+
+
+# ============= BAR SHELF FILTER =============
+
+def recipe_ingredient_names(recipes):
+    """Collect all unique ingredient names used by the recipes"""
+    names = set()
+    for recipe in recipes:
+        ingredients = recipe.get('ingredients')
+        if ingredients:
+            for ingredient in ingredients:
+                ingredient_name = ingredient.get('name', '')
+                if ingredient_name:
+                    names.add(ingredient_name)
+    return names
+
+def normalize_name(name):
+    """Python counterpart of the ingredients.name_normalized column, LOWER(TRIM(name))"""
+    return name.strip(' ').lower()
+
+def is_duplicate_key(error):
+    """Whether a mysql-connector or PyMySQL (aiomysql) error is ER_DUP_ENTRY (1062)"""
+    code = getattr(error, 'errno', None)
+    if code is None and error.args:
+        code = error.args[0]
+    return code == 1062
+
+def availability_query(names):
+    """
+    Build the query fetching bar shelf availability for ingredient names.
+
+    Rows are keyed by name_normalized, matching normalize_name().
+
+    Returns:
+        Tuple of (sql, params)
+    """
+    normalized = sorted({normalize_name(name) for name in names})
+    placeholders = ', '.join(['%s'] * len(normalized))
+    query = (f"SELECT name_normalized, bar_shelf_availability FROM ingredients "
+             f"WHERE name_normalized IN ({placeholders})")
+    return query, tuple(normalized)
+
+def filter_available_recipes(recipes, ingredient_availability):
+    """Keep recipes whose ingredients are all on the bar shelf ('Y'); availability is keyed by normalized name"""
+    filtered_recipes = []
+    for recipe in recipes:
+        ingredients = recipe.get('ingredients')
+        # Only include recipes that have ingredients
+        if ingredients:
+            # Check if all ingredients are available on bar shelf
+            all_available = True
+            for ingredient in ingredients:
+                ingredient_name = ingredient.get('name', '')
+                if not ingredient_name:
+                    # Exclude recipe if ingredient has no name (data integrity issue)
+                    all_available = False
+                    break
+                # Check availability from our pre-fetched data
+                if ingredient_availability.get(normalize_name(ingredient_name)) != 'Y':
+                    # Exclude recipe if ingredient not found or not available
+                    all_available = False
+                    break
+
+            if all_available:
+                filtered_recipes.append(recipe)
+    return filtered_recipes
+
+
+def requested_units(value):
+    """
+    Validate the units query parameter of the recipe endpoints.
+
+    Returns:
+        The normalized display unit, '' if none was requested, or None if it is not supported
+    """
+    unit = normalize_unit(value)
+    if not unit:
+        return ''
+    return unit if unit in DISPLAY_UNITS else None
+
+
+# ============= WRITE PARAMETERS =============
+
+def ingredient_params(data, images):
+    """Column values of an ingredient, in INSERT/UPDATE order (without timestamps)"""
+    return (
+        data.get('name'),
+        data.get('description', ''),
+        data.get('category', ''),
+        json.dumps(data.get('tags', [])),
+        json.dumps(images),
+        data.get('bar_shelf_availability', 'Y'),
+    )
+
+def recipe_params(data, images):
+    """Column values of a recipe, in INSERT/UPDATE order (without timestamps); ingredients get amount_ml"""
+    return (
+        data.get('name'),
+        data.get('description', ''),
+        json.dumps(with_amount_ml(data.get('ingredients', []))),
+        data.get('instructions', ''),
+        json.dumps(data.get('tags', [])),
+        json.dumps(images),
+    )
+
+def collection_params(data, images):
+    """Column values of a collection, in UPDATE order (without timestamps)"""
+    return (
+        data.get('name'),
+        data.get('description', ''),
+        json.dumps(data.get('recipe_ids', [])),
+        json.dumps(data.get('tags', [])),
+        json.dumps(images),
+    )
+
+def created_ingredient(ingredient_id, data, images, now):
+    """Response body for a newly created ingredient"""
+    return {
+        'id': ingredient_id,
+        'name': data.get('name'),
+        'description': data.get('description', ''),
+        'category': data.get('category', ''),
+        'tags': data.get('tags', []),
+        'images': images,
+        'bar_shelf_availability': data.get('bar_shelf_availability', 'Y'),
+        'created_at': now.isoformat(),
+        'updated_at': now.isoformat()
+    }
+
+def created_recipe(recipe_id, data, images, now):
+    """Response body for a newly created recipe"""
+    return {
+        'id': recipe_id,
+        'name': data.get('name'),
+        'description': data.get('description', ''),
+        'ingredients': with_amount_ml(data.get('ingredients', [])),
+        'instructions': data.get('instructions', ''),
+        'tags': data.get('tags', []),
+        'images': images,
+        'created_at': now.isoformat(),
+        'updated_at': now.isoformat()
+    }
+
+
+# ============= IMAGES =============
+
+# Helper function to sanitize filename
+def sanitize_filename(filename):
+    """
+    Sanitize filename to prevent directory traversal and other security issues.
+    Preserves original filename while ensuring safety.
+    """
+    if not filename:
+        return None
+
+    # Get the basename to prevent directory traversal
+    filename = os.path.basename(filename)
+
+    # Remove any remaining path separators
+    filename = filename.replace('/', '_').replace('\\', '_')
+
+    # Replace any potentially problematic characters but keep alphanumeric, dots, dashes, underscores
+    # Note: spaces are preserved, dot and hyphen don't need escaping at the end of character class
+    filename = re.sub(r'[^\w\s.-]', '_', filename)
+
+    # Remove any leading/trailing whitespace or dots
+    filename = filename.strip().strip('.')
+
+    # If filename is empty after sanitization, return None
+    if not filename:
+        return None
+
+    return filename
+
+# Helper function to save base64 image
+def save_base64_image(upload_folder, base64_string, prefix='img', original_filename=None):
+    """
+    Save base64 image to disk, preserving original filename if provided.
+    Also preserves EXIF orientation metadata.
+
+    Args:
+        upload_folder: Directory uploads are stored in
+        base64_string: Base64 encoded image data
+        prefix: Prefix to use if no original filename (default: 'img')
+        original_filename: Original filename to preserve (optional)
+
+    Returns:
+        Saved filename or None on error
+    """
+    started = time.perf_counter()
+    outcome = 'error'
+    try:
+        # Remove data URL prefix if present
+        if ',' in base64_string:
+            base64_string = base64_string.split(',')[1]
+
+        # Decode base64
+        image_data = base64.b64decode(base64_string)
+        image = Image.open(io.BytesIO(image_data))
+
+        # Preserve EXIF orientation by automatically rotating the image
+        # This ensures images display with correct orientation
+        image = exif_transpose(image)
+
+        # Determine filename
+        if original_filename:
+            # Sanitize the original filename
+            safe_filename = sanitize_filename(original_filename)
+            if safe_filename:
+                # Keep the original extension if present, otherwise use the image format
+                name_part, ext_part = os.path.splitext(safe_filename)
+                if not ext_part:
+                    # No extension, add one based on image format
+                    ext_part = f".{image.format.lower()}" if image.format else ".png"
+                filename = f"{name_part}{ext_part}"
+            else:
+                # Fallback if sanitization fails
+                filename = f"{prefix}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.png"
+        else:
+            # No original filename provided, use prefix with timestamp
+            filename = f"{prefix}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.png"
+
+        # Store in the sharded layout, handling filename collisions by adding a counter
+        filename, filepath = allocate_upload_path(upload_folder, filename)
+
+        # Resize if too large and save with the standard storage settings
+        save_optimized_image(image, filepath, image.format)
+
+        outcome = 'ok'
+        return filename
+    except (IOError, ValueError, UnidentifiedImageError) as e:
+        print(f"Error saving image: {e}")
+        return None
+    finally:
+        metrics.IMAGE_PROCESSING_SECONDS.observe(time.perf_counter() - started, 'save_base64_image', outcome)
+
+def save_new_images(upload_folder, data, prefix):
+    """
+    Save the images of a create request.
+
+    Entries are base64 strings or {"data": ..., "filename": ...} objects.
+
+    Returns:
+        List of saved filenames
+    """
+    images = []
+    if 'images' in data and data['images']:
+        for img_data in data['images']:
+            if img_data:
+                # Check if image data includes filename (new format: {"data": "...", "filename": "..."})
+                if isinstance(img_data, dict) and 'data' in img_data:
+                    filename = save_base64_image(
+                        upload_folder,
+                        img_data['data'],
+                        prefix,
+                        img_data.get('filename')
+                    )
+                else:
+                    # Legacy format: just base64 string
+                    filename = save_base64_image(upload_folder, img_data, prefix)
+
+                if filename:
+                    images.append(filename)
+    return images
+
+def discard_images(upload_folder, images):
+    """Delete images saved for a write that did not happen"""
+    for image in images:
+        delete_upload(upload_folder, image)
+
+def plan_image_changes(upload_folder, images, data, prefix):
+    """
+    Apply the images of an update request to a record's existing image list,
+    without deleting anything yet.
+
+    New uploads are saved and appended, existing filenames are kept, and
+    images listed in removed_images are dropped from the list.
+
+    Returns:
+        (images, saved, removed): the updated image list, the uploads saved
+        for it, and the dropped images to delete once the update is committed
+    """
+    images = list(images)
+    saved = []
+    removed = []
+
+    # Handle new image uploads
+    if 'images' in data and data['images']:
+        for img_data in data['images']:
+            # Check if it's a new image (starts with 'data:' or is dict with data field)
+            if isinstance(img_data, dict) and 'data' in img_data:
+                # New format with filename
+                filename = save_base64_image(
+                    upload_folder,
+                    img_data['data'],
+                    prefix,
+                    img_data.get('filename')
+                )
+                if filename:
+                    images.append(filename)
+                    saved.append(filename)
+            elif isinstance(img_data, str) and img_data.startswith('data:'):
+                # Legacy format: just base64 string
+                filename = save_base64_image(upload_folder, img_data, prefix)
+                if filename:
+                    images.append(filename)
+                    saved.append(filename)
+            elif img_data:  # Existing image filename
+                if img_data not in images:
+                    images.append(img_data)
+
+    # Handle image removals
+    if 'removed_images' in data and data['removed_images']:
+        for img in data['removed_images']:
+            if img in images:
+                images.remove(img)
+                removed.append(img)
+
+    return images, saved, removed
+
+def apply_image_changes(upload_folder, images, data, prefix):
+    """
+    Apply the images of an update request to a record's existing image list.
+
+    New uploads are saved and appended, existing filenames are kept, and
+    images listed in removed_images are dropped and deleted from disk.
+
+    Returns:
+        The updated image list
+    """
+    images, _, removed = plan_image_changes(upload_folder, images, data, prefix)
+    discard_images(upload_folder, removed)
+    return images
@@ -1,426 +1,503 @@
-from flask import Flask, jsonify, request, send_from_directory
+"""
+Neighborhood Sips API and frontend server
+
+create_app(config_class) builds a configured Flask app. Importing this module
+does no database or network work: connection pools are created on the first
+query in each process, so pre-fork servers (gunicorn, uWSGI) never share
+MySQL connections between workers. `app` is a default instance for
+`flask run`, the tests and scripts that import helpers from here; it is
+created when first accessed.
+"""
+from flask import (
+    Flask, Blueprint, Response, jsonify, request, make_response, g,
+    current_app, has_app_context, has_request_context,
+)
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import mysql.connector
 from mysql.connector import Error as MySQLError
-from mysql.connector.pooling import MySQLConnectionPool
 import os
-import base64
+import time
+import functools
+import itertools
+import threading
 from datetime import datetime
-import uuid
-from PIL import Image, UnidentifiedImageError
-from PIL.ImageOps import exif_transpose
-import io
-import json
-import re
 from config import Config
+from asset_manifest import (
+    IMMUTABLE_CACHE_CONTROL, build_manifest, resolve_fingerprinted,
+    asset_url, rewrite_html_references, fingerprints,
+)
+from gallery_manifest import GalleryManifest
+from upload_store import resolve_upload
+import api_core
+from api_core import (
+    parse_json_field, serialize_doc, sanitize_filename, parse_row,
+    list_query, recipes_query, recipe_ingredient_names, availability_query, filter_available_recipes,
+    requested_units, is_duplicate_key,
+    ingredient_params, recipe_params, collection_params, created_ingredient, created_recipe,
+    save_new_images, plan_image_changes, apply_image_changes, discard_images,
+    SELECT_INGREDIENT, SELECT_INGREDIENT_IMAGES, SELECT_RECIPE, SELECT_RECIPE_IMAGES,
+    SELECT_COLLECTION, SELECT_COLLECTION_IMAGES, UPDATE_INGREDIENT_BAR_SHELF,
+    INSERT_INGREDIENT, UPDATE_INGREDIENT, DELETE_INGREDIENT,
+    INSERT_RECIPE, UPDATE_RECIPE, DELETE_RECIPE, UPDATE_COLLECTION,
+)
+from file_offload import normalize_mode, send_file_offloaded
+from db_pool import ConnectionPool, PoolTimeoutError, parse_host
+from statement_cache import execute_prepared, fetch_one_prepared
+from health import ProbeCache, run_checks, check_database, check_writable, check_gallery_cache
+from units import DISPLAY_UNITS, convert_recipe_units, unit_rules
+from shelf_insights import (
+    SHELF_FINGERPRINT_QUERY, SHELF_INGREDIENTS_QUERY, SHELF_RECIPES_QUERY,
+    NextBottlesCache, ShelfIndex, fingerprint, next_bottles_params, next_bottles_response
+)
+import metrics
+import query_log
+
+# Routes and request hooks, registered on each app by create_app()
+api = Blueprint('api', __name__)
+
+BACKEND_FOLDER = os.path.dirname(os.path.abspath(__file__))
+
+# Default upload folder (create_app() may point an app elsewhere)
+UPLOAD_FOLDER = os.path.join(BACKEND_FOLDER, Config.UPLOAD_FOLDER)
+
+# Static frontend files
+STATIC_FOLDER = os.path.join(BACKEND_FOLDER, 'static')
+GALLERY_FOLDER = os.path.join(STATIC_FOLDER, 'images', 'gallery')
+
+# On-disk caches
+CACHE_FOLDER = os.path.join(BACKEND_FOLDER, Config.CACHE_FOLDER)
+
+# Gallery manifest, rebuilt when the gallery directory changes (built on first request)
+gallery_manifest = GalleryManifest(
+    GALLERY_FOLDER,
+    cache_path=os.path.join(CACHE_FOLDER, 'gallery_manifest.json'),
+    url_for=lambda filename: '/' + asset_url(STATIC_FOLDER, f'images/gallery/{filename}')
+)
+
+# Connection pools of this process, created by get_db_pools() on first use
+db_pool = None
+replica_pools = {}
+replica_counter = itertools.count()
+_pools_lock = threading.Lock()
+
+# Requests that only read and may be served by a replica
+READ_METHODS = ('GET', 'HEAD')
+
+# Cookie marking a client that wrote recently and must read from the primary
+STICKY_PRIMARY_COOKIE = 'db_primary_until'
+
+
+def create_app(config_class=Config):
+    """
+    Create and configure the Flask app.
+
+    Args:
+        config_class: Configuration class or object (see config.py)
 
-# Supported image formats for saving
-SUPPORTED_IMAGE_FORMATS = ['JPEG', 'PNG', 'GIF']
-
-app = Flask(__name__)
-
-# Load configuration from environment variables
-config = Config()
-app.config['MAX_CONTENT_LENGTH'] = config.MAX_CONTENT_LENGTH
-app.config['SECRET_KEY'] = config.SECRET_KEY
-app.config['DEBUG'] = config.DEBUG
-
-# Configure CORS with allowed origins
-if config.ALLOWED_ORIGINS == ['*']:
-    CORS(app)
-else:
-    CORS(app, origins=config.ALLOWED_ORIGINS)
-
-# Configure upload folder
-UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), config.UPLOAD_FOLDER)
-if not os.path.exists(UPLOAD_FOLDER):
-    os.makedirs(UPLOAD_FOLDER)
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-
-# MySQL Configuration with connection pooling
-try:
-    db_pool = MySQLConnectionPool(
-        pool_name="neighborhood_sips_pool",
-        pool_size=5,
-        host=config.MYSQL_HOST,
-        port=config.MYSQL_PORT,
-        user=config.MYSQL_USER,
-        password=config.MYSQL_PASSWORD,
-        database=config.MYSQL_DATABASE,
+    Returns:
+        Flask app with the API and frontend routes registered
+    """
+    app = Flask(__name__)
+    app.config.from_object(config_class)
+    app.json = TimedJSONProvider(app)
+    if hasattr(config_class, 'init_app'):
+        config_class.init_app(app)
+
+    # Let the front web server send file bytes (see file_offload.py)
+    app.config['FILE_OFFLOAD_MODE'] = normalize_mode(app.config['FILE_OFFLOAD_MODE'])
+    app.config['USE_X_SENDFILE'] = app.config['FILE_OFFLOAD_MODE'] == 'x-sendfile'
+
+    # Configure CORS with allowed origins
+    if app.config['ALLOWED_ORIGINS'] == ['*']:
+        CORS(app)
+    else:
+        CORS(app, origins=app.config['ALLOWED_ORIGINS'])
+
+    # Rounding rules for recipe amounts shown in another unit (?units=)
+    app.config['UNIT_RULES'] = unit_rules(app.config['UNIT_ROUNDING'], app.config['UNIT_SPECIAL_OZ'])
+
+    # Configure upload folder
+    uploads = os.path.join(BACKEND_FOLDER, app.config['UPLOAD_FOLDER'])
+    os.makedirs(uploads, exist_ok=True)
+    app.config['UPLOAD_FOLDER'] = uploads
+
+    # Readiness results are cached briefly so frequent probes stay cheap
+    app.extensions['readiness'] = ProbeCache(
+        functools.partial(readiness_checks, app), ttl=app.config['HEALTH_PROBE_TTL']
+    )
+
+    # Next-bottle suggestions are kept until the shelf or the recipes change
+    app.extensions['next_bottles'] = NextBottlesCache()
+
+    app.register_blueprint(api)
+    app.teardown_appcontext(release_db_connection)
+    return app
+
+# MySQL connections for the pools
+def create_db_connection(settings, host, port):
+    """Open a new MySQL connection for the pool"""
+    return mysql.connector.connect(
+        host=host,
+        port=port,
+        user=settings['MYSQL_USER'],
+        password=settings['MYSQL_PASSWORD'],
+        database=settings['MYSQL_DATABASE'],
         autocommit=False,
         consume_results=True
     )
-    # Test connection
-    conn = db_pool.get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT 1")
-    cursor.fetchall()  # Consume results
-    cursor.close()
-    conn.close()
-    print(f"✓ Connected to MySQL: {config.MYSQL_DATABASE}")
-except MySQLError as e:
-    print(f"✗ MySQL connection error: {e}")
-    print(f"  Host: {config.MYSQL_HOST}:{config.MYSQL_PORT}")
-    print(f"  Database: {config.MYSQL_DATABASE}")
-    print(f"  NOTE: Application will start but database operations will fail.")
-    print(f"  Please ensure MySQL is running and database is initialized (run init_db.py).")
-    db_pool = None
 
-# Helper function to get database connection
-def get_db_connection():
-    """Get a connection from the pool"""
-    if db_pool is None:
-        raise Exception("Database connection pool is not initialized")
-    return db_pool.get_connection()
-
-# Helper function to parse JSON field
-def parse_json_field(value):
-    """Parse JSON field from MySQL that could be str, bytes, bytearray, or already parsed"""
-    if value is None:
-        return None
-    # If already a list or dict, return as-is
-    if isinstance(value, (list, dict)):
-        return value
-    # If bytes or bytearray, decode to string first
-    if isinstance(value, (bytes, bytearray)):
-        value = value.decode('utf-8')
-    # If string, parse as JSON
-    if isinstance(value, str):
-        try:
-            return json.loads(value)
-        except (json.JSONDecodeError, ValueError):
-            return value
-    # For any other type, return as-is
-    return value
-
-# Helper function to serialize document
-def serialize_doc(doc):
-    """Convert database row to dictionary with proper serialization"""
-    if doc is None:
-        return None
-    # Convert to dict if it's a tuple/list (from cursor)
-    if isinstance(doc, (tuple, list)):
-        return doc
-    # Handle datetime objects
-    result = {}
-    for key, value in doc.items():
-        if isinstance(value, datetime):
-            result[key] = value.isoformat()
-        elif isinstance(value, (bytes, bytearray)):
-            result[key] = value.decode('utf-8')
-        else:
-            result[key] = value
-    return result
-
-# Helper function to sanitize filename
-def sanitize_filename(filename):
-    """
-    Sanitize filename to prevent directory traversal and other security issues.
-    Preserves original filename while ensuring safety.
+def create_db_pools(settings):
     """
-    if not filename:
-        return None
-    
-    # Get the basename to prevent directory traversal
-    filename = os.path.basename(filename)
-    
-    # Remove any remaining path separators
-    filename = filename.replace('/', '_').replace('\\', '_')
-    
-    # Replace any potentially problematic characters but keep alphanumeric, dots, dashes, underscores
-    # Note: spaces are preserved, dot and hyphen don't need escaping at the end of character class
-    filename = re.sub(r'[^\w\s.-]', '_', filename)
-    
-    # Remove any leading/trailing whitespace or dots
-    filename = filename.strip().strip('.')
-    
-    # If filename is empty after sanitization, return None
-    if not filename:
-        return None
-    
-    return filename
+    Create the primary pool and the read replica pools (no connections are opened yet).
 
-# Helper function to save base64 image
-def save_base64_image(base64_string, prefix='img', original_filename=None):
+    Returns:
+        Tuple of (primary pool, {"host:port": replica pool})
     """
-    Save base64 image to disk, preserving original filename if provided.
-    Also preserves EXIF orientation metadata.
-    
-    Args:
-        base64_string: Base64 encoded image data
-        prefix: Prefix to use if no original filename (default: 'img')
-        original_filename: Original filename to preserve (optional)
-    
+    def make_pool(host, port):
+        return ConnectionPool(
+            functools.partial(create_db_connection, settings, host, port),
+            pool_size=settings['DB_POOL_SIZE'],
+            max_overflow=settings['DB_POOL_MAX_OVERFLOW'],
+            timeout=settings['DB_POOL_TIMEOUT']
+        )
+
+    replicas = {}
+    for replica in settings['MYSQL_REPLICA_HOSTS']:
+        replica_host, replica_port = parse_host(replica, settings['MYSQL_PORT'])
+        replicas[f"{replica_host}:{replica_port}"] = make_pool(replica_host, replica_port)
+    return make_pool(settings['MYSQL_HOST'], settings['MYSQL_PORT']), replicas
+
+def get_db_pools():
+    """
+    Get this process's connection pools, creating them from the app config on first use.
+
     Returns:
-        Saved filename or None on error
+        Tuple of (primary pool, replica pools)
     """
-    try:
-        # Remove data URL prefix if present
-        if ',' in base64_string:
-            base64_string = base64_string.split(',')[1]
-
-        # Decode base64
-        image_data = base64.b64decode(base64_string)
-        image = Image.open(io.BytesIO(image_data))
-
-        # Preserve EXIF orientation by automatically rotating the image
-        # This ensures images display with correct orientation
-        image = exif_transpose(image)
-
-        # Determine filename
-        if original_filename:
-            # Sanitize the original filename
-            safe_filename = sanitize_filename(original_filename)
-            if safe_filename:
-                # Keep the original extension if present, otherwise use the image format
-                name_part, ext_part = os.path.splitext(safe_filename)
-                if not ext_part:
-                    # No extension, add one based on image format
-                    ext_part = f".{image.format.lower()}" if image.format else ".png"
-                filename = f"{name_part}{ext_part}"
-            else:
-                # Fallback if sanitization fails
-                filename = f"{prefix}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.png"
-        else:
-            # No original filename provided, use prefix with timestamp
-            filename = f"{prefix}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.png"
-
-        # Handle filename collisions by adding a counter
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        counter = 1
-        name_part, ext_part = os.path.splitext(filename)
-        while os.path.exists(filepath):
-            filename = f"{name_part}_{counter}{ext_part}"
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            counter += 1
-
-        # Resize if too large (max 1024x1024)
-        max_size = (1024, 1024)
-        image.thumbnail(max_size, Image.Resampling.LANCZOS)
-
-        # Determine format for saving - preserve original format when possible
-        save_format = image.format if image.format in SUPPORTED_IMAGE_FORMATS else 'PNG'
-        
-        # Save image with appropriate options
-        if save_format == 'JPEG':
-            image.save(filepath, save_format, optimize=True, quality=85)
-        else:
-            image.save(filepath, save_format, optimize=True)
-
-        return filename
-    except (IOError, ValueError, UnidentifiedImageError) as e:
-        print(f"Error saving image: {e}")
-        return None
+    global db_pool, replica_pools
+    if db_pool is None:
+        with _pools_lock:
+            if db_pool is None:
+                primary, replicas = create_db_pools(current_app.config)
+                replica_pools = replicas
+                db_pool = primary
+    return db_pool, replica_pools
+
+def _forget_db_pools():
+    """
+    Drop pools inherited from the parent after fork.
 
-# Serve uploaded images
-@app.route('/api/uploads/<filename>')
-def uploaded_file(filename):
-    return send_from_directory(app.config['UPLOAD_FOLDER'], filename)
+    The child must not use or close them: their sockets are shared with the
+    parent. The child creates its own pools on its first query.
+    """
+    global db_pool, replica_pools, _pools_lock
+    db_pool = None
+    replica_pools = {}
+    _pools_lock = threading.Lock()
 
-# ============= INGREDIENTS ENDPOINTS =============
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_db_pools)
 
-@app.route('/api/ingredients', methods=['GET'])
-def get_ingredients():
-    search = request.args.get('search', '')
-    tags = request.args.get('tags', '')
+def check_db_connection(app):
+    """Run SELECT 1 on the primary and print the result (for startup scripts)"""
+    with app.app_context():
+        try:
+            conn = get_db_pools()[0].get_connection()
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()  # Consume results
+            cursor.close()
+            conn.close()
+            print(f"✓ Connected to MySQL: {app.config['MYSQL_DATABASE']}")
+            return True
+        except MySQLError as e:
+            print(f"✗ MySQL connection error: {e}")
+            print(f"  Host: {app.config['MYSQL_HOST']}:{app.config['MYSQL_PORT']}")
+            print(f"  Database: {app.config['MYSQL_DATABASE']}")
+            print(f"  NOTE: Application will start but database operations will fail.")
+            print(f"  Please ensure MySQL is running and database is initialized (run init_db.py).")
+            return False
+
+# Check whether this client wrote recently and must read its own writes
+def reads_from_primary():
+    try:
+        return float(request.cookies.get(STICKY_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+# Pick a replica pool round-robin
+def choose_replica_pool():
+    """Returns (name, pool) of the next replica"""
+    pools = list(get_db_pools()[1].items())
+    return pools[next(replica_counter) % len(pools)]
+
+# Helper function to acquire a pooled connection, recording the wait
+def acquire_connection(name, pool):
+    started = time.perf_counter()
+    try:
+        return pool.get_connection()
+    finally:
+        metrics.DB_POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - started, name)
+
+# Helper function to get database connection
+def get_db_connection():
+    """
+    Get the request's database connection.
+
+    Acquired from the pool on first use (waiting up to DB_POOL_TIMEOUT when all
+    are busy), reused for the rest of the request and returned in teardown.
 
+    GET requests use a replica when configured, unless the client wrote within
+    the last REPLICA_STICKY_SECONDS. Writes always use the primary. If the
+    replica cannot be reached, the primary is used.
+    """
+    if 'db_conn' not in g:
+        primary, replicas = get_db_pools()
+        if replicas and request.method in READ_METHODS and not reads_from_primary():
+            try:
+                g.db_conn = acquire_connection(*choose_replica_pool())
+                g.db_replica = True
+                return g.db_conn
+            except MySQLError as e:
+                print(f"✗ Replica unavailable, reading from primary: {e}")
+        g.db_conn = acquire_connection('primary', primary)
+        g.db_replica = False
+    return g.db_conn
+
+# Helper function to record a statement run by the request (see query_log.py)
+def record_query(entry):
+    g.setdefault('sql_queries', []).append(entry)
+
+# Helper function for point lookups (fixed-shape queries, see statement_cache.py)
+def fetch_one(sql, params):
+    """Fetch a single row with a cached prepared statement on the request's connection"""
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    return query_log.timed_call(
+        record_query, sql, params, lambda row: 1 if row else 0,
+        fetch_one_prepared, conn, sql, params
+    )
 
-    query = "SELECT * FROM ingredients WHERE 1=1"
-    params = []
+# Helper function to run a fixed-shape write as a prepared statement
+def execute_statement(conn, sql, params):
+    """Execute a cached prepared statement. Returns the cursor (for rowcount)."""
+    return query_log.timed_call(
+        record_query, sql, params, lambda cursor: max(cursor.rowcount, 0),
+        execute_prepared, conn, sql, params
+    )
 
-    if search:
-        query += " AND (name LIKE %s OR description LIKE %s)"
-        search_param = f"%{search}%"
-        params.extend([search_param, search_param])
+# Helper function to get a cursor on the request's connection
+def get_db_cursor(**kwargs):
+    """Create an instrumented cursor on the request's connection; closed in teardown"""
+    cursor = query_log.InstrumentedCursor(get_db_connection().cursor(**kwargs), record_query)
+    g.setdefault('db_cursors', []).append(cursor)
+    return cursor
 
-    if tags:
-        tag_list = [t.strip() for t in tags.split(',')]
-        # Check if any of the tags are in the JSON array
-        tag_conditions = []
-        for tag in tag_list:
-            tag_conditions.append("JSON_CONTAINS(tags, %s)")
-            params.append(json.dumps(tag))
-        query += f" AND ({' OR '.join(tag_conditions)})"
+# Return the request's connection to the pool, even if the handler failed
+def release_db_connection(exc):
+    for cursor in g.pop('db_cursors', []):
+        try:
+            cursor.close()
+        except MySQLError:
+            pass
+
+    conn = g.pop('db_conn', None)
+    if conn is None:
+        return
+    if exc is not None:
+        try:
+            conn.rollback()
+        except MySQLError:
+            pass
+    conn.close()
+
+# After a successful write, keep this client on the primary for a short window
+@api.after_app_request
+def stick_to_primary_after_write(response):
+    if replica_pools and request.method not in READ_METHODS and response.status_code < 400:
+        sticky_seconds = current_app.config['REPLICA_STICKY_SECONDS']
+        until = time.time() + sticky_seconds
+        response.set_cookie(
+            STICKY_PRIMARY_COOKIE, f"{until:.3f}",
+            max_age=sticky_seconds, httponly=True, samesite='Lax'
+        )
+    return response
+
+# All pool connections stayed busy for the whole acquire timeout
+@api.app_errorhandler(PoolTimeoutError)
+def handle_pool_timeout(e):
+    response = jsonify({'error': 'Database is busy, please retry'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+# Connection pool usage and wait metrics
+@api.route('/api/db/pool', methods=['GET'])
+def get_pool_stats():
+    primary, replicas = get_db_pools()
+    return jsonify({
+        'primary': primary.stats(),
+        'replicas': {name: pool.stats() for name, pool in replicas.items()},
+    })
+
+# JSON serialization timed for the Server-Timing header
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            if has_request_context():
+                g.serialize_seconds = g.get('serialize_seconds', 0.0) + time.perf_counter() - started
+
+# Helper function to time image processing for the Server-Timing header
+def process_images(func, *args):
+    started = time.perf_counter()
+    try:
+        return func(*args)
+    finally:
+        g.image_seconds = g.get('image_seconds', 0.0) + time.perf_counter() - started
 
-    query += " ORDER BY name ASC"
+# Helper function to get the upload folder of the current app
+def upload_folder():
+    """The current app's upload folder, or the default one outside an app context"""
+    return current_app.config['UPLOAD_FOLDER'] if has_app_context() else UPLOAD_FOLDER
 
+# Helper function to save base64 image into the upload folder
+def save_base64_image(base64_string, prefix='img', original_filename=None):
+    """Save a base64 image upload (see api_core.save_base64_image). Returns the filename or None."""
+    return api_core.save_base64_image(upload_folder(), base64_string, prefix, original_filename)
+
+# Helper function to add fingerprinted image URLs
+def add_image_urls(doc):
+    """Add fingerprinted upload URLs (relative to the API root) matching doc['images']"""
+    return api_core.add_image_urls(upload_folder(), doc)
+
+# Helper function to set browser caching policy
+def set_cache_headers(response, immutable=False, max_age=None):
+    """Set Cache-Control: immutable for fingerprinted URLs, short and revalidating otherwise"""
+    if immutable:
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        if max_age is None:
+            max_age = current_app.config['STATIC_MAX_AGE']
+        response.headers['Cache-Control'] = f'public, max-age={max_age}, must-revalidate'
+    return response
+
+# Serve uploaded images
+@api.route('/api/uploads/<filename>')
+@api.route('/api/uploads/<path:filename>')
+def uploaded_file(filename):
+    filename, immutable = resolve_fingerprinted(current_app.config['UPLOAD_FOLDER'], filename)
+    # Flat and sharded references both resolve to wherever the file is stored
+    filename = resolve_upload(current_app.config['UPLOAD_FOLDER'], filename) or filename
+    response = send_file_offloaded(
+        current_app.config['UPLOAD_FOLDER'], filename,
+        current_app.config['FILE_OFFLOAD_MODE'], current_app.config['X_ACCEL_UPLOADS_PREFIX']
+    )
+    return set_cache_headers(response, immutable=immutable)
+
+# ============= INGREDIENTS ENDPOINTS =============
+
+@api.route('/api/ingredients', methods=['GET'])
+def get_ingredients():
+    query, params = list_query('ingredients', request.args.get('search', ''), request.args.get('tags', ''))
+
+    cursor = get_db_cursor(dictionary=True)
     cursor.execute(query, params)
     ingredients = cursor.fetchall()
 
     # Parse JSON fields
     for ing in ingredients:
-        ing['tags'] = parse_json_field(ing.get('tags'))
-        ing['images'] = parse_json_field(ing.get('images'))
-
-    cursor.close()
-    conn.close()
+        parse_row('ingredients', ing)
+        add_image_urls(ing)
 
     return jsonify(ingredients)
 
-@app.route('/api/ingredients/<int:ingredient_id>', methods=['GET'])
+@api.route('/api/ingredients/<int:ingredient_id>', methods=['GET'])
 def get_ingredient(ingredient_id):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute("SELECT * FROM ingredients WHERE id = %s", (ingredient_id,))
-    ingredient = cursor.fetchone()
-
-    cursor.close()
-    conn.close()
+    ingredient = fetch_one(SELECT_INGREDIENT, (ingredient_id,))
 
     if ingredient:
-        # Parse JSON fields
-        ingredient['tags'] = parse_json_field(ingredient.get('tags'))
-        ingredient['images'] = parse_json_field(ingredient.get('images'))
+        parse_row('ingredients', ingredient)
+        add_image_urls(ingredient)
         return jsonify(serialize_doc(ingredient))
     return jsonify({'error': 'Ingredient not found'}), 404
 
-@app.route('/api/ingredients', methods=['POST'])
+@api.route('/api/ingredients', methods=['POST'])
 def create_ingredient():
     data = request.json
 
     # Handle image uploads
-    images = []
-    if 'images' in data and data['images']:
-        for img_data in data['images']:
-            if img_data:
-                filename = save_base64_image(img_data, 'ingredient')
-                if filename:
-                    images.append(filename)
+    images = process_images(save_new_images, current_app.config['UPLOAD_FOLDER'], data, 'ingredient')
 
     conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = get_db_cursor()
 
-    query = """
-        INSERT INTO ingredients (name, description, category, tags, images, bar_shelf_availability, created_at, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-    """
     now = datetime.utcnow()
-    params = (
-        data.get('name'),
-        data.get('description', ''),
-        data.get('category', ''),
-        json.dumps(data.get('tags', [])),
-        json.dumps(images),
-        data.get('bar_shelf_availability', 'Y'),
-        now,
-        now
-    )
-
-    cursor.execute(query, params)
+    cursor.execute(INSERT_INGREDIENT, ingredient_params(data, images) + (now, now))
     conn.commit()
-    ingredient_id = cursor.lastrowid
 
-    cursor.close()
-    conn.close()
+    # Nothing inserted: an ingredient with the same normalized name exists
+    if cursor.rowcount == 0:
+        process_images(discard_images, current_app.config['UPLOAD_FOLDER'], images)
+        return jsonify({'error': 'Ingredient already exists', 'id': cursor.lastrowid}), 409
 
-    ingredient = {
-        'id': ingredient_id,
-        'name': data.get('name'),
-        'description': data.get('description', ''),
-        'category': data.get('category', ''),
-        'tags': data.get('tags', []),
-        'images': images,
-        'bar_shelf_availability': data.get('bar_shelf_availability', 'Y'),
-        'created_at': now.isoformat(),
-        'updated_at': now.isoformat()
-    }
-
-    return jsonify(ingredient), 201
-
-@app.route('/api/ingredients/<int:ingredient_id>', methods=['PUT'])
+    return jsonify(created_ingredient(cursor.lastrowid, data, images, now)), 201
+
+@api.route('/api/ingredients/<int:ingredient_id>', methods=['PUT'])
 def update_ingredient(ingredient_id):
     data = request.json
 
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    cursor = get_db_cursor(dictionary=True)
 
     # Get existing ingredient to preserve old images
-    cursor.execute("SELECT images FROM ingredients WHERE id = %s", (ingredient_id,))
-    existing = cursor.fetchone()
+    existing = fetch_one(SELECT_INGREDIENT_IMAGES, (ingredient_id,))
 
     if not existing:
-        cursor.close()
-        conn.close()
         return jsonify({'error': 'Ingredient not found'}), 404
 
-    images = parse_json_field(existing['images']) or []
-
-    # Handle new image uploads
-    if 'images' in data and data['images']:
-        for img_data in data['images']:
-            if img_data and img_data.startswith('data:'):
-                filename = save_base64_image(img_data, 'ingredient')
-                if filename:
-                    images.append(filename)
-            elif img_data:  # Existing image filename
-                if img_data not in images:
-                    images.append(img_data)
-
-    # Handle image removals
-    if 'removed_images' in data and data['removed_images']:
-        for img in data['removed_images']:
-            if img in images:
-                images.remove(img)
-                # Delete file from disk
-                try:
-                    os.remove(os.path.join(app.config['UPLOAD_FOLDER'], img))
-                except:
-                    pass
-
-    query = """
-        UPDATE ingredients
-        SET name = %s, description = %s, category = %s, tags = %s, images = %s, bar_shelf_availability = %s, updated_at = %s
-        WHERE id = %s
-    """
-    now = datetime.utcnow()
-    params = (
-        data.get('name'),
-        data.get('description', ''),
-        data.get('category', ''),
-        json.dumps(data.get('tags', [])),
-        json.dumps(images),
-        data.get('bar_shelf_availability', 'Y'),
-        now,
-        ingredient_id
+    # Removed images are deleted only once the update is committed
+    images, saved, removed = process_images(
+        plan_image_changes, current_app.config['UPLOAD_FOLDER'], parse_json_field(existing['images']) or [], data, 'ingredient'
     )
 
-    cursor.execute(query, params)
+    now = datetime.utcnow()
+    try:
+        cursor.execute(UPDATE_INGREDIENT, ingredient_params(data, images) + (now, ingredient_id))
+    except MySQLError as e:
+        if not is_duplicate_key(e):
+            raise
+        # Renamed to the normalized name of another ingredient
+        conn.rollback()
+        process_images(discard_images, current_app.config['UPLOAD_FOLDER'], saved)
+        return jsonify({'error': 'Ingredient already exists'}), 409
     conn.commit()
+    process_images(discard_images, current_app.config['UPLOAD_FOLDER'], removed)
 
     # Fetch updated ingredient
-    cursor.execute("SELECT * FROM ingredients WHERE id = %s", (ingredient_id,))
-    ingredient = cursor.fetchone()
-
-    cursor.close()
-    conn.close()
+    ingredient = fetch_one(SELECT_INGREDIENT, (ingredient_id,))
 
     if ingredient:
-        # Parse JSON fields
-        ingredient['tags'] = parse_json_field(ingredient.get('tags'))
-        ingredient['images'] = parse_json_field(ingredient.get('images'))
+        parse_row('ingredients', ingredient)
         return jsonify(serialize_doc(ingredient))
     return jsonify({'error': 'Ingredient not found'}), 404
 
-@app.route('/api/ingredients/<int:ingredient_id>', methods=['DELETE'])
+@api.route('/api/ingredients/<int:ingredient_id>', methods=['DELETE'])
 def delete_ingredient(ingredient_id):
     conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = get_db_cursor()
 
-    cursor.execute("DELETE FROM ingredients WHERE id = %s", (ingredient_id,))
+    cursor.execute(DELETE_INGREDIENT, (ingredient_id,))
     deleted_count = cursor.rowcount
     conn.commit()
 
-    cursor.close()
-    conn.close()
-
     if deleted_count:
         return jsonify({'message': 'Ingredient deleted successfully'})
     return jsonify({'error': 'Ingredient not found'}), 404
 
-@app.route('/api/ingredients/<int:ingredient_id>/bar-shelf', methods=['PATCH'])
+@api.route('/api/ingredients/<int:ingredient_id>/bar-shelf', methods=['PATCH'])
 def update_ingredient_bar_shelf(ingredient_id):
     """Update only the bar_shelf_availability field for an ingredient"""
     data = request.json
@@ -431,367 +508,181 @@ def update_ingredient_bar_shelf(ingredient_id):
         return jsonify({'error': 'bar_shelf_availability must be either "Y" or "N"'}), 400
     
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
     
     # Update bar_shelf_availability
-    cursor.execute(
-        "UPDATE ingredients SET bar_shelf_availability = %s WHERE id = %s",
-        (bar_shelf_availability, ingredient_id)
-    )
+    cursor = execute_statement(conn, UPDATE_INGREDIENT_BAR_SHELF, (bar_shelf_availability, ingredient_id))
     
     # Check if any rows were affected
     if cursor.rowcount == 0:
-        cursor.close()
-        conn.close()
         return jsonify({'error': 'Ingredient not found'}), 404
     
     conn.commit()
     
     # Fetch updated ingredient
-    cursor.execute("SELECT * FROM ingredients WHERE id = %s", (ingredient_id,))
-    ingredient = cursor.fetchone()
-    
-    cursor.close()
-    conn.close()
-    
-    # Parse JSON fields
-    ingredient['tags'] = parse_json_field(ingredient.get('tags'))
-    ingredient['images'] = parse_json_field(ingredient.get('images'))
+    ingredient = fetch_one(SELECT_INGREDIENT, (ingredient_id,))
+    parse_row('ingredients', ingredient)
     return jsonify(serialize_doc(ingredient))
 
 # ============= RECIPES ENDPOINTS =============
 
-@app.route('/api/recipes', methods=['GET'])
+@api.route('/api/recipes', methods=['GET'])
 def get_recipes():
-    search = request.args.get('search', '')
-    tags = request.args.get('tags', '')
     bar_shelf_mode = request.args.get('bar_shelf_mode', '').upper()
+    units = requested_units(request.args.get('units', ''))
+    if units is None:
+        return jsonify({'error': 'units must be one of: ' + ', '.join(DISPLAY_UNITS)}), 400
+    query, params = recipes_query(request.args.get('search', ''), request.args.get('tags', ''))
 
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    query = "SELECT * FROM recipes WHERE 1=1"
-    params = []
-
-    if search:
-        query += " AND (name LIKE %s OR JSON_SEARCH(LOWER(ingredients), 'one', LOWER(%s)) IS NOT NULL)"
-        search_param = f"%{search}%"
-        params.extend([search_param, search_param])
-
-    if tags:
-        tag_list = [t.strip() for t in tags.split(',')]
-        tag_conditions = []
-        for tag in tag_list:
-            tag_conditions.append("JSON_CONTAINS(LOWER(tags), LOWER(%s))")
-            params.append(json.dumps(tag))
-        query += f" AND ({' AND '.join(tag_conditions)})"
-
-    query += " ORDER BY name ASC"
-
+    cursor = get_db_cursor(dictionary=True)
     cursor.execute(query, params)
     recipes = cursor.fetchall()
 
     # Parse JSON fields
     for recipe in recipes:
-        recipe['tags'] = parse_json_field(recipe.get('tags'))
-        recipe['images'] = parse_json_field(recipe.get('images'))
-        recipe['ingredients'] = parse_json_field(recipe.get('ingredients'))
+        parse_row('recipes', recipe)
+        add_image_urls(recipe)
 
     # Filter recipes based on bar shelf availability if bar_shelf_mode is 'Y'
     if bar_shelf_mode == 'Y':
-        # Optimize by fetching all ingredient availabilities in one query
-        # First, collect all unique ingredient names from all recipes
-        all_ingredient_names = set()
-        for recipe in recipes:
-            ingredients = recipe.get('ingredients')
-            if ingredients:
-                for ingredient in ingredients:
-                    ingredient_name = ingredient.get('name', '')
-                    if ingredient_name:
-                        all_ingredient_names.add(ingredient_name)
-        
+        # Report bar shelf requests separately in the request metrics
+        g.metrics_route = '/api/recipes?bar_shelf_mode=Y'
         # Fetch all ingredient availabilities in a single query
         ingredient_availability = {}
-        if all_ingredient_names:
-            # Create placeholders for IN clause
-            placeholders = ', '.join(['%s'] * len(all_ingredient_names))
-            query = f"SELECT name, bar_shelf_availability FROM ingredients WHERE name IN ({placeholders})"
-            cursor.execute(query, tuple(all_ingredient_names))
-            results = cursor.fetchall()
-            for result in results:
-                ingredient_availability[result['name']] = result.get('bar_shelf_availability', 'N')
-        
-        # Now filter recipes based on the fetched availability data
-        filtered_recipes = []
-        for recipe in recipes:
-            ingredients = recipe.get('ingredients')
-            # Only include recipes that have ingredients
-            if ingredients:
-                # Check if all ingredients are available on bar shelf
-                all_available = True
-                for ingredient in ingredients:
-                    ingredient_name = ingredient.get('name', '')
-                    if not ingredient_name:
-                        # Exclude recipe if ingredient has no name (data integrity issue)
-                        all_available = False
-                        break
-                    # Check availability from our pre-fetched data
-                    if ingredient_availability.get(ingredient_name) != 'Y':
-                        # Exclude recipe if ingredient not found or not available
-                        all_available = False
-                        break
-                
-                if all_available:
-                    filtered_recipes.append(recipe)
-        recipes = filtered_recipes
-
-    cursor.close()
-    conn.close()
+        names = recipe_ingredient_names(recipes)
+        if names:
+            cursor.execute(*availability_query(names))
+            for result in cursor.fetchall():
+                ingredient_availability[result['name_normalized']] = result.get('bar_shelf_availability', 'N')
+        recipes = filter_available_recipes(recipes, ingredient_availability)
+
+    if units:
+        convert_recipe_units(recipes, units, current_app.config['UNIT_RULES'])
 
     return jsonify(recipes)
 
-@app.route('/api/recipes/<int:recipe_id>', methods=['GET'])
+@api.route('/api/recipes/<int:recipe_id>', methods=['GET'])
 def get_recipe(recipe_id):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute("SELECT * FROM recipes WHERE id = %s", (recipe_id,))
-    recipe = cursor.fetchone()
+    units = requested_units(request.args.get('units', ''))
+    if units is None:
+        return jsonify({'error': 'units must be one of: ' + ', '.join(DISPLAY_UNITS)}), 400
 
-    cursor.close()
-    conn.close()
+    recipe = fetch_one(SELECT_RECIPE, (recipe_id,))
 
     if recipe:
-        # Parse JSON fields
-        recipe['tags'] = parse_json_field(recipe.get('tags'))
-        recipe['images'] = parse_json_field(recipe.get('images'))
-        recipe['ingredients'] = parse_json_field(recipe.get('ingredients'))
+        parse_row('recipes', recipe)
+        add_image_urls(recipe)
+        if units:
+            convert_recipe_units([recipe], units, current_app.config['UNIT_RULES'])
         return jsonify(serialize_doc(recipe))
     return jsonify({'error': 'Recipe not found'}), 404
 
-@app.route('/api/recipes', methods=['POST'])
+@api.route('/api/recipes', methods=['POST'])
 def create_recipe():
     data = request.json
 
     # Handle image uploads
-    images = []
-    if 'images' in data and data['images']:
-        for img_data in data['images']:
-            if img_data:
-                # Check if image data includes filename (new format: {"data": "...", "filename": "..."})
-                if isinstance(img_data, dict) and 'data' in img_data:
-                    filename = save_base64_image(
-                        img_data['data'], 
-                        'recipe', 
-                        img_data.get('filename')
-                    )
-                else:
-                    # Legacy format: just base64 string
-                    filename = save_base64_image(img_data, 'recipe')
-                
-                if filename:
-                    images.append(filename)
+    images = process_images(save_new_images, current_app.config['UPLOAD_FOLDER'], data, 'recipe')
 
     conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = get_db_cursor()
 
-    query = """
-        INSERT INTO recipes (name, description, ingredients, instructions, tags, images, created_at, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-    """
     now = datetime.utcnow()
-    params = (
-        data.get('name'),
-        data.get('description', ''),
-        json.dumps(data.get('ingredients', [])),
-        data.get('instructions', ''),
-        json.dumps(data.get('tags', [])),
-        json.dumps(images),
-        now,
-        now
-    )
-
-    cursor.execute(query, params)
+    cursor.execute(INSERT_RECIPE, recipe_params(data, images) + (now, now))
     conn.commit()
-    recipe_id = cursor.lastrowid
 
-    cursor.close()
-    conn.close()
+    return jsonify(created_recipe(cursor.lastrowid, data, images, now)), 201
 
-    recipe = {
-        'id': recipe_id,
-        'name': data.get('name'),
-        'description': data.get('description', ''),
-        'ingredients': data.get('ingredients', []),
-        'instructions': data.get('instructions', ''),
-        'tags': data.get('tags', []),
-        'images': images,
-        'created_at': now.isoformat(),
-        'updated_at': now.isoformat()
-    }
-
-    return jsonify(recipe), 201
-
-@app.route('/api/recipes/<int:recipe_id>', methods=['PUT'])
+@api.route('/api/recipes/<int:recipe_id>', methods=['PUT'])
 def update_recipe(recipe_id):
     data = request.json
 
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    cursor = get_db_cursor(dictionary=True)
 
     # Get existing recipe to preserve old images
-    cursor.execute("SELECT images FROM recipes WHERE id = %s", (recipe_id,))
-    existing = cursor.fetchone()
+    existing = fetch_one(SELECT_RECIPE_IMAGES, (recipe_id,))
 
     if not existing:
-        cursor.close()
-        conn.close()
         return jsonify({'error': 'Recipe not found'}), 404
 
-    images = parse_json_field(existing['images']) or []
-
-    # Handle new image uploads
-    if 'images' in data and data['images']:
-        for img_data in data['images']:
-            # Check if it's a new image (starts with 'data:' or is dict with data field)
-            if isinstance(img_data, dict) and 'data' in img_data:
-                # New format with filename
-                filename = save_base64_image(
-                    img_data['data'], 
-                    'recipe', 
-                    img_data.get('filename')
-                )
-                if filename:
-                    images.append(filename)
-            elif isinstance(img_data, str) and img_data.startswith('data:'):
-                # Legacy format: just base64 string
-                filename = save_base64_image(img_data, 'recipe')
-                if filename:
-                    images.append(filename)
-            elif img_data:  # Existing image filename
-                if img_data not in images:
-                    images.append(img_data)
-
-    # Handle image removals
-    if 'removed_images' in data and data['removed_images']:
-        for img in data['removed_images']:
-            if img in images:
-                images.remove(img)
-                # Delete file from disk
-                try:
-                    os.remove(os.path.join(app.config['UPLOAD_FOLDER'], img))
-                except:
-                    pass
-
-    query = """
-        UPDATE recipes
-        SET name = %s, description = %s, ingredients = %s, instructions = %s, tags = %s, images = %s, updated_at = %s
-        WHERE id = %s
-    """
-    now = datetime.utcnow()
-    params = (
-        data.get('name'),
-        data.get('description', ''),
-        json.dumps(data.get('ingredients', [])),
-        data.get('instructions', ''),
-        json.dumps(data.get('tags', [])),
-        json.dumps(images),
-        now,
-        recipe_id
+    images = process_images(
+        apply_image_changes, current_app.config['UPLOAD_FOLDER'], parse_json_field(existing['images']) or [], data, 'recipe'
     )
 
-    cursor.execute(query, params)
+    now = datetime.utcnow()
+    cursor.execute(UPDATE_RECIPE, recipe_params(data, images) + (now, recipe_id))
     conn.commit()
 
     # Fetch updated recipe
-    cursor.execute("SELECT * FROM recipes WHERE id = %s", (recipe_id,))
-    recipe = cursor.fetchone()
-
-    cursor.close()
-    conn.close()
+    recipe = fetch_one(SELECT_RECIPE, (recipe_id,))
 
     if recipe:
-        # Parse JSON fields
-        recipe['tags'] = parse_json_field(recipe.get('tags'))
-        recipe['images'] = parse_json_field(recipe.get('images'))
-        recipe['ingredients'] = parse_json_field(recipe.get('ingredients'))
+        parse_row('recipes', recipe)
         return jsonify(serialize_doc(recipe))
     return jsonify({'error': 'Recipe not found'}), 404
 
-@app.route('/api/recipes/<int:recipe_id>', methods=['DELETE'])
+@api.route('/api/recipes/<int:recipe_id>', methods=['DELETE'])
 def delete_recipe(recipe_id):
     conn = get_db_connection()
-    cursor = conn.cursor()
+    cursor = get_db_cursor()
 
-    cursor.execute("DELETE FROM recipes WHERE id = %s", (recipe_id,))
+    cursor.execute(DELETE_RECIPE, (recipe_id,))
     deleted_count = cursor.rowcount
     conn.commit()
 
-    cursor.close()
-    conn.close()
-
     if deleted_count:
         return jsonify({'message': 'Recipe deleted successfully'})
     return jsonify({'error': 'Recipe not found'}), 404
 
-# ============= COLLECTIONS ENDPOINTS =============
+# ============= INSIGHTS ENDPOINTS =============
 
-@app.route('/api/collections', methods=['GET'])
-def get_collections():
-    search = request.args.get('search', '')
-    tags = request.args.get('tags', '')
+@api.route('/api/insights/next-bottles', methods=['GET'])
+def get_next_bottles():
+    """Missing ingredients that would make the most recipes makeable (mode=rank|greedy, k=1..100)"""
+    mode, k, error = next_bottles_params(request.args)
+    if error:
+        return jsonify({'error': error}), 400
 
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    cache = current_app.extensions['next_bottles']
+    cursor = get_db_cursor(dictionary=True)
+    cursor.execute(SHELF_FINGERPRINT_QUERY)
+    current = fingerprint(cursor.fetchone())
 
-    query = "SELECT * FROM collections WHERE 1=1"
-    params = []
+    cached = cache.lookup(current, mode, k)
+    if cached:
+        index, suggestions = cached
+    else:
+        cursor.execute(SHELF_INGREDIENTS_QUERY)
+        ingredients = cursor.fetchall()
+        cursor.execute(SHELF_RECIPES_QUERY)
+        index, suggestions = cache.store(current, ShelfIndex(ingredients, cursor.fetchall()), mode, k)
 
-    if search:
-        query += " AND (name LIKE %s OR description LIKE %s)"
-        search_param = f"%{search}%"
-        params.extend([search_param, search_param])
+    return jsonify(next_bottles_response(index, mode, k, suggestions, cached is not None))
 
-    if tags:
-        tag_list = [t.strip() for t in tags.split(',')]
-        tag_conditions = []
-        for tag in tag_list:
-            tag_conditions.append("JSON_CONTAINS(tags, %s)")
-            params.append(json.dumps(tag))
-        query += f" AND ({' OR '.join(tag_conditions)})"
+# ============= COLLECTIONS ENDPOINTS =============
 
-    query += " ORDER BY name ASC"
+@api.route('/api/collections', methods=['GET'])
+def get_collections():
+    query, params = list_query('collections', request.args.get('search', ''), request.args.get('tags', ''))
 
+    cursor = get_db_cursor(dictionary=True)
     cursor.execute(query, params)
     collections = cursor.fetchall()
 
     # Parse JSON fields
     for coll in collections:
-        coll['tags'] = parse_json_field(coll.get('tags'))
-        coll['images'] = parse_json_field(coll.get('images'))
-        coll['recipe_ids'] = parse_json_field(coll.get('recipe_ids'))
-
-    cursor.close()
-    conn.close()
+        parse_row('collections', coll)
+        add_image_urls(coll)
 
     return jsonify(collections)
 
-@app.route('/api/collections/<int:collection_id>', methods=['GET'])
+@api.route('/api/collections/<int:collection_id>', methods=['GET'])
 def get_collection(collection_id):
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-
-    cursor.execute("SELECT * FROM collections WHERE id = %s", (collection_id,))
-    collection = cursor.fetchone()
-
-    cursor.close()
-    conn.close()
+    collection = fetch_one(SELECT_COLLECTION, (collection_id,))
 
     if collection:
-        # Parse JSON fields
-        collection['tags'] = parse_json_field(collection.get('tags'))
-        collection['images'] = parse_json_field(collection.get('images'))
-        collection['recipe_ids'] = parse_json_field(collection.get('recipe_ids'))
+        parse_row('collections', collection)
+        add_image_urls(collection)
         return jsonify(serialize_doc(collection))
     return jsonify({'error': 'Collection not found'}), 404
 
@@ -846,88 +737,32 @@ def get_collection(collection_id):
 
 #     return jsonify(collection), 201
 
-@app.route('/api/collections/<int:collection_id>', methods=['PUT'])
+@api.route('/api/collections/<int:collection_id>', methods=['PUT'])
 def update_collection(collection_id):
     data = request.json
 
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
+    cursor = get_db_cursor(dictionary=True)
 
     # Get existing collection to preserve old images
-    cursor.execute("SELECT images FROM collections WHERE id = %s", (collection_id,))
-    existing = cursor.fetchone()
+    existing = fetch_one(SELECT_COLLECTION_IMAGES, (collection_id,))
 
     if not existing:
-        cursor.close()
-        conn.close()
         return jsonify({'error': 'Collection not found'}), 404
 
-    images = parse_json_field(existing['images']) or []
-
-    # Handle new image uploads
-    if 'images' in data and data['images']:
-        for img_data in data['images']:
-            # Check if it's a new image (starts with 'data:' or is dict with data field)
-            if isinstance(img_data, dict) and 'data' in img_data:
-                # New format with filename
-                filename = save_base64_image(
-                    img_data['data'], 
-                    'collection', 
-                    img_data.get('filename')
-                )
-                if filename:
-                    images.append(filename)
-            elif isinstance(img_data, str) and img_data.startswith('data:'):
-                # Legacy format: just base64 string
-                filename = save_base64_image(img_data, 'collection')
-                if filename:
-                    images.append(filename)
-            elif img_data:  # Existing image filename
-                if img_data not in images:
-                    images.append(img_data)
-
-    # Handle image removals
-    if 'removed_images' in data and data['removed_images']:
-        for img in data['removed_images']:
-            if img in images:
-                images.remove(img)
-                # Delete file from disk
-                try:
-                    os.remove(os.path.join(app.config['UPLOAD_FOLDER'], img))
-                except:
-                    pass
-
-    query = """
-        UPDATE collections
-        SET name = %s, description = %s, recipe_ids = %s, tags = %s, images = %s, updated_at = %s
-        WHERE id = %s
-    """
-    now = datetime.utcnow()
-    params = (
-        data.get('name'),
-        data.get('description', ''),
-        json.dumps(data.get('recipe_ids', [])),
-        json.dumps(data.get('tags', [])),
-        json.dumps(images),
-        now,
-        collection_id
+    images = process_images(
+        apply_image_changes, current_app.config['UPLOAD_FOLDER'], parse_json_field(existing['images']) or [], data, 'collection'
     )
 
-    cursor.execute(query, params)
+    now = datetime.utcnow()
+    cursor.execute(UPDATE_COLLECTION, collection_params(data, images) + (now, collection_id))
     conn.commit()
 
     # Fetch updated collection
-    cursor.execute("SELECT * FROM collections WHERE id = %s", (collection_id,))
-    collection = cursor.fetchone()
-
-    cursor.close()
-    conn.close()
+    collection = fetch_one(SELECT_COLLECTION, (collection_id,))
 
     if collection:
-        # Parse JSON fields
-        collection['tags'] = parse_json_field(collection.get('tags'))
-        collection['images'] = parse_json_field(collection.get('images'))
-        collection['recipe_ids'] = parse_json_field(collection.get('recipe_ids'))
+        parse_row('collections', collection)
         return jsonify(serialize_doc(collection))
     return jsonify({'error': 'Collection not found'}), 404
 
@@ -948,35 +783,126 @@ def update_collection(collection_id):
 #     return jsonify({'error': 'Collection not found'}), 404
 
 # Health check endpoint
-@app.route('/api/health', methods=['GET'])
+@api.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({'status': 'healthy', 'app': 'Neighborhood Sips'})
 
+# Request counters and latency histograms (see metrics.py)
+@api.before_app_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@api.after_app_request
+def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    # Route templates keep label cardinality bounded
+    route = g.get('metrics_route') or (request.url_rule.rule if request.url_rule else 'unmatched')
+    status = str(response.status_code)
+    metrics.HTTP_REQUESTS.inc(route, request.method, status)
+    metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route, request.method, status)
+    if 'sql_queries' in g:
+        statements, seconds, _ = query_log.totals(g.sql_queries)
+        metrics.DB_QUERIES_PER_REQUEST.observe(statements, route)
+        metrics.DB_SECONDS_PER_REQUEST.observe(seconds, route)
+    return response
+
+# Slow-query log and Server-Timing header (see query_log.py)
+@api.after_app_request
+def report_request_timings(response):
+    entries = g.get('sql_queries', [])
+    threshold = current_app.config['SLOW_QUERY_MS'] / 1000
+    if entries and threshold > 0:
+        route = request.url_rule.rule if request.url_rule else request.path
+        for entry in query_log.slow_queries(entries, threshold):
+            print(query_log.format_slow_query(entry, route))
+            if current_app.config['SLOW_QUERY_EXPLAIN'] and 'db_conn' in g:
+                try:
+                    plan = query_log.explain(g.db_conn, entry)
+                except MySQLError as e:
+                    print(f"  EXPLAIN failed: {e}")
+                    plan = None
+                for line in query_log.format_plan(plan or []):
+                    print(f"  {line}")
+
+    if current_app.config['SERVER_TIMING']:
+        statements, db_seconds, rows = query_log.totals(entries)
+        response.headers['Server-Timing'] = query_log.server_timing_header([
+            ('db', db_seconds, f"{statements} queries, {rows} rows"),
+            ('serialize', g.get('serialize_seconds', 0.0), None),
+            ('image', g.get('image_seconds', 0.0), None),
+        ])
+    return response
+
+# Pool gauges and cache hit ratios, read when metrics are scraped
+@metrics.REGISTRY.register_collector
+def collect_pool_and_cache_metrics():
+    pools = {'primary': db_pool, **replica_pools} if db_pool is not None else {}
+    stats = {name: pool.stats() for name, pool in pools.items()}
+    yield ('db_pool_connections', 'gauge', 'Pooled connections by state',
+           [({'pool': name, 'state': state}, s[state]) for name, s in stats.items()
+            for state in ('open', 'in_use', 'idle')])
+    yield ('db_pool_max_connections', 'gauge', 'Pool size plus overflow',
+           [({'pool': name}, s['pool_size'] + s['max_overflow']) for name, s in stats.items()])
+    yield ('db_pool_waiters', 'gauge', 'Requests waiting for a pooled connection',
+           [({'pool': name}, s['waiters']) for name, s in stats.items()])
+    yield ('db_pool_timeouts_total', 'counter', 'Acquire attempts that timed out',
+           [({'pool': name}, s['timeouts_total']) for name, s in stats.items()])
+    yield ('db_pool_connections_created_total', 'counter', 'Connections opened by the pool',
+           [({'pool': name}, s['created_total']) for name, s in stats.items()])
+
+    yield from metrics.cache_metrics({
+        'gallery_manifest': (gallery_manifest.hits, gallery_manifest.misses),
+        'asset_fingerprints': (fingerprints.hits, fingerprints.misses),
+    })
+
+# Prometheus scrape endpoint
+@api.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    response = Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+# Liveness: the process is serving requests (no dependencies checked)
+@api.route('/api/health/live', methods=['GET'])
+def health_live():
+    return jsonify({'status': 'alive'})
+
+# Readiness checks (see health.py)
+def readiness_checks(app):
+    """Run the readiness checks for an app. Returns (ready, {component: result})."""
+    with app.app_context():
+        checks = {
+            'database': lambda: check_database(get_db_pools()[0], app.config['HEALTH_DB_TIMEOUT']),
+            'uploads': lambda: check_writable(app.config['UPLOAD_FOLDER']),
+        }
+        if os.path.isdir(GALLERY_FOLDER):
+            checks['gallery_cache'] = lambda: check_gallery_cache(gallery_manifest)
+        return run_checks(checks)
+
+# Readiness: the instance can serve traffic; 503 takes it out of the load balancer
+@api.route('/api/health/ready', methods=['GET'])
+def health_ready():
+    (ready, checks), age = current_app.extensions['readiness'].get()
+    response = jsonify({
+        'status': 'ready' if ready else 'not ready',
+        'checks': checks,
+        'age_ms': round(age * 1000, 2),
+    })
+    response.status_code = 200 if ready else 503
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
 # Gallery images endpoint
-@app.route('/api/gallery/images', methods=['GET'])
+@api.route('/api/gallery/images', methods=['GET'])
 def get_gallery_images():
-    """Get list of all images in the gallery directory"""
-    gallery_dir = os.path.join(os.path.dirname(__file__), 'static', 'images', 'gallery')
-    
-    if not os.path.exists(gallery_dir):
-        return jsonify({'images': []})
-    
-    # Get all image files from the gallery directory
-    image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.JPG', '.JPEG', '.PNG', '.GIF'}
-    images = []
+    """Get the gallery manifest: image dimensions, placeholders and menu/general grouping"""
+    if not os.path.exists(GALLERY_FOLDER):
+        return jsonify({'images': [], 'groups': {'general': [], 'menu': []}})
     
     try:
-        for filename in os.listdir(gallery_dir):
-            if os.path.splitext(filename)[1] in image_extensions:
-                images.append({
-                    'filename': filename,
-                    'url': f'/images/gallery/{filename}'
-                })
-        
-        # Sort by filename for consistent ordering
-        images.sort(key=lambda x: x['filename'])
-        
-        return jsonify({'images': images})
+        return jsonify(gallery_manifest.response())
     except Exception as e:
         return jsonify({'error': str(e), 'images': []}), 500
 
@@ -988,17 +914,51 @@ def get_gallery_images():
 # 1. Frontend files are already in backend/static directory
 # 2. Update static/js/config.js to use relative API URL: apiUrl: '/api'
 #
-@app.route('/')
+def send_html_page(path):
+    """Serve an HTML page with its asset references rewritten to fingerprinted URLs"""
+    with open(os.path.join(STATIC_FOLDER, path), 'r', encoding='utf-8') as f:
+        html = f.read()
+    html = rewrite_html_references(html, STATIC_FOLDER, os.path.dirname(path))
+    response = make_response(html)
+    response.mimetype = 'text/html'
+    response.add_etag()
+    response.make_conditional(request)
+    return set_cache_headers(response, max_age=current_app.config['HTML_MAX_AGE'])
+
+@api.route('/')
 def index():
- return send_from_directory('static', 'index.html')
+ return send_html_page('index.html')
 
-@app.route('/<path:path>')
+@api.route('/<path:path>')
 def serve_static(path):
  try:
-     return send_from_directory('static', path)
+     path, immutable = resolve_fingerprinted(STATIC_FOLDER, path)
+     if path.lower().endswith('.html'):
+         if not os.path.isfile(os.path.join(STATIC_FOLDER, path)):
+             raise FileNotFoundError(path)
+         return send_html_page(path)
+     response = send_file_offloaded(
+         STATIC_FOLDER, path, current_app.config['FILE_OFFLOAD_MODE'], current_app.config['X_ACCEL_STATIC_PREFIX']
+     )
+     return set_cache_headers(response, immutable=immutable)
  except:
      # For SPA routing, return index.html for unknown routes
-     return send_from_directory('static', 'index.html')
+     return send_html_page('index.html')
+
+# Fingerprinted asset manifest (logical name -> fingerprinted name)
+@api.route('/api/assets/manifest', methods=['GET'])
+def get_asset_manifest():
+    return jsonify(build_manifest(STATIC_FOLDER))
+
+# Default app for `flask run`, the tests and helper imports, created on first access
+def __getattr__(name):
+    if name == 'app':
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == '__main__':
+    app = create_app()
+    check_db_connection(app)
     app.run(debug=True, host='0.0.0.0', port=5000)
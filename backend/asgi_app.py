@@ -0,0 +1,782 @@
+"""
+ASGI variant of the Neighborhood Sips API
+Serves the same /api/* routes as app.py with Quart and an aiomysql
+connection pool, so one worker process can keep hundreds of requests in
+flight while they wait on MySQL. Image decoding, resizing and encoding run in
+a thread pool so they do not block the event loop.
+
+Queries, row shaping, the bar shelf filter and image handling come from
+api_core.py, shared with the WSGI app, so both return identical responses.
+The frontend pages are not served here; serve backend/static from the web
+server (or keep using the WSGI app for them).
+
+Install the optional dependencies and run with an ASGI server:
+
+    pip install -r requirements-asgi.txt
+    hypercorn asgi_app:app --bind 0.0.0.0:5000 --workers 2
+
+The existing live API tests can be pointed at it:
+
+    API_BASE_URL=http://localhost:5000/api python3 -m pytest test_recipe_api.py
+
+test_asgi_app.py checks both apps return the same responses; install
+requirements-test.txt so it runs instead of being skipped.
+"""
+
+import os
+import time
+import asyncio
+import functools
+import itertools
+import mimetypes
+from datetime import datetime
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+
+import aiomysql
+from quart import Quart, jsonify, request, send_from_directory, g, Response, abort, has_request_context
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
+from werkzeug.security import safe_join
+
+import api_core
+from api_core import (
+    parse_json_field, serialize_doc, parse_row,
+    list_query, recipes_query, recipe_ingredient_names, availability_query, filter_available_recipes,
+    requested_units, is_duplicate_key,
+    ingredient_params, recipe_params, collection_params, created_ingredient, created_recipe,
+    SELECT_INGREDIENT, SELECT_INGREDIENT_IMAGES, SELECT_RECIPE, SELECT_RECIPE_IMAGES,
+    SELECT_COLLECTION, SELECT_COLLECTION_IMAGES, UPDATE_INGREDIENT_BAR_SHELF,
+    INSERT_INGREDIENT, UPDATE_INGREDIENT, DELETE_INGREDIENT,
+    INSERT_RECIPE, UPDATE_RECIPE, DELETE_RECIPE, UPDATE_COLLECTION,
+)
+from config import Config
+from asset_manifest import IMMUTABLE_CACHE_CONTROL, build_manifest, resolve_fingerprinted, asset_url, fingerprints
+from gallery_manifest import GalleryManifest
+from upload_store import resolve_upload
+from file_offload import normalize_mode
+from db_pool import parse_host
+import metrics
+import query_log
+from health import AsyncProbeCache, elapsed_ms, run_check_async, run_checks, check_writable, check_gallery_cache
+from units import DISPLAY_UNITS, convert_recipe_units, unit_rules
+from shelf_insights import (
+    SHELF_FINGERPRINT_QUERY, SHELF_INGREDIENTS_QUERY, SHELF_RECIPES_QUERY,
+    NextBottlesCache, ShelfIndex, fingerprint, next_bottles_params, next_bottles_response
+)
+
+# JSON serialization timed for the Server-Timing header
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            if has_request_context():
+                g.serialize_seconds = g.get('serialize_seconds', 0.0) + time.perf_counter() - started
+
+
+app = Quart(__name__)
+app.json = TimedJSONProvider(app)
+
+# Load configuration from environment variables
+config = Config()
+app.config['MAX_CONTENT_LENGTH'] = config.MAX_CONTENT_LENGTH
+app.config['SECRET_KEY'] = config.SECRET_KEY
+
+# Configure CORS with allowed origins
+if config.ALLOWED_ORIGINS == ['*']:
+    app = cors(app)
+else:
+    app = cors(app, allow_origin=config.ALLOWED_ORIGINS)
+
+BACKEND_FOLDER = os.path.dirname(os.path.abspath(__file__))
+UPLOAD_FOLDER = os.path.join(BACKEND_FOLDER, config.UPLOAD_FOLDER)
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+
+STATIC_FOLDER = os.path.join(BACKEND_FOLDER, 'static')
+GALLERY_FOLDER = os.path.join(STATIC_FOLDER, 'images', 'gallery')
+CACHE_FOLDER = os.path.join(BACKEND_FOLDER, config.CACHE_FOLDER)
+
+# Only x-accel can be offloaded here; other modes send the file from the app
+FILE_OFFLOAD_MODE = normalize_mode(config.FILE_OFFLOAD_MODE)
+
+# Rounding rules for recipe amounts shown in another unit (?units=)
+UNIT_RULES = unit_rules(config.UNIT_ROUNDING, config.UNIT_SPECIAL_OZ)
+
+# Next-bottle suggestions are kept until the shelf or the recipes change
+next_bottles_cache = NextBottlesCache()
+
+gallery_manifest = GalleryManifest(
+    GALLERY_FOLDER,
+    cache_path=os.path.join(CACHE_FOLDER, 'gallery_manifest.json'),
+    url_for=lambda filename: '/' + asset_url(STATIC_FOLDER, f'images/gallery/{filename}')
+)
+
+# Thread pool for image decoding/encoding and other blocking file work
+image_executor = ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) + 2))
+
+# Requests that only read and may be served by a replica
+READ_METHODS = ('GET', 'HEAD')
+STICKY_PRIMARY_COOKIE = 'db_primary_until'
+
+# Pools are created when the server starts, inside its event loop
+db_pool = None
+replica_pools = {}
+replica_counter = itertools.count()
+
+
+class DatabaseBusy(Exception):
+    """No pooled connection became free within DB_POOL_TIMEOUT"""
+
+
+async def create_pool(host, port):
+    """Create an aiomysql pool with the same size limits as the WSGI pool"""
+    return await aiomysql.create_pool(
+        host=host,
+        port=port,
+        user=config.MYSQL_USER,
+        password=config.MYSQL_PASSWORD,
+        db=config.MYSQL_DATABASE,
+        minsize=0,
+        maxsize=config.DB_POOL_SIZE + config.DB_POOL_MAX_OVERFLOW,
+        autocommit=False,
+        charset='utf8mb4',
+    )
+
+
+@app.before_serving
+async def open_pools():
+    global db_pool
+    db_pool = await create_pool(config.MYSQL_HOST, config.MYSQL_PORT)
+    for replica in config.MYSQL_REPLICA_HOSTS:
+        host, port = parse_host(replica, config.MYSQL_PORT)
+        replica_pools[f"{host}:{port}"] = await create_pool(host, port)
+    print(f"✓ MySQL pool ready: {config.MYSQL_DATABASE} ({len(replica_pools)} replica(s))")
+
+
+@app.after_serving
+async def close_pools():
+    for pool in [db_pool, *replica_pools.values()]:
+        if pool is not None:
+            pool.close()
+            await pool.wait_closed()
+    image_executor.shutdown(wait=False)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """Run blocking work (image processing, file scans) in the thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(image_executor, functools.partial(func, *args, **kwargs))
+
+
+async def process_images(func, *args):
+    """Run image work in the thread pool, timed for the Server-Timing header"""
+    started = time.perf_counter()
+    try:
+        return await run_blocking(func, *args)
+    finally:
+        g.image_seconds = g.get('image_seconds', 0.0) + time.perf_counter() - started
+
+
+# ============= DATABASE HELPERS =============
+
+def reads_from_primary():
+    try:
+        return float(request.cookies.get(STICKY_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+async def acquire(name, pool):
+    """Acquire a pooled connection, recording the wait"""
+    started = time.perf_counter()
+    try:
+        return await asyncio.wait_for(pool.acquire(), config.DB_POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise DatabaseBusy()
+    finally:
+        metrics.DB_POOL_ACQUIRE_SECONDS.observe(time.perf_counter() - started, name)
+
+
+async def get_db_connection():
+    """
+    Get the request's database connection, acquired on first use.
+
+    Routing matches the WSGI app: GET requests use a replica when configured,
+    unless the client wrote recently; writes use the primary.
+    """
+    if 'db_conn' not in g:
+        if replica_pools and request.method in READ_METHODS and not reads_from_primary():
+            pools = list(replica_pools.items())
+            name, pool = pools[next(replica_counter) % len(pools)]
+            try:
+                g.db_conn = await acquire(name, pool)
+                g.db_conn_pool = pool
+                return g.db_conn
+            except (aiomysql.Error, OSError, DatabaseBusy) as e:
+                print(f"✗ Replica unavailable, reading from primary: {e!r}")
+        g.db_conn = await acquire('primary', db_pool)
+        g.db_conn_pool = db_pool
+    return g.db_conn
+
+
+def record_query(sql, params):
+    """Start the query entry of a statement (see query_log.py), counted in the request metrics"""
+    entry = query_log.new_entry(sql, params)
+    g.setdefault('sql_queries', []).append(entry)
+    return entry, time.perf_counter()
+
+
+async def execute(sql, params=()):
+    """Execute a statement. Returns (rowcount, lastrowid)."""
+    conn = await get_db_connection()
+    entry, started = record_query(sql, params)
+    try:
+        async with conn.cursor() as cursor:
+            await cursor.execute(sql, params)
+            entry['rows'] = max(cursor.rowcount, 0)
+            return cursor.rowcount, cursor.lastrowid
+    finally:
+        entry['seconds'] = time.perf_counter() - started
+
+
+async def fetch_all(sql, params=()):
+    """Run a query and return all rows as dictionaries"""
+    conn = await get_db_connection()
+    entry, started = record_query(sql, params)
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            await cursor.execute(sql, params)
+            rows = list(await cursor.fetchall())
+            entry['rows'] = len(rows)
+            return rows
+    finally:
+        entry['seconds'] = time.perf_counter() - started
+
+
+async def fetch_one(sql, params=()):
+    """Run a point lookup and return the first row, or None"""
+    rows = await fetch_all(sql, params)
+    return rows[0] if rows else None
+
+
+async def explain(connection, entry):
+    """Run EXPLAIN for a SELECT entry (see query_log.explain). Returns the plan rows or None."""
+    sql = query_log.explain_sql(entry)
+    if sql is None:
+        return None
+    async with connection.cursor(aiomysql.DictCursor) as cursor:
+        await cursor.execute(sql, entry['params'])
+        return list(await cursor.fetchall())
+
+
+async def commit():
+    await (await get_db_connection()).commit()
+
+
+async def rollback():
+    await (await get_db_connection()).rollback()
+
+
+@app.teardown_appcontext
+async def release_db_connection(exc):
+    conn = g.pop('db_conn', None)
+    pool = g.pop('db_conn_pool', None)
+    if conn is None:
+        return
+    try:
+        # aiomysql closes connections returned mid-transaction
+        await conn.rollback()
+    except (aiomysql.Error, OSError):
+        pass
+    pool.release(conn)
+
+
+@app.after_request
+async def stick_to_primary_after_write(response):
+    if replica_pools and request.method not in READ_METHODS and response.status_code < 400:
+        until = time.time() + config.REPLICA_STICKY_SECONDS
+        response.set_cookie(
+            STICKY_PRIMARY_COOKIE, f"{until:.3f}",
+            max_age=config.REPLICA_STICKY_SECONDS, httponly=True, samesite='Lax'
+        )
+    return response
+
+
+# Request counters and latency histograms (see metrics.py)
+@app.before_request
+async def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+async def record_request_metrics(response):
+    started = g.pop('request_started', None)
+    if started is None:
+        return response
+    # Route templates keep label cardinality bounded
+    route = g.get('metrics_route') or (request.url_rule.rule if request.url_rule else 'unmatched')
+    status = str(response.status_code)
+    metrics.HTTP_REQUESTS.inc(route, request.method, status)
+    metrics.HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, route, request.method, status)
+    if 'sql_queries' in g:
+        statements, seconds, _ = query_log.totals(g.sql_queries)
+        metrics.DB_QUERIES_PER_REQUEST.observe(statements, route)
+        metrics.DB_SECONDS_PER_REQUEST.observe(seconds, route)
+    return response
+
+
+# Slow-query log and Server-Timing header, as in the WSGI app (see query_log.py)
+@app.after_request
+async def report_request_timings(response):
+    entries = g.get('sql_queries', [])
+    threshold = config.SLOW_QUERY_MS / 1000
+    if entries and threshold > 0:
+        route = request.url_rule.rule if request.url_rule else request.path
+        for entry in query_log.slow_queries(entries, threshold):
+            print(query_log.format_slow_query(entry, route))
+            if config.SLOW_QUERY_EXPLAIN and 'db_conn' in g:
+                try:
+                    plan = await explain(g.db_conn, entry)
+                except aiomysql.Error as e:
+                    print(f"  EXPLAIN failed: {e}")
+                    plan = None
+                for line in query_log.format_plan(plan or []):
+                    print(f"  {line}")
+
+    if config.SERVER_TIMING:
+        statements, db_seconds, rows = query_log.totals(entries)
+        response.headers['Server-Timing'] = query_log.server_timing_header([
+            ('db', db_seconds, f"{statements} queries, {rows} rows"),
+            ('serialize', g.get('serialize_seconds', 0.0), None),
+            ('image', g.get('image_seconds', 0.0), None),
+        ])
+    return response
+
+
+# Pool gauges and cache hit ratios, read when metrics are scraped
+@metrics.REGISTRY.register_collector
+def collect_pool_and_cache_metrics():
+    pools = {'primary': db_pool, **replica_pools} if db_pool is not None else {}
+    yield ('db_pool_connections', 'gauge', 'Pooled connections by state',
+           [({'pool': name, 'state': state}, value) for name, pool in pools.items()
+            for state, value in (('open', pool.size), ('in_use', pool.size - pool.freesize),
+                                 ('idle', pool.freesize))])
+    yield ('db_pool_max_connections', 'gauge', 'Pool size plus overflow',
+           [({'pool': name}, pool.maxsize) for name, pool in pools.items()])
+    yield from metrics.cache_metrics({
+        'gallery_manifest': (gallery_manifest.hits, gallery_manifest.misses),
+        'asset_fingerprints': (fingerprints.hits, fingerprints.misses),
+    })
+
+
+@app.errorhandler(DatabaseBusy)
+async def handle_database_busy(e):
+    response = jsonify({'error': 'Database is busy, please retry'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+def add_image_urls(doc):
+    return api_core.add_image_urls(UPLOAD_FOLDER, doc)
+
+
+def set_cache_headers(response, immutable=False, max_age=None):
+    """Set Cache-Control: immutable for fingerprinted URLs, short and revalidating otherwise"""
+    if immutable:
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    else:
+        if max_age is None:
+            max_age = config.STATIC_MAX_AGE
+        response.headers['Cache-Control'] = f'public, max-age={max_age}, must-revalidate'
+    return response
+
+
+# ============= UPLOADS =============
+
+@app.route('/api/uploads/<path:filename>')
+async def uploaded_file(filename):
+    filename, immutable = resolve_fingerprinted(UPLOAD_FOLDER, filename)
+    # Flat and sharded references both resolve to wherever the file is stored
+    filename = resolve_upload(UPLOAD_FOLDER, filename) or filename
+    if FILE_OFFLOAD_MODE == 'x-accel':
+        path = safe_join(UPLOAD_FOLDER, filename)
+        if path is None or not os.path.isfile(path):
+            abort(404)
+        response = Response('', mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream')
+        response.headers['X-Accel-Redirect'] = config.X_ACCEL_UPLOADS_PREFIX.rstrip('/') + '/' + quote(filename)
+    else:
+        response = await send_from_directory(UPLOAD_FOLDER, filename)
+    return set_cache_headers(response, immutable=immutable)
+
+
+# ============= INGREDIENTS ENDPOINTS =============
+
+@app.route('/api/ingredients', methods=['GET'])
+async def get_ingredients():
+    query, params = list_query('ingredients', request.args.get('search', ''), request.args.get('tags', ''))
+    ingredients = await fetch_all(query, params)
+
+    for ing in ingredients:
+        parse_row('ingredients', ing)
+        add_image_urls(ing)
+
+    return jsonify(ingredients)
+
+
+@app.route('/api/ingredients/<int:ingredient_id>', methods=['GET'])
+async def get_ingredient(ingredient_id):
+    ingredient = await fetch_one(SELECT_INGREDIENT, (ingredient_id,))
+
+    if ingredient:
+        parse_row('ingredients', ingredient)
+        add_image_urls(ingredient)
+        return jsonify(serialize_doc(ingredient))
+    return jsonify({'error': 'Ingredient not found'}), 404
+
+
+@app.route('/api/ingredients', methods=['POST'])
+async def create_ingredient():
+    data = await request.get_json()
+
+    images = await process_images(api_core.save_new_images, UPLOAD_FOLDER, data, 'ingredient')
+
+    now = datetime.utcnow()
+    inserted, ingredient_id = await execute(INSERT_INGREDIENT, ingredient_params(data, images) + (now, now))
+    await commit()
+
+    # Nothing inserted: an ingredient with the same normalized name exists
+    if not inserted:
+        await process_images(api_core.discard_images, UPLOAD_FOLDER, images)
+        return jsonify({'error': 'Ingredient already exists', 'id': ingredient_id}), 409
+
+    return jsonify(created_ingredient(ingredient_id, data, images, now)), 201
+
+
+@app.route('/api/ingredients/<int:ingredient_id>', methods=['PUT'])
+async def update_ingredient(ingredient_id):
+    data = await request.get_json()
+
+    existing = await fetch_one(SELECT_INGREDIENT_IMAGES, (ingredient_id,))
+    if not existing:
+        return jsonify({'error': 'Ingredient not found'}), 404
+
+    # Removed images are deleted only once the update is committed
+    images, saved, removed = await process_images(
+        api_core.plan_image_changes, UPLOAD_FOLDER, parse_json_field(existing['images']) or [], data, 'ingredient'
+    )
+
+    now = datetime.utcnow()
+    try:
+        await execute(UPDATE_INGREDIENT, ingredient_params(data, images) + (now, ingredient_id))
+    except aiomysql.IntegrityError as e:
+        if not is_duplicate_key(e):
+            raise
+        # Renamed to the normalized name of another ingredient
+        await rollback()
+        await process_images(api_core.discard_images, UPLOAD_FOLDER, saved)
+        return jsonify({'error': 'Ingredient already exists'}), 409
+    await commit()
+    await process_images(api_core.discard_images, UPLOAD_FOLDER, removed)
+
+    ingredient = await fetch_one(SELECT_INGREDIENT, (ingredient_id,))
+    if ingredient:
+        parse_row('ingredients', ingredient)
+        return jsonify(serialize_doc(ingredient))
+    return jsonify({'error': 'Ingredient not found'}), 404
+
+
+@app.route('/api/ingredients/<int:ingredient_id>', methods=['DELETE'])
+async def delete_ingredient(ingredient_id):
+    deleted_count, _ = await execute(DELETE_INGREDIENT, (ingredient_id,))
+    await commit()
+
+    if deleted_count:
+        return jsonify({'message': 'Ingredient deleted successfully'})
+    return jsonify({'error': 'Ingredient not found'}), 404
+
+
+@app.route('/api/ingredients/<int:ingredient_id>/bar-shelf', methods=['PATCH'])
+async def update_ingredient_bar_shelf(ingredient_id):
+    """Update only the bar_shelf_availability field for an ingredient"""
+    data = await request.get_json()
+    bar_shelf_availability = data.get('bar_shelf_availability')
+
+    if bar_shelf_availability not in ['Y', 'N']:
+        return jsonify({'error': 'bar_shelf_availability must be either "Y" or "N"'}), 400
+
+    rowcount, _ = await execute(UPDATE_INGREDIENT_BAR_SHELF, (bar_shelf_availability, ingredient_id))
+    if rowcount == 0:
+        return jsonify({'error': 'Ingredient not found'}), 404
+    await commit()
+
+    ingredient = await fetch_one(SELECT_INGREDIENT, (ingredient_id,))
+    parse_row('ingredients', ingredient)
+    return jsonify(serialize_doc(ingredient))
+
+
+# ============= RECIPES ENDPOINTS =============
+
+@app.route('/api/recipes', methods=['GET'])
+async def get_recipes():
+    bar_shelf_mode = request.args.get('bar_shelf_mode', '').upper()
+    units = requested_units(request.args.get('units', ''))
+    if units is None:
+        return jsonify({'error': 'units must be one of: ' + ', '.join(DISPLAY_UNITS)}), 400
+    query, params = recipes_query(request.args.get('search', ''), request.args.get('tags', ''))
+    recipes = await fetch_all(query, params)
+
+    for recipe in recipes:
+        parse_row('recipes', recipe)
+        add_image_urls(recipe)
+
+    if bar_shelf_mode == 'Y':
+        # Report bar shelf requests separately in the request metrics
+        g.metrics_route = '/api/recipes?bar_shelf_mode=Y'
+        ingredient_availability = {}
+        names = recipe_ingredient_names(recipes)
+        if names:
+            for result in await fetch_all(*availability_query(names)):
+                ingredient_availability[result['name_normalized']] = result.get('bar_shelf_availability', 'N')
+        recipes = filter_available_recipes(recipes, ingredient_availability)
+
+    if units:
+        convert_recipe_units(recipes, units, UNIT_RULES)
+
+    return jsonify(recipes)
+
+
+@app.route('/api/recipes/<int:recipe_id>', methods=['GET'])
+async def get_recipe(recipe_id):
+    units = requested_units(request.args.get('units', ''))
+    if units is None:
+        return jsonify({'error': 'units must be one of: ' + ', '.join(DISPLAY_UNITS)}), 400
+
+    recipe = await fetch_one(SELECT_RECIPE, (recipe_id,))
+
+    if recipe:
+        parse_row('recipes', recipe)
+        add_image_urls(recipe)
+        if units:
+            convert_recipe_units([recipe], units, UNIT_RULES)
+        return jsonify(serialize_doc(recipe))
+    return jsonify({'error': 'Recipe not found'}), 404
+
+
+@app.route('/api/recipes', methods=['POST'])
+async def create_recipe():
+    data = await request.get_json()
+
+    images = await process_images(api_core.save_new_images, UPLOAD_FOLDER, data, 'recipe')
+
+    now = datetime.utcnow()
+    _, recipe_id = await execute(INSERT_RECIPE, recipe_params(data, images) + (now, now))
+    await commit()
+
+    return jsonify(created_recipe(recipe_id, data, images, now)), 201
+
+
+@app.route('/api/recipes/<int:recipe_id>', methods=['PUT'])
+async def update_recipe(recipe_id):
+    data = await request.get_json()
+
+    existing = await fetch_one(SELECT_RECIPE_IMAGES, (recipe_id,))
+    if not existing:
+        return jsonify({'error': 'Recipe not found'}), 404
+
+    images = await process_images(
+        api_core.apply_image_changes, UPLOAD_FOLDER, parse_json_field(existing['images']) or [], data, 'recipe'
+    )
+
+    now = datetime.utcnow()
+    await execute(UPDATE_RECIPE, recipe_params(data, images) + (now, recipe_id))
+    await commit()
+
+    recipe = await fetch_one(SELECT_RECIPE, (recipe_id,))
+    if recipe:
+        parse_row('recipes', recipe)
+        return jsonify(serialize_doc(recipe))
+    return jsonify({'error': 'Recipe not found'}), 404
+
+
+@app.route('/api/recipes/<int:recipe_id>', methods=['DELETE'])
+async def delete_recipe(recipe_id):
+    deleted_count, _ = await execute(DELETE_RECIPE, (recipe_id,))
+    await commit()
+
+    if deleted_count:
+        return jsonify({'message': 'Recipe deleted successfully'})
+    return jsonify({'error': 'Recipe not found'}), 404
+
+
+# ============= INSIGHTS ENDPOINTS =============
+
+@app.route('/api/insights/next-bottles', methods=['GET'])
+async def get_next_bottles():
+    """Missing ingredients that would make the most recipes makeable (mode=rank|greedy, k=1..100)"""
+    mode, k, error = next_bottles_params(request.args)
+    if error:
+        return jsonify({'error': error}), 400
+
+    current = fingerprint(await fetch_one(SHELF_FINGERPRINT_QUERY))
+    cached = next_bottles_cache.lookup(current, mode, k)
+    if cached:
+        index, suggestions = cached
+    else:
+        ingredients = await fetch_all(SHELF_INGREDIENTS_QUERY)
+        recipes = await fetch_all(SHELF_RECIPES_QUERY)
+        index = await run_blocking(ShelfIndex, ingredients, recipes)
+        index, suggestions = next_bottles_cache.store(current, index, mode, k)
+
+    return jsonify(next_bottles_response(index, mode, k, suggestions, cached is not None))
+
+
+# ============= COLLECTIONS ENDPOINTS =============
+
+@app.route('/api/collections', methods=['GET'])
+async def get_collections():
+    query, params = list_query('collections', request.args.get('search', ''), request.args.get('tags', ''))
+    collections = await fetch_all(query, params)
+
+    for coll in collections:
+        parse_row('collections', coll)
+        add_image_urls(coll)
+
+    return jsonify(collections)
+
+
+@app.route('/api/collections/<int:collection_id>', methods=['GET'])
+async def get_collection(collection_id):
+    collection = await fetch_one(SELECT_COLLECTION, (collection_id,))
+
+    if collection:
+        parse_row('collections', collection)
+        add_image_urls(collection)
+        return jsonify(serialize_doc(collection))
+    return jsonify({'error': 'Collection not found'}), 404
+
+
+@app.route('/api/collections/<int:collection_id>', methods=['PUT'])
+async def update_collection(collection_id):
+    data = await request.get_json()
+
+    existing = await fetch_one(SELECT_COLLECTION_IMAGES, (collection_id,))
+    if not existing:
+        return jsonify({'error': 'Collection not found'}), 404
+
+    images = await process_images(
+        api_core.apply_image_changes, UPLOAD_FOLDER, parse_json_field(existing['images']) or [], data, 'collection'
+    )
+
+    now = datetime.utcnow()
+    await execute(UPDATE_COLLECTION, collection_params(data, images) + (now, collection_id))
+    await commit()
+
+    collection = await fetch_one(SELECT_COLLECTION, (collection_id,))
+    if collection:
+        parse_row('collections', collection)
+        return jsonify(serialize_doc(collection))
+    return jsonify({'error': 'Collection not found'}), 404
+
+
+# ============= OTHER ENDPOINTS =============
+
+@app.route('/api/health', methods=['GET'])
+async def health_check():
+    return jsonify({'status': 'healthy', 'app': 'Neighborhood Sips'})
+
+
+# Prometheus scrape endpoint
+@app.route('/api/metrics', methods=['GET'])
+async def get_metrics():
+    response = Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+# Liveness: the process is serving requests (no dependencies checked)
+@app.route('/api/health/live', methods=['GET'])
+async def health_live():
+    return jsonify({'status': 'alive'})
+
+
+async def check_database():
+    """Acquire a pooled connection and run SELECT 1, timing both steps"""
+    started = time.perf_counter()
+    conn = await asyncio.wait_for(db_pool.acquire(), config.HEALTH_DB_TIMEOUT)
+    acquire_ms = elapsed_ms(started)
+    try:
+        started = time.perf_counter()
+        async with conn.cursor() as cursor:
+            await cursor.execute("SELECT 1")
+            await cursor.fetchall()
+        query_ms = elapsed_ms(started)
+    finally:
+        db_pool.release(conn)
+    return {'acquire_ms': acquire_ms, 'query_ms': query_ms}
+
+
+async def readiness_checks():
+    """Run the same readiness checks as the WSGI app. Returns (ready, {component: result})."""
+    database = await run_check_async(check_database)
+    checks = {'uploads': lambda: check_writable(UPLOAD_FOLDER)}
+    if os.path.isdir(GALLERY_FOLDER):
+        checks['gallery_cache'] = lambda: check_gallery_cache(gallery_manifest)
+    ready, results = await run_blocking(run_checks, checks)
+    return ready and database['status'] == 'ok', {'database': database, **results}
+
+
+readiness = AsyncProbeCache(readiness_checks, ttl=config.HEALTH_PROBE_TTL)
+
+
+# Readiness: the instance can serve traffic; 503 takes it out of the load balancer
+@app.route('/api/health/ready', methods=['GET'])
+async def health_ready():
+    (ready, checks), age = await readiness.get()
+    response = jsonify({
+        'status': 'ready' if ready else 'not ready',
+        'checks': checks,
+        'age_ms': round(age * 1000, 2),
+    })
+    response.status_code = 200 if ready else 503
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@app.route('/api/gallery/images', methods=['GET'])
+async def get_gallery_images():
+    """Get the gallery manifest: image dimensions, placeholders and menu/general grouping"""
+    if not os.path.exists(GALLERY_FOLDER):
+        return jsonify({'images': [], 'groups': {'general': [], 'menu': []}})
+
+    try:
+        # A rebuild decodes images, so keep it off the event loop
+        return jsonify(await run_blocking(gallery_manifest.response))
+    except Exception as e:
+        return jsonify({'error': str(e), 'images': []}), 500
+
+
+@app.route('/api/assets/manifest', methods=['GET'])
+async def get_asset_manifest():
+    return jsonify(await run_blocking(build_manifest, STATIC_FOLDER))
+
+
+@app.route('/api/db/pool', methods=['GET'])
+async def get_pool_stats():
+    def stats(pool):
+        if pool is None:
+            return {}
+        return {'size': pool.size, 'free': pool.freesize, 'in_use': pool.size - pool.freesize,
+                'maxsize': pool.maxsize}
+
+    return jsonify({
+        'primary': stats(db_pool),
+        'replicas': {name: stats(pool) for name, pool in replica_pools.items()},
+    })
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Content fingerprinting for static assets and uploaded images
+
+A fingerprinted URL embeds a short hash of the file contents in its name,
+e.g. js/app.js -> js/app.3f2a9c1b7d.js. The content behind such a URL never
+changes, so it can be served with a long-lived immutable Cache-Control
+policy. When the file changes, its fingerprint (and therefore its URL) does
+too.
+
+The manifest maps logical names to fingerprinted ones. It is computed on
+demand by the app (hashes are cached per file and recomputed only when the
+file's mtime or size changes), and can also be written to disk:
+
+USAGE:
+------
+# Write static/asset-manifest.json
+python3 asset_manifest.py
+
+# Write the manifest somewhere else
+python3 asset_manifest.py --output /tmp/asset-manifest.json
+"""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+import posixpath
+import threading
+from urllib.parse import quote
+from werkzeug.security import safe_join
+
+# Number of hex characters of the content hash embedded in the filename
+FINGERPRINT_LENGTH = 10
+
+# Cache-Control policy for fingerprinted responses
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+# Static files that get fingerprinted URLs
+FINGERPRINTED_EXTENSIONS = (
+    '.js', '.css', '.map',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.ico',
+    '.woff', '.woff2', '.ttf',
+)
+
+MANIFEST_FILENAME = 'asset-manifest.json'
+
+_FINGERPRINT_RE = re.compile(r'^(?P<name>.+)\.(?P<digest>[0-9a-f]{%d})(?P<ext>\.[A-Za-z0-9]+)$' % FINGERPRINT_LENGTH)
+
+# src="..." / href="..." attributes in HTML pages
+_HTML_REFERENCE_RE = re.compile(r'(?P<attr>\b(?:src|href)\s*=\s*)(?P<quote>["\'])(?P<url>[^"\']+)(?P=quote)', re.IGNORECASE)
+
+
+class FingerprintCache:
+    """Thread-safe cache of file content fingerprints, keyed by path and invalidated by mtime/size"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, path):
+        """Return the content fingerprint of a file, or None if it does not exist"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._entries.get(path)
+        if cached and cached[0] == key:
+            self.hits += 1
+            return cached[1]
+        self.misses += 1
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        fingerprint = digest.hexdigest()[:FINGERPRINT_LENGTH]
+
+        with self._lock:
+            self._entries[path] = (key, fingerprint)
+        return fingerprint
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared cache used by the app
+fingerprints = FingerprintCache()
+
+
+def fingerprinted_name(relpath, fingerprint):
+    """Insert a fingerprint before the extension, e.g. ('js/app.js', 'abc') -> 'js/app.abc.js'"""
+    head, tail = posixpath.split(relpath)
+    name_part, ext_part = posixpath.splitext(tail)
+    return posixpath.join(head, f"{name_part}.{fingerprint}{ext_part}")
+
+
+def split_fingerprint(relpath):
+    """
+    Split a fingerprinted name into its logical name and fingerprint.
+
+    Returns:
+        Tuple of (logical path, fingerprint), fingerprint is None for plain names
+    """
+    head, tail = posixpath.split(relpath)
+    match = _FINGERPRINT_RE.match(tail)
+    if not match:
+        return relpath, None
+    return posixpath.join(head, f"{match.group('name')}{match.group('ext')}"), match.group('digest')
+
+
+def resolve_fingerprinted(directory, relpath, cache=fingerprints):
+    """
+    Resolve a requested path against a directory, handling fingerprinted names.
+
+    Returns:
+        Tuple of (path to serve, immutable) - immutable is True only when the
+        request carried a fingerprint that matches the current file contents
+    """
+    path = safe_join(directory, relpath)
+    if path is None or os.path.isfile(path):
+        return relpath, False
+
+    logical, fingerprint = split_fingerprint(relpath)
+    logical_path = safe_join(directory, logical)
+    if not fingerprint or logical_path is None:
+        return relpath, False
+
+    return logical, cache.fingerprint(logical_path) == fingerprint
+
+
+def asset_url(directory, relpath, cache=fingerprints):
+    """Return the fingerprinted form of a relative path, or the path unchanged if it cannot be fingerprinted"""
+    path = safe_join(directory, relpath)
+    fingerprint = cache.fingerprint(path) if path else None
+    if not fingerprint:
+        return relpath
+    return fingerprinted_name(relpath, fingerprint)
+
+
+def upload_url(upload_folder, filename, cache=fingerprints):
+    """Return the URL (relative to the API root) of an uploaded file, fingerprinted when it exists"""
+    return 'uploads/' + quote(asset_url(upload_folder, filename, cache))
+
+
+def rewrite_html_references(html, static_dir, page_dir='', cache=fingerprints):
+    """
+    Rewrite local src/href references in an HTML page to fingerprinted URLs.
+
+    Args:
+        html: Page contents
+        static_dir: Root directory of the static files
+        page_dir: Directory of the page relative to static_dir, for relative references
+    """
+    def replace(match):
+        url = match.group('url')
+        # Leave external, data and query/fragment URLs alone
+        if ':' in url or url.startswith('//') or '?' in url or '#' in url:
+            return match.group(0)
+        if not url.lower().endswith(FINGERPRINTED_EXTENSIONS):
+            return match.group(0)
+
+        if url.startswith('/'):
+            relpath = posixpath.normpath(url.lstrip('/'))
+        else:
+            relpath = posixpath.normpath(posixpath.join(page_dir, url))
+        if relpath.startswith('..'):
+            return match.group(0)
+
+        fingerprint = cache.fingerprint(os.path.join(static_dir, relpath))
+        if not fingerprint:
+            return match.group(0)
+
+        new_url = fingerprinted_name(url, fingerprint)
+        return f"{match.group('attr')}{match.group('quote')}{new_url}{match.group('quote')}"
+
+    return _HTML_REFERENCE_RE.sub(replace, html)
+
+
+def build_manifest(static_dir, cache=fingerprints):
+    """Map the logical name of every fingerprintable static file to its fingerprinted name"""
+    manifest = {}
+    for root, dirs, files in os.walk(static_dir):
+        dirs.sort()
+        for filename in sorted(files):
+            if not filename.lower().endswith(FINGERPRINTED_EXTENSIONS):
+                continue
+            relpath = os.path.relpath(os.path.join(root, filename), static_dir).replace(os.sep, '/')
+            manifest[relpath] = asset_url(static_dir, relpath, cache)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Write the fingerprinted static asset manifest'
+    )
+    static_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    parser.add_argument(
+        '--static-dir',
+        default=static_dir,
+        help='Static files directory (default: backend/static)'
+    )
+    parser.add_argument(
+        '--output',
+        default=None,
+        help=f'Manifest path (default: <static-dir>/{MANIFEST_FILENAME})'
+    )
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(args.static_dir, MANIFEST_FILENAME)
+    manifest = build_manifest(args.static_dir)
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    print(f"✓ Wrote {len(manifest)} asset(s) to: {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
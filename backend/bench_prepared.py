@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: text protocol vs cached prepared statements for point lookups
+
+This script:
+1. Picks existing ids from the recipes, ingredients and collections tables
+2. Runs the same point lookup (SELECT * FROM <table> WHERE id = %s) N times
+   with a regular text-protocol cursor and with a cached prepared cursor
+3. Prints median, p95 and mean latency per lookup for each
+
+Both variants run on the same connection, one after the other. Run it
+against a database loaded with sample data (see load_recipes.py).
+
+USAGE:
+------
+# Default: 2000 lookups per table
+python3 bench_prepared.py
+
+# More iterations, only recipes
+python3 bench_prepared.py --iterations 10000 --table recipes
+"""
+
+import sys
+import time
+import argparse
+import statistics
+import mysql.connector
+from config import Config
+from statement_cache import fetch_one_prepared
+
+TABLES = ['recipes', 'ingredients', 'collections']
+
+
+def percentile(values, pct):
+    """Return the pct-th percentile of a sorted list"""
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def time_lookups(lookup, ids, iterations):
+    """Run lookup(id) iterations times, cycling through ids. Returns sorted latencies (µs)."""
+    latencies = []
+    for i in range(iterations):
+        record_id = ids[i % len(ids)]
+        started = time.perf_counter()
+        lookup(record_id)
+        latencies.append((time.perf_counter() - started) * 1_000_000)
+    latencies.sort()
+    return latencies
+
+
+def report(label, latencies):
+    print(f"  {label:<10} median {statistics.median(latencies):8.1f} µs"
+          f"   p95 {percentile(latencies, 95):8.1f} µs"
+          f"   mean {statistics.fmean(latencies):8.1f} µs")
+
+
+def bench_table(conn, table, iterations, warmup):
+    """Benchmark point lookups on one table. Returns (text median, prepared median) or None."""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT id FROM {table} ORDER BY id LIMIT 100")
+    ids = [row[0] for row in cursor.fetchall()]
+    cursor.close()
+    if not ids:
+        print(f"\n⚠ {table}: no rows, skipped")
+        return None
+
+    sql = f"SELECT * FROM {table} WHERE id = %s"
+    text_cursor = conn.cursor(dictionary=True)
+
+    def text_lookup(record_id):
+        text_cursor.execute(sql, (record_id,))
+        return text_cursor.fetchall()
+
+    def prepared_lookup(record_id):
+        return fetch_one_prepared(conn, sql, (record_id,))
+
+    # Warm up both paths (and prepare the statement) before timing
+    time_lookups(text_lookup, ids, warmup)
+    time_lookups(prepared_lookup, ids, warmup)
+
+    text = time_lookups(text_lookup, ids, iterations)
+    prepared = time_lookups(prepared_lookup, ids, iterations)
+    text_cursor.close()
+
+    print(f"\n{table} ({iterations} lookups over {len(ids)} ids):")
+    report('text', text)
+    report('prepared', prepared)
+    return statistics.median(text), statistics.median(prepared)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare text protocol and prepared statement latency for point lookups',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        '--iterations',
+        type=int,
+        default=2000,
+        help='Lookups per table and variant (default: 2000)'
+    )
+    parser.add_argument(
+        '--warmup',
+        type=int,
+        default=200,
+        help='Untimed lookups before measuring (default: 200)'
+    )
+    parser.add_argument(
+        '--table',
+        choices=TABLES,
+        action='append',
+        help='Table to benchmark (repeatable, default: all)'
+    )
+    args = parser.parse_args()
+
+    config = Config()
+    print("=" * 60)
+    print("Prepared Statement Microbenchmark")
+    print("=" * 60)
+    print(f"MySQL: {config.MYSQL_HOST}:{config.MYSQL_PORT}/{config.MYSQL_DATABASE}")
+
+    try:
+        conn = mysql.connector.connect(
+            host=config.MYSQL_HOST,
+            port=config.MYSQL_PORT,
+            user=config.MYSQL_USER,
+            password=config.MYSQL_PASSWORD,
+            database=config.MYSQL_DATABASE,
+            autocommit=True
+        )
+    except mysql.connector.Error as e:
+        print(f"✗ Error connecting to MySQL: {e}")
+        return 1
+
+    try:
+        for table in args.table or TABLES:
+            result = bench_table(conn, table, args.iterations, args.warmup)
+            if result:
+                text_median, prepared_median = result
+                change = (text_median - prepared_median) / text_median * 100
+                direction = 'lower' if change >= 0 else 'higher'
+                print(f"  ✓ prepared median latency {abs(change):.1f}% {direction} than text")
+    finally:
+        conn.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -18,6 +18,18 @@ class Config:
     MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD', '')
     MYSQL_DATABASE = os.environ.get('MYSQL_DATABASE', 'neighborhood_sips')
     
+    # Connection pool: kept-open connections, extra connections under load,
+    # and seconds a request waits for a free connection before failing
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', '5'))
+    DB_POOL_MAX_OVERFLOW = int(os.environ.get('DB_POOL_MAX_OVERFLOW', '5'))
+    DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', '5'))
+    
+    # Read replicas (comma-separated host or host:port, same credentials as the primary)
+    # GET requests read from a replica; for REPLICA_STICKY_SECONDS after a write the
+    # client reads from the primary so it sees its own changes
+    MYSQL_REPLICA_HOSTS = [h.strip() for h in os.environ.get('MYSQL_REPLICA_HOSTS', '').split(',') if h.strip()]
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', '5'))
+    
     # Flask Configuration
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     DEBUG = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
@@ -30,6 +42,38 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))
     UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', 'uploads')
     
+    # Cache Configuration (on-disk caches such as the gallery manifest)
+    CACHE_FOLDER = os.environ.get('CACHE_FOLDER', 'cache')
+    
+    # Browser caching (seconds)
+    # Fingerprinted URLs are always cached for a year as immutable
+    STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', '3600'))
+    HTML_MAX_AGE = int(os.environ.get('HTML_MAX_AGE', '60'))
+    
+    # File offload to the front web server ('', 'x-accel' for nginx, 'x-sendfile' for Apache/lighttpd)
+    FILE_OFFLOAD_MODE = os.environ.get('FILE_OFFLOAD_MODE', '')
+    # nginx internal locations for x-accel
+    X_ACCEL_UPLOADS_PREFIX = os.environ.get('X_ACCEL_UPLOADS_PREFIX', '/internal/uploads/')
+    X_ACCEL_STATIC_PREFIX = os.environ.get('X_ACCEL_STATIC_PREFIX', '/internal/static/')
+    
+    # Health checks: seconds a readiness result is reused, and how long the
+    # readiness probe waits for a pooled connection
+    HEALTH_PROBE_TTL = float(os.environ.get('HEALTH_PROBE_TTL', '2'))
+    HEALTH_DB_TIMEOUT = float(os.environ.get('HEALTH_DB_TIMEOUT', '1'))
+    
+    # SQL instrumentation: log statements slower than SLOW_QUERY_MS (0 disables),
+    # optionally with their EXPLAIN plan, and send per-request db/serialize/image
+    # totals in the Server-Timing response header
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '200'))
+    SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN', 'False').lower() == 'true'
+    SERVER_TIMING = os.environ.get('SERVER_TIMING', 'True').lower() == 'true'
+    
+    # Recipe amounts shown with GET /api/recipes?units=oz|ml|cl: rounding step
+    # per unit (0 keeps two decimals), and whether the standard Oz measures for
+    # 10 ml and 20 ml apply (see units.SPECIAL_ML_TO_OZ)
+    UNIT_ROUNDING = os.environ.get('UNIT_ROUNDING', 'oz=0.25,cl=0.25,ml=0.5')
+    UNIT_SPECIAL_OZ = os.environ.get('UNIT_SPECIAL_OZ', 'True').lower() == 'true'
+    
     @staticmethod
     def init_app(app):
         """Initialize application with configuration"""
@@ -21,14 +21,40 @@ python3 convert_ml_to_oz.py
 
 # Apply conversion without creating backup
 python3 convert_ml_to_oz.py --no-backup
+
+# Batched mode: chunked UPDATE ... CASE statements in one transaction
+python3 convert_ml_to_oz.py --batch
+
+# Preview the batched conversion as a diff file
+python3 convert_ml_to_oz.py --batch --dry-run --diff-file ml_to_oz.diff
+
+# Resumable: commit each chunk and record progress in a checkpoint file
+python3 convert_ml_to_oz.py --batch --checkpoint ml_to_oz.checkpoint
+
+BATCHED MODE:
+-------------
+The default mode loads every recipe at once and runs an UPDATE and commit
+per modified recipe. With --batch the script:
+- Reads recipes in pages of --batch-size ordered by id (keyset pagination)
+- Converts each page in Python with the same rules as the default mode
+- Writes each page's modified recipes with a single UPDATE ... CASE id
+- Commits once at the end, so a failure leaves the table unchanged
+With --checkpoint FILE every chunk is committed on its own and the last
+committed id and running totals are written to FILE; running the same
+command again resumes after that id. Delete the file to start over.
+With --diff-file FILE the before/after of every converted ingredient is
+written to FILE (with or without --dry-run).
 """
 
+import os
 import sys
 import json
 import argparse
 from datetime import datetime
 import mysql.connector
 from config import Config
+from units import SPECIAL_ML_TO_OZ
+from api_core import parse_json_field
 
 
 def create_backup_table(cursor, conn):
@@ -78,12 +104,6 @@ def convert_ingredient_units(ingredients):
     Returns:
         Tuple of (converted_ingredients, conversion_count)
     """
-    # Special mapping for common ML values to standard Oz increments
-    SPECIAL_ML_TO_OZ = {
-        10: 0.25,
-        20: 0.75,
-    }
-    
     if not isinstance(ingredients, list):
         return ingredients, 0
     
@@ -227,6 +247,170 @@ def convert_recipes(cursor, conn, dry_run=False):
     return stats
 
 
+# Recipes per page and per UPDATE ... CASE statement in batched mode
+DEFAULT_BATCH_SIZE = 500
+
+
+def fetch_recipe_pages(cursor, batch_size, after_id=0):
+    """Yield pages of recipes ordered by id, starting after after_id"""
+    while True:
+        cursor.execute(
+            "SELECT id, name, ingredients FROM recipes WHERE id > %s ORDER BY id LIMIT %s",
+            (after_id, batch_size)
+        )
+        page = cursor.fetchall()
+        if not page:
+            return
+        yield page
+        after_id = page[-1]['id']
+
+
+def build_case_update(updates, now):
+    """
+    Build one UPDATE setting the ingredients of several recipes.
+
+    Args:
+        updates: List of (recipe id, converted ingredients)
+        now: updated_at value
+
+    Returns:
+        Tuple of (query, params)
+    """
+    cases = ' '.join(['WHEN %s THEN CAST(%s AS JSON)'] * len(updates))
+    placeholders = ', '.join(['%s'] * len(updates))
+    query = (f"UPDATE recipes SET ingredients = CASE id {cases} ELSE ingredients END, updated_at = %s "
+             f"WHERE id IN ({placeholders})")
+    params = []
+    for recipe_id, ingredients in updates:
+        params.extend((recipe_id, json.dumps(ingredients)))
+    params.append(now)
+    params.extend(recipe_id for recipe_id, _ in updates)
+    return query, params
+
+
+def conversion_diff(recipe, ingredients, converted_ingredients):
+    """Return diff lines for the converted ingredients of a recipe"""
+    lines = [f"@@ {recipe['name']} (ID: {recipe['id']})"]
+    for original, converted in zip(ingredients, converted_ingredients):
+        if original != converted:
+            name = original.get('name', 'Unknown')
+            lines.append(f"- {name}: {original.get('amount')} {original.get('units')}")
+            lines.append(f"+ {name}: {converted.get('amount')} {converted.get('units')}")
+    return lines
+
+
+def read_checkpoint(path):
+    """Load a checkpoint file, or None if it does not exist"""
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_checkpoint(path, checkpoint):
+    """Write a checkpoint file atomically"""
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f)
+    os.replace(temporary_path, path)
+
+
+def convert_recipes_batched(cursor, conn, dry_run=False, batch_size=DEFAULT_BATCH_SIZE,
+                            checkpoint_path=None, diff_path=None):
+    """
+    Convert all recipes from ml to Oz with one UPDATE ... CASE per page
+    
+    Without a checkpoint every page is written in a single transaction; with
+    one, each page is committed and recorded so an interrupted run resumes.
+    
+    Returns:
+        Dictionary with conversion statistics (like convert_recipes)
+    """
+    print("\n" + "=" * 80)
+    print("Converting Recipe Ingredients from ml to Oz (batched)")
+    print("=" * 80)
+    
+    stats = {
+        'total_recipes': 0,
+        'recipes_modified': 0,
+        'total_conversions': 0,
+        'recipes_with_ml': []
+    }
+    
+    after_id = 0
+    checkpoint = read_checkpoint(checkpoint_path)
+    if checkpoint:
+        after_id = checkpoint['last_id']
+        for key in ('total_recipes', 'recipes_modified', 'total_conversions'):
+            stats[key] = checkpoint[key]
+        print(f"\nResuming after recipe ID {after_id} from {checkpoint_path}")
+    
+    if dry_run:
+        print("\n=== DRY RUN MODE - No changes will be saved ===\n")
+    
+    diff_file = open(diff_path, 'a' if checkpoint else 'w', encoding='utf-8') if diff_path else None
+    try:
+        for page in fetch_recipe_pages(cursor, batch_size, after_id):
+            updates = []
+            page_conversions = 0
+            for recipe in page:
+                # JSON columns may come back as bytes
+                ingredients = parse_json_field(recipe['ingredients'])
+                if not isinstance(ingredients, list):
+                    print(f"  ⚠ Skipping recipe '{recipe['name']}' (ID: {recipe['id']}): Invalid JSON")
+                    continue
+                
+                converted_ingredients, conversion_count = convert_ingredient_units(ingredients)
+                if conversion_count > 0:
+                    updates.append((recipe['id'], converted_ingredients))
+                    page_conversions += conversion_count
+                    stats['recipes_with_ml'].append({
+                        'id': recipe['id'],
+                        'name': recipe['name'],
+                        'conversions': conversion_count
+                    })
+                    if diff_file:
+                        diff_file.write('\n'.join(conversion_diff(recipe, ingredients, converted_ingredients)) + '\n')
+            
+            if updates and not dry_run:
+                query, params = build_case_update(updates, datetime.now())
+                cursor.execute(query, params)
+            
+            stats['total_recipes'] += len(page)
+            stats['recipes_modified'] += len(updates)
+            stats['total_conversions'] += page_conversions
+            print(f"  ✓ Recipes up to ID {page[-1]['id']}: {len(updates)} modified, "
+                  f"{page_conversions} conversions")
+            
+            if checkpoint_path and not dry_run:
+                conn.commit()
+                write_checkpoint(checkpoint_path, {
+                    'last_id': page[-1]['id'],
+                    'total_recipes': stats['total_recipes'],
+                    'recipes_modified': stats['recipes_modified'],
+                    'total_conversions': stats['total_conversions'],
+                })
+            if diff_file:
+                diff_file.flush()
+        
+        if not dry_run:
+            conn.commit()
+    except mysql.connector.Error as e:
+        conn.rollback()
+        print(f"  ✗ Error updating recipes, rolled back: {e}")
+        if checkpoint_path:
+            print(f"    Committed chunks are recorded in {checkpoint_path}; run again to resume")
+        raise
+    finally:
+        if diff_file:
+            diff_file.close()
+    
+    if diff_path:
+        print(f"\nDiff written to {diff_path}")
+    
+    return stats
+
+
 def print_summary(stats, dry_run=False):
     """Print summary of conversion results"""
     print("\n" + "=" * 80)
@@ -262,6 +446,12 @@ Examples:
   
   # Apply conversion without creating backup
   python3 convert_ml_to_oz.py --no-backup
+  
+  # Batched conversion in one transaction
+  python3 convert_ml_to_oz.py --batch
+  
+  # Resumable batched conversion with a diff of every change
+  python3 convert_ml_to_oz.py --batch --checkpoint ml_to_oz.checkpoint --diff-file ml_to_oz.diff
         """
     )
     parser.add_argument(
@@ -274,6 +464,25 @@ Examples:
         action='store_true',
         help='Skip creating a backup table before conversion'
     )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Read recipes in pages and write each page with one UPDATE ... CASE, in one transaction'
+    )
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f'Recipes per page in batched mode (default: {DEFAULT_BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '--checkpoint',
+        help='With --batch, commit each page and record progress in this file to resume from'
+    )
+    parser.add_argument(
+        '--diff-file',
+        help='With --batch, write the before/after of every converted ingredient to this file'
+    )
     
     args = parser.parse_args()
     
@@ -300,16 +509,23 @@ Examples:
         return 1
     
     try:
-        # Create backup if not in dry-run mode and not disabled
+        # Create backup if not in dry-run mode and not disabled (nor resuming)
         backup_table_name = None
-        if not args.dry_run and not args.no_backup:
+        resuming = args.batch and read_checkpoint(args.checkpoint) is not None
+        if not args.dry_run and not args.no_backup and not resuming:
             backup_table_name = create_backup_table(cursor, conn)
             if not backup_table_name:
                 print("\n✗ Failed to create backup. Aborting conversion.")
                 return 1
         
         # Convert recipes
-        stats = convert_recipes(cursor, conn, dry_run=args.dry_run)
+        if args.batch:
+            stats = convert_recipes_batched(
+                cursor, conn, dry_run=args.dry_run, batch_size=args.batch_size,
+                checkpoint_path=args.checkpoint, diff_path=args.diff_file
+            )
+        else:
+            stats = convert_recipes(cursor, conn, dry_run=args.dry_run)
         
         # Print summary
         print_summary(stats, dry_run=args.dry_run)
@@ -0,0 +1,254 @@
+"""
+Database connection pool for Neighborhood Sips
+A thread-safe pool with a bounded wait: when every connection is busy, a
+request queues for up to the acquire timeout instead of failing immediately
+(mysql-connector's MySQLConnectionPool raises PoolError straight away).
+
+- pool_size connections are kept open once created
+- up to max_overflow extra connections are opened under load and closed
+  again when returned while nobody is waiting
+- get_connection() waits up to timeout seconds, then raises PoolTimeoutError
+
+Connections handed out are wrapped so that close() returns them to the pool,
+so existing code that calls conn.close() keeps working unchanged.
+
+stats() reports in-use, idle, waiters and acquire wait times for monitoring.
+
+With track_leaks enabled (tests), the pool records where each connection was
+acquired; checked_out() lists connections that have not been returned.
+"""
+
+import time
+import threading
+import traceback
+from collections import deque
+from mysql.connector.errors import PoolError, Error as MySQLError
+
+# Idle connections older than this are pinged before being handed out (seconds)
+DEFAULT_PING_AFTER = 30
+
+
+def parse_host(value, default_port):
+    """Split 'host' or 'host:port' into (host, port)"""
+    host, _, port = value.rpartition(':') if ':' in value else (value, '', '')
+    return host, int(port) if port else default_port
+
+
+class PoolTimeoutError(PoolError):
+    """Raised when no connection became available within the acquire timeout"""
+
+
+class PooledConnection:
+    """Proxy around a pooled connection; close() returns it to the pool"""
+
+    def __init__(self, pool, connection, acquired_at=None):
+        self._pool = pool
+        self._connection = connection
+        self.acquired_at = acquired_at
+
+    def __getattr__(self, name):
+        connection = self.__dict__.get('_connection')
+        if connection is None:
+            raise AttributeError(f"Connection has been returned to the pool (accessing '{name}')")
+        return getattr(connection, name)
+
+    @property
+    def raw_connection(self):
+        """The underlying connection (e.g. for per-connection caches)"""
+        return self._connection
+
+    def close(self):
+        """Return the connection to the pool (safe to call more than once)"""
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._pool._checked_out.pop(id(self), None)
+            self._pool._release(connection)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ConnectionPool:
+    """Bounded connection pool with queueing, overflow and metrics"""
+
+    def __init__(self, factory, pool_size=5, max_overflow=0, timeout=5.0,
+                 ping_after=DEFAULT_PING_AFTER, track_leaks=False):
+        """
+        Args:
+            factory: Callable returning a new DB-API connection
+            pool_size: Connections kept open in the pool
+            max_overflow: Extra connections allowed under load
+            timeout: Seconds to wait for a free connection before PoolTimeoutError
+            ping_after: Ping idle connections older than this before reuse (seconds)
+            track_leaks: Record the acquiring stack of every connection (for tests)
+        """
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        if max_overflow < 0:
+            raise ValueError("max_overflow must not be negative")
+
+        self.factory = factory
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.timeout = timeout
+        self.ping_after = ping_after
+        self.track_leaks = track_leaks
+        self._checked_out = {}  # id(PooledConnection) -> (acquired_at, stack)
+
+        self._cond = threading.Condition()
+        self._idle = deque()  # (connection, returned_at)
+        self._open = 0        # connections created and not yet closed
+        self._in_use = 0
+        self._waiters = 0
+
+        # Metrics
+        self._acquired_total = 0
+        self._timeouts_total = 0
+        self._created_total = 0
+        self._wait_seconds_total = 0.0
+        self._wait_seconds_max = 0.0
+
+    @property
+    def max_connections(self):
+        return self.pool_size + self.max_overflow
+
+    def get_connection(self, timeout=None):
+        """
+        Acquire a connection, waiting up to timeout seconds when all are busy.
+
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+        """
+        if timeout is None:
+            timeout = self.timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._cond:
+            connection, returned_at = self._acquire_slot(deadline, timeout)
+            waited = time.monotonic() - started
+            self._acquired_total += 1
+            self._wait_seconds_total += waited
+            self._wait_seconds_max = max(self._wait_seconds_max, waited)
+
+        try:
+            if connection is None:
+                connection = self.factory()
+                with self._cond:
+                    self._created_total += 1
+            elif time.monotonic() - returned_at > self.ping_after:
+                connection = self._revalidate(connection)
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+        pooled = PooledConnection(self, connection, time.monotonic())
+        if self.track_leaks:
+            self._checked_out[id(pooled)] = (pooled.acquired_at, ''.join(traceback.format_stack()[:-1]))
+        return pooled
+
+    def _acquire_slot(self, deadline, timeout):
+        """Reserve an idle connection or a slot for a new one. Called with the lock held."""
+        while True:
+            if self._idle:
+                self._in_use += 1
+                return self._idle.pop()
+            if self._open < self.max_connections:
+                self._open += 1
+                self._in_use += 1
+                return None, None
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._timeouts_total += 1
+                raise PoolTimeoutError(
+                    f"No database connection available within {timeout}s "
+                    f"({self._in_use} in use, {self._waiters} waiting)"
+                )
+            self._waiters += 1
+            try:
+                self._cond.wait(remaining)
+            finally:
+                self._waiters -= 1
+
+    def _revalidate(self, connection):
+        """Replace a connection the server has dropped while it sat idle"""
+        try:
+            connection.ping(reconnect=False)
+            return connection
+        except (MySQLError, AttributeError, OSError):
+            self._close_quietly(connection)
+            connection = self.factory()
+            with self._cond:
+                self._created_total += 1
+            return connection
+
+    def _release(self, connection):
+        """Return a connection, rolling back any open transaction"""
+        healthy = True
+        try:
+            if getattr(connection, 'in_transaction', False):
+                connection.rollback()
+        except (MySQLError, OSError):
+            healthy = False
+
+        with self._cond:
+            self._in_use -= 1
+            # Overflow connections are closed unless someone is waiting for one
+            if healthy and (self._open <= self.pool_size or self._waiters):
+                self._idle.append((connection, time.monotonic()))
+                self._cond.notify()
+                return
+            self._open -= 1
+            self._cond.notify()
+        self._close_quietly(connection)
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_all(self):
+        """Close every idle connection (connections in use are closed when returned)"""
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for connection, _ in idle:
+            self._close_quietly(connection)
+
+    def checked_out(self):
+        """
+        Connections acquired and not yet returned (requires track_leaks).
+
+        Returns:
+            List of (seconds held, acquiring stack trace)
+        """
+        now = time.monotonic()
+        return [(now - acquired_at, stack) for acquired_at, stack in list(self._checked_out.values())]
+
+    def stats(self):
+        """Snapshot of pool usage and acquire wait metrics"""
+        with self._cond:
+            return {
+                'pool_size': self.pool_size,
+                'max_overflow': self.max_overflow,
+                'timeout': self.timeout,
+                'open': self._open,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiters': self._waiters,
+                'acquired_total': self._acquired_total,
+                'created_total': self._created_total,
+                'timeouts_total': self._timeouts_total,
+                'wait_seconds_total': round(self._wait_seconds_total, 6),
+                'wait_seconds_max': round(self._wait_seconds_max, 6),
+            }
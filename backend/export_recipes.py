@@ -14,6 +14,23 @@ python3 export_recipes.py
 # Export to a specific file
 python3 export_recipes.py --output /path/to/recipes.txt
 
+# Other formats: txt (default), jsonl, csv or md, optionally gzipped
+python3 export_recipes.py --format jsonl --gzip
+python3 export_recipes.py --output recipes.csv.gz
+
+# Format chunks in 4 worker processes (large catalogs)
+python3 export_recipes.py --format md --workers 4
+
+STREAMING:
+----------
+Recipes are read from an unbuffered cursor in chunks of --chunk-size rows
+(fetchmany), formatted and written chunk by chunk, so memory stays flat
+however large the catalog is. The format is taken from --format, else from
+the output file's extension (.txt, .jsonl, .csv, .md, each optionally with
+.gz); a .gz extension or --gzip compresses the output. With --workers N,
+chunks are formatted in N processes while the next chunks are read; output
+order is preserved.
+
 DATABASE CONFIGURATION:
 -----------------------
 Uses MySQL connection settings from environment variables or .env file:
@@ -24,9 +41,15 @@ Uses MySQL connection settings from environment variables or .env file:
 - MYSQL_DATABASE (default: neighborhood_sips)
 """
 
+import io
+import os
+import csv
 import sys
+import gzip
 import json
 import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import mysql.connector
 from config import Config
@@ -45,7 +68,8 @@ def connect_to_db():
             database=config.MYSQL_DATABASE,
             connection_timeout=30,
         )
-        cursor = conn.cursor(dictionary=True)
+        # Unbuffered: rows stay on the server until fetched (see stream_recipes)
+        cursor = conn.cursor(dictionary=True, buffered=False)
         print("✓ Connected to MySQL")
         return conn, cursor
     except mysql.connector.Error as e:
@@ -54,10 +78,30 @@ def connect_to_db():
         sys.exit(1)
 
 
-def fetch_recipes(cursor):
-    """Fetch all recipes from the database."""
-    cursor.execute("SELECT * FROM recipes")
-    return cursor.fetchall()
+# Rows per fetchmany() and per formatting task
+DEFAULT_CHUNK_SIZE = 500
+
+EXPORT_COLUMNS = "id, name, description, ingredients, instructions, tags"
+
+
+def count_recipes(conn):
+    """Count the recipes to export (run before streaming, which occupies the connection)."""
+    cursor = conn.cursor(buffered=True)
+    try:
+        cursor.execute("SELECT COUNT(*) FROM recipes")
+        return cursor.fetchone()[0]
+    finally:
+        cursor.close()
+
+
+def stream_recipes(cursor, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield lists of recipe rows, reading chunk_size rows at a time from the server."""
+    cursor.execute(f"SELECT {EXPORT_COLUMNS} FROM recipes ORDER BY id")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
 
 
 def format_ingredients(ingredients_raw):
@@ -71,13 +115,9 @@ def format_ingredients(ingredients_raw):
     Each ingredient entry is expected to have at least a 'name' key and
     optionally 'amount', 'units', and 'notes' keys.
     """
-    if isinstance(ingredients_raw, str):
-        try:
-            ingredients = json.loads(ingredients_raw)
-        except (json.JSONDecodeError, TypeError):
-            return ["  (could not parse ingredients)"]
-    else:
-        ingredients = ingredients_raw or []
+    ingredients = parse_json_list(ingredients_raw)
+    if ingredients is None:
+        return ["  (could not parse ingredients)"]
 
     lines = []
     for ing in ingredients:
@@ -99,15 +139,23 @@ def format_ingredients(ingredients_raw):
     return lines if lines else ["  (no ingredients listed)"]
 
 
-def format_tags(tags_raw):
-    """Parse and return a comma-separated tag string."""
-    if isinstance(tags_raw, str):
+def parse_json_list(value):
+    """Decode a JSON list column (str, bytes or already decoded); None if it cannot be parsed."""
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode("utf-8")
+    if isinstance(value, str):
         try:
-            tags = json.loads(tags_raw)
+            return json.loads(value)
         except (json.JSONDecodeError, TypeError):
-            return tags_raw
-    else:
-        tags = tags_raw or []
+            return None
+    return value or []
+
+
+def format_tags(tags_raw):
+    """Parse and return a comma-separated tag string."""
+    tags = parse_json_list(tags_raw)
+    if tags is None:
+        return tags_raw.decode("utf-8") if isinstance(tags_raw, (bytes, bytearray)) else tags_raw
 
     return ", ".join(str(t) for t in tags) if tags else "none"
 
@@ -145,31 +193,175 @@ def recipe_to_text(recipe):
     return "\n".join(lines)
 
 
-def export_recipes(output_path):
+def recipe_to_json(recipe):
+    """Convert a single recipe row into one JSON line."""
+    ingredients = parse_json_list(recipe.get("ingredients"))
+    tags = parse_json_list(recipe.get("tags"))
+    doc = {
+        "id": recipe.get("id"),
+        "name": recipe.get("name"),
+        "description": recipe.get("description") or "",
+        "ingredients": ingredients if ingredients is not None else [],
+        "instructions": recipe.get("instructions") or "",
+        "tags": tags if tags is not None else [],
+    }
+    return json.dumps(doc, ensure_ascii=False, default=str) + "\n"
+
+
+def recipe_to_markdown(recipe):
+    """Convert a single recipe row into a Markdown section."""
+    lines = [f"## {recipe.get('name', 'Unnamed Recipe')}", ""]
+
+    description = (recipe.get("description") or "").strip()
+    if description:
+        lines.extend([description, ""])
+
+    lines.extend(["**Ingredients**", ""])
+    lines.extend(line[2:] if line.startswith("  - ") else line.strip()
+                 for line in format_ingredients(recipe.get("ingredients")))
+
+    instructions = (recipe.get("instructions") or "").strip()
+    if instructions:
+        lines.extend(["", "**Instructions**", ""])
+        lines.extend(f"{step}  " for step in instructions.splitlines())
+
+    tags_str = format_tags(recipe.get("tags"))
+    if tags_str and tags_str != "none":
+        lines.extend(["", f"*Tags: {tags_str}*"])
+
+    lines.extend(["", ""])
+    return "\n".join(lines)
+
+
+CSV_COLUMNS = ["id", "name", "description", "ingredients", "instructions", "tags"]
+
+
+def recipe_to_csv_row(recipe):
+    """Convert a single recipe row into CSV values (ingredients joined with '; ')."""
+    ingredients = "; ".join(line.strip()[2:] if line.strip().startswith("- ") else line.strip()
+                            for line in format_ingredients(recipe.get("ingredients")))
+    tags_str = format_tags(recipe.get("tags"))
+    return [
+        recipe.get("id"),
+        recipe.get("name", ""),
+        recipe.get("description") or "",
+        ingredients,
+        recipe.get("instructions") or "",
+        "" if tags_str == "none" else tags_str,
+    ]
+
+
+def format_chunk(fmt, recipes):
+    """Format a chunk of recipe rows as one string (runs in a worker process with --workers)."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerows(recipe_to_csv_row(recipe) for recipe in recipes)
+        return buffer.getvalue()
+    return "".join(FORMATTERS[fmt](recipe) for recipe in recipes)
+
+
+FORMATTERS = {
+    "txt": recipe_to_text,
+    "jsonl": recipe_to_json,
+    "md": recipe_to_markdown,
+}
+
+FORMATS = ("txt", "jsonl", "csv", "md")
+
+
+def export_header(fmt, total):
+    """Text written before the first recipe."""
+    if fmt == "txt":
+        return "\n".join([
+            "RECIPES EXPORT",
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Total recipes: {total}",
+            "",
+        ]) + "\n"
+    if fmt == "md":
+        return (f"# Recipes Export\n\nGenerated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}  \n"
+                f"Total recipes: {total}\n\n")
+    if fmt == "csv":
+        return ",".join(CSV_COLUMNS) + "\n"
+    return ""
+
+
+def output_format(output_path, fmt=None, compress=None):
+    """
+    Resolve the format and compression from the arguments and the file name.
+
+    Returns:
+        Tuple of (format, gzip?)
+    """
+    name = output_path.lower()
+    if compress is None:
+        compress = name.endswith(".gz")
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if fmt is None:
+        extension = os.path.splitext(name)[1].lstrip(".")
+        fmt = extension if extension in FORMATS else "txt"
+    return fmt, compress
+
+
+def open_output(output_path, compress):
+    """Open the output file for text writing, gzipped if requested."""
+    if compress:
+        return gzip.open(output_path, "wt", encoding="utf-8", newline="")
+    return open(output_path, "w", encoding="utf-8", newline="")
+
+
+def write_chunks(out, fmt, chunks, workers=0):
+    """
+    Format and write recipe chunks in order.
+
+    With workers, chunks are formatted in a process pool; at most two chunks
+    per worker are in flight, so reading stays just ahead of writing.
+
+    Returns:
+        Number of recipes written
+    """
+    count = 0
+    if workers <= 1:
+        for chunk in chunks:
+            out.write(format_chunk(fmt, chunk))
+            count += len(chunk)
+        return count
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append((executor.submit(format_chunk, fmt, chunk), len(chunk)))
+            if len(in_flight) >= workers * 2:
+                future, size = in_flight.popleft()
+                out.write(future.result())
+                count += size
+        while in_flight:
+            future, size = in_flight.popleft()
+            out.write(future.result())
+            count += size
+    return count
+
+
+def export_recipes(output_path, fmt=None, compress=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=0):
     """Main export routine."""
+    fmt, compress = output_format(output_path, fmt, compress)
     conn, cursor = connect_to_db()
 
     try:
-        recipes = fetch_recipes(cursor)
-        print(f"Found {len(recipes)} recipe(s) in the database.")
+        total = count_recipes(conn)
+        print(f"Found {total} recipe(s) in the database.")
 
-        if not recipes:
+        if not total:
             print("Nothing to export.")
             return
 
-        header_lines = [
-            "RECIPES EXPORT",
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Total recipes: {len(recipes)}",
-            "",
-        ]
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write("\n".join(header_lines) + "\n")
-            for recipe in recipes:
-                f.write(recipe_to_text(recipe))
+        with open_output(output_path, compress) as f:
+            f.write(export_header(fmt, total))
+            count = write_chunks(f, fmt, stream_recipes(cursor, chunk_size), workers)
 
-        print(f"✓ Exported {len(recipes)} recipe(s) to: {output_path}")
+        print(f"✓ Exported {count} recipe(s) to: {output_path} ({fmt}{', gzip' if compress else ''})")
 
     finally:
         cursor.close()
@@ -178,16 +370,40 @@ def export_recipes(output_path):
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Export all recipes from MySQL to a text file."
+        description="Export all recipes from MySQL to a text, JSONL, CSV or Markdown file."
     )
     parser.add_argument(
         "--output",
-        default="recipes_export.txt",
-        help="Path to the output text file (default: recipes_export.txt)",
+        help="Path to the output file (default: recipes_export.<format>, plus .gz with --gzip)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        help="Output format (default: from the output file extension, else txt)",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        default=None,
+        help="Compress the output (default: when the output file ends in .gz)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"Rows fetched and formatted at a time (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Format chunks in N worker processes (default: in this process)",
     )
     args = parser.parse_args()
 
-    export_recipes(args.output)
+    output = args.output or f"recipes_export.{args.format or 'txt'}" + (".gz" if args.gzip else "")
+    export_recipes(output, fmt=args.format, compress=args.gzip, chunk_size=args.chunk_size,
+                   workers=args.workers)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+"""
+Fake MySQL connections for the tests
+
+One configurable cursor and connection stand in for mysql-connector (and,
+through the async variants, aiomysql), so tests only keep their own row
+data. Rows are either a fixed list or a function (query, params) -> rows
+answering each statement. fake_pool() serves app.py's database from a pool
+of these connections for the length of a with block.
+"""
+
+import functools
+from contextlib import contextmanager
+from db_pool import ConnectionPool
+
+
+class FakeCursor:
+    """DB-API cursor answering every statement from its rows"""
+
+    def __init__(self, rows=(), rowcount=-1, with_rows=True, executed=None):
+        """
+        Args:
+            rows: Rows for every query, or a function (query, params) -> rows (None for no result set)
+            rowcount: rowcount reported after each statement
+            with_rows: Whether statements return a result set (mysql-connector's with_rows)
+            executed: List each (query, params) is appended to
+        """
+        self.rows = rows
+        self.rowcount = rowcount
+        self.with_rows = with_rows
+        self.lastrowid = None
+        self.executed = [] if executed is None else executed
+        self.fetches = []
+        self.closed = False
+        self._result = []
+
+    def execute(self, query, params=None):
+        self.executed.append((query, params))
+        rows = self.rows(query, params) if callable(self.rows) else self.rows
+        # Copies, so handlers can modify rows without changing the test data
+        self._result = [dict(row) if isinstance(row, dict) else row for row in rows or []]
+
+    def executemany(self, query, seq_params):
+        self.executed.append((query, list(seq_params)))
+
+    def fetchone(self):
+        self.fetches.append(1)
+        return self._result.pop(0) if self._result else None
+
+    def fetchmany(self, size):
+        self.fetches.append(size)
+        rows, self._result = self._result[:size], self._result[size:]
+        return rows
+
+    def fetchall(self):
+        self.fetches.append('all')
+        rows, self._result = self._result, []
+        return rows
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """Connection handing out cursors over the same rows; counts commits and rollbacks"""
+
+    def __init__(self, rows=(), rowcount=-1, cursor_class=FakeCursor):
+        """
+        Args:
+            rows, rowcount: Passed to every cursor (see FakeCursor)
+            cursor_class: FakeCursor subclass to hand out
+        """
+        self.rows = rows
+        self.rowcount = rowcount
+        self.cursor_class = cursor_class
+        self.executed = []
+        self.cursors = []
+        self.cursor_kwargs = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.in_transaction = False
+        self.closed = False
+
+    def cursor(self, **kwargs):
+        self.cursor_kwargs.append(kwargs)
+        cursor = self.cursor_class(self.rows, self.rowcount, executed=self.executed)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        self.commits += 1
+        self.in_transaction = False
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def ping(self, reconnect=False):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def connection_factory(rows=(), **kwargs):
+    """Zero-argument connection factory for ConnectionPool"""
+    return functools.partial(FakeConnection, rows, **kwargs)
+
+
+@contextmanager
+def fake_pool(rows=(), factory=None, pool_size=1, track_leaks=False, **kwargs):
+    """
+    Serve app.py's database from a pool of fake connections (no replicas).
+
+    Args:
+        rows, kwargs: Passed to every FakeConnection
+        factory: Connection factory to use instead (e.g. one that raises)
+
+    Yields:
+        The pool; the previous pools are restored afterwards
+    """
+    import app as app_module
+
+    previous = (app_module.db_pool, app_module.replica_pools)
+    app_module.db_pool = ConnectionPool(
+        factory or connection_factory(rows, **kwargs), pool_size=pool_size, timeout=0.1, track_leaks=track_leaks
+    )
+    app_module.replica_pools = {}
+    try:
+        yield app_module.db_pool
+    finally:
+        app_module.db_pool, app_module.replica_pools = previous
+
+
+class FakeAsyncCursor(FakeCursor):
+    """aiomysql cursor over the same rows"""
+
+    async def execute(self, query, params=None):
+        FakeCursor.execute(self, query, params)
+
+    async def fetchall(self):
+        return FakeCursor.fetchall(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+class FakeAsyncConnection(FakeConnection):
+    """aiomysql connection handing out FakeAsyncCursors"""
+
+    def __init__(self, rows=(), rowcount=-1):
+        super().__init__(rows, rowcount, cursor_class=FakeAsyncCursor)
+
+    def cursor(self, *cursor_class):
+        return super().cursor()
+
+    async def commit(self):
+        FakeConnection.commit(self)
+
+    async def rollback(self):
+        FakeConnection.rollback(self)
+
+
+class FakeAsyncPool:
+    """Stands in for an aiomysql pool of FakeAsyncConnections"""
+    size = 1
+    freesize = 1
+    maxsize = 1
+
+    def __init__(self, rows=(), rowcount=-1):
+        self.rows = rows
+        self.rowcount = rowcount
+        self.released = 0
+
+    async def acquire(self):
+        return FakeAsyncConnection(self.rows, self.rowcount)
+
+    def release(self, conn):
+        self.released += 1
@@ -0,0 +1,65 @@
+"""
+File offload for Neighborhood Sips
+Lets the front web server send upload and static file bytes instead of the
+Flask workers. After Flask has resolved a file, it returns an empty response
+carrying a header that tells the web server which file to send:
+
+    x-accel     nginx: X-Accel-Redirect: <internal prefix>/<relative path>
+    x-sendfile  Apache mod_xsendfile / lighttpd: X-Sendfile: <absolute path>
+
+With no mode configured the file is sent by Flask as before.
+
+Example nginx configuration for x-accel (prefixes must match the config):
+
+    location /internal/uploads/ {
+        internal;
+        alias /path/to/backend/uploads/;
+    }
+    location /internal/static/ {
+        internal;
+        alias /path/to/backend/static/;
+    }
+"""
+
+import os
+import mimetypes
+from urllib.parse import quote
+from flask import Response, send_from_directory
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+OFFLOAD_MODES = ('', 'x-accel', 'x-sendfile')
+
+
+def normalize_mode(mode):
+    """Validate an offload mode from the configuration"""
+    mode = (mode or '').strip().lower()
+    if mode not in OFFLOAD_MODES:
+        raise ValueError(f"Unsupported FILE_OFFLOAD_MODE '{mode}', expected one of: x-accel, x-sendfile")
+    return mode
+
+
+def accel_redirect_response(directory, relpath, internal_prefix):
+    """Build an empty response that makes nginx send directory/relpath from its internal location"""
+    path = safe_join(directory, relpath)
+    if path is None or not os.path.isfile(path):
+        raise NotFound()
+
+    mimetype = mimetypes.guess_type(relpath)[0] or 'application/octet-stream'
+    response = Response(mimetype=mimetype)
+    response.headers['X-Accel-Redirect'] = internal_prefix.rstrip('/') + '/' + quote(relpath)
+    return response
+
+
+def send_file_offloaded(directory, relpath, mode='', internal_prefix=''):
+    """
+    Send a file, letting the front web server transfer the bytes when offloading is enabled.
+
+    X-Sendfile is handled by Flask itself (USE_X_SENDFILE) inside send_from_directory.
+
+    Raises:
+        NotFound: If the file does not exist or is outside directory
+    """
+    if mode == 'x-accel':
+        return accel_redirect_response(directory, relpath, internal_prefix)
+    return send_from_directory(directory, relpath)
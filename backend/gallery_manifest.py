@@ -0,0 +1,249 @@
+"""
+Gallery manifest for Neighborhood Sips
+Describes every gallery image (dimensions, size, capture date, a tiny blurred
+placeholder) and groups them into menus and general images, so the gallery
+page can lay itself out before the full-size images arrive.
+
+The manifest is cached in memory and on disk, and rebuilt only when the
+gallery directory's mtime changes (files added, removed or renamed). Entries
+for files whose mtime and size are unchanged are reused during a rebuild.
+"""
+
+import os
+import io
+import json
+import base64
+import threading
+from datetime import datetime
+from PIL import Image, ImageFilter, UnidentifiedImageError
+from PIL.ImageOps import exif_transpose
+
+# Extensions listed in the gallery
+GALLERY_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif')
+
+# Longest side of the blurred placeholder, in pixels
+PLACEHOLDER_SIZE = 16
+PLACEHOLDER_BLUR_RADIUS = 1
+PLACEHOLDER_QUALITY = 40
+
+# Bump when the entry format changes to invalidate on-disk caches
+MANIFEST_VERSION = 1
+
+# EXIF tags
+EXIF_IFD_POINTER = 0x8769
+EXIF_DATETIME_ORIGINAL = 36867
+EXIF_DATETIME = 306
+EXIF_ORIENTATION = 274
+
+
+def gallery_group(filename):
+    """Return the gallery section an image belongs to"""
+    return 'menu' if filename.lower().startswith('menu') else 'general'
+
+
+def parse_exif_datetime(value):
+    """Convert an EXIF 'YYYY:MM:DD HH:MM:SS' string to ISO format, or None"""
+    if not value:
+        return None
+    if isinstance(value, bytes):
+        value = value.decode('ascii', errors='ignore')
+    try:
+        return datetime.strptime(value.strip('\x00 '), '%Y:%m:%d %H:%M:%S').isoformat()
+    except ValueError:
+        return None
+
+
+def make_placeholder(image):
+    """Build a tiny blurred JPEG data URI of an image"""
+    placeholder = image.copy()
+    if placeholder.mode not in ('RGB', 'L'):
+        placeholder = placeholder.convert('RGB')
+    placeholder.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BILINEAR)
+    placeholder = placeholder.filter(ImageFilter.GaussianBlur(PLACEHOLDER_BLUR_RADIUS))
+
+    buffer = io.BytesIO()
+    placeholder.save(buffer, 'JPEG', quality=PLACEHOLDER_QUALITY)
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+
+
+def describe_image(path):
+    """Read dimensions, capture date and placeholder of a single image"""
+    with Image.open(path) as image:
+        width, height = image.size
+        exif = image.getexif()
+
+        # Browsers apply EXIF orientation, so report the displayed dimensions
+        if exif.get(EXIF_ORIENTATION) in (5, 6, 7, 8):
+            width, height = height, width
+
+        captured_at = parse_exif_datetime(exif.get_ifd(EXIF_IFD_POINTER).get(EXIF_DATETIME_ORIGINAL))
+        if not captured_at:
+            captured_at = parse_exif_datetime(exif.get(EXIF_DATETIME))
+
+        image.draft('RGB', (PLACEHOLDER_SIZE * 4, PLACEHOLDER_SIZE * 4))
+        placeholder = make_placeholder(exif_transpose(image))
+
+    return {
+        'width': width,
+        'height': height,
+        'captured_at': captured_at,
+        'placeholder': placeholder,
+    }
+
+
+class GalleryManifest:
+    """In-memory and on-disk cached manifest of a gallery directory"""
+
+    def __init__(self, gallery_dir, cache_path=None, url_for=None):
+        """
+        Args:
+            gallery_dir: Directory containing the gallery images
+            cache_path: JSON file used to persist the manifest between restarts (optional)
+            url_for: Function mapping a filename to its URL (default: /images/gallery/<filename>)
+        """
+        self.gallery_dir = gallery_dir
+        self.cache_path = cache_path
+        self.url_for = url_for or (lambda filename: f'/images/gallery/{filename}')
+        self._lock = threading.Lock()
+        self._manifest = None
+        self._response = None
+        self.hits = 0
+        self.misses = 0
+
+    def _directory_mtime(self):
+        return os.stat(self.gallery_dir).st_mtime_ns
+
+    def _load_from_disk(self):
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return None
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if manifest.get('version') != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def _save_to_disk(self, manifest):
+        if not self.cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            print(f"Error saving gallery manifest: {e}")
+
+    def _build(self, mtime, previous=None):
+        """Scan the gallery, reusing entries of unchanged files from a previous manifest"""
+        previous_entries = {}
+        if previous:
+            previous_entries = {entry['filename']: entry for entry in previous.get('images', [])}
+
+        images = []
+        for filename in sorted(os.listdir(self.gallery_dir)):
+            if not filename.lower().endswith(GALLERY_IMAGE_EXTENSIONS):
+                continue
+            path = os.path.join(self.gallery_dir, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            entry = previous_entries.get(filename)
+            if entry and entry.get('mtime') == stat.st_mtime_ns and entry.get('bytes') == stat.st_size:
+                entry = dict(entry)
+            else:
+                try:
+                    details = describe_image(path)
+                except (IOError, ValueError, UnidentifiedImageError) as e:
+                    print(f"Error reading gallery image {filename}: {e}")
+                    details = {'width': None, 'height': None, 'captured_at': None, 'placeholder': None}
+                entry = {
+                    'filename': filename,
+                    'bytes': stat.st_size,
+                    'mtime': stat.st_mtime_ns,
+                    'group': gallery_group(filename),
+                    **details,
+                }
+            entry['url'] = self.url_for(filename)
+            images.append(entry)
+
+        return {
+            'version': MANIFEST_VERSION,
+            'directory_mtime': mtime,
+            'generated_at': datetime.utcnow().isoformat(),
+            'images': images,
+        }
+
+    def get(self):
+        """Return the current manifest, rebuilding it if the gallery directory changed"""
+        mtime = self._directory_mtime()
+        manifest = self._manifest
+        if manifest and manifest['directory_mtime'] == mtime:
+            self.hits += 1
+            return manifest
+
+        with self._lock:
+            # Another thread may have rebuilt it while we waited
+            manifest = self._manifest
+            if manifest and manifest['directory_mtime'] == mtime:
+                self.hits += 1
+                return manifest
+
+            self.misses += 1
+            disk_manifest = self._load_from_disk()
+            if disk_manifest and disk_manifest.get('directory_mtime') == mtime:
+                manifest = disk_manifest
+                for entry in manifest['images']:
+                    entry['url'] = self.url_for(entry['filename'])
+            else:
+                manifest = self._build(mtime, previous=manifest or disk_manifest)
+                self._save_to_disk(manifest)
+
+            self._manifest = manifest
+            self._response = None
+            return manifest
+
+    def is_warm(self):
+        """True if the in-memory manifest is current (the next get() is a cache hit)"""
+        manifest = self._manifest
+        try:
+            return bool(manifest) and manifest['directory_mtime'] == self._directory_mtime()
+        except OSError:
+            return False
+
+    def response(self):
+        """Return the manifest shaped for the API, cached until the manifest changes"""
+        manifest = self.get()
+        cached = self._response
+        if cached and cached[0] is manifest:
+            return cached[1]
+        response = manifest_response(manifest)
+        self._response = (manifest, response)
+        return response
+
+    def invalidate(self):
+        with self._lock:
+            self._manifest = None
+            self._response = None
+
+
+def manifest_response(manifest):
+    """Shape a manifest for the API: all images plus server-side menu/general grouping"""
+    images = [
+        {key: value for key, value in entry.items() if key != 'mtime'}
+        for entry in manifest['images']
+    ]
+    groups = {'general': [], 'menu': []}
+    for entry in images:
+        groups[entry['group']].append(entry)
+
+    return {
+        'images': images,
+        'groups': groups,
+        'generated_at': manifest['generated_at'],
+    }
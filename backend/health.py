@@ -0,0 +1,169 @@
+"""
+Health checks for Neighborhood Sips
+
+- Liveness: the process is up and serving requests (no dependencies checked)
+- Readiness: the instance can serve traffic. It checks connection pool
+  acquisition, a timed SELECT 1, that the upload folder is writable and
+  that the gallery manifest cache is warm (warming it if not)
+
+Each check reports its status and latency. Load balancers probe often, so
+readiness results are cached for a short TTL; while one request refreshes
+them, concurrent probes wait for that result instead of repeating the
+checks. The ASGI app uses the async variants (run_check_async,
+AsyncProbeCache) for its aiomysql pool.
+"""
+
+import time
+import asyncio
+import tempfile
+import threading
+
+# Seconds a readiness result is reused
+DEFAULT_PROBE_TTL = 2.0
+
+
+def elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def run_check(check):
+    """
+    Run one check and time it.
+
+    Args:
+        check: Callable returning a dict of details; raising marks the check failed
+
+    Returns:
+        Dict with status ('ok' or 'fail'), latency_ms and the details or error
+    """
+    started = time.perf_counter()
+    try:
+        details = check() or {}
+        status = 'ok'
+    except Exception as e:
+        details = {'error': f"{type(e).__name__}: {e}"}
+        status = 'fail'
+    return {'status': status, 'latency_ms': elapsed_ms(started), **details}
+
+
+async def run_check_async(check):
+    """run_check for a coroutine function"""
+    started = time.perf_counter()
+    try:
+        details = await check() or {}
+        status = 'ok'
+    except Exception as e:
+        details = {'error': f"{type(e).__name__}: {e}"}
+        status = 'fail'
+    return {'status': status, 'latency_ms': elapsed_ms(started), **details}
+
+
+def check_database(pool, timeout):
+    """Acquire a pooled connection and run SELECT 1, timing both steps"""
+    started = time.perf_counter()
+    conn = pool.get_connection(timeout=timeout)
+    acquire_ms = elapsed_ms(started)
+    try:
+        started = time.perf_counter()
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+        query_ms = elapsed_ms(started)
+    finally:
+        conn.close()
+    return {'acquire_ms': acquire_ms, 'query_ms': query_ms}
+
+
+def check_writable(directory):
+    """Create and remove a temporary file in a directory"""
+    with tempfile.NamedTemporaryFile(dir=directory, prefix='.ready-') as f:
+        f.write(b'ok')
+        f.flush()
+    return {}
+
+
+def check_gallery_cache(manifest):
+    """Report whether the gallery manifest was cached, building it if not"""
+    warm = manifest.is_warm()
+    if not warm:
+        manifest.response()
+    return {'warm': warm}
+
+
+def run_checks(checks):
+    """
+    Run named checks.
+
+    Returns:
+        Tuple of (ready, {name: result})
+    """
+    results = {name: run_check(check) for name, check in checks.items()}
+    return all(result['status'] == 'ok' for result in results.values()), results
+
+
+class ProbeCache:
+    """Caches a probe result for ttl seconds; only one caller refreshes it at a time"""
+
+    def __init__(self, probe, ttl=DEFAULT_PROBE_TTL):
+        """
+        Args:
+            probe: Callable returning the result to cache
+            ttl: Seconds a result is reused
+        """
+        self.probe = probe
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._result = None
+        self._checked_at = 0.0
+
+    def fresh(self):
+        return self._result is not None and time.monotonic() - self._checked_at < self.ttl
+
+    def get(self):
+        """
+        Return the cached result, running the probe if it has expired.
+
+        Returns:
+            Tuple of (result, age in seconds)
+        """
+        if self.fresh():
+            return self._result, time.monotonic() - self._checked_at
+
+        with self._lock:
+            # Another request may have refreshed it while we waited
+            if not self.fresh():
+                self._result = self.probe()
+                self._checked_at = time.monotonic()
+            return self._result, time.monotonic() - self._checked_at
+
+    def clear(self):
+        with self._lock:
+            self._result = None
+
+
+class AsyncProbeCache(ProbeCache):
+    """ProbeCache for a coroutine probe; concurrent probes await the one refresh"""
+
+    def __init__(self, probe, ttl=DEFAULT_PROBE_TTL):
+        super().__init__(probe, ttl)
+        # Created on first use, inside the server's event loop
+        self._async_lock = None
+
+    async def get(self):
+        """
+        Return the cached result, awaiting the probe if it has expired.
+
+        Returns:
+            Tuple of (result, age in seconds)
+        """
+        if self.fresh():
+            return self._result, time.monotonic() - self._checked_at
+
+        if self._async_lock is None:
+            self._async_lock = asyncio.Lock()
+        async with self._async_lock:
+            if not self.fresh():
+                self._result = await self.probe()
+                self._checked_at = time.monotonic()
+            return self._result, time.monotonic() - self._checked_at
@@ -0,0 +1,235 @@
+"""
+Recipe image import for Neighborhood Sips
+Places recipe images from a bar-data checkout in the uploads folder as
+cheaply as the filesystem allows:
+
+- reflink: copy-on-write clone (btrfs, XFS, ...), when source and uploads
+  folder share a filesystem that supports it
+- link: hard link, when they share a filesystem. The upload and the
+  checkout then share one file, so only use it if neither is edited in place
+- copy: a regular copy (with metadata) otherwise
+
+Imports run in a thread pool. Optionally images are re-encoded with the
+same resize and encode settings as uploaded images (save_optimized_image)
+instead. Like uploads, images are placed in their shard directory
+(upload_store.sharded_path) and recipes store the sharded reference. Once
+every import finished, each referenced file is checked to exist in the
+uploads folder.
+"""
+
+import os
+import errno
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, UnidentifiedImageError
+from PIL.ImageOps import exif_transpose
+from image_utils import get_save_format, is_image_file, save_optimized_image, stored_filename
+from upload_store import sharded_path
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Linux ioctl cloning a whole file (FICLONE)
+FICLONE = 0x40049409
+
+# Methods tried, in order, for each import mode
+IMPORT_METHODS = {
+    'auto': ('reflink', 'link', 'copy'),
+    'reflink': ('reflink', 'copy'),
+    'link': ('link', 'copy'),
+    'copy': ('copy',),
+}
+
+DEFAULT_IMPORT_WORKERS = 8
+
+# Format an image is re-encoded in, by source file extension
+EXTENSION_FORMATS = {
+    '.jpg': 'JPEG',
+    '.jpeg': 'JPEG',
+    '.png': 'PNG',
+    '.gif': 'GIF',
+}
+
+
+def reflink_file(source, dest):
+    """Clone source to dest (copy-on-write); raises OSError if the filesystem can't"""
+    if fcntl is None:
+        raise OSError(errno.EOPNOTSUPP, 'reflink is not supported on this platform')
+    try:
+        with open(source, 'rb') as src, open(dest, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        if os.path.exists(dest):
+            os.remove(dest)
+        raise
+    shutil.copystat(source, dest)
+
+
+def import_file(source, dest, mode='auto'):
+    """
+    Place source at dest, replacing any existing file.
+
+    Reflinks and hard links are only tried when both are on the same
+    filesystem; otherwise (or if they fail) the file is copied.
+
+    Returns:
+        The method used: 'reflink', 'link' or 'copy'
+    """
+    if os.path.lexists(dest):
+        os.remove(dest)
+
+    same_filesystem = os.stat(source).st_dev == os.stat(os.path.dirname(dest) or '.').st_dev
+    for method in IMPORT_METHODS[mode]:
+        if method == 'reflink' and same_filesystem:
+            try:
+                reflink_file(source, dest)
+                return method
+            except OSError:
+                continue
+        elif method == 'link' and same_filesystem:
+            try:
+                os.link(source, dest)
+                return method
+            except OSError:
+                continue
+        elif method == 'copy':
+            shutil.copy2(source, dest)
+            return method
+    raise ValueError(f"Unknown import mode: {mode}")
+
+
+def is_current(source, dest):
+    """Check whether dest already holds an import of source (same file, or same size and mtime)"""
+    try:
+        source_stat = os.stat(source)
+        dest_stat = os.stat(dest)
+    except OSError:
+        return False
+    if os.path.samestat(source_stat, dest_stat):
+        return True
+    return source_stat.st_size == dest_stat.st_size and source_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+
+def reencode_format(filename):
+    return get_save_format(EXTENSION_FORMATS.get(os.path.splitext(filename)[1].lower()))
+
+
+def reencode_image(source, dest):
+    """Resize and re-encode source to dest with the upload settings"""
+    with Image.open(source) as image:
+        image = exif_transpose(image)
+        save_optimized_image(image, dest, reencode_format(dest))
+
+
+class ImageImporter:
+    """Imports recipe images in a thread pool: names are assigned at once, files written in the background"""
+
+    def __init__(self, upload_folder, mode='auto', reencode=False, workers=DEFAULT_IMPORT_WORKERS):
+        """
+        Args:
+            upload_folder: Uploads folder the images are placed in
+            mode: 'auto', 'reflink', 'link' or 'copy' (see IMPORT_METHODS)
+            reencode: Re-encode images with the upload settings instead of linking or copying
+            workers: Number of import threads
+        """
+        if mode not in IMPORT_METHODS:
+            raise ValueError(f"Unknown import mode: {mode}")
+        self.upload_folder = upload_folder
+        self.mode = mode
+        self.reencode = reencode
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._futures = []
+        self._lock = threading.Lock()
+        self._claimed = {}  # filename -> source path, for this run
+        self.referenced = []
+        self.methods = {}
+        self.errors = []
+
+    def _claim(self, filename, source):
+        """
+        Pick the upload reference of a source image, renaming if another recipe claimed it this run.
+
+        The reference only depends on the filename, so re-runs find their earlier imports.
+        """
+        if self.reencode:
+            filename = stored_filename(filename, reencode_format(filename))
+        name_part, ext_part = os.path.splitext(filename)
+        candidate = filename
+        counter = 1
+        while self._claimed.get(candidate, source) != source:
+            candidate = f"{name_part}_{counter}{ext_part}"
+            counter += 1
+        if candidate != filename:
+            print(f"  ⚠ Warning: {filename} is used by another recipe, importing as {candidate}")
+        self._claimed[candidate] = source
+        return sharded_path(candidate)
+
+    def upload_path(self, reference):
+        """Absolute path of an upload reference like '3f/a9/Margarita.jpg'"""
+        return os.path.join(self.upload_folder, *reference.split('/'))
+
+    def import_folder(self, recipe_folder):
+        """
+        Schedule the import of every image in a recipe folder.
+
+        Returns:
+            The images' sharded references in the uploads folder
+        """
+        references = []
+        for filename in sorted(os.listdir(recipe_folder)):
+            source = os.path.join(recipe_folder, filename)
+            if not is_image_file(filename) or not os.path.isfile(source):
+                continue
+            reference = self._claim(filename, source)
+            references.append(reference)
+            self._futures.append(self._executor.submit(self._import, source, reference))
+        self.referenced.extend(references)
+        return references
+
+    def _import(self, source, reference):
+        dest = self.upload_path(reference)
+        try:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            if self.reencode:
+                if os.path.exists(dest) and os.stat(dest).st_mtime_ns >= os.stat(source).st_mtime_ns:
+                    method = 'unchanged'
+                else:
+                    reencode_image(source, dest)
+                    method = 'reencode'
+            elif is_current(source, dest):
+                method = 'unchanged'
+            else:
+                method = import_file(source, dest, self.mode)
+        except (OSError, ValueError, UnidentifiedImageError) as e:
+            with self._lock:
+                self.errors.append((source, e))
+            return
+        with self._lock:
+            self.methods[method] = self.methods.get(method, 0) + 1
+
+    def finish(self):
+        """
+        Wait for every scheduled import and verify each referenced file exists.
+
+        Returns:
+            List of referenced images missing from the uploads folder
+        """
+        for future in self._futures:
+            future.result()
+        self._executor.shutdown()
+        self._futures = []
+
+        missing = [reference for reference in self.referenced
+                   if not os.path.isfile(self.upload_path(reference))]
+
+        methods = ', '.join(f"{method} {count}" for method, count in sorted(self.methods.items())) or 'none'
+        print(f"\nImages: {len(self.referenced)} referenced ({methods}), "
+              f"{len(self.errors)} errors, {len(missing)} missing")
+        for source, error in self.errors[:10]:
+            print(f"  ✗ {source}: {error}")
+        for name in missing[:10]:
+            print(f"  ✗ Missing upload: {name}")
+        return missing
@@ -0,0 +1,96 @@
+"""
+Image processing helpers for Neighborhood Sips
+Shared by the API (save_base64_image) and the image maintenance scripts so
+that every stored image goes through the same resize/encode settings
+"""
+
+import os
+from PIL import Image
+
+# Supported image formats for saving
+SUPPORTED_IMAGE_FORMATS = ['JPEG', 'PNG', 'GIF']
+
+# Largest dimensions kept for a stored image
+MAX_IMAGE_SIZE = (1024, 1024)
+
+# JPEG encoder quality used for stored images
+JPEG_QUALITY = 85
+
+# Derivative variants generated next to an optimized image
+# Maps the variant suffix to its maximum dimensions
+DERIVATIVE_SIZES = {
+    'thumb': (320, 320),
+}
+
+# File extensions treated as images by the maintenance scripts
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+
+# File extension used for each save format
+FORMAT_EXTENSIONS = {
+    'JPEG': '.jpg',
+    'PNG': '.png',
+    'GIF': '.gif',
+}
+
+
+def get_save_format(image_format):
+    """Return the format an image is stored in - original format when supported, PNG otherwise"""
+    return image_format if image_format in SUPPORTED_IMAGE_FORMATS else 'PNG'
+
+
+def has_transparency(image):
+    """Check whether an image has an alpha channel or transparent palette entries"""
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def save_optimized_image(image, fp, image_format, max_size=MAX_IMAGE_SIZE):
+    """
+    Resize and save an image with the standard storage settings.
+
+    Args:
+        image: PIL image (already EXIF transposed)
+        fp: Destination path or file object
+        image_format: Original format of the image (e.g. image.format)
+        max_size: Maximum (width, height) to keep (default: MAX_IMAGE_SIZE)
+
+    Returns:
+        The format the image was saved in
+    """
+    # Resize if too large
+    image.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    # Determine format for saving - preserve original format when possible
+    save_format = get_save_format(image_format)
+
+    # JPEG cannot store alpha or palette images
+    if save_format == 'JPEG' and image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGB')
+
+    # Save image with appropriate options
+    if save_format == 'JPEG':
+        image.save(fp, save_format, optimize=True, quality=JPEG_QUALITY)
+    else:
+        image.save(fp, save_format, optimize=True)
+
+    return save_format
+
+
+def stored_filename(filename, save_format):
+    """Return filename with an extension matching save_format, e.g. 'Menu.webp' -> 'Menu.png'"""
+    name_part, ext_part = os.path.splitext(filename)
+    if save_format == 'JPEG' and ext_part.lower() in ('.jpg', '.jpeg'):
+        return filename
+    if ext_part.lower() == FORMAT_EXTENSIONS.get(save_format):
+        return filename
+    return f"{name_part}{FORMAT_EXTENSIONS.get(save_format, ext_part)}"
+
+
+def derivative_filename(filename, variant):
+    """Build the filename of a derivative, e.g. 'Margarita.jpg' -> 'Margarita.thumb.jpg'"""
+    name_part, ext_part = os.path.splitext(filename)
+    return f"{name_part}.{variant}{ext_part}"
+
+
+def is_image_file(filename):
+    """Check whether a filename has one of the known image extensions"""
+    return filename.lower().endswith(IMAGE_EXTENSIONS)
@@ -0,0 +1,223 @@
+"""
+HTTP fetcher with a local mirror for the ingredient loader
+Downloads go through one pooled requests.Session (keep-alive connections,
+retries with backoff on connection errors and 429/5xx responses) and run
+in a bounded thread pool.
+
+With a mirror directory every response body is stored content-addressed:
+
+    mirror/objects/3f/3fa9...e1    (named by the SHA-256 of the body)
+    mirror/index.json              (url -> sha256, ETag, Last-Modified, status)
+
+Later runs revalidate mirrored URLs with If-None-Match / If-Modified-Since
+and reuse the stored body on 304 Not Modified. If the network fails, the
+mirrored copy is used. In offline mode the network is never touched and
+everything is served from the mirror (404s are mirrored too, so fallback
+lookups behave the same offline).
+"""
+
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_WORKERS = 8
+DEFAULT_TIMEOUT = 10
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+
+# Responses retried (with backoff) before giving up
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def make_session(pool_size=DEFAULT_WORKERS, retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF):
+    """Create a Session whose connection pool fits pool_size threads and that retries GETs"""
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=('GET',),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class Mirror:
+    """Content-addressed store of fetched response bodies"""
+
+    def __init__(self, mirror_dir):
+        self.mirror_dir = mirror_dir
+        self.index_path = os.path.join(mirror_dir, 'index.json')
+        self._lock = threading.Lock()
+        self._index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self._index = json.load(f)
+
+    def _object_path(self, digest):
+        return os.path.join(self.mirror_dir, 'objects', digest[:2], digest)
+
+    def lookup(self, url):
+        """
+        Return the index entry of a URL, or None if it was never mirrored.
+
+        An entry whose object file has been deleted counts as not mirrored,
+        so the URL is fetched again (or reported unavailable offline).
+        """
+        with self._lock:
+            entry = self._index.get(url)
+        if not entry:
+            return None
+        if entry['status'] == 200 and not os.path.isfile(self._object_path(entry['sha256'])):
+            print(f"  ⚠ {url}: mirrored object {entry['sha256'][:12]} is missing")
+            return None
+        return dict(entry)
+
+    def read(self, entry):
+        """Return the mirrored body of an index entry (None for a mirrored 404)"""
+        if entry['status'] != 200:
+            return None
+        with open(self._object_path(entry['sha256']), 'rb') as f:
+            return f.read()
+
+    def store(self, url, status, body=None, etag=None, last_modified=None):
+        """Store a response; bodies already in the mirror are not written again"""
+        entry = {'status': status, 'fetched_at': datetime.utcnow().isoformat()}
+        if status == 200:
+            digest = hashlib.sha256(body).hexdigest()
+            path = self._object_path(digest)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+            entry.update(sha256=digest, etag=etag, last_modified=last_modified)
+        with self._lock:
+            self._index[url] = entry
+
+    def save(self):
+        """Write the index (atomically)"""
+        os.makedirs(self.mirror_dir, exist_ok=True)
+        with self._lock:
+            index = dict(self._index)
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+
+class Fetcher:
+    """Fetches URLs through a pooled session and an optional mirror"""
+
+    def __init__(self, mirror_dir=None, offline=False, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT,
+                 session=None):
+        """
+        Args:
+            mirror_dir: Directory of the local mirror (optional)
+            offline: Serve everything from the mirror without network access
+            workers: Concurrent requests in fetch_all (and connection pool size)
+            timeout: Seconds per request
+            session: requests.Session to use (default: make_session(workers))
+        """
+        if offline and not mirror_dir:
+            raise ValueError("Offline mode needs a mirror directory")
+        self.mirror = Mirror(mirror_dir) if mirror_dir else None
+        self.offline = offline
+        self.workers = workers
+        self.timeout = timeout
+        self.session = session or (None if offline else make_session(workers))
+        self._lock = threading.Lock()
+        self.stats = {}
+
+    def _count(self, outcome):
+        with self._lock:
+            self.stats[outcome] = self.stats.get(outcome, 0) + 1
+
+    def get(self, url):
+        """
+        Fetch a URL.
+
+        Returns:
+            Response body (bytes), or None if it does not exist (404) or
+            could not be fetched or found in the mirror
+        """
+        entry = self.mirror.lookup(url) if self.mirror else None
+        if self.offline:
+            self._count('mirror' if entry else 'not mirrored')
+            return self.mirror.read(entry) if entry else None
+
+        headers = {}
+        if entry and entry['status'] == 200:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            if entry:
+                print(f"  ⚠ {url}: {e}; using mirrored copy")
+                self._count('stale')
+                return self.mirror.read(entry)
+            print(f"  ⚠ Error fetching {url}: {e}")
+            self._count('error')
+            return None
+
+        if response.status_code == 304 and entry:
+            self._count('not modified')
+            return self.mirror.read(entry)
+        if response.status_code == 404:
+            if self.mirror:
+                self.mirror.store(url, 404)
+            self._count('not found')
+            return None
+        if response.status_code != 200:
+            self._count('error')
+            if entry:
+                print(f"  ⚠ {url}: HTTP {response.status_code}; using mirrored copy")
+                return self.mirror.read(entry)
+            print(f"  ⚠ Error fetching {url}: HTTP {response.status_code}")
+            return None
+
+        if self.mirror:
+            self.mirror.store(url, 200, response.content, response.headers.get('ETag'),
+                              response.headers.get('Last-Modified'))
+        self._count('downloaded')
+        return response.content
+
+    def get_json(self, url):
+        """Fetch and decode a JSON document (None if missing or invalid)"""
+        body = self.get(url)
+        if body is None:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            print(f"  ⚠ Invalid JSON from {url}: {e}")
+            return None
+
+    def map(self, func, items):
+        """Apply func to items in the thread pool, returning results in order"""
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(func, items))
+
+    def close(self):
+        """Save the mirror index and close the session"""
+        if self.mirror:
+            self.mirror.save()
+        if self.session:
+            self.session.close()
+
+    def summary(self):
+        return ', '.join(f"{outcome} {count}" for outcome, count in sorted(self.stats.items())) or 'no requests'
@@ -36,8 +36,11 @@ def init_database():
             bar_shelf_availability CHAR(1) DEFAULT 'N',
             created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
             updated_at DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            name_normalized VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin
+                GENERATED ALWAYS AS (LOWER(TRIM(name))) STORED,
             INDEX idx_name (name),
-            INDEX idx_category (category)
+            INDEX idx_category (category),
+            UNIQUE KEY uq_ingredients_name_normalized (name_normalized)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
     """)
     
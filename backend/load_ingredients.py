@@ -2,15 +2,28 @@
 """
 Load ingredients from Bar Assistant data repository
 https://github.com/bar-assistant/data/tree/v5/data/ingredients
+
+Ingredient files are downloaded concurrently over one pooled session with
+retries (see ingredient_fetcher.py).
+
+Usage:
+    # Fetch from GitHub
+    python3 load_ingredients.py
+
+    # Keep a local mirror; later runs only re-download files whose ETag changed
+    python3 load_ingredients.py --mirror-dir ../bar-assistant-mirror
+
+    # Load from the mirror without network access
+    python3 load_ingredients.py --mirror-dir ../bar-assistant-mirror --offline
 """
 
 import os
 import sys
 import json
-import requests
 from datetime import datetime
 import mysql.connector
 from config import Config
+from ingredient_fetcher import Fetcher, DEFAULT_WORKERS
 
 # Bar Assistant data repository - using direct raw URLs
 GITHUB_RAW_BASE = "https://raw.githubusercontent.com/bar-assistant/data/v5/data/ingredients"
@@ -19,34 +32,25 @@ GITHUB_RAW_BASE = "https://raw.githubusercontent.com/bar-assistant/data/v5/data/
 # We'll fetch this list directly from the repository's file listing
 INGREDIENT_FILES_URL = "https://raw.githubusercontent.com/bar-assistant/data/v5/data/ingredients/_files.json"
 
-def fetch_ingredient_files():
+def fetch_ingredient_files(fetcher):
     """Fetch list of ingredient files from Bar Assistant"""
     print("Fetching ingredient files from Bar Assistant repository...")
     
-    try:
-        # First, try to get the _files.json if it exists
-        response = requests.get(INGREDIENT_FILES_URL, timeout=10)
-        if response.status_code == 200:
-            files = response.json()
-            print(f"Found {len(files)} ingredient files from _files.json")
-            return files
-    except:
-        pass
+    # First, try to get the _files.json if it exists
+    files = fetcher.get_json(INGREDIENT_FILES_URL)
+    if files:
+        print(f"Found {len(files)} ingredient files from _files.json")
+        return files
     
     # If _files.json doesn't exist, use a predefined list of common ingredients
     # This is a fallback approach - we'll fetch the main ingredients file
     print("Fetching main ingredients list...")
-    try:
-        # Try to get ingredients from a known consolidated file
-        url = "https://raw.githubusercontent.com/bar-assistant/data/v5/ingredients.json"
-        response = requests.get(url, timeout=10)
-        if response.status_code == 200:
-            data = response.json()
-            if isinstance(data, list):
-                print(f"Found {len(data)} ingredients in consolidated file")
-                return [{'name': f"ingredient_{i}.json", 'data': ing} for i, ing in enumerate(data)]
-    except Exception as e:
-        print(f"Note: {e}")
+    # Try to get ingredients from a known consolidated file
+    url = "https://raw.githubusercontent.com/bar-assistant/data/v5/ingredients.json"
+    data = fetcher.get_json(url)
+    if isinstance(data, list):
+        print(f"Found {len(data)} ingredients in consolidated file")
+        return [{'name': f"ingredient_{i}.json", 'data': ing} for i, ing in enumerate(data)]
     
     # Final fallback: scrape the directory listing
     print("Attempting to fetch individual ingredient files...")
@@ -64,26 +68,14 @@ def fetch_ingredient_files():
     
     return [{'name': f} for f in common_ingredients]
 
-def fetch_ingredient_data(file_info):
-    """Fetch individual ingredient data"""
+def fetch_ingredient_data(file_info, fetcher):
+    """Fetch individual ingredient data (None if missing; 404s of the fallback list are silent)"""
     
     # If data is already included in file_info
     if 'data' in file_info:
         return file_info['data']
     
-    filename = file_info['name']
-    url = f"{GITHUB_RAW_BASE}/{filename}"
-    try:
-        response = requests.get(url, timeout=10)
-        if response.status_code == 404:
-            return None
-        response.raise_for_status()
-        return response.json()
-    except Exception as e:
-        # Silently skip 404s for our fallback list
-        if "404" not in str(e):
-            print(f"  ⚠ Error fetching {filename}: {e}")
-        return None
+    return fetcher.get_json(f"{GITHUB_RAW_BASE}/{file_info['name']}")
 
 def convert_ingredient(bar_assistant_data):
     """Convert Bar Assistant ingredient format to Neighborhood Sips format"""
@@ -123,11 +115,22 @@ def convert_ingredient(bar_assistant_data):
     
     return ingredient
 
-def load_ingredients_to_db(dry_run=False):
+def load_ingredients_to_db(dry_run=False, mirror_dir=None, offline=False, workers=DEFAULT_WORKERS):
     """Load ingredients from Bar Assistant into MongoDB"""
     
-    # Fetch file list
-    files = fetch_ingredient_files()
+    fetcher = Fetcher(mirror_dir=mirror_dir, offline=offline, workers=workers)
+    try:
+        # Fetch file list, then every ingredient file concurrently
+        files = fetch_ingredient_files(fetcher)
+        if files:
+            print(f"Fetching {len(files)} ingredient files ({workers} at a time)...")
+            ingredients_data = fetcher.map(lambda file_info: fetch_ingredient_data(file_info, fetcher), files)
+    finally:
+        fetcher.close()
+    print(f"Requests: {fetcher.summary()}")
+    if mirror_dir:
+        print(f"Mirror: {mirror_dir}")
+    
     if not files:
         print("No ingredient files found")
         return 0
@@ -158,11 +161,9 @@ def load_ingredients_to_db(dry_run=False):
     loaded_count = 0
     skipped_count = 0
     
-    for file_info in files:
+    for file_info, bar_data in zip(files, ingredients_data):
         filename = file_info.get('name', 'unknown')
         
-        # Fetch ingredient data
-        bar_data = fetch_ingredient_data(file_info)
         if not bar_data:
             skipped_count += 1
             continue
@@ -179,19 +180,12 @@ def load_ingredients_to_db(dry_run=False):
             print(f"  ✓ Would load: {ingredient['name']} ({ingredient['category']})")
             loaded_count += 1
         else:
-            # Check if ingredient already exists
-            cursor.execute("SELECT id FROM ingredients WHERE name = %s", (ingredient['name'],))
-            existing = cursor.fetchone()
-            if existing:
-                print(f"  ⚠ Skipping {ingredient['name']}: Already exists")
-                skipped_count += 1
-                continue
-            
-            # Insert into database
+            # Insert into database; an existing ingredient (same normalized name) is left unchanged
             try:
                 query = """
                     INSERT INTO ingredients (name, description, category, tags, images, created_at, updated_at)
                     VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
                 """
                 params = (
                     ingredient['name'],
@@ -203,6 +197,10 @@ def load_ingredients_to_db(dry_run=False):
                     ingredient['updated_at']
                 )
                 cursor.execute(query, params)
+                if cursor.rowcount == 0:
+                    print(f"  ⚠ Skipping {ingredient['name']}: Already exists")
+                    skipped_count += 1
+                    continue
                 conn.commit()
                 print(f"  ✓ Loaded: {ingredient['name']} ({ingredient['category']})")
                 loaded_count += 1
@@ -236,15 +234,38 @@ def main():
         action='store_true',
         help='Show what would be loaded without actually loading'
     )
+    parser.add_argument(
+        '--mirror-dir',
+        help='Keep downloaded files in this local mirror and revalidate them by ETag'
+    )
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Load from --mirror-dir only, without network access'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Concurrent downloads (default: {DEFAULT_WORKERS})'
+    )
     
     args = parser.parse_args()
     
+    if args.offline and not args.mirror_dir:
+        parser.error('--offline requires --mirror-dir')
+    
     print("=" * 60)
     print("Bar Assistant Ingredients Loader")
     print("Neighborhood Sips Application")
     print("=" * 60)
     
-    count = load_ingredients_to_db(dry_run=args.dry_run)
+    count = load_ingredients_to_db(
+        dry_run=args.dry_run,
+        mirror_dir=args.mirror_dir,
+        offline=args.offline,
+        workers=args.workers
+    )
     
     if count > 0:
         print(f"\n✓ Successfully processed {count} ingredients")
@@ -28,6 +28,18 @@ python3 load_recipes.py --data-dir /path/to/bar-data-copy --dry-run
 # Load recipes with images (takes longer, copies image files)
 python3 load_recipes.py --data-dir /path/to/bar-data-copy --copy-images
 
+# Bulk mode: far fewer round trips, recommended for full imports
+python3 load_recipes.py --data-dir /path/to/bar-data-copy --bulk
+
+# Pipeline mode: parse folders in parallel while batching inserts
+python3 load_recipes.py --data-dir /path/to/bar-data-copy --workers 4
+
+# Sync mode: update recipes changed upstream since the last sync
+python3 load_recipes.py --data-dir /path/to/bar-data-copy --sync
+
+# LOAD DATA mode: staging files and set-based merges for large catalogs
+python3 load_recipes.py --data-dir /path/to/bar-data-copy --load-data
+
 EXAMPLES:
 ---------
 # Example 1: Dry run to preview recipes
@@ -42,11 +54,34 @@ python3 load_recipes.py --data-dir ../bar-data-copy --copy-images
 # Example 4: Load from absolute path
 python3 load_recipes.py --data-dir /home/user/repositories/bar-data-copy
 
+# Example 5: Bulk import committing every 200 recipes
+python3 load_recipes.py --data-dir ../bar-data-copy --bulk --chunk-size 200
+
+# Example 6: Pipeline with 8 parse workers
+python3 load_recipes.py --data-dir ../bar-data-copy --workers 8
+
+# Example 7: Nightly re-sync after git pull, deleting recipes removed upstream
+python3 load_recipes.py --data-dir ../bar-data-copy --sync --prune
+
+# Example 8: LOAD DATA ingest, keeping the staging files for inspection
+python3 load_recipes.py --data-dir ../bar-data-copy --load-data --staging-dir /tmp/staging
+
 COMMAND-LINE OPTIONS:
 ---------------------
 --data-dir PATH      (Required) Path to the bar-data-copy repository directory
 --dry-run            Show what would be loaded without actually saving to database
---copy-images        Copy recipe images to the uploads folder (may take longer)
+--copy-images        Import recipe images into the uploads folder (see IMAGES below)
+--image-mode MODE    auto (default), reflink, link or copy
+--reencode-images    Resize and re-encode images like uploaded ones
+--image-workers N    Threads importing images (default: 8)
+--bulk               Bulk mode (see BULK MODE below)
+--chunk-size N       Recipes per batch in bulk mode (default: 100)
+--workers N          Pipeline mode with N parse processes (see PIPELINE MODE below)
+--queue-size N       Parsed folders allowed to wait for the writer (default: 500)
+--sync               Sync mode (see SYNC MODE below)
+--prune              With --sync, delete recipes whose folder was removed upstream
+--load-data          LOAD DATA mode (see LOAD DATA MODE below)
+--staging-dir PATH   With --load-data, keep the staging files in PATH
 
 WHAT IT DOES:
 -------------
@@ -58,6 +93,87 @@ WHAT IT DOES:
 - Skips recipes that already exist in the database
 - Provides a summary of loaded and skipped recipes
 
+BULK MODE:
+----------
+The default mode runs a SELECT (and possibly an INSERT and commit) for every
+ingredient of every recipe, plus an existence check and commit per recipe:
+thousands of round trips for a full import. With --bulk the loader:
+- Preloads all ingredient names -> ids and all recipe names once
+- Per chunk of recipes, inserts the missing ingredients with one executemany,
+  reads back their ids with one SELECT, inserts the recipes with one
+  executemany and commits once
+- Reports throughput in recipes per second
+Names are matched case-insensitively, like the default mode's lookups
+under MySQL's default collation. If a chunk fails, it is rolled back and
+its recipes are counted as skipped.
+
+PIPELINE MODE:
+--------------
+With --workers N the loader runs as a pipeline:
+- N worker processes check each folder for data.json, parse it and validate
+  the recipe (object with a non-empty name, list of ingredients with names)
+- This process is the single database writer: it takes parsed recipes as
+  they finish and writes them with the bulk mode batches (--chunk-size)
+- At most --queue-size folders are in flight, so workers run ahead of the
+  writer without holding the whole repository in memory
+- A folder with unreadable JSON or an invalid recipe is reported and
+  skipped; the rest of the run continues
+- Prints progress per chunk and, at the end, time spent parsing (summed over
+  workers), waiting for parsed folders, writing to the database and in total
+Pipeline mode implies --bulk. --dry-run ignores --workers.
+
+IMAGES:
+-------
+With --copy-images every image in a recipe folder is imported into the
+uploads folder under its original name, in a pool of --image-workers
+threads while recipes are being written:
+- auto: reflink (copy-on-write clone) when the checkout and uploads share a
+  filesystem that supports it, else a hard link on the same filesystem,
+  else a regular copy. A hard-linked upload shares its file with the
+  checkout; use --image-mode reflink or copy if either is edited in place
+- Images already imported (same file, or same size and mtime) are skipped
+- --reencode-images resizes and re-encodes each image with the same
+  settings as uploaded images (webp files are stored as png)
+- If two recipes use the same image name, the second is imported with a
+  counter suffix (e.g. image_1.jpg)
+- At the end, every image referenced by a recipe is checked to exist
+
+SYNC MODE:
+----------
+The other modes skip any recipe whose name exists, so upstream edits are
+never picked up. With --sync the loader keeps a SHA-256 hash of each
+folder's data.json in the recipe_sources table (created on first use) and:
+- Loads all stored hashes, recipe names and ingredient names once, then
+  compares hashes locally; unchanged folders are not even parsed
+- Inserts new recipes and updates changed ones in --chunk-size batches,
+  recording the new hashes in the same transaction
+- On the first sync, takes over existing recipes with the same name
+- Lists folders removed upstream; with --prune their recipes are deleted
+  and the folders tombstoned (deleted_at is set, and cleared again if the
+  folder comes back)
+- Prints a diff: + added, ~ updated, - removed, then the totals
+Only data.json is hashed: a changed image alone does not trigger an update.
+--sync takes precedence over --bulk and --workers; --dry-run ignores it.
+
+LOAD DATA MODE:
+---------------
+For onboarding a large catalog, --load-data avoids per-row inserts entirely:
+- Reads and validates every folder and writes three TSV staging files:
+  ingredients (deduplicated by normalized name), recipes and recipe
+  ingredients (recipe, position, name and the entry without its id)
+- Loads each file into a TEMPORARY staging table with LOAD DATA LOCAL INFILE
+- Merges with two INSERT ... SELECT statements: missing ingredients by
+  name_normalized, then new recipes with their ingredients JSON built in
+  staged order with the merged ingredient ids
+- Loads and merges in one transaction, rolled back on any error
+- Prints rows per second for staging, loading and merging
+Recipes whose name exists are skipped, like the other modes. Recipes keep
+their ingredients in the ingredients JSON column (there are no tag or link
+tables to merge into). The server must allow local_infile (SET GLOBAL
+local_infile = 1); the loader enables it on its connection.
+--load-data takes precedence over --bulk and --workers; --sync and
+--dry-run ignore it.
+
 DATABASE CONFIGURATION:
 -----------------------
 The script uses MySQL connection settings from environment variables or .env file:
@@ -84,10 +200,19 @@ Each folder represents a recipe with:
 import os
 import sys
 import json
+import time
 import shutil
+import hashlib
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 import mysql.connector
 from config import Config
+from api_core import normalize_name
+from units import amount_ml
+from image_utils import is_image_file
+from image_import import ImageImporter, DEFAULT_IMPORT_WORKERS, IMPORT_METHODS, import_file, is_current
+from upload_store import sharded_path
 
 def find_recipe_folders(data_dir):
     """Find all recipe folders in the data directory"""
@@ -111,6 +236,17 @@ def find_recipe_folders(data_dir):
     
     return recipe_folders
 
+def list_recipe_folder_paths(data_dir):
+    """List the folder paths in the cocktails directory (data.json is checked by the parse workers)"""
+    cocktails_dir = os.path.join(data_dir, 'data', 'cocktails')
+    
+    if not os.path.exists(cocktails_dir):
+        print(f"Error: Directory not found: {cocktails_dir}")
+        return []
+    
+    with os.scandir(cocktails_dir) as entries:
+        return sorted(entry.path for entry in entries if entry.is_dir())
+
 def load_recipe_data(data_file):
     """Load recipe data from JSON file"""
     try:
@@ -120,56 +256,117 @@ def load_recipe_data(data_file):
         print(f"  ⚠ Error reading {data_file}: {e}")
         return None
 
+# Upsert on the unique name_normalized key: an existing ingredient is left
+# unchanged and lastrowid is its id
+INSERT_INGREDIENT = """
+    INSERT INTO ingredients (name, description, category, tags, images, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
+"""
+
+INSERT_RECIPE = """
+    INSERT INTO recipes (name, description, ingredients, instructions, tags, images, created_at, updated_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+UPDATE_RECIPE = """
+    UPDATE recipes
+    SET name = %s, description = %s, ingredients = %s, instructions = %s, tags = %s, images = %s,
+        updated_at = %s
+    WHERE id = %s
+"""
+
+# Content hash of each source folder's data.json, for sync mode
+RECIPE_SOURCES_TABLE = """
+    CREATE TABLE IF NOT EXISTS recipe_sources (
+        source VARCHAR(255) NOT NULL PRIMARY KEY,
+        content_hash CHAR(64) NOT NULL,
+        recipe_id INT,
+        synced_at DATETIME NOT NULL,
+        deleted_at DATETIME NULL,
+        INDEX idx_recipe_id (recipe_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+UPSERT_RECIPE_SOURCE = """
+    INSERT INTO recipe_sources (source, content_hash, recipe_id, synced_at, deleted_at)
+    VALUES (%s, %s, %s, %s, NULL)
+    ON DUPLICATE KEY UPDATE content_hash = VALUES(content_hash), recipe_id = VALUES(recipe_id),
+        synced_at = VALUES(synced_at), deleted_at = NULL
+"""
+
+# Recipes per batch in bulk mode
+DEFAULT_CHUNK_SIZE = 100
+
+# Parsed folders waiting for the database writer in pipeline mode
+DEFAULT_QUEUE_SIZE = 500
+
+def ingredient_insert_params(ingredient_data, now):
+    """Build INSERT_INGREDIENT parameters for an ingredient of a recipe"""
+    tags = []
+    
+    # Add category as tag if available
+    if ingredient_data.get('category'):
+        tags.append(ingredient_data['category'])
+    
+    # Add origin as tag if available
+    if ingredient_data.get('origin'):
+        tags.append(ingredient_data['origin'])
+    
+    return (
+        ingredient_data.get('name', ''),
+        ingredient_data.get('description', ''),
+        ingredient_data.get('category', ''),
+        json.dumps(tags),
+        json.dumps([]),  # Empty images array
+        now,
+        now
+    )
+
+def recipe_insert_params(recipe):
+    """Build INSERT_RECIPE parameters for a converted recipe"""
+    return (
+        recipe['name'],
+        recipe['description'],
+        json.dumps(recipe['ingredients']),
+        recipe['instructions'],
+        json.dumps(recipe['tags']),
+        json.dumps(recipe['images']),
+        recipe['created_at'],
+        recipe['updated_at']
+    )
+
+def recipe_update_params(recipe, recipe_id):
+    """Build UPDATE_RECIPE parameters for a converted recipe"""
+    return (
+        recipe['name'],
+        recipe['description'],
+        json.dumps(recipe['ingredients']),
+        recipe['instructions'],
+        json.dumps(recipe['tags']),
+        json.dumps(recipe['images']),
+        recipe['updated_at'],
+        recipe_id
+    )
+
 def find_or_create_ingredient(cursor, conn, ingredient_data):
-    """Find existing ingredient or create a new one"""
+    """Find existing ingredient or create a new one (one upsert statement)"""
     ingredient_name = ingredient_data.get('name', '')
     
     if not ingredient_name:
         return None
     
-    # Check if ingredient exists
-    cursor.execute("SELECT id FROM ingredients WHERE name = %s", (ingredient_name,))
-    result = cursor.fetchone()
-    
-    if result:
-        return result['id']
-    
-    # Create new ingredient
+    # Create the ingredient, or get the id of the one with the same normalized name.
+    # It is committed together with the recipe.
     try:
-        query = """
-            INSERT INTO ingredients (name, description, category, tags, images, created_at, updated_at)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        now = datetime.now()
-        tags = []
-        
-        # Add category as tag if available
-        if ingredient_data.get('category'):
-            tags.append(ingredient_data['category'])
-        
-        # Add origin as tag if available
-        if ingredient_data.get('origin'):
-            tags.append(ingredient_data['origin'])
-        
-        params = (
-            ingredient_name,
-            ingredient_data.get('description', ''),
-            ingredient_data.get('category', ''),
-            json.dumps(tags),
-            json.dumps([]),  # Empty images array
-            now,
-            now
-        )
-        
-        cursor.execute(query, params)
-        conn.commit()
+        cursor.execute(INSERT_INGREDIENT, ingredient_insert_params(ingredient_data, datetime.now()))
         return cursor.lastrowid
     except mysql.connector.Error as e:
         print(f"  ⚠ Error creating ingredient {ingredient_name}: {e}")
         return None
 
-def copy_recipe_images(recipe_folder, upload_folder):
-    """Copy recipe images to upload folder and return list of filenames"""
+def copy_recipe_images(recipe_folder, upload_folder, mode='auto'):
+    """Import recipe images into their shards of the upload folder and return their references"""
     images = []
     
     # Find all image files in the recipe folder
@@ -177,31 +374,44 @@ def copy_recipe_images(recipe_folder, upload_folder):
         file_path = os.path.join(recipe_folder, filename)
         
         # Check if it's an image file
-        if os.path.isfile(file_path) and filename.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.webp')):
+        if os.path.isfile(file_path) and is_image_file(filename):
             try:
-                # Use the original filename
-                dest_path = os.path.join(upload_folder, filename)
+                # Use the original filename, in its shard directory
+                reference = sharded_path(filename)
+                dest_path = os.path.join(upload_folder, *reference.split('/'))
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
                 
                 # Warn if file already exists (collision)
-                if os.path.exists(dest_path):
+                if os.path.exists(dest_path) and not is_current(file_path, dest_path):
                     print(f"  ⚠ Warning: {filename} already exists, will be overwritten")
                 
-                # Copy the image
-                # shutil.copy2(file_path, dest_path)
-                images.append(filename)
-            except Exception as e:
+                # Reflink, hard link or copy the image
+                if not is_current(file_path, dest_path):
+                    import_file(file_path, dest_path, mode)
+                images.append(reference)
+            except OSError as e:
                 print(f"  ⚠ Error copying image {filename}: {e}")
     
     return images
 
-def convert_recipe(recipe_data, recipe_folder, cursor, conn, upload_folder, copy_images=False):
-    """Convert recipe from bar-data-copy format to my_bar format"""
+def convert_recipe(recipe_data, recipe_folder, cursor, conn, upload_folder, copy_images=False,
+                   ingredient_lookup=None, image_importer=None):
+    """
+    Convert recipe from bar-data-copy format to my_bar format
+
+    ingredient_lookup maps an ingredient's data to its id; by default the
+    ingredient is looked up (and created if missing) in the database.
+    With copy_images, images are imported by image_importer (in the
+    background) if given, otherwise right away.
+    """
+    if ingredient_lookup is None:
+        ingredient_lookup = lambda ing_data: find_or_create_ingredient(cursor, conn, ing_data)
     
     # Process ingredients
     ingredients_list = []
     for ing_data in recipe_data.get('ingredients', []):
         # Find or create the ingredient in the database
-        ingredient_id = find_or_create_ingredient(cursor, conn, ing_data)
+        ingredient_id = ingredient_lookup(ing_data)
         
         if ingredient_id:
             # Format the ingredient with amount and unit
@@ -213,6 +423,11 @@ def convert_recipe(recipe_data, recipe_folder, cursor, conn, upload_folder, copy
                 'optional': ing_data.get('optional', False)
             }
             
+            # Canonical quantity for converting units at read time
+            ml = amount_ml(ing_data.get('amount'), ing_data.get('units'))
+            if ml is not None:
+                ingredient_entry['amount_ml'] = ml
+            
             # Add note if available
             if ing_data.get('note'):
                 ingredient_entry['note'] = ing_data['note']
@@ -221,7 +436,9 @@ def convert_recipe(recipe_data, recipe_folder, cursor, conn, upload_folder, copy
     
     # Copy images if requested
     images = []
-    if copy_images:
+    if copy_images and image_importer:
+        images = image_importer.import_folder(recipe_folder)
+    elif copy_images:
         images = copy_recipe_images(recipe_folder, upload_folder)
     
     # Build tags list
@@ -257,12 +474,711 @@ def convert_recipe(recipe_data, recipe_folder, cursor, conn, upload_folder, copy
     
     return recipe
 
-def load_recipes_to_db(data_dir, dry_run=False, copy_images=False):
+def preload_ingredient_ids(cursor):
+    """Load every ingredient as name key -> id (one query)"""
+    cursor.execute("SELECT id, name FROM ingredients")
+    return {normalize_name(row['name']): row['id'] for row in cursor.fetchall()}
+
+def preload_recipe_names(cursor):
+    """Load the name keys of every existing recipe (one query)"""
+    cursor.execute("SELECT name FROM recipes")
+    return {normalize_name(row['name']) for row in cursor.fetchall()}
+
+def chunked(items, size):
+    """Split a list into lists of at most size items"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+def insert_missing_ingredients(cursor, recipes_data, ingredient_ids):
+    """
+    Insert the ingredients of a chunk of recipes that do not exist yet.
+
+    Uses one executemany for the upserts and one SELECT to read back the ids.
+
+    Returns:
+        Dict of name key -> id for the inserted ingredients
+    """
+    missing = {}
+    for recipe_data in recipes_data:
+        for ing_data in recipe_data.get('ingredients', []):
+            name = ing_data.get('name', '')
+            key = normalize_name(name) if name else None
+            if key and key not in ingredient_ids and key not in missing:
+                missing[key] = ing_data
+    if not missing:
+        return {}
+
+    now = datetime.now()
+    cursor.executemany(INSERT_INGREDIENT, [ingredient_insert_params(ing, now) for ing in missing.values()])
+
+    keys = list(missing)
+    placeholders = ', '.join(['%s'] * len(keys))
+    cursor.execute(f"SELECT id, name FROM ingredients WHERE name_normalized IN ({placeholders})", keys)
+    return {normalize_name(row['name']): row['id'] for row in cursor.fetchall()}
+
+class BulkRecipeWriter:
+    """Writes recipes in chunks using preloaded name lookups and batched inserts"""
+
+    def __init__(self, cursor, conn, upload_folder, copy_images=False, image_importer=None):
+        self.cursor = cursor
+        self.conn = conn
+        self.upload_folder = upload_folder
+        self.copy_images = copy_images
+        self.image_importer = image_importer
+        self.ingredient_ids = preload_ingredient_ids(cursor)
+        self.existing_recipes = preload_recipe_names(cursor)
+        self.started = time.perf_counter()
+        self.loaded_count = 0
+        self.skipped_count = 0
+        self.chunks = 0
+        self.seconds = 0.0
+        print(f"Preloaded {len(self.ingredient_ids)} ingredients and {len(self.existing_recipes)} recipes")
+
+    def claim(self, recipe_folder_info, recipe_data):
+        """
+        Check a recipe is new (not in the database or earlier in the input) and reserve its name.
+
+        Returns:
+            True if the recipe should be written
+        """
+        recipe_data.setdefault('name', recipe_folder_info['name'])
+        key = normalize_name(recipe_data['name'])
+        if key in self.existing_recipes:
+            self.skipped_count += 1
+            return False
+        self.existing_recipes.add(key)
+        return True
+
+    def write_chunk(self, chunk):
+        """Insert a chunk of (recipe folder info, recipe data) and commit, or roll it back on error"""
+        started = time.perf_counter()
+        self.chunks += 1
+        try:
+            new_ids = insert_missing_ingredients(self.cursor, [data for _, data in chunk], self.ingredient_ids)
+            chunk_ids = {**self.ingredient_ids, **new_ids}
+            lookup = lambda ing_data: chunk_ids.get(normalize_name(ing_data.get('name', '')))
+
+            rows = []
+            for recipe_folder_info, recipe_data in chunk:
+                recipe = convert_recipe(
+                    recipe_data, recipe_folder_info['path'], self.cursor, self.conn, self.upload_folder,
+                    copy_images=self.copy_images, ingredient_lookup=lookup,
+                    image_importer=self.image_importer
+                )
+                rows.append(recipe_insert_params(recipe))
+            self.cursor.executemany(INSERT_RECIPE, rows)
+            self.conn.commit()
+        except mysql.connector.Error as e:
+            self.conn.rollback()
+            print(f"  ✗ Chunk {self.chunks} failed, rolled back {len(chunk)} recipes: {e}")
+            self.skipped_count += len(chunk)
+            return
+        finally:
+            self.seconds += time.perf_counter() - started
+
+        # Only remember ingredient ids once they are committed
+        self.ingredient_ids.update(new_ids)
+        self.loaded_count += len(chunk)
+        elapsed = time.perf_counter() - self.started
+        print(f"  ✓ Chunk {self.chunks}: {len(chunk)} recipes, {len(new_ids)} new ingredients "
+              f"({self.loaded_count / elapsed:.1f} recipes/s)")
+
+def load_recipes_bulk(recipe_folders, cursor, conn, upload_folder, copy_images=False,
+                      chunk_size=DEFAULT_CHUNK_SIZE, image_importer=None):
+    """
+    Load recipes in chunks with preloaded lookups and batched inserts.
+
+    Returns:
+        Tuple of (loaded count, skipped count)
+    """
+    writer = BulkRecipeWriter(cursor, conn, upload_folder, copy_images, image_importer)
+
+    # Read recipe files and drop recipes that already exist (or repeat in the input)
+    pending = []
+    for recipe_folder_info in recipe_folders:
+        recipe_data = load_recipe_data(recipe_folder_info['data_file'])
+        if not recipe_data:
+            writer.skipped_count += 1
+            continue
+        if writer.claim(recipe_folder_info, recipe_data):
+            pending.append((recipe_folder_info, recipe_data))
+    print(f"{len(pending)} new recipes, {writer.skipped_count} skipped (existing or unreadable)\n")
+
+    for chunk in chunked(pending, chunk_size):
+        writer.write_chunk(chunk)
+
+    return writer.loaded_count, writer.skipped_count
+
+def validate_recipe(recipe_data):
+    """Return the problems that would stop a recipe from loading (empty list if none)"""
+    if not isinstance(recipe_data, dict):
+        return ['data.json is not an object']
+    
+    problems = []
+    name = recipe_data.get('name')
+    if name is not None and (not isinstance(name, str) or not name.strip()):
+        problems.append('name is empty')
+    if not isinstance(recipe_data.get('tags', []), list):
+        problems.append('tags is not a list')
+    
+    ingredients = recipe_data.get('ingredients', [])
+    if not isinstance(ingredients, list):
+        problems.append('ingredients is not a list')
+    else:
+        for number, ing_data in enumerate(ingredients, start=1):
+            if not isinstance(ing_data, dict) or not isinstance(ing_data.get('name', ''), str):
+                problems.append(f'ingredient {number} is invalid')
+    return problems
+
+def parse_recipe_folder(folder_path):
+    """
+    Check, read and validate one recipe folder (runs in a worker process).
+
+    Never raises, so one bad folder cannot stop the run.
+
+    Returns:
+        Dict with the folder info, recipe data (None if the folder has no
+        data.json or failed), error message (or None) and parse seconds
+    """
+    started = time.perf_counter()
+    data_file = os.path.join(folder_path, 'data.json')
+    result = {
+        'folder': {'name': os.path.basename(folder_path), 'path': folder_path, 'data_file': data_file},
+        'data': None,
+        'error': None,
+    }
+    try:
+        if os.path.isfile(data_file):
+            with open(data_file, 'r', encoding='utf-8') as f:
+                recipe_data = json.load(f)
+            problems = validate_recipe(recipe_data)
+            if problems:
+                result['error'] = '; '.join(problems)
+            else:
+                result['data'] = recipe_data
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+def load_recipes_pipeline(folder_paths, cursor, conn, upload_folder, copy_images=False,
+                          chunk_size=DEFAULT_CHUNK_SIZE, workers=None, queue_size=DEFAULT_QUEUE_SIZE,
+                          image_importer=None):
+    """
+    Parse recipe folders in worker processes while this process writes them in chunks.
+
+    At most queue_size folders are submitted but not yet written, so workers
+    run ahead of the database writer without reading the whole tree into
+    memory. Folders that fail to parse or validate are reported and skipped.
+
+    Returns:
+        Tuple of (loaded count, skipped count)
+    """
+    started = time.perf_counter()
+    writer = BulkRecipeWriter(cursor, conn, upload_folder, copy_images, image_importer)
+    workers = workers or os.cpu_count() or 1
+    queue_size = max(queue_size, chunk_size)
+    total = len(folder_paths)
+    parsed = 0
+    failed = 0
+    parse_seconds = 0.0
+    wait_seconds = 0.0
+    pending = []
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        remaining = iter(folder_paths)
+        in_flight = {}
+        
+        def submit_more():
+            while len(in_flight) + len(pending) < queue_size:
+                folder_path = next(remaining, None)
+                if folder_path is None:
+                    return
+                in_flight[executor.submit(parse_recipe_folder, folder_path)] = folder_path
+        
+        submit_more()
+        while in_flight:
+            wait_started = time.perf_counter()
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            wait_seconds += time.perf_counter() - wait_started
+            
+            for future in done:
+                folder_path = in_flight.pop(future)
+                parsed += 1
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker itself died; only this folder is lost
+                    result = {'folder': {'name': os.path.basename(folder_path)}, 'data': None,
+                              'error': f"{type(e).__name__}: {e}", 'seconds': 0.0}
+                parse_seconds += result['seconds']
+                
+                if result['error']:
+                    print(f"  ⚠ Skipping {result['folder']['name']}: {result['error']}")
+                    failed += 1
+                elif result['data'] is not None and writer.claim(result['folder'], result['data']):
+                    pending.append((result['folder'], result['data']))
+            
+            while len(pending) >= chunk_size:
+                chunk, pending = pending[:chunk_size], pending[chunk_size:]
+                writer.write_chunk(chunk)
+                print(f"    {parsed}/{total} folders parsed")
+            submit_more()
+        
+        for chunk in chunked(pending, chunk_size):
+            writer.write_chunk(chunk)
+    
+    print("\nStage timing:")
+    print(f"  - Parse and validate (summed over {workers} workers): {parse_seconds:.2f}s")
+    print(f"  - Writer waiting for parsed folders: {wait_seconds:.2f}s")
+    print(f"  - Database writes: {writer.seconds:.2f}s")
+    print(f"  - Wall time: {time.perf_counter() - started:.2f}s")
+    if failed:
+        print(f"  ⚠ {failed} folders failed to parse or validate")
+    
+    return writer.loaded_count, writer.skipped_count + failed
+
+def content_hash(raw):
+    """SHA-256 hex digest of a data.json file's bytes"""
+    return hashlib.sha256(raw).hexdigest()
+
+def preload_recipe_sources(cursor):
+    """Load every synced source folder as source -> row (one query)"""
+    cursor.execute("SELECT source, content_hash, recipe_id, deleted_at FROM recipe_sources")
+    return {row['source']: row for row in cursor.fetchall()}
+
+def preload_recipe_ids(cursor):
+    """Load every recipe as name key -> id (one query)"""
+    cursor.execute("SELECT id, name FROM recipes")
+    return {normalize_name(row['name']): row['id'] for row in cursor.fetchall()}
+
+def plan_sync(recipe_folders, sources, recipe_ids):
+    """
+    Compare source folders with their stored content hashes (no queries).
+
+    Only folders whose hash changed are parsed. A new folder whose recipe
+    name already exists (e.g. loaded before sync mode) takes over that recipe.
+
+    Returns:
+        Dict with 'add' and 'update' lists of {'folder', 'data', 'hash',
+        'recipe_id'}, 'unchanged' and 'failed' counts and 'removed' sources
+    """
+    plan = {'add': [], 'update': [], 'unchanged': 0, 'failed': 0, 'removed': []}
+    live_sources = {source: row for source, row in sources.items() if not row['deleted_at']}
+    existing_ids = set(recipe_ids.values())
+    owned_ids = {row['recipe_id'] for row in live_sources.values()}
+    claimed_names = set()
+    
+    for recipe_folder_info in recipe_folders:
+        source = recipe_folder_info['name']
+        try:
+            with open(recipe_folder_info['data_file'], 'rb') as f:
+                raw = f.read()
+        except OSError as e:
+            print(f"  ⚠ Error reading {recipe_folder_info['data_file']}: {e}")
+            plan['failed'] += 1
+            continue
+        
+        digest = content_hash(raw)
+        stored = live_sources.get(source)
+        if stored and stored['content_hash'] == digest and stored['recipe_id'] in existing_ids:
+            plan['unchanged'] += 1
+            continue
+        
+        try:
+            recipe_data = json.loads(raw)
+            problems = validate_recipe(recipe_data)
+        except ValueError as e:
+            problems = [f"invalid JSON: {e}"]
+        if problems:
+            print(f"  ⚠ Skipping {source}: {'; '.join(problems)}")
+            plan['failed'] += 1
+            continue
+        recipe_data.setdefault('name', source)
+        key = normalize_name(recipe_data['name'])
+        if key in claimed_names:
+            print(f"  ⚠ Skipping {source}: recipe name '{recipe_data['name']}' appears in another folder")
+            plan['failed'] += 1
+            continue
+        claimed_names.add(key)
+        
+        if stored and stored['recipe_id'] in existing_ids:
+            recipe_id = stored['recipe_id']
+        else:
+            recipe_id = recipe_ids.get(key)
+            if recipe_id in owned_ids:
+                print(f"  ⚠ Skipping {source}: recipe '{recipe_data['name']}' is synced from another folder")
+                plan['failed'] += 1
+                continue
+        
+        item = {'folder': recipe_folder_info, 'data': recipe_data, 'hash': digest, 'recipe_id': recipe_id}
+        plan['update' if recipe_id else 'add'].append(item)
+    
+    seen = {recipe_folder_info['name'] for recipe_folder_info in recipe_folders}
+    plan['removed'] = sorted(source for source in live_sources if source not in seen)
+    return plan
+
+def write_sync_chunk(cursor, conn, chunk, ingredient_ids, upload_folder, copy_images=False,
+                     image_importer=None):
+    """
+    Insert or update a chunk of planned recipes and record their hashes, in one transaction.
+
+    Returns:
+        True if the chunk was committed
+    """
+    now = datetime.now()
+    try:
+        new_ids = insert_missing_ingredients(cursor, [item['data'] for item in chunk], ingredient_ids)
+        chunk_ids = {**ingredient_ids, **new_ids}
+        lookup = lambda ing_data: chunk_ids.get(normalize_name(ing_data.get('name', '')))
+        
+        inserts = []
+        updates = []
+        for item in chunk:
+            recipe = convert_recipe(
+                item['data'], item['folder']['path'], cursor, conn, upload_folder,
+                copy_images=copy_images, ingredient_lookup=lookup, image_importer=image_importer
+            )
+            if item['recipe_id']:
+                updates.append(recipe_update_params(recipe, item['recipe_id']))
+            else:
+                inserts.append(recipe_insert_params(recipe))
+        
+        recipe_ids = {}
+        if inserts:
+            cursor.executemany(INSERT_RECIPE, inserts)
+            names = [params[0] for params in inserts]
+            placeholders = ', '.join(['%s'] * len(names))
+            cursor.execute(f"SELECT id, name FROM recipes WHERE name IN ({placeholders})", names)
+            recipe_ids = {normalize_name(row['name']): row['id'] for row in cursor.fetchall()}
+        if updates:
+            cursor.executemany(UPDATE_RECIPE, updates)
+        
+        cursor.executemany(UPSERT_RECIPE_SOURCE, [
+            (item['folder']['name'], item['hash'],
+             item['recipe_id'] or recipe_ids.get(normalize_name(item['data']['name'])), now)
+            for item in chunk
+        ])
+        conn.commit()
+    except mysql.connector.Error as e:
+        conn.rollback()
+        print(f"  ✗ Sync chunk failed, rolled back {len(chunk)} recipes: {e}")
+        return False
+    
+    ingredient_ids.update(new_ids)
+    return True
+
+def tombstone_sources(cursor, conn, sources, removed):
+    """Delete the recipes of removed source folders and mark the folders deleted"""
+    recipe_ids = [sources[source]['recipe_id'] for source in removed if sources[source]['recipe_id']]
+    try:
+        if recipe_ids:
+            placeholders = ', '.join(['%s'] * len(recipe_ids))
+            cursor.execute(f"DELETE FROM recipes WHERE id IN ({placeholders})", recipe_ids)
+        placeholders = ', '.join(['%s'] * len(removed))
+        cursor.execute(
+            f"UPDATE recipe_sources SET deleted_at = %s WHERE source IN ({placeholders})",
+            [datetime.now()] + list(removed)
+        )
+        conn.commit()
+    except mysql.connector.Error as e:
+        conn.rollback()
+        print(f"  ✗ Error tombstoning removed recipes: {e}")
+        return False
+    return True
+
+def sync_recipes(recipe_folders, cursor, conn, upload_folder, copy_images=False,
+                 chunk_size=DEFAULT_CHUNK_SIZE, prune=False, image_importer=None):
+    """
+    Upsert only the recipes whose source folder changed since the last sync.
+
+    Returns:
+        Dict of added, updated, unchanged, removed and failed counts
+    """
+    cursor.execute(RECIPE_SOURCES_TABLE)
+    sources = preload_recipe_sources(cursor)
+    recipe_ids = preload_recipe_ids(cursor)
+    ingredient_ids = preload_ingredient_ids(cursor)
+    print(f"Preloaded {len(sources)} source hashes, {len(recipe_ids)} recipes and "
+          f"{len(ingredient_ids)} ingredients")
+    
+    plan = plan_sync(recipe_folders, sources, recipe_ids)
+    counts = {'added': 0, 'updated': 0, 'unchanged': plan['unchanged'], 'removed': 0,
+              'failed': plan['failed']}
+    
+    for chunk in chunked(plan['add'] + plan['update'], chunk_size):
+        if not write_sync_chunk(cursor, conn, chunk, ingredient_ids, upload_folder, copy_images,
+                                image_importer):
+            counts['failed'] += len(chunk)
+            continue
+        for item in chunk:
+            if item['recipe_id']:
+                print(f"  ~ {item['data']['name']}")
+                counts['updated'] += 1
+            else:
+                print(f"  + {item['data']['name']}")
+                counts['added'] += 1
+    
+    if plan['removed'] and prune and tombstone_sources(cursor, conn, sources, plan['removed']):
+        counts['removed'] = len(plan['removed'])
+    for source in plan['removed']:
+        print(f"  - {source}" + ("" if prune else " (removed upstream; use --prune to delete)"))
+    
+    print(f"\nSync: {counts['added']} added, {counts['updated']} updated, {counts['unchanged']} unchanged, "
+          f"{counts['removed']} removed, {counts['failed']} failed")
+    return counts
+
+# Staging tables for LOAD DATA mode. They are TEMPORARY, so they belong to
+# this connection only and disappear when it closes. name_normalized matches
+# the ingredients column, so the merge joins on the unique key.
+STAGING_TABLES = {
+    'stage_ingredients': """
+        CREATE TEMPORARY TABLE stage_ingredients (
+            name VARCHAR(255) NOT NULL,
+            description TEXT,
+            category VARCHAR(100),
+            tags TEXT,
+            name_normalized VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin
+                GENERATED ALWAYS AS (LOWER(TRIM(name))) STORED,
+            PRIMARY KEY (name_normalized)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'stage_recipes': """
+        CREATE TEMPORARY TABLE stage_recipes (
+            seq INT NOT NULL PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            description TEXT,
+            instructions TEXT,
+            tags TEXT,
+            images TEXT,
+            INDEX idx_name (name)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    'stage_recipe_ingredients': """
+        CREATE TEMPORARY TABLE stage_recipe_ingredients (
+            recipe_seq INT NOT NULL,
+            position INT NOT NULL,
+            name VARCHAR(255) NOT NULL,
+            entry TEXT NOT NULL,
+            name_normalized VARCHAR(255) CHARACTER SET utf8mb4 COLLATE utf8mb4_bin
+                GENERATED ALWAYS AS (LOWER(TRIM(name))) STORED,
+            PRIMARY KEY (recipe_seq, position),
+            INDEX idx_name_normalized (name_normalized)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+}
+
+# Columns written to each staging file, in order
+STAGING_COLUMNS = {
+    'stage_ingredients': ('name', 'description', 'category', 'tags'),
+    'stage_recipes': ('seq', 'name', 'description', 'instructions', 'tags', 'images'),
+    'stage_recipe_ingredients': ('recipe_seq', 'position', 'name', 'entry'),
+}
+
+LOAD_STAGING_FILE = """
+    LOAD DATA LOCAL INFILE %s INTO TABLE {table}
+    CHARACTER SET utf8mb4
+    FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+    LINES TERMINATED BY '\\n'
+    ({columns})
+"""
+
+MERGE_INGREDIENTS = """
+    INSERT INTO ingredients (name, description, category, tags, images, created_at, updated_at)
+    SELECT s.name, s.description, s.category, CAST(s.tags AS JSON), JSON_ARRAY(), NOW(), NOW()
+    FROM stage_ingredients s
+    LEFT JOIN ingredients i ON i.name_normalized = s.name_normalized
+    WHERE i.id IS NULL
+"""
+
+# Builds each recipe's ingredients JSON in staged order, with the ids of the
+# merged ingredients. GROUP_CONCAT keeps the order (JSON_ARRAYAGG cannot);
+# its length limit is raised for the session before merging.
+MERGE_RECIPES = """
+    INSERT INTO recipes (name, description, ingredients, instructions, tags, images, created_at, updated_at)
+    SELECT r.name, r.description,
+        COALESCE(CAST(CONCAT('[', GROUP_CONCAT(
+            JSON_SET(CAST(ri.entry AS JSON), '$.id', i.id) ORDER BY ri.position SEPARATOR ','
+        ), ']') AS JSON), JSON_ARRAY()),
+        r.instructions, CAST(r.tags AS JSON), CAST(r.images AS JSON), NOW(), NOW()
+    FROM stage_recipes r
+    LEFT JOIN recipes existing ON existing.name = r.name
+    LEFT JOIN stage_recipe_ingredients ri ON ri.recipe_seq = r.seq
+    LEFT JOIN ingredients i ON i.name_normalized = ri.name_normalized
+    WHERE existing.id IS NULL
+    GROUP BY r.seq
+"""
+
+def escape_staging_field(value):
+    r"""Escape a value for LOAD DATA's default TSV format (None becomes \N)"""
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+            .replace('\r', '\\r').replace('\0', '\\0'))
+
+def write_staging_file(path, rows):
+    """Write rows as a TSV staging file and return the row count"""
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for row in rows:
+            f.write('\t'.join(escape_staging_field(value) for value in row) + '\n')
+            count += 1
+    return count
+
+def stage_recipe_files(recipe_folders, staging_dir, upload_folder, copy_images=False, image_importer=None):
+    """
+    Read and convert recipe folders into normalized staging files (no queries).
+
+    Ingredients are deduplicated by normalized name and recipes by name; each
+    recipe ingredient is staged without its id, which the merge fills in.
+
+    Returns:
+        Dict of file paths by staging table and 'recipes', 'ingredients',
+        'recipe_ingredients' and 'failed' counts
+    """
+    ingredients = {}
+    recipes = []
+    recipe_ingredients = []
+    claimed_names = set()
+    failed = 0
+
+    for recipe_folder_info in recipe_folders:
+        recipe_data = load_recipe_data(recipe_folder_info['data_file'])
+        problems = validate_recipe(recipe_data) if recipe_data is not None else ['unreadable data.json']
+        if problems:
+            print(f"  ⚠ Skipping {recipe_folder_info['name']}: {'; '.join(problems)}")
+            failed += 1
+            continue
+        recipe_data.setdefault('name', recipe_folder_info['name'])
+        key = normalize_name(recipe_data['name'])
+        if key in claimed_names:
+            failed += 1
+            continue
+        claimed_names.add(key)
+
+        for ing_data in recipe_data.get('ingredients', []):
+            name = ing_data.get('name', '')
+            if name:
+                ingredients.setdefault(normalize_name(name), ing_data)
+
+        # The lookup stands in the name for the id, so ingredients without a name are dropped
+        recipe = convert_recipe(
+            recipe_data, recipe_folder_info['path'], None, None, upload_folder,
+            copy_images=copy_images, ingredient_lookup=lambda ing_data: ing_data.get('name') or None,
+            image_importer=image_importer
+        )
+        seq = len(recipes) + 1
+        recipes.append((seq, recipe['name'], recipe['description'], recipe['instructions'],
+                        json.dumps(recipe['tags']), json.dumps(recipe['images'])))
+        for position, entry in enumerate(recipe['ingredients'], start=1):
+            name = entry.pop('id')
+            recipe_ingredients.append((seq, position, name, json.dumps(entry)))
+
+    now = datetime.now()
+    staged = {'failed': failed, 'files': {}}
+    rows = {
+        'stage_ingredients': [ingredient_insert_params(ing, now)[:4] for ing in ingredients.values()],
+        'stage_recipes': recipes,
+        'stage_recipe_ingredients': recipe_ingredients,
+    }
+    for table, table_rows in rows.items():
+        path = os.path.join(staging_dir, f"{table}.tsv")
+        staged['files'][table] = path
+        staged[table[len('stage_'):]] = write_staging_file(path, table_rows)
+    return staged
+
+def merge_staged_recipes(cursor, conn, files):
+    """
+    Load the staging files into temporary tables and merge them, in one transaction.
+
+    Returns:
+        Dict of rows loaded per staging table, 'ingredients' and 'recipes'
+        inserted and seconds spent loading and merging
+    """
+    result = {'loaded': {}}
+    try:
+        load_started = time.perf_counter()
+        for table, create in STAGING_TABLES.items():
+            cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS {table}")
+            cursor.execute(create)
+            cursor.execute(
+                LOAD_STAGING_FILE.format(table=table, columns=', '.join(STAGING_COLUMNS[table])),
+                (files[table],)
+            )
+            result['loaded'][table] = cursor.rowcount
+        result['load_seconds'] = time.perf_counter() - load_started
+
+        merge_started = time.perf_counter()
+        cursor.execute("SET SESSION group_concat_max_len = 16777216")
+        cursor.execute(MERGE_INGREDIENTS)
+        result['ingredients'] = cursor.rowcount
+        cursor.execute(MERGE_RECIPES)
+        result['recipes'] = cursor.rowcount
+        conn.commit()
+        result['merge_seconds'] = time.perf_counter() - merge_started
+    except mysql.connector.Error as e:
+        conn.rollback()
+        print(f"  ✗ Merge failed, rolled back: {e}")
+        return None
+    return result
+
+def load_recipes_load_data(recipe_folders, cursor, conn, upload_folder, copy_images=False,
+                           staging_dir=None, image_importer=None):
+    """
+    Ingest recipes through TSV staging files, LOAD DATA LOCAL INFILE and set-based merges.
+
+    Staging files go to a temporary directory, or are kept in staging_dir if given.
+
+    Returns:
+        Tuple of (loaded count, skipped count)
+    """
+    def rate(rows, seconds):
+        return f"{rows / seconds:,.0f} rows/s" if seconds else "n/a"
+
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        staging_dir = staging_dir or temporary_dir
+        os.makedirs(staging_dir, exist_ok=True)
+
+        started = time.perf_counter()
+        staged = stage_recipe_files(recipe_folders, staging_dir, upload_folder, copy_images, image_importer)
+        stage_seconds = time.perf_counter() - started
+        staged_rows = staged['ingredients'] + staged['recipes'] + staged['recipe_ingredients']
+        print(f"Staged {staged['recipes']} recipes, {staged['ingredients']} ingredients and "
+              f"{staged['recipe_ingredients']} recipe ingredients in {stage_seconds:.2f}s "
+              f"({rate(staged_rows, stage_seconds)})")
+
+        result = merge_staged_recipes(cursor, conn, staged['files'])
+
+    if result is None:
+        return 0, staged['recipes'] + staged['failed']
+
+    loaded_rows = sum(result['loaded'].values())
+    merged_rows = result['ingredients'] + result['recipes']
+    print("\nLOAD DATA timing:")
+    for table, rows in result['loaded'].items():
+        print(f"  - {table}: {rows} rows")
+    print(f"  - Load into staging tables: {result['load_seconds']:.2f}s "
+          f"({rate(loaded_rows, result['load_seconds'])})")
+    print(f"  - Merge: {result['ingredients']} new ingredients, {result['recipes']} new recipes in "
+          f"{result['merge_seconds']:.2f}s ({rate(merged_rows, result['merge_seconds'])})")
+    print(f"  - Total: {time.perf_counter() - started:.2f}s")
+
+    return result['recipes'], staged['recipes'] - result['recipes'] + staged['failed']
+
+def load_recipes_to_db(data_dir, dry_run=False, copy_images=False, bulk=False,
+                       chunk_size=DEFAULT_CHUNK_SIZE, workers=0, queue_size=DEFAULT_QUEUE_SIZE,
+                       sync=False, prune=False, image_mode='auto', reencode_images=False,
+                       image_workers=DEFAULT_IMPORT_WORKERS, load_data=False, staging_dir=None):
     """Load recipes from bar-data-copy repository into MySQL database"""
+    sync = sync and not dry_run
+    load_data = load_data and not dry_run and not sync
+    pipeline = workers > 0 and not dry_run and not sync and not load_data
     
-    # Find all recipe folders
+    # Find all recipe folders (pipeline workers check each folder themselves)
     print(f"\nScanning for recipes in: {data_dir}")
-    recipe_folders = find_recipe_folders(data_dir)
+    if pipeline:
+        recipe_folders = list_recipe_folder_paths(data_dir)
+    else:
+        recipe_folders = find_recipe_folders(data_dir)
     
     if not recipe_folders:
         print("No recipe folders found")
@@ -285,7 +1201,8 @@ def load_recipes_to_db(data_dir, dry_run=False, copy_images=False):
                 password=config.MYSQL_PASSWORD,
                 database=config.MYSQL_DATABASE,
                 connection_timeout=30,
-                autocommit=False
+                autocommit=False,
+                allow_local_infile=load_data
             )
             cursor = conn.cursor(dictionary=True)
             print("✓ Connected to MySQL")
@@ -298,13 +1215,49 @@ def load_recipes_to_db(data_dir, dry_run=False, copy_images=False):
         upload_folder = os.path.join(os.path.dirname(__file__), 'uploads')
         if not os.path.exists(upload_folder):
             os.makedirs(upload_folder)
+        
+        # Images are imported in the background while recipes are written
+        image_importer = None
+        if copy_images:
+            image_importer = ImageImporter(upload_folder, image_mode, reencode_images, image_workers)
     
     # Process each recipe
     print(f"\nProcessing recipes...\n")
+    started = time.perf_counter()
     loaded_count = 0
     skipped_count = 0
     
-    for recipe_folder_info in recipe_folders:
+    if sync:
+        counts = sync_recipes(
+            recipe_folders, cursor, conn, upload_folder, copy_images=copy_images,
+            chunk_size=chunk_size, prune=prune, image_importer=image_importer
+        )
+        loaded_count = counts['added'] + counts['updated']
+        skipped_count = counts['unchanged'] + counts['failed']
+        recipe_folders_to_process = []
+    elif load_data:
+        loaded_count, skipped_count = load_recipes_load_data(
+            recipe_folders, cursor, conn, upload_folder, copy_images=copy_images,
+            staging_dir=staging_dir, image_importer=image_importer
+        )
+        recipe_folders_to_process = []
+    elif pipeline:
+        loaded_count, skipped_count = load_recipes_pipeline(
+            recipe_folders, cursor, conn, upload_folder, copy_images=copy_images,
+            chunk_size=chunk_size, workers=workers, queue_size=queue_size,
+            image_importer=image_importer
+        )
+        recipe_folders_to_process = []
+    elif bulk and not dry_run:
+        loaded_count, skipped_count = load_recipes_bulk(
+            recipe_folders, cursor, conn, upload_folder,
+            copy_images=copy_images, chunk_size=chunk_size, image_importer=image_importer
+        )
+        recipe_folders_to_process = []
+    else:
+        recipe_folders_to_process = recipe_folders
+    
+    for recipe_folder_info in recipe_folders_to_process:
         recipe_name = recipe_folder_info['name']
         
         # Load recipe data
@@ -337,26 +1290,12 @@ def load_recipes_to_db(data_dir, dry_run=False, copy_images=False):
                     cursor,
                     conn,
                     upload_folder,
-                    copy_images=copy_images
+                    copy_images=copy_images,
+                    image_importer=image_importer
                 )
                 
                 # Insert into database
-                query = """
-                    INSERT INTO recipes (name, description, ingredients, instructions, tags, images, created_at, updated_at)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                """
-                params = (
-                    recipe['name'],
-                    recipe['description'],
-                    json.dumps(recipe['ingredients']),
-                    recipe['instructions'],
-                    json.dumps(recipe['tags']),
-                    json.dumps(recipe['images']),
-                    recipe['created_at'],
-                    recipe['updated_at']
-                )
-                
-                cursor.execute(query, params)
+                cursor.execute(INSERT_RECIPE, recipe_insert_params(recipe))
                 conn.commit()
                 
                 print(f"  ✓ Loaded: {recipe_display_name}")
@@ -366,6 +1305,8 @@ def load_recipes_to_db(data_dir, dry_run=False, copy_images=False):
                 loaded_count += 1
                 
             except Exception as e:
+                # Drop this recipe's ingredient upserts too, or the next commit would keep them
+                conn.rollback()
                 print(f"  ✗ Error loading {recipe_display_name}: {e}")
                 skipped_count += 1
     
@@ -373,11 +1314,21 @@ def load_recipes_to_db(data_dir, dry_run=False, copy_images=False):
         cursor.close()
         conn.close()
     
+    missing_images = []
+    if not dry_run and image_importer:
+        missing_images = image_importer.finish()
+    
     print(f"\n{'=' * 60}")
     print(f"Summary:")
     print(f"  - Total recipes found: {len(recipe_folders)}")
     print(f"  - Loaded: {loaded_count}")
     print(f"  - Skipped: {skipped_count}")
+    if not dry_run:
+        elapsed = time.perf_counter() - started
+        print(f"  - Time: {elapsed:.1f}s ({loaded_count / elapsed if elapsed else 0:.1f} recipes/s)")
+    
+    if missing_images:
+        print(f"  ✗ {len(missing_images)} referenced images are missing from {upload_folder}")
     
     if not dry_run:
         print(f"\n✓ Recipes loaded into '{database_name}' database")
@@ -400,6 +1351,18 @@ Examples:
   
   # Load recipes without images (faster)
   python load_recipes.py --data-dir /path/to/bar-data-copy
+  
+  # Bulk import (batched inserts, one commit per chunk)
+  python load_recipes.py --data-dir /path/to/bar-data-copy --bulk
+  
+  # Parse folders in 4 worker processes while batching inserts
+  python load_recipes.py --data-dir /path/to/bar-data-copy --workers 4
+  
+  # Nightly re-sync: pick up upstream edits and removals
+  python load_recipes.py --data-dir /path/to/bar-data-copy --sync --prune
+  
+  # Onboard a large catalog with LOAD DATA LOCAL INFILE
+  python load_recipes.py --data-dir /path/to/bar-data-copy --load-data
         """
     )
     parser.add_argument(
@@ -417,6 +1380,65 @@ Examples:
         action='store_true',
         help='Copy recipe images to uploads folder (may take longer)'
     )
+    parser.add_argument(
+        '--bulk',
+        action='store_true',
+        help='Preload lookups and insert in batches (much faster for full imports)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Recipes per batch and commit in bulk mode (default: {DEFAULT_CHUNK_SIZE})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=0,
+        help='Parse recipe folders in N worker processes and write in bulk batches (default: off)'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f'Parsed folders allowed to wait for the database writer (default: {DEFAULT_QUEUE_SIZE})'
+    )
+    parser.add_argument(
+        '--image-mode',
+        choices=list(IMPORT_METHODS),
+        default='auto',
+        help='How --copy-images places files: auto (reflink, hard link or copy), reflink, link or copy'
+    )
+    parser.add_argument(
+        '--reencode-images',
+        action='store_true',
+        help='With --copy-images, resize and re-encode images like uploaded ones'
+    )
+    parser.add_argument(
+        '--image-workers',
+        type=int,
+        default=DEFAULT_IMPORT_WORKERS,
+        help=f'Threads importing images (default: {DEFAULT_IMPORT_WORKERS})'
+    )
+    parser.add_argument(
+        '--load-data',
+        action='store_true',
+        help='Ingest through staging files and LOAD DATA LOCAL INFILE with set-based merges'
+    )
+    parser.add_argument(
+        '--staging-dir',
+        help='With --load-data, write the staging files here and keep them (default: temporary directory)'
+    )
+    parser.add_argument(
+        '--sync',
+        action='store_true',
+        help='Insert new and update changed recipes, using content hashes of the source folders'
+    )
+    parser.add_argument(
+        '--prune',
+        action='store_true',
+        help='With --sync, delete recipes whose source folder was removed upstream'
+    )
     
     args = parser.parse_args()
     
@@ -433,10 +1455,21 @@ Examples:
     count = load_recipes_to_db(
         args.data_dir,
         dry_run=args.dry_run,
-        copy_images=args.copy_images
+        copy_images=args.copy_images,
+        bulk=args.bulk,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        queue_size=args.queue_size,
+        sync=args.sync,
+        prune=args.prune,
+        image_mode=args.image_mode,
+        reencode_images=args.reencode_images,
+        image_workers=args.image_workers,
+        load_data=args.load_data,
+        staging_dir=args.staging_dir
     )
     
-    if count > 0 or args.dry_run:
+    if count > 0 or args.dry_run or args.sync:
         print(f"\n✓ Successfully processed {count} recipes")
         return 0
     else:
@@ -334,22 +334,15 @@ def load_sample_ingredients(dry_run=False):
     skipped_count = 0
     
     for ing_data in SAMPLE_INGREDIENTS:
-        # Check if ingredient already exists
-        cursor.execute("SELECT id FROM ingredients WHERE name = %s", (ing_data['name'],))
-        existing = cursor.fetchone()
-        if existing:
-            print(f"  ⚠ Skipping {ing_data['name']}: Already exists")
-            skipped_count += 1
-            continue
-        
         # Prepare ingredient data
         now = datetime.utcnow()
         
-        # Insert into database
+        # Insert into database; an existing ingredient (same normalized name) is left unchanged
         try:
             query = """
                 INSERT INTO ingredients (name, description, category, tags, images, created_at, updated_at)
                 VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)
             """
             params = (
                 ing_data['name'],
@@ -361,6 +354,10 @@ def load_sample_ingredients(dry_run=False):
                 now
             )
             cursor.execute(query, params)
+            if cursor.rowcount == 0:
+                print(f"  ⚠ Skipping {ing_data['name']}: Already exists")
+                skipped_count += 1
+                continue
             conn.commit()
             print(f"  ✓ Loaded: {ing_data['name']} ({ing_data['category']})")
             loaded_count += 1
@@ -0,0 +1,185 @@
+"""
+Prometheus metrics for Neighborhood Sips
+Counters and histograms kept in process memory and rendered in the
+Prometheus text exposition format (version 0.0.4) by /api/metrics.
+
+Recording is cheap enough to leave on in production: an observation is a
+dictionary lookup and a few additions under the metric's own lock, held only
+for that update (no global lock, no I/O). Values that already live elsewhere
+(pool stats, cache hit counters) are read by collectors at scrape time
+instead of being recorded on every request.
+
+Each process keeps its own values; with several workers, scrape each worker
+(or run one worker per metrics target).
+"""
+
+import math
+import threading
+from bisect import bisect_left
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Latency buckets in seconds (5 ms to 10 s)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Buckets for per-request query counts
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def format_labels(labels):
+    """Render {name: value} as {name="value",...} (empty string for no labels)"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + '}'
+
+
+def format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels"""
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = dict(self._values)
+        for labelvalues, value in sorted(values.items()):
+            yield self.name, dict(zip(self.labelnames, labelvalues)), value
+
+
+class Histogram:
+    """Histogram with fixed buckets and labels"""
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._values = {}  # labelvalues -> [count per bucket..., count above last bucket, sum]
+
+    def observe(self, value, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                state = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {labelvalues: list(state) for labelvalues, state in self._values.items()}
+        for labelvalues, state in sorted(values.items()):
+            labels = dict(zip(self.labelnames, labelvalues))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), state[:-1]):
+                cumulative += count
+                yield f'{self.name}_bucket', {**labels, 'le': format_value(float(bound))}, cumulative
+            yield f'{self.name}_count', labels, cumulative
+            yield f'{self.name}_sum', labels, state[-1]
+
+
+class Registry:
+    """Metrics and scrape-time collectors of this process"""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._add(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, documentation, labelnames, buckets))
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector):
+        """
+        Register a function called at scrape time.
+
+        The collector returns an iterable of (name, type, documentation,
+        [(labels dict, value), ...]) tuples.
+        """
+        self._collectors.append(collector)
+        return collector
+
+    def render(self):
+        """Render every metric in the Prometheus text format"""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+        for collector in self._collectors:
+            for name, metric_type, documentation, samples in collector():
+                lines.append(f'# HELP {name} {documentation}')
+                lines.append(f'# TYPE {name} {metric_type}')
+                for labels, value in samples:
+                    lines.append(f'{name}{format_labels(labels)} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+def cache_metrics(caches):
+    """
+    Collector samples for caches with hit and miss counters.
+
+    Args:
+        caches: {cache name: (hits, misses)}
+    """
+    yield ('cache_hits_total', 'counter', 'Cache lookups served from the cache',
+           [({'cache': name}, hits) for name, (hits, _) in caches.items()])
+    yield ('cache_misses_total', 'counter', 'Cache lookups that had to rebuild',
+           [({'cache': name}, misses) for name, (_, misses) in caches.items()])
+    yield ('cache_hit_ratio', 'gauge', 'Hits divided by lookups since start',
+           [({'cache': name}, round(hits / (hits + misses), 6)) for name, (hits, misses) in caches.items()
+            if hits + misses])
+
+
+# Registry of the app process
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    'http_requests_total', 'HTTP requests handled', ('route', 'method', 'status')
+)
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds', 'HTTP request latency', ('route', 'method', 'status')
+)
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    'db_queries_per_request', 'Database statements executed per request', ('route',), COUNT_BUCKETS
+)
+DB_SECONDS_PER_REQUEST = REGISTRY.histogram(
+    'db_query_duration_seconds_per_request', 'Time spent in database calls per request', ('route',)
+)
+DB_POOL_ACQUIRE_SECONDS = REGISTRY.histogram(
+    'db_pool_acquire_seconds', 'Time waiting to acquire a pooled connection', ('pool',)
+)
+IMAGE_PROCESSING_SECONDS = REGISTRY.histogram(
+    'image_processing_seconds', 'Image decode, resize and save time', ('operation', 'outcome')
+)
+
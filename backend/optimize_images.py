@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Re-encode existing upload and gallery images with the standard storage settings
+
+Images that were stored before save_base64_image optimized them (webp files,
+large JPEGs, multi-MB PNG menus) are re-encoded with the same resize/quality
+settings used by the API, and a thumbnail derivative is generated for each.
+
+The source files are never modified. Optimized variants are written to the
+output directory, mirroring the source layout:
+
+    optimized/uploads/Margarita.jpg
+    optimized/uploads/Margarita.thumb.jpg
+    optimized/static/images/gallery/Menu May 2026.jpg
+    optimized/static/images/gallery/Menu May 2026.thumb.jpg
+
+A manifest (optimized/manifest.json) records the content hash of every
+processed source file, so re-running the script only processes new or
+changed images.
+
+USAGE:
+------
+# Process uploads/, uploads/cocktail_images/ and static/images/gallery/
+python3 optimize_images.py
+
+# Preview what would be processed
+python3 optimize_images.py --dry-run
+
+# Use 8 worker processes and a custom output directory
+python3 optimize_images.py --workers 8 --output-dir /tmp/optimized
+
+# Re-process everything, ignoring the manifest
+python3 optimize_images.py --force
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image, UnidentifiedImageError
+from PIL.ImageOps import exif_transpose
+from image_utils import (
+    DERIVATIVE_SIZES, SUPPORTED_IMAGE_FORMATS, derivative_filename,
+    get_save_format, has_transparency, is_image_file, save_optimized_image, stored_filename,
+)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Directories scanned by default (relative to the backend directory)
+# uploads/ is walked recursively, which includes uploads/cocktail_images/
+DEFAULT_SOURCE_DIRS = [
+    'uploads',
+    os.path.join('static', 'images', 'gallery'),
+]
+
+DEFAULT_OUTPUT_DIR = 'optimized'
+MANIFEST_FILENAME = 'manifest.json'
+
+# Number of processed files between manifest saves
+MANIFEST_SAVE_INTERVAL = 25
+
+
+def file_sha256(path):
+    """Return the SHA-256 hex digest of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_images(source_dirs, exclude_dir=None):
+    """Walk the source directories and return (absolute path, relative path) pairs"""
+    exclude_dir = os.path.abspath(exclude_dir) if exclude_dir else None
+    seen = set()
+    images = []
+
+    for source_dir in source_dirs:
+        source_dir = os.path.abspath(os.path.join(BASE_DIR, source_dir))
+        if not os.path.isdir(source_dir):
+            print(f"  ⚠ Skipping missing directory: {source_dir}")
+            continue
+
+        # Keep the layout relative to the backend directory, or to the parent of
+        # directories that live elsewhere
+        if os.path.commonpath([source_dir, BASE_DIR]) == BASE_DIR:
+            rel_base = BASE_DIR
+        else:
+            rel_base = os.path.dirname(source_dir)
+
+        for root, dirs, files in os.walk(source_dir):
+            # Never re-process our own output
+            if exclude_dir:
+                dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != exclude_dir]
+            dirs.sort()
+            for filename in sorted(files):
+                if not is_image_file(filename):
+                    continue
+                path = os.path.join(root, filename)
+                if path in seen:
+                    continue
+                seen.add(path)
+                images.append((path, os.path.relpath(path, rel_base)))
+
+    return images
+
+
+def load_manifest(manifest_path):
+    """Load the manifest of processed files, or return an empty one"""
+    if not os.path.exists(manifest_path):
+        return {'files': {}}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest.setdefault('files', {})
+        return manifest
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"  ⚠ Could not read manifest {manifest_path}: {e}")
+        return {'files': {}}
+
+
+def save_manifest(manifest, manifest_path):
+    """Atomically write the manifest to disk"""
+    manifest['updated_at'] = datetime.now().isoformat()
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+
+def outputs_exist(entry, output_dir):
+    """Check that every output recorded for a manifest entry is still on disk"""
+    outputs = entry.get('outputs') or []
+    return bool(outputs) and all(os.path.exists(os.path.join(output_dir, p)) for p in outputs)
+
+
+def optimize_image_file(source_path, rel_path, output_dir, known_hash=None):
+    """
+    Re-encode one image and write its derivatives.
+
+    Runs in a worker process, so it only takes and returns plain data.
+
+    Returns:
+        Dictionary describing the result ('status' is 'optimized', 'skipped' or 'error')
+    """
+    try:
+        source_hash = file_sha256(source_path)
+        if known_hash and source_hash == known_hash:
+            return {'rel_path': rel_path, 'status': 'skipped', 'sha256': source_hash}
+
+        source_bytes = os.path.getsize(source_path)
+
+        with Image.open(source_path) as original:
+            source_format = original.format
+            image = exif_transpose(original)
+            image.load()
+
+        # Formats the API does not store (e.g. webp) are converted to JPEG when
+        # there is no transparency to keep, instead of the much larger PNG
+        if source_format not in SUPPORTED_IMAGE_FORMATS and not has_transparency(image):
+            source_format = 'JPEG'
+
+        save_format = get_save_format(source_format)
+        rel_dir, filename = os.path.split(rel_path)
+        dest_dir = os.path.join(output_dir, rel_dir)
+        os.makedirs(dest_dir, exist_ok=True)
+
+        # Main optimized variant, same settings as save_base64_image
+        optimized_name = stored_filename(filename, save_format)
+        optimized_path = os.path.join(dest_dir, optimized_name)
+        save_optimized_image(image.copy(), optimized_path, source_format)
+        optimized_bytes = os.path.getsize(optimized_path)
+
+        # Re-encoding a file with the same format that did not get smaller is pointless,
+        # keep the original bytes instead
+        kept_original = False
+        if optimized_bytes >= source_bytes and optimized_name == filename:
+            shutil.copyfile(source_path, optimized_path)
+            optimized_bytes = source_bytes
+            kept_original = True
+
+        outputs = [os.path.join(rel_dir, optimized_name)]
+
+        # Derivatives (thumbnails)
+        for variant, max_size in DERIVATIVE_SIZES.items():
+            variant_name = derivative_filename(optimized_name, variant)
+            save_optimized_image(image.copy(), os.path.join(dest_dir, variant_name), source_format, max_size=max_size)
+            outputs.append(os.path.join(rel_dir, variant_name))
+
+        return {
+            'rel_path': rel_path,
+            'status': 'optimized',
+            'sha256': source_hash,
+            'source_bytes': source_bytes,
+            'optimized_bytes': optimized_bytes,
+            'kept_original': kept_original,
+            'format': save_format,
+            'outputs': outputs,
+        }
+    except (IOError, ValueError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        return {'rel_path': rel_path, 'status': 'error', 'error': str(e)}
+
+
+def format_bytes(num_bytes):
+    """Human readable byte count"""
+    sign = '-' if num_bytes < 0 else ''
+    num_bytes = abs(num_bytes)
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num_bytes < 1024 or unit == 'GB':
+            return f"{sign}{num_bytes:.1f} {unit}" if unit != 'B' else f"{sign}{num_bytes} B"
+        num_bytes /= 1024.0
+
+
+def optimize_images(source_dirs, output_dir, workers=None, force=False, dry_run=False):
+    """
+    Re-encode all images in the source directories.
+
+    Returns:
+        Dictionary with processing statistics
+    """
+    output_dir = os.path.abspath(os.path.join(BASE_DIR, output_dir))
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
+
+    print(f"\nScanning for images in: {', '.join(source_dirs)}")
+    images = find_images(source_dirs, exclude_dir=output_dir)
+    print(f"Found {len(images)} image files")
+
+    manifest = load_manifest(manifest_path)
+    files = manifest['files']
+
+    stats = {
+        'total': len(images),
+        'optimized': 0,
+        'skipped': 0,
+        'errors': 0,
+        'source_bytes': 0,
+        'optimized_bytes': 0,
+    }
+
+    tasks = []
+    for source_path, rel_path in images:
+        entry = files.get(rel_path)
+        known_hash = None
+        if entry and not force and outputs_exist(entry, output_dir):
+            known_hash = entry.get('sha256')
+        tasks.append((source_path, rel_path, known_hash))
+
+    if dry_run:
+        print("\n=== DRY RUN MODE - No files will be written ===\n")
+        for source_path, rel_path, known_hash in tasks:
+            if known_hash and file_sha256(source_path) == known_hash:
+                stats['skipped'] += 1
+            else:
+                print(f"  ✓ Would optimize: {rel_path} ({format_bytes(os.path.getsize(source_path))})")
+                stats['optimized'] += 1
+        return stats
+
+    os.makedirs(output_dir, exist_ok=True)
+    started = time.perf_counter()
+    processed_since_save = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(optimize_image_file, source_path, rel_path, output_dir, known_hash)
+            for source_path, rel_path, known_hash in tasks
+        ]
+        for done, future in enumerate(as_completed(futures), start=1):
+            result = future.result()
+            rel_path = result['rel_path']
+
+            if result['status'] == 'skipped':
+                stats['skipped'] += 1
+                continue
+
+            if result['status'] == 'error':
+                print(f"  ✗ [{done}/{len(tasks)}] {rel_path}: {result['error']}")
+                stats['errors'] += 1
+                continue
+
+            stats['optimized'] += 1
+            stats['source_bytes'] += result['source_bytes']
+            stats['optimized_bytes'] += result['optimized_bytes']
+            saved = result['source_bytes'] - result['optimized_bytes']
+            print(f"  ✓ [{done}/{len(tasks)}] {rel_path}: "
+                  f"{format_bytes(result['source_bytes'])} → {format_bytes(result['optimized_bytes'])} "
+                  f"(saved {format_bytes(saved)})")
+
+            files[rel_path] = {
+                'sha256': result['sha256'],
+                'source_bytes': result['source_bytes'],
+                'optimized_bytes': result['optimized_bytes'],
+                'kept_original': result['kept_original'],
+                'format': result['format'],
+                'outputs': result['outputs'],
+                'processed_at': datetime.now().isoformat(),
+            }
+
+            # Save progress regularly so an interrupted run can resume
+            processed_since_save += 1
+            if processed_since_save >= MANIFEST_SAVE_INTERVAL:
+                save_manifest(manifest, manifest_path)
+                processed_since_save = 0
+
+    save_manifest(manifest, manifest_path)
+    stats['elapsed'] = time.perf_counter() - started
+    return stats
+
+
+def print_summary(stats, dry_run=False):
+    """Print summary of the optimization run"""
+    print(f"\n{'=' * 60}")
+    print("Summary:")
+    print(f"  - Total images found: {stats['total']}")
+    print(f"  - {'Would optimize' if dry_run else 'Optimized'}: {stats['optimized']}")
+    print(f"  - Unchanged since last run: {stats['skipped']}")
+    print(f"  - Errors: {stats['errors']}")
+    if not dry_run and stats['optimized']:
+        saved = stats['source_bytes'] - stats['optimized_bytes']
+        percent = (saved / stats['source_bytes'] * 100) if stats['source_bytes'] else 0
+        print(f"  - Original size: {format_bytes(stats['source_bytes'])}")
+        print(f"  - Optimized size: {format_bytes(stats['optimized_bytes'])}")
+        print(f"  - Bytes saved: {format_bytes(saved)} ({percent:.1f}%)")
+        print(f"  - Elapsed: {stats['elapsed']:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Re-encode existing upload and gallery images with the standard storage settings',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Process the default directories
+  python3 optimize_images.py
+
+  # Preview without writing anything
+  python3 optimize_images.py --dry-run
+
+  # Process a specific directory with 4 workers
+  python3 optimize_images.py --source uploads/cocktail_images --workers 4
+        """
+    )
+    parser.add_argument(
+        '--source',
+        action='append',
+        help='Directory to process, relative to the backend directory (repeatable, '
+             'default: uploads and static/images/gallery)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        default=DEFAULT_OUTPUT_DIR,
+        help=f'Directory for optimized variants and the manifest (default: {DEFAULT_OUTPUT_DIR})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Number of worker processes (default: number of CPUs)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-process all images, ignoring the manifest'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Show what would be processed without writing files'
+    )
+
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Image Optimizer")
+    print("Neighborhood Sips Application")
+    print("=" * 60)
+
+    stats = optimize_images(
+        args.source or DEFAULT_SOURCE_DIRS,
+        args.output_dir,
+        workers=args.workers,
+        force=args.force,
+        dry_run=args.dry_run
+    )
+    print_summary(stats, dry_run=args.dry_run)
+
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""
+SQL instrumentation for Neighborhood Sips
+Every statement a request runs is recorded as a query entry:
+
+    {'sql': ..., 'params': (...), 'param_count': 2, 'seconds': 0.0123, 'rows': 14}
+
+Seconds include fetching the results; rows counts rows fetched for queries
+and affected rows for writes. The app keeps the entries of the current request, logs
+statements slower than SLOW_QUERY_MS (optionally with their EXPLAIN plan,
+which flags full table scans such as the JSON_SEARCH/JSON_CONTAINS filters)
+and reports the totals in the Server-Timing response header.
+"""
+
+import time
+
+# EXPLAIN columns printed for slow queries
+EXPLAIN_COLUMNS = ('table', 'type', 'possible_keys', 'key', 'rows', 'filtered', 'Extra')
+
+
+def new_entry(sql, params=None, param_count=None):
+    """Create the query entry of a statement"""
+    params = tuple(params) if params else ()
+    return {
+        'sql': sql,
+        'params': params,
+        'param_count': len(params) if param_count is None else param_count,
+        'seconds': 0.0,
+        'rows': 0,
+    }
+
+
+class InstrumentedCursor:
+    """Cursor proxy recording a query entry for every statement it runs"""
+
+    def __init__(self, cursor, record):
+        """
+        Args:
+            cursor: DB-API cursor to wrap
+            record: Called with each new query entry (before it runs)
+        """
+        self._cursor = cursor
+        self._record = record
+        self._entry = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def _run(self, entry, method, *args, **kwargs):
+        self._entry = entry
+        self._record(entry)
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            entry['seconds'] += time.perf_counter() - started
+            if not getattr(self._cursor, 'with_rows', True):
+                entry['rows'] = max(self._cursor.rowcount, 0)
+
+    def execute(self, operation, params=None, **kwargs):
+        if params is None:
+            return self._run(new_entry(operation), self._cursor.execute, operation, **kwargs)
+        return self._run(new_entry(operation, params), self._cursor.execute, operation, params, **kwargs)
+
+    def executemany(self, operation, seq_params, **kwargs):
+        seq_params = list(seq_params)
+        entry = new_entry(operation, param_count=sum(len(params) for params in seq_params))
+        return self._run(entry, self._cursor.executemany, operation, seq_params, **kwargs)
+
+    def _fetch(self, method, *args):
+        started = time.perf_counter()
+        result = method(*args)
+        if self._entry is not None:
+            self._entry['seconds'] += time.perf_counter() - started
+            if isinstance(result, list):
+                self._entry['rows'] += len(result)
+            elif result is not None:
+                self._entry['rows'] += 1
+        return result
+
+    def fetchone(self):
+        return self._fetch(self._cursor.fetchone)
+
+    def fetchmany(self, *args):
+        return self._fetch(self._cursor.fetchmany, *args)
+
+    def fetchall(self):
+        return self._fetch(self._cursor.fetchall)
+
+
+def timed_call(record, sql, params, count_rows, func, *args):
+    """
+    Run func(*args), which executes sql, and record its query entry.
+
+    Args:
+        record: Called with the query entry
+        count_rows: Function mapping func's result to the number of rows
+    """
+    entry = new_entry(sql, params)
+    record(entry)
+    started = time.perf_counter()
+    try:
+        result = func(*args)
+        entry['rows'] = count_rows(result)
+        return result
+    finally:
+        entry['seconds'] = time.perf_counter() - started
+
+
+def totals(entries):
+    """Returns (statement count, total seconds, total rows)"""
+    return len(entries), sum(e['seconds'] for e in entries), sum(e['rows'] for e in entries)
+
+
+def slow_queries(entries, threshold_seconds):
+    return [e for e in entries if e['seconds'] >= threshold_seconds]
+
+
+def explain_sql(entry):
+    """The EXPLAIN statement for a SELECT entry, or None for other statements"""
+    if not entry['sql'].lstrip().upper().startswith('SELECT'):
+        return None
+    return 'EXPLAIN ' + entry['sql']
+
+
+def explain(connection, entry):
+    """
+    Run EXPLAIN for a SELECT entry on the given connection.
+
+    Returns:
+        List of plan rows (dicts), or None if the statement is not a SELECT
+    """
+    sql = explain_sql(entry)
+    if sql is None:
+        return None
+    cursor = connection.cursor(dictionary=True)
+    try:
+        cursor.execute(sql, entry['params'])
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+
+
+def format_plan(plan):
+    """One line per plan row, marking full table scans"""
+    lines = []
+    for row in plan:
+        details = ', '.join(f"{column}={row.get(column)}" for column in EXPLAIN_COLUMNS if column in row)
+        if row.get('type') == 'ALL':
+            details += '  <- full table scan'
+        lines.append(details)
+    return lines
+
+
+def format_slow_query(entry, route):
+    sql = ' '.join(entry['sql'].split())
+    return (f"⚠ Slow query on {route}: {entry['seconds'] * 1000:.1f} ms, "
+            f"{entry['rows']} rows, {entry['param_count']} params: {sql}")
+
+
+def server_timing_header(timings):
+    """
+    Build a Server-Timing header value.
+
+    Args:
+        timings: List of (name, seconds, description or None)
+    """
+    metrics = []
+    for name, seconds, description in timings:
+        metric = f"{name};dur={seconds * 1000:.2f}"
+        if description:
+            metric += f';desc="{description}"'
+        metrics.append(metric)
+    return ', '.join(metrics)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Move existing uploads into the sharded directory layout
+
+This script:
+1. Moves every file stored directly in the upload folder into its shard
+   directory (e.g. uploads/Margarita.jpg -> uploads/3f/a9/Margarita.jpg)
+2. Rewrites the references in the images JSON of the ingredients, recipes
+   and collections tables to the new sharded paths
+
+Files are moved before the database is updated. The API resolves flat
+references to sharded files, so images keep loading while the migration
+runs and if the database step has to be re-run.
+
+Sub-directories of the upload folder (such as cocktail_images/) are left
+as they are.
+
+USAGE:
+------
+# Preview the migration without changing anything
+python3 shard_uploads.py --dry-run
+
+# Move files and update the database
+python3 shard_uploads.py
+
+# Only move files (e.g. no database available)
+python3 shard_uploads.py --skip-db
+"""
+
+import os
+import sys
+import json
+import argparse
+import filecmp
+import mysql.connector
+from config import Config
+from upload_store import sharded_path, is_sharded
+
+# Tables with an images JSON column
+IMAGE_TABLES = ['ingredients', 'recipes', 'collections']
+
+
+def plan_moves(upload_folder):
+    """Return (filename, sharded reference) for every flat file in the upload folder"""
+    moves = []
+    for filename in sorted(os.listdir(upload_folder)):
+        path = os.path.join(upload_folder, filename)
+        if not os.path.isfile(path) or filename.startswith('.'):
+            continue
+        moves.append((filename, sharded_path(filename)))
+    return moves
+
+
+def move_files(upload_folder, moves, dry_run=False):
+    """
+    Move flat files into their shards.
+
+    Returns:
+        Dictionary mapping flat filename -> sharded reference for every file now in its shard
+    """
+    moved = {}
+    for filename, reference in moves:
+        source = os.path.join(upload_folder, filename)
+        target = os.path.join(upload_folder, *reference.split('/'))
+
+        if os.path.exists(target):
+            if filecmp.cmp(source, target, shallow=False):
+                # Already copied by an earlier, interrupted run
+                if not dry_run:
+                    os.remove(source)
+                moved[filename] = reference
+            else:
+                print(f"  ⚠ Skipping {filename}: a different file already exists at {reference}")
+            continue
+
+        if dry_run:
+            print(f"  ✓ Would move: {filename} → {reference}")
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(source, target)
+        moved[filename] = reference
+
+    return moved
+
+
+def rewrite_references(images, upload_folder, planned=None):
+    """
+    Rewrite flat image references to sharded ones.
+
+    A reference is rewritten when the flat file no longer exists and the file
+    is present in its shard, or (in a dry run, where nothing was moved) when
+    the file is one of the planned moves.
+
+    Args:
+        planned: Flat filenames that would be moved into their shard (dry run)
+
+    Returns:
+        Tuple of (new images list, number of references changed)
+    """
+    changed = 0
+    new_images = []
+    for img in images:
+        if isinstance(img, str) and img and '/' not in img and not is_sharded(img):
+            reference = sharded_path(img)
+            flat_exists = os.path.isfile(os.path.join(upload_folder, img))
+            sharded_exists = os.path.isfile(os.path.join(upload_folder, *reference.split('/')))
+            if (sharded_exists and not flat_exists) or (planned is not None and img in planned):
+                new_images.append(reference)
+                changed += 1
+                continue
+        new_images.append(img)
+    return new_images, changed
+
+
+def update_database(cursor, conn, upload_folder, dry_run=False, planned=None):
+    """
+    Rewrite image references in all tables. Returns number of rows updated.
+
+    In a dry run, pass the planned moves so rows are counted as if the files
+    had been moved.
+    """
+    rows_updated = 0
+
+    for table in IMAGE_TABLES:
+        cursor.execute(f"SELECT id, images FROM {table}")
+        rows = cursor.fetchall()
+        table_updates = []
+
+        for row in rows:
+            images = row['images']
+            if isinstance(images, (bytes, bytearray)):
+                images = images.decode('utf-8')
+            if isinstance(images, str):
+                try:
+                    images = json.loads(images)
+                except json.JSONDecodeError:
+                    continue
+            if not isinstance(images, list):
+                continue
+
+            new_images, changed = rewrite_references(images, upload_folder, planned)
+            if changed:
+                table_updates.append((json.dumps(new_images), row['id']))
+
+        print(f"  - {table}: {len(table_updates)} of {len(rows)} row(s) to update")
+
+        if table_updates and not dry_run:
+            # images only - updated_at is left alone, the content did not change
+            cursor.executemany(
+                f"UPDATE {table} SET images = %s, updated_at = updated_at WHERE id = %s",
+                table_updates
+            )
+        rows_updated += len(table_updates)
+
+    if not dry_run:
+        conn.commit()
+
+    return rows_updated
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Move existing uploads into the sharded directory layout',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Preview the migration
+  python3 shard_uploads.py --dry-run
+
+  # Move files and update references
+  python3 shard_uploads.py
+        """
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Show what would be moved and updated without changing anything'
+    )
+    parser.add_argument(
+        '--skip-db',
+        action='store_true',
+        help='Only move files, do not update database references'
+    )
+    args = parser.parse_args()
+
+    config = Config()
+    upload_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), config.UPLOAD_FOLDER)
+
+    print("=" * 60)
+    print("Upload Sharding Migration")
+    print("Neighborhood Sips Application")
+    print("=" * 60)
+
+    if args.dry_run:
+        print("\n=== DRY RUN MODE - No changes will be saved ===")
+
+    moves = plan_moves(upload_folder)
+    print(f"\nFound {len(moves)} flat file(s) in {upload_folder}\n")
+    moved = move_files(upload_folder, moves, dry_run=args.dry_run)
+    print(f"\n✓ {len(moved)} file(s) {'would be ' if args.dry_run else ''}in their shard")
+
+    if args.skip_db:
+        return 0
+
+    print(f"\nConnecting to MySQL at {config.MYSQL_HOST}:{config.MYSQL_PORT}")
+    try:
+        conn = mysql.connector.connect(
+            host=config.MYSQL_HOST,
+            port=config.MYSQL_PORT,
+            user=config.MYSQL_USER,
+            password=config.MYSQL_PASSWORD,
+            database=config.MYSQL_DATABASE,
+            connection_timeout=30,
+            autocommit=False
+        )
+        cursor = conn.cursor(dictionary=True)
+        print("✓ Connected to MySQL")
+    except mysql.connector.Error as e:
+        print(f"✗ Error connecting to MySQL: {e}")
+        print("Files were moved; re-run with MySQL available to update references.")
+        return 1
+
+    try:
+        print("\nUpdating image references:")
+        planned = None
+        if args.dry_run:
+            # Nothing was moved, so check references against the planned layout
+            print("  (dry run: counts assume the files above were moved)")
+            planned = set(moved)
+        rows = update_database(cursor, conn, upload_folder, dry_run=args.dry_run, planned=planned)
+        print(f"\n✓ {rows} row(s) {'would be ' if args.dry_run else ''}updated")
+        return 0
+    except mysql.connector.Error as e:
+        conn.rollback()
+        print(f"✗ Error updating references: {e}")
+        return 1
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
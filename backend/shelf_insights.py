@@ -0,0 +1,233 @@
+"""
+"Next bottle to buy" suggestions for the bar shelf
+
+Builds an ingredient x recipe incidence matrix from the bar shelf flags and
+the recipes' ingredients, stored as one Python int bitset per ingredient (bit
+r set if recipe r uses it). Recipes are also grouped into bitsets by how many
+of their ingredients are missing from the shelf. Every question is then
+answered with bitwise AND/OR and bit counts over whole rows of the
+matrix, which takes milliseconds for thousands of recipes:
+
+- rank: each missing ingredient scored by the recipes it alone would unlock
+- greedy: k bottles chosen one at a time, each maximizing the recipes made
+  makeable given the bottles already chosen
+
+Ingredients are matched by normalized name, like the bar shelf recipe
+filter, and a recipe counts as makeable only if all of its ingredients are
+on the shelf. The matrix and results are cached by a fingerprint of the
+ingredients and recipes tables, so they are rebuilt only after the shelf or
+the recipes change.
+"""
+
+import threading
+from api_core import normalize_name, parse_json_field
+
+# Rows for building the matrix, and a cheap fingerprint of what they depend on.
+# Both tables are checksummed row by row: two changes can land within the
+# same updated_at second, and not every write bumps updated_at.
+SHELF_INGREDIENTS_QUERY = "SELECT id, name, bar_shelf_availability FROM ingredients"
+SHELF_RECIPES_QUERY = "SELECT id, name, ingredients FROM recipes"
+SHELF_FINGERPRINT_QUERY = """
+    SELECT
+        (SELECT COUNT(*) FROM ingredients) AS ingredient_count,
+        (SELECT BIT_XOR(CRC32(CONCAT_WS(':', id, name, bar_shelf_availability)))
+         FROM ingredients) AS shelf_checksum,
+        (SELECT COUNT(*) FROM recipes) AS recipe_count,
+        (SELECT BIT_XOR(CRC32(CONCAT_WS(':', id, name, ingredients)))
+         FROM recipes) AS recipe_checksum,
+        (SELECT MAX(updated_at) FROM recipes) AS recipes_updated
+"""
+
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 100
+MODES = ('rank', 'greedy')
+
+
+def fingerprint(row):
+    """Hashable fingerprint of the SHELF_FINGERPRINT_QUERY row"""
+    return tuple(str(row[key]) for key in ('ingredient_count', 'shelf_checksum',
+                                            'recipe_count', 'recipe_checksum', 'recipes_updated'))
+
+
+def _bit_count_fallback(bits):
+    return bin(bits).count('1')
+
+
+# int.bit_count() needs Python 3.10
+bit_count = getattr(int, 'bit_count', _bit_count_fallback)
+
+
+def bit_indexes(bits):
+    """Indexes of the set bits of an int, lowest first"""
+    indexes = []
+    while bits:
+        low = bits & -bits
+        indexes.append(low.bit_length() - 1)
+        bits ^= low
+    return indexes
+
+
+class ShelfIndex:
+    """Incidence bitsets of missing ingredients x recipes"""
+
+    def __init__(self, ingredients, recipes):
+        """
+        Args:
+            ingredients: Rows with id, name and bar_shelf_availability
+            recipes: Rows with id, name and ingredients (list or JSON)
+        """
+        on_shelf = set()
+        self.bottles = {}
+        for row in ingredients:
+            key = normalize_name(row['name'] or '')
+            self.bottles.setdefault(key, {'id': row['id'], 'name': row['name']})
+            if row.get('bar_shelf_availability') == 'Y':
+                on_shelf.add(key)
+
+        self.recipe_names = []
+        self.uses = {}
+        missing_counts = []
+        for recipe in recipes:
+            entries = parse_json_field(recipe['ingredients']) or []
+            names = [entry.get('name') if isinstance(entry, dict) else None for entry in entries]
+            # Same rule as the bar shelf filter: no ingredients, or one without a name, is never makeable
+            if not names or not all(names):
+                continue
+            missing = {normalize_name(name) for name in names} - on_shelf
+            bit = 1 << len(self.recipe_names)
+            self.recipe_names.append(recipe['name'])
+            for key in missing:
+                self.uses[key] = self.uses.get(key, 0) | bit
+                # Referenced by a recipe but not in the ingredients table: suggest it by name
+                self.bottles.setdefault(key, {'id': None, 'name': name_for(key, names)})
+            missing_counts.append(len(missing))
+
+        # levels[n]: recipes missing exactly n ingredients
+        self.levels = [0] * (max(missing_counts, default=0) + 1)
+        for index, count in enumerate(missing_counts):
+            self.levels[count] |= 1 << index
+
+    @property
+    def makeable(self):
+        return bit_count(self.levels[0])
+
+    def suggestion(self, key, unlocked, makeable):
+        return {
+            'id': self.bottles[key]['id'],
+            'name': self.bottles[key]['name'],
+            'unlocks': bit_count(unlocked),
+            'recipes': sorted(self.recipe_names[i] for i in bit_indexes(unlocked)),
+            'makeable_after': makeable,
+        }
+
+    def rank(self, k):
+        """The k missing ingredients that alone unlock the most recipes"""
+        one_away = self.levels[1] if len(self.levels) > 1 else 0
+        scored = sorted(
+            ((uses & one_away, uses, key) for key, uses in self.uses.items()),
+            key=lambda item: (-bit_count(item[0]), -bit_count(item[1]), item[2])
+        )
+        return [self.suggestion(key, unlocked, self.makeable + bit_count(unlocked))
+                for unlocked, _, key in scored[:k] if unlocked]
+
+    def greedy(self, k):
+        """
+        Choose k bottles one at a time, each unlocking the most recipes given the ones before.
+
+        Ties (including when no single bottle unlocks anything) go to the
+        bottle bringing the most recipes within one ingredient of makeable,
+        then to the one used by the most recipes.
+        """
+        levels = list(self.levels) + [0]
+        remaining = dict(self.uses)
+        suggestions = []
+        while remaining and len(suggestions) < k:
+            # max() keeps the first of equal scores, so ties go to the lowest name
+            key = max(sorted(remaining), key=lambda key: (
+                bit_count(remaining[key] & levels[1]),
+                bit_count(remaining[key] & levels[2]),
+                bit_count(remaining[key]),
+            ))
+            uses = remaining.pop(key)
+            unlocked = uses & levels[1]
+            # Recipes using this bottle now miss one ingredient fewer
+            for count in range(1, len(levels) - 1):
+                moved = uses & levels[count]
+                levels[count] &= ~moved
+                levels[count - 1] |= moved
+            suggestions.append(self.suggestion(key, unlocked, bit_count(levels[0])))
+        return suggestions
+
+    def suggest(self, mode, k):
+        return self.greedy(k) if mode == 'greedy' else self.rank(k)
+
+
+def name_for(key, names):
+    """The recipe's spelling of an ingredient name with the given normalized key"""
+    return next(name for name in names if normalize_name(name) == key)
+
+
+class NextBottlesCache:
+    """Keeps the ShelfIndex and its answers until the tables' fingerprint changes"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._index = None
+        self._results = {}
+
+    def lookup(self, current, mode, k):
+        """Cached (index, suggestions) for the fingerprint, or None"""
+        with self._lock:
+            if current != self._fingerprint:
+                return None
+            key = (mode, k)
+            if key not in self._results:
+                self._results[key] = self._index.suggest(mode, k)
+            return self._index, self._results[key]
+
+    def store(self, current, index, mode, k):
+        """Cache a freshly built index and return (index, suggestions)"""
+        suggestions = index.suggest(mode, k)
+        with self._lock:
+            self._fingerprint = current
+            self._index = index
+            self._results = {(mode, k): suggestions}
+        return index, suggestions
+
+    def clear(self):
+        with self._lock:
+            self._fingerprint = None
+            self._index = None
+            self._results = {}
+
+
+def next_bottles_params(args):
+    """
+    Validate the k and mode query parameters.
+
+    Returns:
+        Tuple of (mode, k, error message or None)
+    """
+    mode = (args.get('mode') or 'greedy').lower()
+    if mode not in MODES:
+        return None, None, 'mode must be one of: ' + ', '.join(MODES)
+    try:
+        k = int(args.get('k', DEFAULT_SUGGESTIONS))
+    except ValueError:
+        return None, None, 'k must be an integer'
+    if not 1 <= k <= MAX_SUGGESTIONS:
+        return None, None, f'k must be between 1 and {MAX_SUGGESTIONS}'
+    return mode, k, None
+
+
+def next_bottles_response(index, mode, k, suggestions, cached):
+    """Response body of GET /api/insights/next-bottles"""
+    return {
+        'mode': mode,
+        'k': k,
+        'recipes': len(index.recipe_names),
+        'makeable': index.makeable,
+        'suggestions': suggestions,
+        'cached': cached,
+    }
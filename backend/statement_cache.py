@@ -0,0 +1,81 @@
+"""
+Prepared statement cache for Neighborhood Sips
+Hot fixed-shape queries (point lookups by id, single-column updates) are run
+as server-side prepared statements: the SQL is parsed by MySQL once per
+pooled connection and later executions only send the parameters, with
+results returned in the binary protocol.
+
+Prepared cursors are cached on the underlying connection, so they survive
+the connection going back to the pool and are reused by later requests.
+The cache is bounded; the least recently used statement is closed when it
+is full.
+
+mysql-connector only skips re-preparing when execute() receives the very
+same string object it prepared, so the cache always executes its own copy
+of the SQL text.
+"""
+
+from collections import OrderedDict
+from mysql.connector import Error as MySQLError
+
+# Prepared statements kept per connection (MySQL limits them server-wide
+# with max_prepared_stmt_count, default 16382)
+MAX_PREPARED_STATEMENTS = 32
+
+
+def _statement_cache(connection):
+    """Return the prepared cursor cache of the underlying connection"""
+    raw = getattr(connection, 'raw_connection', connection)
+    cache = getattr(raw, '_prepared_cursors', None)
+    if cache is None:
+        cache = OrderedDict()
+        raw._prepared_cursors = cache
+    return cache
+
+
+def prepared_cursor(connection, sql, dictionary=True):
+    """
+    Get the cached prepared cursor for a statement, creating it on first use.
+
+    Returns:
+        Tuple of (cursor, sql) - execute the returned sql object on the cursor
+    """
+    cache = _statement_cache(connection)
+    key = (sql, dictionary)
+    entry = cache.get(key)
+    if entry is not None:
+        cache.move_to_end(key)
+        return entry
+
+    cursor = connection.cursor(prepared=True, dictionary=dictionary)
+    entry = cache[key] = (cursor, sql)
+    if len(cache) > MAX_PREPARED_STATEMENTS:
+        _, (old_cursor, _) = cache.popitem(last=False)
+        try:
+            old_cursor.close()
+        except MySQLError:
+            pass
+    return entry
+
+
+def execute_prepared(connection, sql, params=(), dictionary=True):
+    """
+    Execute a statement through its cached prepared cursor.
+
+    Returns:
+        The cursor, for fetching rows or reading rowcount
+    """
+    cursor, statement = prepared_cursor(connection, sql, dictionary)
+    try:
+        cursor.execute(statement, tuple(params))
+    except MySQLError:
+        # Drop the statement; it is prepared again on the next call
+        _statement_cache(connection).pop((sql, dictionary), None)
+        raise
+    return cursor
+
+
+def fetch_one_prepared(connection, sql, params=(), dictionary=True):
+    """Run a prepared point lookup and return the first row, or None"""
+    rows = execute_prepared(connection, sql, params, dictionary).fetchall()
+    return rows[0] if rows else None
@@ -179,8 +179,14 @@ app.controller('RecipesController', ['$scope', 'ApiService', 'API_URL', function
         return ingredient ? ingredient.name : 'Unknown';
     };
 
-    // Get image URL
-    $scope.getImageUrl = function(filename) {
+    // Get image URL - prefer the fingerprinted (long-cached) URL returned by the API
+    $scope.getImageUrl = function(filename, doc) {
+        if (doc && doc.image_urls && doc.images) {
+            var index = doc.images.indexOf(filename);
+            if (index !== -1 && doc.image_urls[index]) {
+                return API_URL + '/' + doc.image_urls[index];
+            }
+        }
         return API_URL + '/uploads/' + filename;
     };
 
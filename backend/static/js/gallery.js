@@ -40,8 +40,9 @@ async function loadGalleryImages() {
         const data = await response.json();
         
         if (data.images && data.images.length > 0) {
-            generalImages = data.images.filter(img => !img.filename.toLowerCase().startsWith('menu'));
-            menuImages = data.images.filter(img => img.filename.toLowerCase().startsWith('menu'));
+            // Menu/general grouping is done by the server
+            generalImages = (data.groups && data.groups.general) || [];
+            menuImages = (data.groups && data.groups.menu) || [];
             renderGallery();
         } else {
             showEmptyState();
@@ -52,6 +53,22 @@ async function loadGalleryImages() {
     }
 }
 
+// Width/height hints so the browser can reserve space before the image loads
+function sizeAttributes(img) {
+    if (!img.width || !img.height) {
+        return '';
+    }
+    return ` width="${img.width}" height="${img.height}"`;
+}
+
+// Blurred low-quality placeholder shown behind the image while it loads
+function placeholderStyle(img) {
+    if (!img.placeholder || img.placeholder.indexOf('data:image/') !== 0) {
+        return '';
+    }
+    return ` style="background-image: url('${img.placeholder}'); background-size: cover; background-position: center;"`;
+}
+
 // Render the gallery with two sections
 function renderGallery() {
     const container = document.getElementById('galleryContainer');
@@ -68,8 +85,8 @@ function renderGallery() {
                 <h3 class="gallery-section-title"></h3>
                 <div class="gallery-mosaic">
                     ${generalImages.map((img, index) => `
-                        <div class="gallery-mosaic-item" onclick="openImageModal(${index}, 'general')">
-                            <img src="${img.url}" alt="Gallery image ${index + 1}" loading="lazy">
+                        <div class="gallery-mosaic-item" onclick="openImageModal(${index}, 'general')"${placeholderStyle(img)}>
+                            <img src="${img.url}" alt="Gallery image ${index + 1}" loading="lazy"${sizeAttributes(img)}>
                         </div>
                     `).join('')}
                 </div>
@@ -83,8 +100,8 @@ function renderGallery() {
                 <h3 class="gallery-section-title">Menus</h3>
                 <div class="gallery-mosaic">
                     ${menuImages.map((img, index) => `
-                        <div class="gallery-mosaic-item" onclick="openImageModal(${index}, 'menu')">
-                            <img src="${img.url}" alt="Creative menu ${index + 1}" loading="lazy">
+                        <div class="gallery-mosaic-item" onclick="openImageModal(${index}, 'menu')"${placeholderStyle(img)}>
+                            <img src="${img.url}" alt="Creative menu ${index + 1}" loading="lazy"${sizeAttributes(img)}>
                         </div>
                     `).join('')}
                 </div>
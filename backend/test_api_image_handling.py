@@ -96,7 +96,7 @@ def test_recipe_creation_legacy_format():
         # Should work with legacy format too
         if isinstance(img_data, str) and img_data.startswith('data:'):
             filename = save_base64_image(img_data, 'recipe')
-            if filename and filename.startswith('recipe_'):
+            if filename and os.path.basename(filename).startswith('recipe_'):
                 print(f"✓ Recipe image saved with prefix: {filename}")
                 # Clean up
                 try:
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test the app factory: fast imports with no database work, per-app
+configuration, lazy pool creation and fresh pools after fork
+"""
+import sys
+import os
+import subprocess
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import app as app_module
+from app import create_app, get_db_pools
+from config import Config
+from db_pool import ConnectionPool
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Self time allowed for executing app.py itself (dependencies excluded)
+MAX_IMPORT_SELF_SECONDS = 0.25
+
+IMPORT_CHECK = """
+import mysql.connector
+connects = []
+mysql.connector.connect = lambda *args, **kwargs: connects.append(kwargs)
+import app
+assert 'app' not in vars(app), 'default app created at import'
+assert app.db_pool is None, 'pool created at import'
+app.create_app()
+print(len(connects))
+"""
+
+
+def test_import_does_no_database_work():
+    """Test importing app.py and creating an app open no connections and stay fast"""
+    print("\n=== Test 1: Import-time work ===")
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', IMPORT_CHECK],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, f"Import check failed:\n{result.stderr[-2000:]}"
+    assert result.stdout.strip() == '0', f"Expected no MySQL connections, got {result.stdout.strip()}"
+
+    # -X importtime lines: "import time: self [us] | cumulative | module"
+    self_us = next(
+        int(line.split('|')[0].split(':')[1])
+        for line in result.stderr.splitlines()
+        if line.startswith('import time:') and line.split('|')[2].strip() == 'app'
+    )
+    print(f"  app.py import self time: {self_us / 1000:.1f} ms")
+    assert self_us / 1_000_000 < MAX_IMPORT_SELF_SECONDS, f"Import took {self_us / 1000:.1f} ms"
+
+    print("✓ PASS: No database connections at import or app creation")
+    return True
+
+
+def test_factory_config_and_lazy_pools():
+    """Test each app gets its own configuration and pools are created on first use"""
+    print("\n=== Test 2: Factory configuration and lazy pools ===")
+
+    class TestConfig(Config):
+        FILE_OFFLOAD_MODE = 'X-Accel'
+        DB_POOL_SIZE = 2
+        DB_POOL_MAX_OVERFLOW = 1
+        MYSQL_REPLICA_HOSTS = ['replica-a', 'replica-b:3307']
+
+    test_app = create_app(TestConfig)
+    assert test_app is not app_module.app
+    assert test_app.config['FILE_OFFLOAD_MODE'] == 'x-accel'
+    assert os.path.isabs(test_app.config['UPLOAD_FOLDER'])
+    assert any(str(rule) == '/api/recipes/<int:recipe_id>' for rule in test_app.url_map.iter_rules())
+
+    previous = (app_module.db_pool, app_module.replica_pools)
+    app_module.db_pool, app_module.replica_pools = None, {}
+    try:
+        with test_app.app_context():
+            primary, replicas = get_db_pools()
+            assert get_db_pools()[0] is primary, "Expected pools to be created once"
+        assert isinstance(primary, ConnectionPool)
+        assert (primary.pool_size, primary.max_overflow) == (2, 1)
+        assert sorted(replicas) == ['replica-a:3306', 'replica-b:3307']
+        assert primary.stats()['open'] == 0, "Expected no connections before the first query"
+    finally:
+        app_module.db_pool, app_module.replica_pools = previous
+
+    print("✓ PASS: Per-app configuration, pools created lazily")
+    return True
+
+
+def test_forked_child_creates_own_pools():
+    """Test a forked worker does not inherit the parent's pools"""
+    print("\n=== Test 3: Fresh pools after fork ===")
+
+    if not hasattr(os, 'fork'):
+        print("⚠ Skipped: os.fork not available")
+        return True
+
+    previous = (app_module.db_pool, app_module.replica_pools)
+    app_module.db_pool = ConnectionPool(lambda: None, pool_size=1)
+    app_module.replica_pools = {'replica:3306': ConnectionPool(lambda: None, pool_size=1)}
+    try:
+        pid = os.fork()
+        if pid == 0:
+            ok = app_module.db_pool is None and app_module.replica_pools == {}
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0, "Child process kept the parent's pools"
+        assert app_module.db_pool is not None, "Parent pools must be untouched"
+    finally:
+        app_module.db_pool, app_module.replica_pools = previous
+
+    print("✓ PASS: Forked child starts without pools")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing App Factory and Lazy Pools")
+    print("=" * 80)
+
+    tests = [
+        test_import_does_no_database_work,
+        test_factory_config_and_lazy_pools,
+        test_forked_child_creates_own_pools,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Test the ASGI variant (asgi_app.py) returns the same responses as the WSGI app
+
+Both apps are served canned rows from fake connections, so no MySQL server is
+needed. Reported as skipped when the optional ASGI dependencies are not
+installed; requirements-test.txt includes them, so parity runs in CI:
+
+    pip install -r requirements-test.txt
+    python3 -m pytest test_asgi_app.py
+"""
+import sys
+import os
+import json
+import asyncio
+import io
+import re
+import time
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime
+import pytest
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app as wsgi_app
+from fake_db import FakeAsyncPool, fake_pool
+import metrics
+from mysql.connector.errors import IntegrityError
+
+try:
+    import asgi_app as asgi_module
+    ASGI_IMPORT_ERROR = None
+except ImportError as e:
+    asgi_module = None
+    ASGI_IMPORT_ERROR = e
+
+NOW = datetime(2025, 6, 1, 12, 30)
+
+INGREDIENTS = [
+    {'id': 1, 'name': 'Gin', 'tags': '["spirit"]', 'images': '[]', 'bar_shelf_availability': 'Y',
+     'created_at': NOW, 'updated_at': NOW},
+    {'id': 2, 'name': 'Lime', 'tags': '["citrus"]', 'images': '[]', 'bar_shelf_availability': 'N',
+     'created_at': NOW, 'updated_at': NOW},
+]
+
+RECIPES = [
+    {'id': 1, 'name': 'Gin Neat', 'tags': '["classic"]', 'images': '[]',
+     'ingredients': '[{"name": "Gin", "amount": "2 oz"}]', 'created_at': NOW, 'updated_at': NOW},
+    {'id': 2, 'name': 'Gimlet', 'tags': '["sour"]', 'images': '[]',
+     'ingredients': '[{"name": "Gin", "amount": "2 oz"}, {"name": "Lime", "amount": "1 oz"}]',
+     'created_at': NOW, 'updated_at': NOW},
+]
+
+
+def rows_for(sql, params):
+    """Canned result rows for a statement, shared by the WSGI and ASGI fakes"""
+    sql = ' '.join(sql.split())
+    if sql.startswith('SELECT name_normalized, bar_shelf_availability FROM ingredients'):
+        return [{'name_normalized': i['name'].lower(), 'bar_shelf_availability': i['bar_shelf_availability']}
+                for i in INGREDIENTS if i['name'].lower() in params]
+    for table, rows in (('ingredients', INGREDIENTS), ('recipes', RECIPES)):
+        if sql.startswith(f'SELECT * FROM {table} WHERE id = %s'):
+            return [dict(r) for r in rows if r['id'] == params[0]]
+        if sql.startswith(f'SELECT * FROM {table}'):
+            return [dict(r) for r in rows]
+    return []
+
+
+# Skip, visibly, when the ASGI dependencies are missing
+requires_asgi = pytest.mark.skipif(
+    asgi_module is None, reason=f"ASGI dependencies not installed ({ASGI_IMPORT_ERROR})"
+)
+
+
+def get_both(url, rows=rows_for):
+    """GET a URL from both apps. Returns ((status, headers, body) WSGI, (...) ASGI)."""
+    previous_async_pool = asgi_module.db_pool
+    asgi_module.db_pool = FakeAsyncPool(rows, rowcount=0)
+    try:
+        with fake_pool(rows, rowcount=0) as pool:
+            response = wsgi_app.test_client().get(url)
+        wsgi = (response.status_code, response.headers, response.get_data())
+
+        async def fetch():
+            response = await asgi_module.app.test_client().get(url)
+            return response.status_code, response.headers, await response.get_data()
+
+        asgi = asyncio.run(fetch())
+        assert asgi_module.db_pool.released == pool.stats()['acquired_total'], \
+            "Expected every async connection to be released"
+        return wsgi, asgi
+    finally:
+        asgi_module.db_pool = previous_async_pool
+
+
+def assert_same_json(url, expected_status=200):
+    wsgi, asgi = get_both(url)
+    assert wsgi[0] == asgi[0] == expected_status, f"{url}: status {wsgi[0]} (WSGI) vs {asgi[0]} (ASGI)"
+    assert json.loads(wsgi[2]) == json.loads(asgi[2]), f"{url}: bodies differ\n{wsgi[2]}\n{asgi[2]}"
+    return json.loads(asgi[2])
+
+
+@requires_asgi
+def test_read_endpoints_match():
+    """Test list, point lookup and not-found responses are identical"""
+    print("\n=== Test 1: Read endpoints match ===")
+
+    assert_same_json('/api/health')
+    assert len(assert_same_json('/api/ingredients')) == 2
+    ingredient = assert_same_json('/api/ingredients/1')
+    assert ingredient['tags'] == ['spirit'] and ingredient['created_at'] == '2025-06-01T12:30:00'
+    assert_same_json('/api/ingredients/99', expected_status=404)
+    assert_same_json('/api/recipes/2')
+
+    print("✓ PASS: Same status and JSON from both apps")
+    return True
+
+
+@requires_asgi
+def test_bar_shelf_filter_matches():
+    """Test the bar shelf recipe filter gives the same result"""
+    print("\n=== Test 2: Bar shelf filter matches ===")
+
+    recipes = assert_same_json('/api/recipes?bar_shelf_mode=Y')
+    assert [r['name'] for r in recipes] == ['Gin Neat'], f"Unexpected recipes: {recipes}"
+
+    print("✓ PASS: Only recipes with every ingredient on the shelf, in both apps")
+    return True
+
+
+@requires_asgi
+def test_static_endpoints_match():
+    """Test uploads and the asset manifest are served the same way"""
+    print("\n=== Test 3: Uploads and asset manifest match ===")
+
+    assert_same_json('/api/assets/manifest')
+
+    upload = next(
+        name for name in sorted(os.listdir(wsgi_app.config['UPLOAD_FOLDER']))
+        if os.path.isfile(os.path.join(wsgi_app.config['UPLOAD_FOLDER'], name))
+    )
+    wsgi, asgi = get_both(f'/api/uploads/{upload}')
+    assert wsgi[0] == asgi[0] == 200, f"Expected 200, got {wsgi[0]} / {asgi[0]}"
+    assert wsgi[2] == asgi[2], "Upload bytes differ"
+    assert wsgi[1]['Cache-Control'] == asgi[1]['Cache-Control']
+    assert wsgi[1]['Content-Type'] == asgi[1]['Content-Type']
+
+    wsgi, asgi = get_both('/api/uploads/missing-file.png')
+    assert wsgi[0] == asgi[0] == 404
+
+    print("✓ PASS: Same upload bytes, headers and manifest from both apps")
+    return True
+
+
+@requires_asgi
+def test_health_probes_match():
+    """Test the liveness and readiness probes answer the same way"""
+    print("\n=== Test 4: Health probes match ===")
+
+    assert_same_json('/api/health/live')
+
+    wsgi_app.extensions['readiness'].clear()
+    asgi_module.readiness.clear()
+    wsgi, asgi = get_both('/api/health/ready')
+    assert wsgi[0] == asgi[0] == 200, f"Expected ready, got {wsgi[0]} / {asgi[0]}\n{asgi[2]}"
+    wsgi, asgi = json.loads(wsgi[2]), json.loads(asgi[2])
+    assert wsgi['status'] == asgi['status'] == 'ready'
+    assert {name: check['status'] for name, check in wsgi['checks'].items()} == \
+        {name: check['status'] for name, check in asgi['checks'].items()}, f"{wsgi['checks']} vs {asgi['checks']}"
+    assert set(asgi['checks']['database']) == {'status', 'latency_ms', 'acquire_ms', 'query_ms'}
+
+    print("✓ PASS: Same probes and readiness checks in both apps")
+    return True
+
+
+@requires_asgi
+def test_metrics_match():
+    """Test both apps expose the same Prometheus metrics"""
+    print("\n=== Test 5: Metrics match ===")
+
+    # Both apps record into this process's registry: one request each
+    def bar_shelf_requests():
+        labels = {'route': '/api/recipes?bar_shelf_mode=Y', 'method': 'GET', 'status': '200'}
+        return sum(value for _, sample_labels, value in metrics.HTTP_REQUESTS.samples() if sample_labels == labels)
+
+    before = bar_shelf_requests()
+    get_both('/api/recipes?bar_shelf_mode=Y')
+    assert bar_shelf_requests() == before + 2, "Expected the ASGI request counted under the bar shelf route"
+
+    wsgi, asgi = get_both('/api/metrics')
+    assert wsgi[0] == asgi[0] == 200, f"Expected 200, got {wsgi[0]} / {asgi[0]}"
+    assert wsgi[1]['Content-Type'] == asgi[1]['Content-Type']
+    assert asgi[1]['Cache-Control'] == 'no-store'
+
+    def families(body):
+        return {line.split()[2] for line in body.decode().splitlines() if line.startswith('# TYPE')}
+
+    assert families(wsgi[2]) == families(asgi[2]), families(wsgi[2]) ^ families(asgi[2])
+    assert 'db_pool_acquire_seconds_count{pool="primary"}' in asgi[2].decode()
+
+    print("✓ PASS: Same metric families from both apps")
+    return True
+
+
+@requires_asgi
+def test_rename_conflict_matches():
+    """Test renaming an ingredient onto an existing name returns 409 in both apps and keeps its images"""
+    print("\n=== Test 6: Rename conflict matches ===")
+
+    def rows(error):
+        def respond(query, params):
+            if query.lstrip().startswith('UPDATE ingredients'):
+                raise error
+            return [{'images': '["lime.png"]'}]
+        return respond
+
+    body = {'name': 'gin ', 'images': [], 'removed_images': ['lime.png']}
+    previous = (wsgi_app.config['UPLOAD_FOLDER'], asgi_module.UPLOAD_FOLDER, asgi_module.db_pool)
+    with tempfile.TemporaryDirectory() as upload_folder:
+        with open(os.path.join(upload_folder, 'lime.png'), 'wb') as f:
+            f.write(b'png')
+        wsgi_app.config['UPLOAD_FOLDER'] = asgi_module.UPLOAD_FOLDER = upload_folder
+        asgi_module.db_pool = FakeAsyncPool(rows(asgi_module.aiomysql.IntegrityError(1062, "Duplicate entry 'gin'")))
+        try:
+            with fake_pool(rows(IntegrityError(msg="Duplicate entry 'gin'", errno=1062))):
+                wsgi = wsgi_app.test_client().put('/api/ingredients/2', json=body)
+
+            async def put():
+                response = await asgi_module.app.test_client().put('/api/ingredients/2', json=body)
+                return response.status_code, await response.get_json()
+
+            asgi = asyncio.run(put())
+        finally:
+            wsgi_app.config['UPLOAD_FOLDER'], asgi_module.UPLOAD_FOLDER, asgi_module.db_pool = previous
+
+        assert wsgi.status_code == asgi[0] == 409, f"Expected 409, got {wsgi.status_code} / {asgi[0]}"
+        assert wsgi.get_json() == asgi[1] == {'error': 'Ingredient already exists'}
+        assert os.listdir(upload_folder) == ['lime.png'], "Expected the removed image kept after the conflict"
+
+    print("✓ PASS: 409 from both apps; images untouched")
+    return True
+
+
+@requires_asgi
+def test_request_timings_match():
+    """Test both apps log slow queries with their plan and send the same Server-Timing metrics"""
+    print("\n=== Test 7: Slow-query log and Server-Timing match ===")
+
+    def slow_rows(query, params):
+        time.sleep(0.002)
+        if query.startswith('EXPLAIN'):
+            return [{'id': 1, 'table': 'recipes', 'type': 'ALL', 'key': None, 'rows': 5000}]
+        return rows_for(query, params)
+
+    timing_config = {'SLOW_QUERY_MS': 1, 'SLOW_QUERY_EXPLAIN': True, 'SERVER_TIMING': True}
+    previous = {key: (wsgi_app.config[key], getattr(asgi_module.config, key)) for key in timing_config}
+    wsgi_app.config.update(timing_config)
+    for key, value in timing_config.items():
+        setattr(asgi_module.config, key, value)
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            wsgi, asgi = get_both('/api/recipes?tags=classic', rows=slow_rows)
+    finally:
+        for key, (wsgi_value, asgi_value) in previous.items():
+            wsgi_app.config[key] = wsgi_value
+            setattr(asgi_module.config, key, asgi_value)
+
+    log = output.getvalue()
+    assert log.count('Slow query on /api/recipes') == 2, f"Expected a slow-query line per app, got: {log}"
+    assert log.count('full table scan') == 2, f"Expected the EXPLAIN plan from both apps, got: {log}"
+
+    def timing_names(headers):
+        return re.findall(r'(\w+);dur=', headers['Server-Timing'])
+
+    assert timing_names(wsgi[1]) == timing_names(asgi[1]) == ['db', 'serialize', 'image'], \
+        f"{wsgi[1].get('Server-Timing')} vs {asgi[1].get('Server-Timing')}"
+    for headers in (wsgi[1], asgi[1]):
+        assert 'desc="1 queries, 2 rows"' in headers['Server-Timing'], headers['Server-Timing']
+
+    print("✓ PASS: Same slow-query log and Server-Timing metrics from both apps")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing ASGI / WSGI Response Parity")
+    print("=" * 80)
+
+    if asgi_module is None:
+        print(f"✗ ERROR: ASGI dependencies not installed ({ASGI_IMPORT_ERROR}); "
+              "pip install -r requirements-test.txt")
+        return 1
+
+    tests = [
+        test_read_endpoints_match,
+        test_bar_shelf_filter_matches,
+        test_static_endpoints_match,
+        test_health_probes_match,
+        test_metrics_match,
+        test_rename_conflict_matches,
+        test_request_timings_match,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test fingerprinted URLs and Cache-Control policies for static assets and uploads
+"""
+import sys
+import os
+import re
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app, STATIC_FOLDER, add_image_urls
+from asset_manifest import (
+    IMMUTABLE_CACHE_CONTROL, fingerprinted_name, split_fingerprint, fingerprints,
+)
+
+
+def test_split_fingerprint():
+    """Test fingerprinted names round-trip to their logical names"""
+    print("\n=== Test 1: Fingerprinted name round-trip ===")
+
+    name = fingerprinted_name('js/app.js', '0123456789')
+    assert name == 'js/app.0123456789.js', f"Unexpected fingerprinted name: {name}"
+    assert split_fingerprint(name) == ('js/app.js', '0123456789')
+    assert split_fingerprint('Menu May 2026.jpg') == ('Menu May 2026.jpg', None)
+
+    print("✓ PASS: Fingerprinted names round-trip")
+    return True
+
+
+def test_index_html_rewritten_and_revalidated():
+    """Test index.html references fingerprinted assets and gets a short revalidating policy"""
+    print("\n=== Test 2: index.html references fingerprinted assets ===")
+
+    client = app.test_client()
+    response = client.get('/')
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+
+    cache_control = response.headers.get('Cache-Control', '')
+    assert 'immutable' not in cache_control, "index.html must not be immutable"
+    assert 'must-revalidate' in cache_control, f"Expected revalidating policy, got {cache_control}"
+
+    html = response.get_data(as_text=True)
+    match = re.search(r'href="(css/style\.[0-9a-f]{10}\.css)"', html)
+    assert match, "Expected fingerprinted css/style.css reference"
+
+    # The fingerprinted asset is served as immutable
+    asset = client.get('/' + match.group(1))
+    assert asset.status_code == 200, f"Expected 200, got {asset.status_code}"
+    assert asset.headers.get('Cache-Control') == IMMUTABLE_CACHE_CONTROL, \
+        f"Expected immutable policy, got {asset.headers.get('Cache-Control')}"
+
+    # The plain name still works but is not immutable
+    plain = client.get('/css/style.css')
+    assert plain.status_code == 200
+    assert 'immutable' not in plain.headers.get('Cache-Control', '')
+
+    # A stale fingerprint serves current content without the immutable policy
+    stale = client.get('/css/style.0000000000.css')
+    assert stale.status_code == 200
+    assert 'immutable' not in stale.headers.get('Cache-Control', '')
+
+    print("✓ PASS: index.html rewritten, fingerprinted assets immutable")
+    return True
+
+
+def test_fingerprinted_upload():
+    """Test uploaded images get fingerprinted URLs served as immutable"""
+    print("\n=== Test 3: Fingerprinted upload URLs ===")
+
+    filename = 'test_fingerprint_upload.jpg'
+    path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+    with open(path, 'wb') as f:
+        f.write(b'fake image bytes')
+
+    try:
+        doc = add_image_urls({'images': [filename]})
+        url = doc['image_urls'][0]
+        expected = 'uploads/' + fingerprinted_name(filename, fingerprints.fingerprint(path))
+        assert url == expected, f"Expected {expected}, got {url}"
+
+        client = app.test_client()
+        response = client.get('/api/' + url)
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.data == b'fake image bytes'
+        assert response.headers.get('Cache-Control') == IMMUTABLE_CACHE_CONTROL
+
+        response = client.get('/api/uploads/' + filename)
+        assert response.status_code == 200
+        assert 'immutable' not in response.headers.get('Cache-Control', '')
+    finally:
+        os.remove(path)
+
+    print("✓ PASS: Upload URLs are fingerprinted and immutable")
+    return True
+
+
+def test_asset_manifest_endpoint():
+    """Test the manifest maps logical names to fingerprinted names"""
+    print("\n=== Test 4: Asset manifest endpoint ===")
+
+    client = app.test_client()
+    response = client.get('/api/assets/manifest')
+    assert response.status_code == 200
+    manifest = response.get_json()
+
+    assert 'js/app.js' in manifest, "Expected js/app.js in manifest"
+    logical, fingerprint = split_fingerprint(manifest['js/app.js'])
+    assert logical == 'js/app.js' and fingerprint, f"Unexpected manifest entry: {manifest['js/app.js']}"
+    assert os.path.exists(os.path.join(STATIC_FOLDER, 'js', 'app.js'))
+
+    print("✓ PASS: Manifest maps logical names to fingerprinted names")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Asset Fingerprinting and Caching")
+    print("=" * 80)
+
+    tests = [
+        test_split_fingerprint,
+        test_index_html_rewritten_and_revalidated,
+        test_fingerprinted_upload,
+        test_asset_manifest_endpoint,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
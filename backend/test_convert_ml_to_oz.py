@@ -5,11 +5,59 @@ Test script for convert_ml_to_oz.py conversion logic
 
 import sys
 import os
+import copy
+import json
+import tempfile
 
 # Add the backend directory to Python path
 sys.path.insert(0, os.path.dirname(__file__))
 
-from convert_ml_to_oz import convert_ingredient_units
+import mysql.connector
+from convert_ml_to_oz import convert_ingredient_units, convert_recipes_batched
+
+
+class FakeRecipesTable:
+    """In-memory recipes table answering the batched mode's page SELECT and UPDATE ... CASE"""
+    
+    def __init__(self, recipes, fail_on_update=None, as_bytes=False):
+        self.recipes = {recipe['id']: copy.deepcopy(recipe) for recipe in recipes}
+        self.as_bytes = as_bytes
+        self.committed = copy.deepcopy(self.recipes)
+        self.fail_on_update = fail_on_update
+        self.updates = 0
+        self.commits = 0
+        self.rows = []
+    
+    def execute(self, query, params):
+        if query.startswith('SELECT id, name, ingredients FROM recipes WHERE id > %s'):
+            after_id, limit = params
+            ids = sorted(i for i in self.recipes if i > after_id)[:limit]
+            self.rows = [dict(self.recipes[i], ingredients=self.column(self.recipes[i]['ingredients'])) for i in ids]
+        elif query.startswith('UPDATE recipes SET ingredients = CASE id'):
+            self.updates += 1
+            if self.updates == self.fail_on_update:
+                raise mysql.connector.Error('Lock wait timeout exceeded')
+            count = query.count('WHEN %s')
+            for i in range(count):
+                self.recipes[params[2 * i]]['ingredients'] = json.loads(params[2 * i + 1])
+            assert params[2 * count + 1:] == [params[2 * i] for i in range(count)]
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+    
+    def column(self, ingredients):
+        """The ingredients JSON column as the driver returns it"""
+        value = json.dumps(ingredients)
+        return value.encode('utf-8') if self.as_bytes else value
+    
+    def fetchall(self):
+        return self.rows
+    
+    def commit(self):
+        self.commits += 1
+        self.committed = copy.deepcopy(self.recipes)
+    
+    def rollback(self):
+        self.recipes = copy.deepcopy(self.committed)
 
 
 def test_basic_ml_conversion():
@@ -265,6 +313,75 @@ def test_rounding_to_quarter_oz():
     return True
 
 
+def test_batched_conversion():
+    """Test batched mode: one UPDATE per page, one transaction, diff file and checkpoint resume"""
+    print("\n=== Test 12: Batched conversion ===")
+    
+    recipes = [
+        {'id': n, 'name': f'Recipe {n}',
+         'ingredients': [{'name': 'Gin', 'amount': 30 * n, 'units': 'ml'}, {'name': 'Bitters', 'amount': 2, 'units': 'dashes'}]
+         if n % 2 else [{'name': 'Rum', 'amount': 2, 'units': 'Oz'}]}
+        for n in range(1, 8)
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        # Dry run: no writes, diff file lists every change
+        table = FakeRecipesTable(recipes)
+        diff_path = os.path.join(tmp, 'ml_to_oz.diff')
+        stats = convert_recipes_batched(table, table, dry_run=True, batch_size=3, diff_path=diff_path)
+        assert (stats['total_recipes'], stats['recipes_modified']) == (7, 4), stats
+        assert table.updates == 0 and table.commits == 0
+        with open(diff_path, encoding='utf-8') as f:
+            diff = f.read()
+        assert '@@ Recipe 3 (ID: 3)\n- Gin: 90 ml\n+ Gin: 3.0 Oz\n' in diff, diff
+        assert 'Bitters' not in diff and 'Recipe 2' not in diff
+        
+        # Without a checkpoint: one UPDATE per page with changes, one commit
+        table = FakeRecipesTable(recipes)
+        convert_recipes_batched(table, table, batch_size=3)
+        assert table.updates == 3 and table.commits == 1, (table.updates, table.commits)
+        assert table.committed[5]['ingredients'][0] == {'name': 'Gin', 'amount': 5.0, 'units': 'Oz'}
+        
+        # With a checkpoint: a failed page keeps earlier pages and the run resumes after them
+        table = FakeRecipesTable(recipes, fail_on_update=2)
+        checkpoint_path = os.path.join(tmp, 'ml_to_oz.checkpoint')
+        try:
+            convert_recipes_batched(table, table, batch_size=3, checkpoint_path=checkpoint_path)
+            assert False, "Expected the second page to fail"
+        except mysql.connector.Error:
+            pass
+        with open(checkpoint_path, encoding='utf-8') as f:
+            assert json.load(f)['last_id'] == 3
+        assert table.committed[1]['ingredients'][0]['units'] == 'Oz'
+        assert table.committed[5]['ingredients'][0]['units'] == 'ml', "Expected failed page rolled back"
+        
+        table.fail_on_update = None
+        stats = convert_recipes_batched(table, table, batch_size=3, checkpoint_path=checkpoint_path)
+        assert (stats['total_recipes'], stats['recipes_modified']) == (7, 4), stats
+        assert all(ing['units'] != 'ml' for r in table.committed.values() for ing in r['ingredients'])
+    
+    print("✓ PASS: Batched conversion writes pages with UPDATE ... CASE and resumes from checkpoint")
+    return True
+
+
+def test_batched_bytes_rows():
+    """Test batched mode decodes bytes JSON columns and skips rows that are not ingredient lists"""
+    print("\n=== Test 13: Batched conversion with bytes rows ===")
+    
+    recipes = [
+        {'id': 1, 'name': 'Gimlet', 'ingredients': [{'name': 'Gin', 'amount': 60, 'units': 'ml'}]},
+        {'id': 2, 'name': 'Broken', 'ingredients': {'name': 'Gin', 'amount': 60, 'units': 'ml'}},
+    ]
+    table = FakeRecipesTable(recipes, as_bytes=True)
+    stats = convert_recipes_batched(table, table, batch_size=10)
+    assert (stats['total_recipes'], stats['recipes_modified']) == (2, 1), stats
+    assert table.committed[1]['ingredients'] == [{'name': 'Gin', 'amount': 2.0, 'units': 'Oz'}]
+    assert table.committed[2]['ingredients'] == recipes[1]['ingredients'], "Expected the non-list row skipped"
+    
+    print("✓ PASS: bytes rows converted; non-list ingredients skipped")
+    return True
+
+
 def main():
     """Run all tests"""
     print("=" * 80)
@@ -282,7 +399,9 @@ def main():
         test_empty_ingredients_list,
         test_additional_ingredient_fields,
         test_special_ml_conversions,
-        test_rounding_to_quarter_oz
+        test_rounding_to_quarter_oz,
+        test_batched_conversion,
+        test_batched_bytes_rows
     ]
     
     passed = 0
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Test the bounded-wait connection pool (queueing, overflow, timeouts, metrics)
+"""
+import sys
+import os
+import time
+import threading
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from db_pool import ConnectionPool, PoolTimeoutError
+from fake_db import FakeConnection
+from mysql.connector.errors import PoolError
+
+
+def test_reuse_and_rollback():
+    """Test connections are reused and open transactions rolled back on return"""
+    print("\n=== Test 1: Reuse and rollback on release ===")
+
+    created = []
+    pool = ConnectionPool(lambda: created.append(FakeConnection()) or created[-1], pool_size=2)
+
+    conn = pool.get_connection()
+    raw = conn._connection
+    raw.in_transaction = True
+    conn.close()
+    conn.close()  # second close is a no-op
+
+    assert raw.rollbacks == 1, "Expected open transaction rolled back"
+    again = pool.get_connection()
+    assert again._connection is raw, "Expected idle connection reused"
+    again.close()
+
+    stats = pool.stats()
+    assert len(created) == 1 and stats['created_total'] == 1
+    assert stats['in_use'] == 0 and stats['idle'] == 1 and stats['acquired_total'] == 2
+
+    print("✓ PASS: Connections reused and rolled back")
+    return True
+
+
+def test_waits_instead_of_failing():
+    """Test a request beyond the pool size waits for a released connection"""
+    print("\n=== Test 2: Bounded wait when the pool is exhausted ===")
+
+    pool = ConnectionPool(FakeConnection, pool_size=1, timeout=2)
+    held = pool.get_connection()
+
+    def release_later():
+        time.sleep(0.05)
+        held.close()
+
+    thread = threading.Thread(target=release_later)
+    thread.start()
+    conn = pool.get_connection()
+    thread.join()
+
+    stats = pool.stats()
+    assert stats['wait_seconds_max'] >= 0.04, f"Expected a measured wait, got {stats['wait_seconds_max']}"
+    assert stats['waiters'] == 0 and stats['in_use'] == 1
+    conn.close()
+
+    print("✓ PASS: Sixth-request case waits instead of failing")
+    return True
+
+
+def test_overflow_and_timeout():
+    """Test overflow connections are closed on return and exhaustion times out"""
+    print("\n=== Test 3: Overflow and acquire timeout ===")
+
+    pool = ConnectionPool(FakeConnection, pool_size=1, max_overflow=1, timeout=0.05)
+    first = pool.get_connection()
+    second = pool.get_connection()
+    assert pool.stats()['open'] == 2
+
+    try:
+        pool.get_connection()
+        assert False, "Expected PoolTimeoutError"
+    except PoolTimeoutError as e:
+        assert isinstance(e, PoolError), "PoolTimeoutError should be a PoolError"
+    assert pool.stats()['timeouts_total'] == 1
+
+    # Whichever connection comes back while the pool is over its size is closed
+    overflow = second._connection
+    second.close()
+    first.close()
+    assert overflow.closed, "Expected overflow connection closed on return"
+    stats = pool.stats()
+    assert stats['open'] == 1 and stats['idle'] == 1, f"Unexpected stats: {stats}"
+
+    print("✓ PASS: Overflow released and exhaustion times out")
+    return True
+
+
+def test_failed_connect_frees_slot():
+    """Test a failing factory does not leak pool slots"""
+    print("\n=== Test 4: Failed connect frees its slot ===")
+
+    def broken_factory():
+        raise PoolError("server unavailable")
+
+    pool = ConnectionPool(broken_factory, pool_size=1, timeout=0.05)
+    for _ in range(3):
+        try:
+            pool.get_connection()
+            assert False, "Expected connect error"
+        except PoolTimeoutError:
+            assert False, "Slot leaked: got timeout instead of connect error"
+        except PoolError:
+            pass
+
+    stats = pool.stats()
+    assert stats['open'] == 0 and stats['in_use'] == 0, f"Unexpected stats: {stats}"
+
+    print("✓ PASS: Failed connects do not leak slots")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Connection Pool")
+    print("=" * 80)
+
+    tests = [
+        test_reuse_and_rollback,
+        test_waits_instead_of_failing,
+        test_overflow_and_timeout,
+        test_failed_connect_frees_slot,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Test the streaming recipe export (export_recipes.py): chunked fetches,
+txt/jsonl/csv/md output, gzip and formatting in worker processes
+"""
+import sys
+import os
+import csv
+import gzip
+import json
+import tempfile
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import export_recipes
+from fake_db import FakeCursor
+from export_recipes import output_format, open_output, export_header, stream_recipes, write_chunks, format_chunk
+
+RECIPES = [
+    {
+        'id': n,
+        'name': f'Recipe {n}',
+        'description': 'Bright, sour' if n % 2 else None,
+        'ingredients': json.dumps([{'name': 'Gin', 'amount': 2, 'units': 'oz'}, {'name': 'Lime, fresh'}]),
+        'instructions': 'Shake\nStrain',
+        'tags': json.dumps(['sour']) if n % 2 else '[]',
+    }
+    for n in range(1, 8)
+]
+
+
+def recipe_rows(query, params):
+    assert 'ORDER BY id' in query and 'SELECT *' not in query, query
+    return RECIPES
+
+
+def export_to(path, fmt=None, compress=None, workers=0):
+    """Export RECIPES to path the way export_recipes() does, without a database"""
+    fmt, compress = output_format(path, fmt, compress)
+    cursor = FakeCursor(recipe_rows)
+    with open_output(path, compress) as f:
+        f.write(export_header(fmt, len(RECIPES)))
+        count = write_chunks(f, fmt, stream_recipes(cursor, chunk_size=3), workers)
+    return count, cursor
+
+
+def test_streams_in_chunks():
+    """Test rows are fetched in chunks and the text format is unchanged"""
+    print("\n=== Test 1: Chunked text export ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'recipes_export.txt')
+        count, cursor = export_to(path)
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+
+    assert count == 7
+    assert cursor.fetches == [3, 3, 3, 3], f"Expected fetchmany(3) until empty, got {cursor.fetches}"
+    assert text.startswith('RECIPES EXPORT\n') and 'Total recipes: 7' in text
+    assert text.endswith(''.join(export_recipes.recipe_to_text(recipe) for recipe in RECIPES)), \
+        "Expected the text blocks in id order"
+
+    print("✓ PASS: Streamed in chunks of 3 with the existing text layout")
+    return True
+
+
+def test_formats_and_gzip():
+    """Test jsonl, csv and md output, with the format and gzip taken from the file name"""
+    print("\n=== Test 2: Formats and gzip ===")
+
+    assert output_format('out.jsonl.gz') == ('jsonl', True)
+    assert output_format('out.csv', compress=True) == ('csv', True)
+    assert output_format('out.data', fmt='md') == ('md', False)
+    assert output_format('out.data') == ('txt', False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'recipes.jsonl.gz')
+        export_to(path)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            docs = [json.loads(line) for line in f]
+        assert [doc['id'] for doc in docs] == list(range(1, 8))
+        assert docs[0]['ingredients'][0] == {'name': 'Gin', 'amount': 2, 'units': 'oz'} and docs[0]['tags'] == ['sour']
+
+        path = os.path.join(tmp, 'recipes.csv')
+        export_to(path)
+        with open(path, encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 7
+        assert rows[0]['ingredients'] == 'Gin (2 oz); Lime, fresh', rows[0]
+        assert rows[0]['instructions'] == 'Shake\nStrain' and rows[1]['tags'] == ''
+
+        path = os.path.join(tmp, 'recipes.md')
+        export_to(path)
+        with open(path, encoding='utf-8') as f:
+            markdown = f.read()
+        assert markdown.startswith('# Recipes Export')
+        assert '## Recipe 1\n\nBright, sour\n\n**Ingredients**\n\n- Gin (2 oz)\n- Lime, fresh\n' in markdown
+        assert '*Tags: sour*' in markdown
+
+    print("✓ PASS: jsonl, csv and md written; gzip detected from .gz")
+    return True
+
+
+def test_workers_preserve_order():
+    """Test formatting in worker processes writes the same output in order"""
+    print("\n=== Test 3: Worker processes ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'recipes.md')
+        count, _ = export_to(path, workers=2)
+        with open(path, encoding='utf-8') as f:
+            parallel = f.read()
+
+    expected = format_chunk('md', RECIPES)
+    assert count == 7
+    assert parallel.endswith(expected), "Expected the same Markdown, in id order"
+
+    print("✓ PASS: Parallel formatting matches the serial output")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Streaming Recipe Export")
+    print("=" * 80)
+
+    tests = [
+        test_streams_in_chunks,
+        test_formats_and_gzip,
+        test_workers_preserve_order,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test X-Accel-Redirect / X-Sendfile offload of uploads and static files
+"""
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app, STATIC_FOLDER
+from file_offload import normalize_mode
+from upload_store import sharded_path
+
+
+def get_with_mode(mode, url):
+    """Request a URL with the given offload mode enabled"""
+    previous_mode = app.config['FILE_OFFLOAD_MODE']
+    previous_sendfile = app.config['USE_X_SENDFILE']
+    app.config['FILE_OFFLOAD_MODE'] = mode
+    app.config['USE_X_SENDFILE'] = mode == 'x-sendfile'
+    try:
+        return app.test_client().get(url)
+    finally:
+        app.config['FILE_OFFLOAD_MODE'] = previous_mode
+        app.config['USE_X_SENDFILE'] = previous_sendfile
+
+
+def test_normalize_mode():
+    """Test offload modes are validated"""
+    print("\n=== Test 1: Offload mode validation ===")
+
+    assert normalize_mode(None) == ''
+    assert normalize_mode(' X-Accel ') == 'x-accel'
+    try:
+        normalize_mode('x-nginx')
+        assert False, "Expected ValueError for unknown mode"
+    except ValueError:
+        pass
+
+    print("✓ PASS: Offload modes validated")
+    return True
+
+
+def test_accel_redirect_upload():
+    """Test uploads return an X-Accel-Redirect to the sharded path with caching headers"""
+    print("\n=== Test 2: X-Accel-Redirect for uploads ===")
+
+    filename = 'test_offload_upload.jpg'
+    reference = sharded_path(filename)
+    path = os.path.join(app.config['UPLOAD_FOLDER'], *reference.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(b'offloaded bytes')
+
+    try:
+        # Flat reference is resolved to the shard before redirecting
+        response = get_with_mode('x-accel', '/api/uploads/' + filename)
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.headers.get('X-Accel-Redirect') == '/internal/uploads/' + reference, \
+            f"Unexpected redirect: {response.headers.get('X-Accel-Redirect')}"
+        assert response.data == b'', "Body must be left to the web server"
+        assert response.mimetype == 'image/jpeg'
+        assert 'max-age' in response.headers.get('Cache-Control', '')
+
+        missing = get_with_mode('x-accel', '/api/uploads/missing_offload.jpg')
+        assert missing.status_code == 404, f"Expected 404, got {missing.status_code}"
+        assert 'X-Accel-Redirect' not in missing.headers
+    finally:
+        os.remove(path)
+        for directory in (os.path.dirname(path), os.path.dirname(os.path.dirname(path))):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+    print("✓ PASS: Uploads offloaded with X-Accel-Redirect")
+    return True
+
+
+def test_sendfile_and_fallback_static():
+    """Test static files use X-Sendfile when enabled and are sent by Flask otherwise"""
+    print("\n=== Test 3: X-Sendfile and fallback for static files ===")
+
+    response = get_with_mode('x-sendfile', '/css/style.css')
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    assert response.headers.get('X-Sendfile') == os.path.join(STATIC_FOLDER, 'css', 'style.css'), \
+        f"Unexpected X-Sendfile: {response.headers.get('X-Sendfile')}"
+
+    response = get_with_mode('x-accel', '/css/style.css')
+    assert response.headers.get('X-Accel-Redirect') == '/internal/static/css/style.css'
+
+    response = get_with_mode('', '/css/style.css')
+    assert 'X-Accel-Redirect' not in response.headers and 'X-Sendfile' not in response.headers
+    with open(os.path.join(STATIC_FOLDER, 'css', 'style.css'), 'rb') as f:
+        assert response.data == f.read(), "Expected Flask to send the file itself"
+
+    print("✓ PASS: Static files offloaded or sent by Flask")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing File Offload")
+    print("=" * 80)
+
+    tests = [
+        test_normalize_mode,
+        test_accel_redirect_upload,
+        test_sendfile_and_fallback_static,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the cached gallery manifest (dimensions, placeholders, grouping, invalidation)
+"""
+import sys
+import os
+import time
+import tempfile
+from PIL import Image
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from gallery_manifest import GalleryManifest
+
+
+def create_image(path, size, color='red', date_taken=None):
+    """Create a JPEG, optionally with an EXIF capture date"""
+    img = Image.new('RGB', size, color=color)
+    exif = img.getexif()
+    if date_taken:
+        exif[306] = date_taken  # DateTime
+    img.save(path, 'JPEG', exif=exif)
+
+
+def test_manifest_contents():
+    """Test dimensions, byte size, capture date, placeholder and grouping"""
+    print("\n=== Test 1: Manifest contents ===")
+
+    with tempfile.TemporaryDirectory() as gallery_dir:
+        create_image(os.path.join(gallery_dir, 'party.jpg'), (300, 200), date_taken='2025:05:11 12:58:38')
+        create_image(os.path.join(gallery_dir, 'Menu May 2026.jpg'), (100, 400), color='blue')
+        with open(os.path.join(gallery_dir, 'readme.txt'), 'w') as f:
+            f.write('not an image')
+
+        response = GalleryManifest(gallery_dir).response()
+
+        assert len(response['images']) == 2, f"Expected 2 images, got {len(response['images'])}"
+        assert [img['filename'] for img in response['groups']['menu']] == ['Menu May 2026.jpg']
+        assert [img['filename'] for img in response['groups']['general']] == ['party.jpg']
+
+        party = response['groups']['general'][0]
+        assert (party['width'], party['height']) == (300, 200), f"Unexpected size: {party}"
+        assert party['bytes'] == os.path.getsize(os.path.join(gallery_dir, 'party.jpg'))
+        assert party['captured_at'] == '2025-05-11T12:58:38', f"Unexpected date: {party['captured_at']}"
+        assert party['placeholder'].startswith('data:image/jpeg;base64,'), "Expected placeholder data URI"
+        assert len(party['placeholder']) < 2000, "Placeholder should be tiny"
+        assert party['url'] == '/images/gallery/party.jpg'
+
+    print("✓ PASS: Manifest contains dimensions, dates, placeholders and groups")
+    return True
+
+
+def test_manifest_cache_and_invalidation():
+    """Test the manifest is served from cache and rebuilt when the directory changes"""
+    print("\n=== Test 2: Cache hits and directory mtime invalidation ===")
+
+    with tempfile.TemporaryDirectory() as gallery_dir, tempfile.TemporaryDirectory() as cache_dir:
+        cache_path = os.path.join(cache_dir, 'gallery_manifest.json')
+        create_image(os.path.join(gallery_dir, 'one.jpg'), (50, 50))
+
+        manifest = GalleryManifest(gallery_dir, cache_path=cache_path)
+        first = manifest.get()
+        assert manifest.get() is first, "Expected in-memory cache hit"
+        assert manifest.hits == 1 and manifest.misses == 1
+        assert os.path.exists(cache_path), "Expected manifest persisted to disk"
+
+        # A fresh instance (e.g. after restart) loads from disk without rescanning
+        restarted = GalleryManifest(gallery_dir, cache_path=cache_path)
+        assert restarted.get()['generated_at'] == first['generated_at'], "Expected manifest loaded from disk"
+
+        # Adding a file changes the directory mtime and triggers a rebuild
+        time.sleep(0.01)
+        create_image(os.path.join(gallery_dir, 'two.jpg'), (60, 40))
+        os.utime(gallery_dir, ns=(time.time_ns(), time.time_ns() + 1_000_000))
+        rebuilt = manifest.get()
+        assert [img['filename'] for img in rebuilt['images']] == ['one.jpg', 'two.jpg'], \
+            f"Expected rebuilt manifest, got {rebuilt['images']}"
+
+    print("✓ PASS: Manifest cached in memory and on disk, invalidated by directory mtime")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Gallery Manifest")
+    print("=" * 80)
+
+    tests = [
+        test_manifest_contents,
+        test_manifest_cache_and_invalidation,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test the liveness and readiness endpoints and the readiness result cache
+
+Uses fake pooled connections, so no MySQL server is needed.
+"""
+import sys
+import os
+import time
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app
+from fake_db import connection_factory, fake_pool
+from health import ProbeCache
+from mysql.connector.errors import InterfaceError
+
+
+def unreachable_database():
+    raise InterfaceError("Can't connect to MySQL server")
+
+
+def get_ready(factory):
+    """GET /api/health/ready with a fresh result and a pool built from factory"""
+    app.extensions['readiness'].clear()
+    try:
+        with fake_pool(factory=factory) as pool:
+            client = app.test_client()
+            first = client.get('/api/health/ready')
+            second = client.get('/api/health/ready')
+            return first, second, pool.stats()
+    finally:
+        app.extensions['readiness'].clear()
+
+
+def test_probe_cache_ttl():
+    """Test probe results are reused until the TTL expires"""
+    print("\n=== Test 1: Probe result cache ===")
+
+    calls = []
+    cache = ProbeCache(lambda: calls.append(1) or len(calls), ttl=0.2)
+    assert cache.get()[0] == 1
+    result, age = cache.get()
+    assert result == 1 and len(calls) == 1, "Expected the cached result within the TTL"
+    assert 0 <= age < 0.2
+
+    time.sleep(0.25)
+    assert cache.get()[0] == 2, "Expected a fresh result after the TTL"
+
+    print("✓ PASS: Results cached for the TTL")
+    return True
+
+
+def test_ready_when_dependencies_ok():
+    """Test readiness reports every component with latencies and is cached"""
+    print("\n=== Test 2: Ready ===")
+
+    first, second, stats = get_ready(connection_factory([(1,)]))
+    assert first.status_code == 200, f"Expected 200, got {first.status_code}: {first.get_json()}"
+    body = first.get_json()
+    assert body['status'] == 'ready'
+    database = body['checks']['database']
+    assert database['status'] == 'ok'
+    assert {'latency_ms', 'acquire_ms', 'query_ms'} <= set(database)
+    assert body['checks']['uploads']['status'] == 'ok'
+    if 'gallery_cache' in body['checks']:
+        assert 'warm' in body['checks']['gallery_cache']
+    assert first.headers['Cache-Control'] == 'no-store'
+
+    # The second probe within the TTL reuses the result
+    assert second.get_json()['checks'] == body['checks']
+    assert stats['acquired_total'] == 1, f"Expected one probe, got {stats['acquired_total']}"
+
+    print("✓ PASS: Ready with component latencies, second probe served from cache")
+    return True
+
+
+def test_not_ready_when_database_down():
+    """Test readiness fails (503) when MySQL is unreachable but liveness stays up"""
+    print("\n=== Test 3: Not ready without a database ===")
+
+    first, _, _ = get_ready(unreachable_database)
+    assert first.status_code == 503, f"Expected 503, got {first.status_code}"
+    body = first.get_json()
+    assert body['status'] == 'not ready'
+    assert body['checks']['database']['status'] == 'fail'
+    assert 'InterfaceError' in body['checks']['database']['error']
+    assert body['checks']['uploads']['status'] == 'ok'
+
+    live = app.test_client().get('/api/health/live')
+    assert live.status_code == 200 and live.get_json()['status'] == 'alive'
+
+    print("✓ PASS: 503 with the failing component, liveness unaffected")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Health and Readiness Endpoints")
+    print("=" * 80)
+
+    tests = [
+        test_probe_cache_ttl,
+        test_ready_when_dependencies_ok,
+        test_not_ready_when_database_down,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
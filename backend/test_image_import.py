@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Test the recipe image import (image_import.py): link/copy fallbacks,
+re-encoding, name collisions and verification
+"""
+import sys
+import os
+import tempfile
+from PIL import Image
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from image_import import ImageImporter, import_file
+from upload_store import sharded_path
+
+
+def make_recipe_folder(root, name, images):
+    """Create a recipe folder with data.json and the given {filename: (width, height)} images"""
+    folder = os.path.join(root, name)
+    os.makedirs(folder)
+    with open(os.path.join(folder, 'data.json'), 'w') as f:
+        f.write('{}')
+    for filename, size in images.items():
+        image_format = 'WEBP' if filename.endswith('.webp') else 'JPEG'
+        Image.new('RGB', size, (200, 40, 40)).save(os.path.join(folder, filename), image_format)
+    return folder
+
+
+def test_import_file_links_or_copies():
+    """Test auto mode links on the same filesystem and copy mode makes an independent file"""
+    print("\n=== Test 1: Link or copy ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        folder = make_recipe_folder(temp_dir, 'gimlet', {'gimlet.jpg': (40, 40)})
+        source = os.path.join(folder, 'gimlet.jpg')
+
+        linked = os.path.join(temp_dir, 'linked.jpg')
+        method = import_file(source, linked, 'auto')
+        assert method in ('reflink', 'link'), f"Expected reflink or link on one filesystem, got {method}"
+        if method == 'link':
+            assert os.path.samefile(source, linked)
+
+        copied = os.path.join(temp_dir, 'copied.jpg')
+        assert import_file(source, copied, 'copy') == 'copy'
+        assert not os.path.samefile(source, copied)
+        with open(source, 'rb') as a, open(copied, 'rb') as b:
+            assert a.read() == b.read(), "Copy differs from source"
+        assert os.stat(source).st_mtime_ns == os.stat(copied).st_mtime_ns, "Expected mtime preserved"
+
+    print(f"✓ PASS: auto used {method}; copy is an identical separate file")
+    return True
+
+
+def test_importer_collisions_and_verification():
+    """Test sharded names are assigned up front, collisions renamed, re-runs skipped and files verified"""
+    print("\n=== Test 2: Importer ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        uploads = os.path.join(temp_dir, 'uploads')
+        os.makedirs(uploads)
+        first = make_recipe_folder(temp_dir, 'first', {'image.jpg': (30, 30), 'glass.jpg': (30, 30)})
+        second = make_recipe_folder(temp_dir, 'second', {'image.jpg': (30, 30)})
+
+        importer = ImageImporter(uploads, mode='copy', workers=4)
+        assert importer.import_folder(first) == [sharded_path('glass.jpg'), sharded_path('image.jpg')]
+        assert importer.import_folder(second) == [sharded_path('image_1.jpg')], "Expected the clash renamed"
+        assert importer.finish() == [], "Expected every referenced image present"
+        assert importer.methods == {'copy': 3}, importer.methods
+        assert not any(name.endswith('.jpg') for name in os.listdir(uploads)), "Expected no flat uploads"
+        assert os.path.isfile(os.path.join(uploads, *sharded_path('image_1.jpg').split('/')))
+
+        # A second run finds the files already imported
+        importer = ImageImporter(uploads, mode='copy')
+        importer.import_folder(first)
+        assert importer.finish() == []
+        assert importer.methods == {'unchanged': 2}, importer.methods
+
+        # A referenced image that fails to import is reported missing
+        broken = make_recipe_folder(temp_dir, 'broken', {})
+        with open(os.path.join(broken, 'broken.jpg'), 'wb') as f:
+            f.write(b'not an image')
+        importer = ImageImporter(uploads, reencode=True)
+        importer.import_folder(broken)
+        missing = importer.finish()
+        assert missing == [sharded_path('broken.jpg')], f"Expected broken.jpg missing, got {missing}"
+        assert len(importer.errors) == 1
+
+    print("✓ PASS: Clash renamed, re-run skipped, missing files reported")
+    return True
+
+
+def test_importer_reencodes():
+    """Test re-encoding resizes images and stores webp as png"""
+    print("\n=== Test 3: Re-encode ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        uploads = os.path.join(temp_dir, 'uploads')
+        os.makedirs(uploads)
+        folder = make_recipe_folder(temp_dir, 'sour', {'sour.jpg': (3000, 1500), 'foam.webp': (64, 64)})
+
+        importer = ImageImporter(uploads, reencode=True)
+        assert importer.import_folder(folder) == [sharded_path('foam.png'), sharded_path('sour.jpg')]
+        assert importer.finish() == []
+
+        with Image.open(importer.upload_path(sharded_path('sour.jpg'))) as image:
+            assert image.size == (1024, 512), f"Expected resize to 1024x512, got {image.size}"
+        with Image.open(importer.upload_path(sharded_path('foam.png'))) as image:
+            assert image.format == 'PNG'
+
+    print("✓ PASS: Images re-encoded with the upload settings")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Recipe Image Import")
+    print("=" * 80)
+
+    tests = [
+        test_import_file_links_or_copies,
+        test_importer_collisions_and_verification,
+        test_importer_reencodes,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
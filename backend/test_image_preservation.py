@@ -80,7 +80,7 @@ def test_save_with_original_filename():
     
     # Test 2: Save without original filename (should use prefix)
     filename2 = save_base64_image(base64_image, 'recipe')
-    if filename2 and filename2.startswith('recipe_'):
+    if filename2 and os.path.basename(filename2).startswith('recipe_'):
         print(f"✓ Saved with prefix: {filename2}")
     else:
         print(f"✗ Failed to use prefix: {filename2}")
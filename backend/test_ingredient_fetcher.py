@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Test the ingredient fetcher (ingredient_fetcher.py) against a local HTTP server
+standing in for raw.githubusercontent.com: concurrent downloads, the
+content-addressed mirror, ETag revalidation, retries and offline mode
+"""
+import sys
+import os
+import json
+import hashlib
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from ingredient_fetcher import Fetcher, Mirror, make_session
+import load_ingredients
+
+FILES = {
+    '/gin.json': json.dumps({'name': 'Gin', 'category': 'Spirit'}).encode(),
+    '/vodka.json': json.dumps({'name': 'Vodka', 'category': 'Spirit'}).encode(),
+    '/london-dry-gin.json': json.dumps({'name': 'Gin', 'category': 'Spirit'}).encode(),
+}
+
+
+class StandIn(BaseHTTPRequestHandler):
+    """Serves FILES with ETags; /flaky.json fails with 503 on its first request"""
+    requests_seen = []
+    flaky_failures = 0
+
+    def do_GET(self):
+        StandIn.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.path == '/flaky.json' and StandIn.flaky_failures < 1:
+            StandIn.flaky_failures += 1
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = FILES.get(self.path, FILES['/gin.json'] if self.path == '/flaky.json' else None)
+        if body is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    StandIn.requests_seen = []
+    StandIn.flaky_failures = 0
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_mirror_and_revalidation():
+    """Test concurrent downloads fill the mirror and a second run revalidates by ETag"""
+    print("\n=== Test 1: Mirror and ETag revalidation ===")
+
+    server, base = serve()
+    try:
+        with tempfile.TemporaryDirectory() as mirror_dir:
+            urls = [f"{base}{path}" for path in ('/gin.json', '/vodka.json', '/london-dry-gin.json', '/missing.json')]
+
+            fetcher = Fetcher(mirror_dir=mirror_dir, workers=4)
+            first = fetcher.map(fetcher.get_json, urls)
+            fetcher.close()
+            assert [d and d['name'] for d in first] == ['Gin', 'Vodka', 'Gin', None], first
+            assert fetcher.stats == {'downloaded': 3, 'not found': 1}, fetcher.stats
+
+            # Identical bodies are stored once
+            objects = [name for _, _, names in os.walk(os.path.join(mirror_dir, 'objects')) for name in names]
+            assert len(objects) == 2, f"Expected 2 content-addressed objects, got {objects}"
+
+            StandIn.requests_seen = []
+            fetcher = Fetcher(mirror_dir=mirror_dir, workers=4)
+            second = fetcher.map(fetcher.get_json, urls)
+            fetcher.close()
+            assert second == first
+            assert fetcher.stats == {'not modified': 3, 'not found': 1}, fetcher.stats
+            conditional = [etag for path, etag in StandIn.requests_seen if path != '/missing.json']
+            assert len(conditional) == 3 and all(conditional), "Expected If-None-Match on every mirrored URL"
+    finally:
+        server.shutdown()
+
+    print("✓ PASS: Mirror deduplicated, second run served by 304 Not Modified")
+    return True
+
+
+def test_retries_server_errors():
+    """Test a 503 is retried on the pooled session"""
+    print("\n=== Test 2: Retries ===")
+
+    server, base = serve()
+    try:
+        fetcher = Fetcher(session=make_session(pool_size=2, backoff=0))
+        assert fetcher.get_json(f"{base}/flaky.json") == {'name': 'Gin', 'category': 'Spirit'}
+        fetcher.close()
+        assert [path for path, _ in StandIn.requests_seen] == ['/flaky.json', '/flaky.json']
+    finally:
+        server.shutdown()
+
+    print("✓ PASS: 503 retried and the second attempt succeeded")
+    return True
+
+
+def test_offline_mode():
+    """Test offline mode serves the mirror, including mirrored 404s, without network access"""
+    print("\n=== Test 3: Offline ===")
+
+    server, base = serve()
+    with tempfile.TemporaryDirectory() as mirror_dir:
+        try:
+            fetcher = Fetcher(mirror_dir=mirror_dir)
+            fetcher.map(fetcher.get, [f"{base}/gin.json", f"{base}/missing.json"])
+            fetcher.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        fetcher = Fetcher(mirror_dir=mirror_dir, offline=True)
+        assert fetcher.session is None, "Offline mode must not create a session"
+        assert fetcher.get_json(f"{base}/gin.json")['name'] == 'Gin'
+        assert fetcher.get(f"{base}/missing.json") is None
+        assert fetcher.get(f"{base}/never-fetched.json") is None
+        assert fetcher.stats == {'mirror': 2, 'not mirrored': 1}, fetcher.stats
+
+        # Online again but the server is gone: fall back to the mirrored copy
+        fetcher = Fetcher(mirror_dir=mirror_dir, session=make_session(retries=0))
+        assert fetcher.get_json(f"{base}/gin.json")['name'] == 'Gin'
+        assert fetcher.stats == {'stale': 1}, fetcher.stats
+
+        # The index points at a deleted object: unavailable offline, not a crash
+        os.remove(Mirror(mirror_dir)._object_path(hashlib.sha256(FILES['/gin.json']).hexdigest()))
+        fetcher = Fetcher(mirror_dir=mirror_dir, offline=True)
+        assert fetcher.get_json(f"{base}/gin.json") is None
+        assert fetcher.stats == {'not mirrored': 1}, fetcher.stats
+
+    print("✓ PASS: Mirror served offline and when the network fails")
+    return True
+
+
+def test_missing_object_refetched():
+    """Test a mirrored URL whose object file was deleted is downloaded again"""
+    print("\n=== Test 4: Missing mirror object ===")
+
+    server, base = serve()
+    try:
+        with tempfile.TemporaryDirectory() as mirror_dir:
+            fetcher = Fetcher(mirror_dir=mirror_dir)
+            fetcher.get(f"{base}/vodka.json")
+            fetcher.close()
+            path = fetcher.mirror._object_path(hashlib.sha256(FILES['/vodka.json']).hexdigest())
+            os.remove(path)
+
+            StandIn.requests_seen = []
+            fetcher = Fetcher(mirror_dir=mirror_dir)
+            assert fetcher.get_json(f"{base}/vodka.json")['name'] == 'Vodka'
+            fetcher.close()
+            assert StandIn.requests_seen == [('/vodka.json', None)], "Expected an unconditional request"
+            assert fetcher.stats == {'downloaded': 1}, fetcher.stats
+            assert os.path.isfile(path), "Expected the object written again"
+    finally:
+        server.shutdown()
+
+    print("✓ PASS: Missing object treated as a cache miss and re-fetched")
+    return True
+
+
+def test_loader_runs_offline():
+    """Test load_ingredients.py dry run works from a mirror alone"""
+    print("\n=== Test 5: Offline loader dry run ===")
+
+    with tempfile.TemporaryDirectory() as mirror_dir:
+        mirror = Mirror(mirror_dir)
+        files = [{'name': 'gin.json'}, {'name': 'vodka.json'}, {'name': 'gone.json'}]
+        mirror.store(load_ingredients.INGREDIENT_FILES_URL, 200, json.dumps(files).encode())
+        mirror.store(f"{load_ingredients.GITHUB_RAW_BASE}/gin.json", 200, FILES['/gin.json'])
+        mirror.store(f"{load_ingredients.GITHUB_RAW_BASE}/vodka.json", 200, FILES['/vodka.json'])
+        mirror.store(f"{load_ingredients.GITHUB_RAW_BASE}/gone.json", 404)
+        mirror.save()
+
+        count = load_ingredients.load_ingredients_to_db(dry_run=True, mirror_dir=mirror_dir, offline=True)
+        assert count == 2, f"Expected 2 ingredients from the mirror, got {count}"
+
+    print("✓ PASS: Ingredients loaded from the mirror without network")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Ingredient Fetcher")
+    print("=" * 80)
+
+    tests = [
+        test_mirror_and_revalidation,
+        test_retries_server_errors,
+        test_offline_mode,
+        test_missing_object_refetched,
+        test_loader_runs_offline,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,6 +12,7 @@ from io import StringIO
 sys.path.insert(0, os.path.dirname(__file__))
 
 from load_recipes import copy_recipe_images
+from upload_store import sharded_path
 
 def test_copy_recipe_images_preserves_filenames():
     """Test that copy_recipe_images preserves original filenames"""
@@ -51,13 +52,14 @@ def test_copy_recipe_images_preserves_filenames():
         # Check results
         all_passed = True
         
-        # Test 1: Check that the function returns the expected filenames
-        if sorted(result) == sorted(expected_images):
+        # Test 1: Check that the function returns the original filenames, in their shards
+        expected_references = [sharded_path(filename) for filename in expected_images]
+        if sorted(result) == sorted(expected_references):
             print("✓ PASS: Function returns original filenames")
             print(f"  Returned: {result}")
         else:
             print("✗ FAIL: Function did not return original filenames")
-            print(f"  Expected: {expected_images}")
+            print(f"  Expected: {expected_references}")
             print(f"  Got: {result}")
             all_passed = False
         
@@ -65,7 +67,7 @@ def test_copy_recipe_images_preserves_filenames():
         
         # Test 2: Check that files exist with original names in upload folder
         for filename in expected_images:
-            dest_path = os.path.join(upload_folder, filename)
+            dest_path = os.path.join(upload_folder, *sharded_path(filename).split('/'))
             if os.path.exists(dest_path):
                 print(f"✓ PASS: Image copied with original name: {filename}")
             else:
@@ -75,7 +77,7 @@ def test_copy_recipe_images_preserves_filenames():
         print()
         
         # Test 3: Check that no renamed files exist (no files with "recipe_" prefix)
-        uploaded_files = os.listdir(upload_folder)
+        uploaded_files = [f for _, _, files in os.walk(upload_folder) for f in files]
         renamed_files = [f for f in uploaded_files if f.startswith('recipe_')]
         if len(renamed_files) == 0:
             print("✓ PASS: No files were renamed with 'recipe_' prefix")
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Test the bulk import, pipeline, sync and LOAD DATA modes of load_recipes.py against an in-memory fake database
+"""
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_db import FakeConnection, FakeCursor
+from load_recipes import (
+    load_recipes_bulk, load_recipes_pipeline, sync_recipes, load_recipes_load_data,
+    find_recipe_folders, list_recipe_folder_paths
+)
+
+
+class FakeDatabase(FakeConnection):
+    """Just enough of MySQL for the loader: ingredients, recipes and recipe_sources tables"""
+
+    def __init__(self, ingredients=(), recipes=()):
+        super().__init__()
+        self.ingredients = {i + 1: name for i, name in enumerate(ingredients)}
+        self.recipes = [{'id': i + 1, 'name': name} for i, name in enumerate(recipes)]
+        self.sources = {}
+        self.next_recipe_id = len(self.recipes) + 1
+        self.statements = []
+        self.staged = {}
+
+    def cursor(self, **kwargs):
+        return TablesCursor(self)
+
+
+def read_staging_file(path):
+    """Parse a LOAD DATA staging file back into rows"""
+    escapes = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r', '0': '\0'}
+    rows = []
+    with open(path, encoding='utf-8', newline='\n') as f:
+        for line in f:
+            row = []
+            for field in line[:-1].split('\t'):
+                if field == '\\N':
+                    row.append(None)
+                    continue
+                value, i = [], 0
+                while i < len(field):
+                    if field[i] == '\\':
+                        value.append(escapes[field[i + 1]])
+                        i += 2
+                    else:
+                        value.append(field[i])
+                        i += 1
+                row.append(''.join(value))
+            rows.append(row)
+    return rows
+
+
+class TablesCursor(FakeCursor):
+    """Runs the loader's statements against the FakeDatabase tables"""
+
+    def __init__(self, db):
+        super().__init__(self.respond)
+        self.db = db
+
+    def respond(self, query, params):
+        query = ' '.join(query.split())
+        self.db.statements.append(('execute', query))
+        if query == 'SELECT id, name FROM ingredients':
+            return [{'id': i, 'name': n} for i, n in self.db.ingredients.items()]
+        elif query.startswith('SELECT id, name FROM ingredients WHERE name_normalized IN'):
+            wanted = {p.lower() for p in params}
+            return [{'id': i, 'name': n} for i, n in self.db.ingredients.items() if n.lower() in wanted]
+        elif query == 'SELECT name FROM recipes':
+            return [{'name': r['name']} for r in self.db.recipes]
+        elif query == 'SELECT id, name FROM recipes':
+            return [{'id': r['id'], 'name': r['name']} for r in self.db.recipes]
+        elif query.startswith('SELECT id, name FROM recipes WHERE name IN'):
+            wanted = {p.lower() for p in params}
+            return [{'id': r['id'], 'name': r['name']} for r in self.db.recipes if r['name'].lower() in wanted]
+        elif query.startswith('CREATE TABLE IF NOT EXISTS recipe_sources'):
+            return []
+        elif query.startswith('SELECT source, content_hash, recipe_id, deleted_at FROM recipe_sources'):
+            return [dict(row, source=source) for source, row in self.db.sources.items()]
+        elif query.startswith('DELETE FROM recipes WHERE id IN'):
+            self.db.recipes = [r for r in self.db.recipes if r['id'] not in params]
+        elif query.startswith('UPDATE recipe_sources SET deleted_at'):
+            for source in params[1:]:
+                self.db.sources[source]['deleted_at'] = params[0]
+        elif query.startswith(('DROP TEMPORARY TABLE', 'CREATE TEMPORARY TABLE', 'SET SESSION')):
+            return []
+        elif query.startswith('LOAD DATA LOCAL INFILE'):
+            table = query.split(' INTO TABLE ')[1].split()[0]
+            self.db.staged[table] = read_staging_file(params[0])
+            self.rowcount = len(self.db.staged[table])
+        elif query.startswith('INSERT INTO ingredients') and 'FROM stage_ingredients' in query:
+            existing = {n.strip().lower() for n in self.db.ingredients.values()}
+            new = [row[0] for row in self.db.staged['stage_ingredients'] if row[0].strip().lower() not in existing]
+            for name in new:
+                self.db.ingredients[len(self.db.ingredients) + 1] = name
+            self.rowcount = len(new)
+        elif query.startswith('INSERT INTO recipes') and 'FROM stage_recipes' in query:
+            ids = {n.strip().lower(): i for i, n in self.db.ingredients.items()}
+            existing = {r['name'].lower() for r in self.db.recipes}
+            self.rowcount = 0
+            for seq, name, *_ in self.db.staged['stage_recipes']:
+                if name.lower() in existing:
+                    continue
+                entries = sorted((int(row[1]), row) for row in self.db.staged['stage_recipe_ingredients']
+                                 if row[0] == seq)
+                ingredients = [dict(json.loads(row[3]), id=ids[row[2].strip().lower()]) for _, row in entries]
+                self.db.recipes.append({'id': self.db.next_recipe_id, 'name': name, 'ingredients': ingredients})
+                self.db.next_recipe_id += 1
+                self.rowcount += 1
+        else:
+            raise AssertionError(f"Unexpected query: {query}")
+
+    def executemany(self, query, seq_params):
+        query = ' '.join(query.split())
+        self.db.statements.append(('executemany', query))
+        for params in seq_params:
+            if query.startswith('INSERT INTO ingredients'):
+                self.db.ingredients[len(self.db.ingredients) + 1] = params[0]
+            elif query.startswith('INSERT INTO recipes'):
+                self.db.recipes.append({'id': self.db.next_recipe_id, 'name': params[0],
+                                        'ingredients': json.loads(params[2])})
+                self.db.next_recipe_id += 1
+            elif query.startswith('UPDATE recipes'):
+                recipe = next(r for r in self.db.recipes if r['id'] == params[-1])
+                recipe.update(name=params[0], description=params[1], ingredients=json.loads(params[2]))
+            elif query.startswith('INSERT INTO recipe_sources'):
+                self.db.sources[params[0]] = {'content_hash': params[1], 'recipe_id': params[2],
+                                              'deleted_at': None}
+            else:
+                raise AssertionError(f"Unexpected statement: {query}")
+
+
+def write_recipes(data_dir, recipes):
+    for folder, recipe in recipes.items():
+        path = os.path.join(data_dir, 'data', 'cocktails', folder)
+        os.makedirs(path)
+        with open(os.path.join(path, 'data.json'), 'w', encoding='utf-8') as f:
+            json.dump(recipe, f)
+
+
+def test_bulk_load_batches_round_trips():
+    """Test bulk mode preloads once, batches inserts per chunk and links ingredient ids"""
+    print("\n=== Test 1: Bulk load ===")
+
+    recipes = {
+        f'recipe-{n}': {
+            'name': f'Recipe {n}',
+            'ingredients': [{'name': 'Gin', 'amount': 2, 'units': 'oz'},
+                            {'name': f'Syrup {n % 3}', 'amount': 0.5, 'units': 'oz'}],
+        }
+        for n in range(7)
+    }
+    recipes['existing'] = {'name': 'NEGRONI', 'ingredients': [{'name': 'Campari'}]}
+
+    db = FakeDatabase(ingredients=['gin'], recipes=['Negroni'])
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_recipes(data_dir, recipes)
+        folders = sorted(find_recipe_folders(data_dir), key=lambda f: f['name'])
+        loaded, skipped = load_recipes_bulk(folders, db.cursor(), db, data_dir, chunk_size=3)
+
+    assert (loaded, skipped) == (7, 1), f"Expected 7 loaded and 1 skipped, got {loaded}, {skipped}"
+    assert db.commits == 3, f"Expected one commit per chunk, got {db.commits}"
+
+    # 2 preload queries + per chunk: ingredient insert, id read-back, recipe insert
+    recipe_inserts = [s for s in db.statements if s[0] == 'executemany' and 'INTO recipes' in s[1]]
+    assert len(recipe_inserts) == 3
+    assert len(db.statements) <= 2 + 3 * 3, f"Too many round trips: {len(db.statements)}"
+
+    # 'Gin' matches the existing 'gin' row; each syrup is created once
+    names = sorted(db.ingredients.values())
+    assert names == ['Syrup 0', 'Syrup 1', 'Syrup 2', 'gin'], names
+    ids = {name.lower(): i for i, name in db.ingredients.items()}
+    for recipe in db.recipes[1:]:
+        for ingredient in recipe['ingredients']:
+            assert ingredient['id'] == ids[ingredient['name'].lower()], f"Wrong id for {ingredient}"
+
+    print("✓ PASS: One commit per chunk, batched inserts, ingredients deduplicated and linked")
+    return True
+
+
+def test_pipeline_isolates_bad_folders():
+    """Test pipeline mode loads good folders and skips unreadable or invalid ones"""
+    print("\n=== Test 2: Pipeline load ===")
+
+    recipes = {
+        f'recipe-{n}': {'name': f'Recipe {n}', 'ingredients': [{'name': f'Bitters {n % 2}'}]}
+        for n in range(9)
+    }
+    recipes['invalid'] = {'name': 'Invalid', 'ingredients': 'gin, lime'}
+    recipes['duplicate'] = {'name': 'recipe 0', 'ingredients': []}
+
+    db = FakeDatabase()
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_recipes(data_dir, recipes)
+        cocktails_dir = os.path.join(data_dir, 'data', 'cocktails')
+        os.makedirs(os.path.join(cocktails_dir, 'broken'))
+        with open(os.path.join(cocktails_dir, 'broken', 'data.json'), 'w') as f:
+            f.write('{"name": "Broken", ')
+        os.makedirs(os.path.join(cocktails_dir, 'no-data'))
+
+        folder_paths = list_recipe_folder_paths(data_dir)
+        assert len(folder_paths) == 13, f"Expected 13 folders, got {len(folder_paths)}"
+        loaded, skipped = load_recipes_pipeline(
+            folder_paths, db.cursor(), db, data_dir, chunk_size=4, workers=2, queue_size=4
+        )
+
+    # broken JSON, invalid ingredients and the duplicate name are skipped; no-data is ignored
+    assert (loaded, skipped) == (9, 3), f"Expected 9 loaded and 3 skipped, got {loaded}, {skipped}"
+    # Workers finish in any order, so either spelling of 'recipe 0' may win
+    names = sorted(r['name'].lower() for r in db.recipes)
+    assert names == [f'recipe {n}' for n in range(9)], names
+    assert db.commits == 3, f"Expected chunks of 4, 4 and 1, got {db.commits} commits"
+    assert sorted(db.ingredients.values()) == ['Bitters 0', 'Bitters 1'], db.ingredients
+
+    print("✓ PASS: Bad folders skipped, good recipes written in chunks by one writer")
+    return True
+
+
+def test_sync_upserts_only_changed_recipes():
+    """Test sync mode adds, updates, skips unchanged and tombstones removed recipes"""
+    print("\n=== Test 3: Sync ===")
+
+    recipes = {
+        'gimlet': {'name': 'Gimlet', 'ingredients': [{'name': 'Gin'}, {'name': 'Lime'}]},
+        'martini': {'name': 'Martini', 'ingredients': [{'name': 'Gin'}, {'name': 'Vermouth'}]},
+        'daiquiri': {'name': 'Daiquiri', 'ingredients': [{'name': 'Rum'}, {'name': 'Lime'}]},
+        'negroni': {'name': 'Negroni', 'ingredients': [{'name': 'Gin'}, {'name': 'Campari'}]},
+    }
+
+    # Negroni was loaded before sync mode existed
+    db = FakeDatabase(ingredients=['Gin'], recipes=['Negroni'])
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_recipes(data_dir, recipes)
+        cocktails_dir = os.path.join(data_dir, 'data', 'cocktails')
+        sync = lambda **kwargs: sync_recipes(find_recipe_folders(data_dir), db.cursor(), db, data_dir, **kwargs)
+
+        counts = sync()
+        assert (counts['added'], counts['updated']) == (3, 1), f"First sync: {counts}"
+        assert [r['id'] for r in db.recipes if r['name'] == 'Negroni'] == [1], "Expected Negroni taken over"
+        assert len(db.sources) == 4
+
+        # Nothing changed: only the preload queries run
+        db.statements = []
+        counts = sync()
+        assert counts['unchanged'] == 4 and counts['added'] == counts['updated'] == 0, f"Second sync: {counts}"
+        assert all(statement[0] == 'execute' for statement in db.statements), db.statements
+
+        # Upstream edits one recipe, removes one and adds one
+        with open(os.path.join(cocktails_dir, 'gimlet', 'data.json'), 'w', encoding='utf-8') as f:
+            json.dump({'name': 'Gimlet', 'description': 'Navy strength', 'ingredients': [{'name': 'Gin'}]}, f)
+        shutil.rmtree(os.path.join(cocktails_dir, 'martini'))
+        write_recipes(data_dir, {'southside': {'name': 'Southside', 'ingredients': [{'name': 'Mint'}]}})
+        martini_id = db.sources['martini']['recipe_id']
+
+        counts = sync(prune=True)
+        expected = {'added': 1, 'updated': 1, 'unchanged': 2, 'removed': 1, 'failed': 0}
+        assert counts == expected, f"Third sync: {counts}"
+
+    gimlet = next(r for r in db.recipes if r['name'] == 'Gimlet')
+    assert gimlet['description'] == 'Navy strength' and len(gimlet['ingredients']) == 1
+    assert martini_id not in [r['id'] for r in db.recipes], "Expected removed recipe deleted"
+    assert db.sources['martini']['deleted_at'] is not None, "Expected removed folder tombstoned"
+    assert sorted(r['name'] for r in db.recipes) == ['Daiquiri', 'Gimlet', 'Negroni', 'Southside']
+
+    print("✓ PASS: Only changed folders written; removed folder tombstoned")
+    return True
+
+
+def test_load_data_stages_and_merges():
+    """Test LOAD DATA mode stages escaped TSV files and merges them in one transaction"""
+    print("\n=== Test 4: LOAD DATA ingest ===")
+
+    recipes = {
+        'gimlet': {'name': 'Gimlet', 'instructions': 'Shake\tand\nstrain \\ serve',
+                   'ingredients': [{'name': 'Gin', 'amount': 2, 'units': 'oz'},
+                                   {'name': 'Lime Juice', 'amount': '3/4', 'units': 'oz', 'note': 'fresh'}]},
+        'daiquiri': {'name': 'Daiquiri', 'ingredients': [{'name': 'Rum'}, {'name': 'lime juice '}, {'name': ''}]},
+        'negroni': {'name': 'negroni', 'ingredients': [{'name': 'Campari'}]},
+        'broken': {'name': 'Broken', 'ingredients': 'Gin'},
+    }
+
+    db = FakeDatabase(ingredients=['GIN'], recipes=['Negroni'])
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_recipes(data_dir, recipes)
+        folders = sorted(find_recipe_folders(data_dir), key=lambda f: f['name'])
+        staging_dir = os.path.join(data_dir, 'staging')
+        loaded, skipped = load_recipes_load_data(folders, db.cursor(), db, data_dir, staging_dir=staging_dir)
+
+        # Staging files are kept when a directory is given, and round-trip special characters
+        staged_recipes = read_staging_file(os.path.join(staging_dir, 'stage_recipes.tsv'))
+        gimlet = next(row for row in staged_recipes if row[1] == 'Gimlet')
+        assert gimlet[3] == 'Shake\tand\nstrain \\ serve', gimlet
+
+    assert (loaded, skipped) == (2, 2), f"Expected 2 loaded and 2 skipped, got {loaded}, {skipped}"
+    assert db.commits == 1 and db.rollbacks == 0, "Expected a single transaction"
+    assert not [s for s in db.statements if s[0] == 'executemany'], "Expected no row-by-row inserts"
+
+    # 'lime juice ' (first seen) and 'Lime Juice' are staged once; 'Gin' matches 'GIN'
+    staged_names = sorted(row[0] for row in db.staged['stage_ingredients'])
+    assert staged_names == ['Campari', 'Gin', 'Rum', 'lime juice '], staged_names
+    assert sorted(db.ingredients.values()) == ['Campari', 'GIN', 'Rum', 'lime juice '], db.ingredients
+
+    daiquiri = next(r for r in db.recipes if r['name'] == 'Daiquiri')
+    assert [i['name'] for i in daiquiri['ingredients']] == ['Rum', 'lime juice '], "Expected staged order"
+    gimlet = next(r for r in db.recipes if r['name'] == 'Gimlet')
+    assert gimlet['ingredients'][0]['id'] == 1 and gimlet['ingredients'][1]['note'] == 'fresh'
+    assert gimlet['ingredients'][1]['id'] == daiquiri['ingredients'][1]['id']
+
+    print("✓ PASS: Staged, loaded and merged in one transaction without per-row inserts")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Bulk, Pipeline, Sync and LOAD DATA Recipe Import")
+    print("=" * 80)
+
+    tests = [
+        test_bulk_load_batches_round_trips,
+        test_pipeline_isolates_bad_folders,
+        test_sync_upserts_only_changed_recipes,
+        test_load_data_stages_and_merges,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test the Prometheus metrics: text format, request and database metrics,
+pool gauges and image processing timings
+
+Uses fake pooled connections, so no MySQL server is needed.
+"""
+import sys
+import os
+import io
+import base64
+import tempfile
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app
+import api_core
+import metrics
+from fake_db import fake_pool
+from PIL import Image
+
+
+def sample_value(text, line_prefix):
+    """Value of the first exposition line starting with line_prefix"""
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(' ', 1)[1])
+    raise AssertionError(f"No sample starting with {line_prefix}")
+
+
+def test_text_format():
+    """Test counters and histograms render in the Prometheus text format"""
+    print("\n=== Test 1: Exposition format ===")
+
+    registry = metrics.Registry()
+    counter = registry.counter('jobs_total', 'Jobs run', ('kind',))
+    histogram = registry.histogram('job_seconds', 'Job time', ('kind',), buckets=(0.1, 1.0))
+    counter.inc('a "quoted"\nkind')
+    counter.inc('b', amount=2)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'b')
+    text = registry.render()
+
+    assert '# TYPE jobs_total counter' in text
+    assert 'jobs_total{kind="a \\"quoted\\"\\nkind"} 1' in text, text
+    assert 'jobs_total{kind="b"} 2' in text
+    assert '# TYPE job_seconds histogram' in text
+    assert 'job_seconds_bucket{kind="b",le="0.1"} 2' in text, "Bucket bounds are inclusive"
+    assert 'job_seconds_bucket{kind="b",le="1"} 3' in text
+    assert 'job_seconds_bucket{kind="b",le="+Inf"} 4' in text
+    assert 'job_seconds_count{kind="b"} 4' in text
+    assert sample_value(text, 'job_seconds_sum{kind="b"}') == 3.65
+
+    print("✓ PASS: Escaped labels, cumulative buckets, count and sum")
+    return True
+
+
+def test_request_and_pool_metrics():
+    """Test requests record route latency, database time, pool waits and gauges"""
+    print("\n=== Test 2: Request, database and pool metrics ===")
+
+    with fake_pool(pool_size=2, rowcount=1):
+        client = app.test_client()
+        before = metrics.REGISTRY.render()
+        assert client.get('/api/recipes?bar_shelf_mode=Y').status_code == 200
+        assert client.get('/api/ingredients/1').status_code == 404
+        response = client.get('/api/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == metrics.CONTENT_TYPE
+    text = response.get_data(as_text=True)
+
+    def increase(prefix):
+        try:
+            old = sample_value(before, prefix)
+        except AssertionError:
+            old = 0
+        return sample_value(text, prefix) - old
+
+    bar_shelf = 'route="/api/recipes?bar_shelf_mode=Y",method="GET",status="200"'
+    assert increase(f'http_requests_total{{{bar_shelf}}}') == 1
+    assert increase(f'http_request_duration_seconds_count{{{bar_shelf}}}') == 1
+    lookup = 'route="/api/ingredients/<int:ingredient_id>"'
+    assert increase(f'http_requests_total{{{lookup},method="GET",status="404"}}') == 1
+    assert increase(f'db_queries_per_request_count{{{lookup}}}') == 1
+    assert increase(f'db_queries_per_request_sum{{{lookup}}}') == 1, "Expected one statement"
+    assert increase('db_pool_acquire_seconds_count{pool="primary"}') == 2
+    assert sample_value(text, 'db_pool_connections{pool="primary",state="in_use"}') == 0
+    assert sample_value(text, 'db_pool_max_connections{pool="primary"}') == 2
+    assert '# TYPE cache_hits_total counter' in text
+
+    print("✓ PASS: Route latency, bar shelf mode, queries per request and pool gauges")
+    return True
+
+
+def test_image_processing_timed():
+    """Test image saves are timed by outcome"""
+    print("\n=== Test 3: Image processing durations ===")
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (20, 20), 'red').save(buffer, 'PNG')
+    image_b64 = base64.b64encode(buffer.getvalue()).decode('ascii')
+
+    ok = 'image_processing_seconds_count{operation="save_base64_image",outcome="ok"}'
+    error = 'image_processing_seconds_count{operation="save_base64_image",outcome="error"}'
+
+    def count(prefix):
+        try:
+            return sample_value(metrics.REGISTRY.render(), prefix)
+        except AssertionError:
+            return 0
+
+    before_ok, before_error = count(ok), count(error)
+    with tempfile.TemporaryDirectory() as upload_folder:
+        assert api_core.save_base64_image(upload_folder, image_b64, 'test')
+        assert api_core.save_base64_image(upload_folder, 'bm90IGFuIGltYWdl', 'test') is None
+    assert count(ok) == before_ok + 1
+    assert count(error) == before_error + 1
+
+    print("✓ PASS: Successful and failed image saves recorded")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Prometheus Metrics")
+    print("=" * 80)
+
+    tests = [
+        test_text_format,
+        test_request_and_pool_metrics,
+        test_image_processing_timed,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
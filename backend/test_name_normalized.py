@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Test unique normalized ingredient names: the dedupe migration plan, the
+bar shelf lookup by normalized name and upsert-based ingredient creation
+
+Uses fake pooled connections, so no MySQL server is needed.
+"""
+import sys
+import os
+import json
+import base64
+import tempfile
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app
+from api_core import availability_query, filter_available_recipes
+from add_name_normalized_column import plan_dedupe, remap_recipe_ingredients, dedupe_ingredients
+from load_recipes import find_or_create_ingredient
+from fake_db import FakeConnection, FakeCursor, fake_pool
+from mysql.connector.errors import IntegrityError
+
+
+# {normalized name: id} rows upserted by UpsertCursor
+UPSERTED = {}
+
+
+class UpsertCursor(FakeCursor):
+    """Upserts into UPSERTED like ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)"""
+
+    def execute(self, query, params=None):
+        super().execute(query, params)
+        assert 'ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id)' in query, f"Expected an upsert: {query}"
+        key = params[0].strip(' ').lower()
+        if key in UPSERTED:
+            self.rowcount, self.lastrowid = 0, UPSERTED[key]
+        else:
+            UPSERTED[key] = len(UPSERTED) + 1
+            self.rowcount, self.lastrowid = 1, UPSERTED[key]
+
+
+def test_dedupe_plan():
+    """Test duplicates map to the lowest id, keep bar shelf availability and repoint recipes"""
+    print("\n=== Test 1: Dedupe plan ===")
+
+    ingredients = [
+        {'id': 7, 'name': 'Lime Juice ', 'bar_shelf_availability': 'Y'},
+        {'id': 3, 'name': 'Lime juice', 'bar_shelf_availability': 'N'},
+        {'id': 9, 'name': 'LIME JUICE', 'bar_shelf_availability': 'N'},
+        {'id': 4, 'name': 'Gin', 'bar_shelf_availability': 'Y'},
+    ]
+    remap, mark_available = plan_dedupe(ingredients)
+    assert remap == {7: 3, 9: 3}, remap
+    assert mark_available == [3], "Expected the kept row to inherit 'Y'"
+
+    recipe = [{'id': 4, 'name': 'Gin'}, {'id': 9, 'name': 'LIME JUICE'}]
+    assert remap_recipe_ingredients(recipe, remap) == [{'id': 4, 'name': 'Gin'}, {'id': 3, 'name': 'LIME JUICE'}]
+    assert remap_recipe_ingredients([{'id': 4, 'name': 'Gin'}], remap) is None
+
+    print("✓ PASS: Lowest id kept, availability merged, recipe ids repointed")
+    return True
+
+
+def dedupe_cursor(ingredients, recipes):
+    """Cursor serving ingredient and recipe rows to the dedupe migration"""
+    def rows(query, params):
+        if query.startswith('SELECT id, name'):
+            return ingredients
+        if query.startswith('SELECT id, ingredients'):
+            return recipes
+    return FakeCursor(rows)
+
+
+def statements(cursor):
+    return [(' '.join(query.split()), params) for query, params in cursor.executed]
+
+
+def test_dedupe_repoints_bytes_json():
+    """Test recipes whose JSON comes back as bytes are repointed, and unparsable ones block the delete"""
+    print("\n=== Test 2: Dedupe with bytes JSON ===")
+
+    ingredients = [
+        {'id': 3, 'name': 'Lime juice', 'bar_shelf_availability': 'Y'},
+        {'id': 9, 'name': 'LIME JUICE', 'bar_shelf_availability': 'N'},
+    ]
+    recipes = [
+        {'id': 1, 'ingredients': json.dumps([{'id': 9, 'name': 'LIME JUICE'}]).encode('utf-8')},
+        {'id': 2, 'ingredients': bytearray(json.dumps([{'id': 9, 'name': 'LIME JUICE'}]), 'utf-8')},
+        {'id': 3, 'ingredients': None},
+    ]
+    cursor = dedupe_cursor(ingredients, recipes)
+    assert dedupe_ingredients(cursor, FakeConnection()) == 1
+
+    updates = [params for query, params in statements(cursor) if query.startswith('UPDATE recipes')]
+    assert updates == [[(json.dumps([{'id': 3, 'name': 'LIME JUICE'}]), 1),
+                        (json.dumps([{'id': 3, 'name': 'LIME JUICE'}]), 2)]], updates
+    assert any(query.startswith('DELETE FROM ingredients') for query, _ in statements(cursor))
+
+    cursor = dedupe_cursor(ingredients, recipes + [{'id': 4, 'ingredients': b'[{"id": 9,'}])
+    assert dedupe_ingredients(cursor, FakeConnection()) is None, "Expected the run to stop"
+    assert not any(query.startswith(('UPDATE', 'DELETE')) for query, _ in statements(cursor)), \
+        "Expected nothing changed when a recipe cannot be parsed"
+
+    print("✓ PASS: bytes JSON repointed; unparsable recipes stop the merge")
+    return True
+
+
+def test_bar_shelf_lookup_is_normalized():
+    """Test the availability lookup and filter ignore case and surrounding spaces"""
+    print("\n=== Test 3: Bar shelf lookup ===")
+
+    sql, params = availability_query({'Lime Juice', 'lime juice ', 'Gin'})
+    assert 'WHERE name_normalized IN (%s, %s)' in sql, sql
+    assert params == ('gin', 'lime juice')
+
+    availability = {'gin': 'Y', 'lime juice': 'Y'}
+    recipes = [
+        {'name': 'Gimlet', 'ingredients': [{'name': 'gin'}, {'name': 'Lime juice'}]},
+        {'name': 'Daiquiri', 'ingredients': [{'name': 'Rum'}, {'name': 'Lime Juice'}]},
+    ]
+    assert [r['name'] for r in filter_available_recipes(recipes, availability)] == ['Gimlet']
+
+    print("✓ PASS: Names matched by normalized name")
+    return True
+
+
+def test_upserts():
+    """Test loaders and the API create ingredients with one upsert and detect duplicates"""
+    print("\n=== Test 4: Upserts ===")
+
+    UPSERTED.clear()
+    conn = FakeConnection(cursor_class=UpsertCursor)
+    cursor = conn.cursor()
+    first = find_or_create_ingredient(cursor, conn, {'name': 'Lime juice'})
+    again = find_or_create_ingredient(cursor, conn, {'name': 'Lime Juice '})
+    assert first == again == 1, f"Expected the existing id, got {first}, {again}"
+    assert len(conn.executed) == 2, "Expected one statement per ingredient"
+
+    with fake_pool(cursor_class=UpsertCursor):
+        client = app.test_client()
+        response = client.post('/api/ingredients', json={'name': 'Campari', 'images': []})
+        assert response.status_code == 201, response.status_code
+        assert response.get_json()['id'] == 2
+
+        response = client.post('/api/ingredients', json={'name': 'LIME JUICE', 'images': []})
+        assert response.status_code == 409, response.status_code
+        assert response.get_json() == {'error': 'Ingredient already exists', 'id': 1}
+
+    print("✓ PASS: One upsert per ingredient; duplicate create returns 409 with the existing id")
+    return True
+
+
+# A 1x1 PNG upload
+NEW_IMAGE = 'data:image/png;base64,' + base64.b64encode(bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d49444154789c6360f8cfc0f01f0005000201e7a1f8'
+    '9a0000000049454e44ae426082'
+)).decode('ascii')
+
+
+def stored_files(upload_folder):
+    return sorted(os.path.relpath(os.path.join(root, name), upload_folder)
+                  for root, _, names in os.walk(upload_folder) for name in names)
+
+
+def test_update_rename_conflict():
+    """Test renaming an ingredient onto another's name returns 409 and leaves its images alone"""
+    print("\n=== Test 5: Rename onto an existing name ===")
+
+    def rows(query, params):
+        if query.lstrip().startswith('UPDATE ingredients'):
+            raise IntegrityError(msg="Duplicate entry 'gin' for key 'name_normalized'", errno=1062)
+        return [{'id': 2, 'name': 'Lime', 'images': json.dumps(['lime.png'])}]
+
+    previous_folder = app.config['UPLOAD_FOLDER']
+    with tempfile.TemporaryDirectory() as upload_folder:
+        with open(os.path.join(upload_folder, 'lime.png'), 'wb') as f:
+            f.write(b'png')
+        app.config['UPLOAD_FOLDER'] = upload_folder
+        try:
+            with fake_pool(rows) as pool:
+                response = app.test_client().put('/api/ingredients/2', json={
+                    'name': 'GIN', 'images': [NEW_IMAGE], 'removed_images': ['lime.png'],
+                })
+                raw, _ = pool._idle[0]
+        finally:
+            app.config['UPLOAD_FOLDER'] = previous_folder
+
+        assert response.status_code == 409, response.status_code
+        assert response.get_json() == {'error': 'Ingredient already exists'}
+        assert raw.rollbacks >= 1 and raw.commits == 0, "Expected the update rolled back"
+        assert stored_files(upload_folder) == ['lime.png'], \
+            f"Expected the upload discarded and the removed image kept, got {stored_files(upload_folder)}"
+
+    print("✓ PASS: Duplicate rename returns 409; new upload discarded, old images kept")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Unique Normalized Ingredient Names")
+    print("=" * 80)
+
+    tests = [
+        test_dedupe_plan,
+        test_dedupe_repoints_bytes_json,
+        test_bar_shelf_lookup_is_normalized,
+        test_upserts,
+        test_update_rename_conflict,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the optimize_images backfill script
+"""
+import sys
+import os
+import json
+import tempfile
+from PIL import Image
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from optimize_images import optimize_images, MANIFEST_FILENAME
+
+
+def create_source_tree(root):
+    """Create a small tree of unoptimized images"""
+    source_dir = os.path.join(root, 'uploads')
+    nested_dir = os.path.join(source_dir, 'cocktail_images')
+    os.makedirs(nested_dir)
+
+    # Large JPEG that should be resized
+    Image.new('RGB', (2400, 1600), color='red').save(os.path.join(source_dir, 'big.jpg'), 'JPEG', quality=100)
+    # webp without transparency should become a JPEG
+    Image.new('RGB', (400, 300), color='green').save(os.path.join(nested_dir, 'lime.webp'), 'WEBP')
+    # Not an image, should be ignored
+    with open(os.path.join(source_dir, 'notes.txt'), 'w') as f:
+        f.write('not an image')
+
+    return source_dir
+
+
+def test_optimize_and_resume():
+    """Test that images are optimized, derivatives written and re-runs skipped"""
+    print("\n=== Test 1: Optimize images and resume from manifest ===")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_dir = create_source_tree(temp_dir)
+        output_dir = os.path.join(temp_dir, 'optimized')
+
+        stats = optimize_images([source_dir], output_dir, workers=2)
+
+        assert stats['total'] == 2, f"Expected 2 images, got {stats['total']}"
+        assert stats['optimized'] == 2, f"Expected 2 optimized, got {stats['optimized']}"
+        assert stats['errors'] == 0, f"Expected no errors, got {stats['errors']}"
+        assert stats['optimized_bytes'] < stats['source_bytes'], "Expected bytes to be saved"
+
+        big = os.path.join(output_dir, 'uploads', 'big.jpg')
+        with Image.open(big) as img:
+            assert max(img.size) <= 1024, f"Expected image resized to 1024px, got {img.size}"
+        assert os.path.exists(os.path.join(output_dir, 'uploads', 'big.thumb.jpg')), "Missing thumbnail"
+        assert os.path.exists(os.path.join(output_dir, 'uploads', 'cocktail_images', 'lime.jpg')), \
+            "Expected webp converted to JPEG"
+
+        with open(os.path.join(output_dir, MANIFEST_FILENAME)) as f:
+            manifest = json.load(f)
+        assert len(manifest['files']) == 2, "Expected 2 manifest entries"
+
+        # Second run only re-processes changed files
+        stats = optimize_images([source_dir], output_dir, workers=2)
+        assert stats['skipped'] == 2, f"Expected 2 skipped on re-run, got {stats['skipped']}"
+        assert stats['optimized'] == 0, f"Expected nothing re-processed, got {stats['optimized']}"
+
+        Image.new('RGB', (2000, 2000), color='blue').save(os.path.join(source_dir, 'big.jpg'), 'JPEG')
+        stats = optimize_images([source_dir], output_dir, workers=2)
+        assert stats['optimized'] == 1, f"Expected changed file re-processed, got {stats['optimized']}"
+
+    print("✓ PASS: Images optimized and re-runs resume from the manifest")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing optimize_images")
+    print("=" * 80)
+
+    tests = [
+        test_optimize_and_resume,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
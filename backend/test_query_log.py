@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test SQL instrumentation: query entries, slow-query log with EXPLAIN and the
+Server-Timing header
+
+Uses fake pooled connections, so no MySQL server is needed.
+"""
+import sys
+import os
+import io
+import time
+from contextlib import redirect_stdout
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app
+from fake_db import FakeCursor, fake_pool
+from query_log import InstrumentedCursor, server_timing_header
+
+FULL_SCAN_PLAN = [{'id': 1, 'table': 'recipes', 'type': 'ALL', 'key': None, 'rows': 5000, 'Extra': 'Using where'}]
+
+# Statements executed by fake cursors
+executed = []
+
+
+def slow_rows(rows=()):
+    """Rows for a fake cursor whose statements take 2 ms; EXPLAIN answers with a full scan"""
+    def respond(query, params):
+        executed.append((query, params))
+        time.sleep(0.002)
+        return FULL_SCAN_PLAN if query.startswith('EXPLAIN') else rows
+    return respond
+
+
+def test_cursor_records_entries():
+    """Test statement text, parameter count, duration and rows are recorded"""
+    print("\n=== Test 1: Query entries ===")
+
+    entries = []
+    cursor = InstrumentedCursor(FakeCursor(slow_rows([{'id': 1}, {'id': 2}])), entries.append)
+    cursor.execute("SELECT * FROM recipes WHERE name LIKE %s AND id > %s", ('%gin%', 3))
+    assert len(cursor.fetchall()) == 2
+
+    writer = InstrumentedCursor(FakeCursor(slow_rows(), rowcount=4, with_rows=False), entries.append)
+    writer.execute("UPDATE ingredients SET bar_shelf_availability = 'N'")
+
+    select, update = entries
+    assert select['param_count'] == 2 and select['params'] == ('%gin%', 3)
+    assert select['rows'] == 2, f"Expected 2 rows, got {select['rows']}"
+    assert select['seconds'] >= 0.002
+    assert update['param_count'] == 0 and update['rows'] == 4
+    assert executed[-1] == ("UPDATE ingredients SET bar_shelf_availability = 'N'", None), \
+        "Statements without parameters must be passed through unchanged"
+
+    print("✓ PASS: SQL, parameter count, duration and rows recorded")
+    return True
+
+
+def test_slow_query_log_and_server_timing():
+    """Test slow statements are logged with their EXPLAIN plan and totals sent in Server-Timing"""
+    print("\n=== Test 2: Slow-query log and Server-Timing ===")
+
+    previous_config = {key: app.config[key] for key in ('SLOW_QUERY_MS', 'SLOW_QUERY_EXPLAIN', 'SERVER_TIMING')}
+    app.config.update(SLOW_QUERY_MS=1, SLOW_QUERY_EXPLAIN=True, SERVER_TIMING=True)
+    output = io.StringIO()
+    try:
+        with fake_pool(slow_rows()), redirect_stdout(output):
+            response = app.test_client().get('/api/recipes?tags=classic')
+    finally:
+        app.config.update(previous_config)
+
+    assert response.status_code == 200
+    log = output.getvalue()
+    assert 'Slow query on /api/recipes' in log, f"Expected a slow-query line, got: {log}"
+    assert 'JSON_CONTAINS' in log or 'JSON_SEARCH' in log, log
+    assert 'type=ALL' in log and 'full table scan' in log, f"Expected the EXPLAIN plan, got: {log}"
+    assert any(query.startswith('EXPLAIN SELECT') for query, _ in executed)
+
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('db;dur='), timing
+    assert 'desc="1 queries, 0 rows"' in timing
+    assert 'serialize;dur=' in timing and 'image;dur=0.00' in timing
+
+    print("✓ PASS: Slow query logged with a full-scan plan, Server-Timing sent")
+    return True
+
+
+def test_server_timing_format():
+    """Test the Server-Timing header format"""
+    print("\n=== Test 3: Server-Timing format ===")
+
+    header = server_timing_header([('db', 0.0123, '2 queries'), ('image', 0.5, None)])
+    assert header == 'db;dur=12.30;desc="2 queries", image;dur=500.00', header
+
+    print("✓ PASS: Durations in milliseconds with optional descriptions")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing SQL Instrumentation")
+    print("=" * 80)
+
+    tests = [
+        test_cursor_records_entries,
+        test_slow_query_log_and_server_timing,
+        test_server_timing_format,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
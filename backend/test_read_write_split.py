@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test read/write splitting between the primary and replica pools
+
+Uses stub connection factories, so no MySQL servers are needed. Each stub
+connection records which server it belongs to.
+"""
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import app as app_module
+from app import app, STICKY_PRIMARY_COOKIE
+from db_pool import ConnectionPool, parse_host
+from mysql.connector.errors import InterfaceError
+
+# Server name of every connection opened, and of every statement executed, in order
+opened = []
+used = []
+
+
+class StubCursor:
+    rowcount = 1
+
+    def __init__(self, server):
+        self.server = server
+
+    def execute(self, query, params=None):
+        used.append(self.server)
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class StubConnection:
+    def __init__(self, server):
+        self.server = server
+        self.in_transaction = False
+        opened.append(server)
+
+    def cursor(self, **kwargs):
+        return StubCursor(self.server)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def stub_factory(server, down=False):
+    def factory():
+        if down:
+            raise InterfaceError(f"Can't connect to {server}")
+        return StubConnection(server)
+    return factory
+
+
+class StubPools:
+    """Swap the app's pools for stub pools for the duration of a test"""
+
+    def __init__(self, replica_down=False):
+        self.replica_down = replica_down
+
+    def __enter__(self):
+        self.previous = (app_module.db_pool, app_module.replica_pools)
+        app_module.db_pool = ConnectionPool(stub_factory('primary'), pool_size=1, timeout=0.1)
+        app_module.replica_pools = {
+            'replica:3306': ConnectionPool(stub_factory('replica', self.replica_down), pool_size=1, timeout=0.1)
+        }
+        opened.clear()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        app_module.db_pool, app_module.replica_pools = self.previous
+
+
+def server_used(client, method, url, **kwargs):
+    """Make a request and return the server of the connection it used"""
+    used.clear()
+    getattr(client, method)(url, **kwargs)
+    assert len(set(used)) == 1, f"Expected one server per request, got {used}"
+    return used[0]
+
+
+def test_parse_host():
+    """Test replica host parsing"""
+    print("\n=== Test 1: Replica host parsing ===")
+
+    assert parse_host('db-replica', 3306) == ('db-replica', 3306)
+    assert parse_host('10.0.0.5:3307', 3306) == ('10.0.0.5', 3307)
+
+    print("✓ PASS: Replica hosts parsed")
+    return True
+
+
+def test_reads_use_replica_writes_use_primary():
+    """Test GETs go to the replica, writes to the primary with read-your-writes stickiness"""
+    print("\n=== Test 2: Read/write routing and stickiness ===")
+
+    with StubPools():
+        client = app.test_client()
+
+        assert server_used(client, 'get', '/api/ingredients/1') == 'replica'
+        assert client.get_cookie(STICKY_PRIMARY_COOKIE) is None
+
+        assert server_used(client, 'delete', '/api/ingredients/1') == 'primary'
+        assert client.get_cookie(STICKY_PRIMARY_COOKIE) is not None, "Expected sticky cookie after write"
+
+        # Within the window the client reads its own writes from the primary
+        assert server_used(client, 'get', '/api/ingredients/1') == 'primary'
+
+        # After the window, reads go back to the replica
+        client.set_cookie(STICKY_PRIMARY_COOKIE, '0')
+        assert server_used(client, 'get', '/api/ingredients/1') == 'replica'
+
+        # Other clients are not affected by someone else's write
+        assert server_used(app.test_client(), 'get', '/api/ingredients/1') == 'replica'
+
+    print("✓ PASS: Reads on replica, writes on primary, sticky after writes")
+    return True
+
+
+def test_replica_down_falls_back_to_primary():
+    """Test reads fall back to the primary when the replica is unreachable"""
+    print("\n=== Test 3: Replica failure falls back to primary ===")
+
+    with StubPools(replica_down=True):
+        client = app.test_client()
+        assert server_used(client, 'get', '/api/ingredients/1') == 'primary'
+        assert opened == ['primary'], f"Unexpected connections: {opened}"
+        assert app_module.replica_pools['replica:3306'].stats()['in_use'] == 0
+
+    print("✓ PASS: Primary used when the replica is down")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Read/Write Splitting")
+    print("=" * 80)
+
+    tests = [
+        test_parse_host,
+        test_reads_use_replica_writes_use_primary,
+        test_replica_down_falls_back_to_primary,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
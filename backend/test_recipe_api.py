@@ -6,8 +6,10 @@ Test script for Recipe Management API endpoints
 import requests
 import json
 import sys
+import os
 
-BASE_URL = "http://localhost:5000/api"
+# Point at another server (e.g. the ASGI variant) with API_BASE_URL
+BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:5000/api")
 
 def test_create_recipe():
     """Test creating a new recipe"""
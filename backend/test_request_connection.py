@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test the request-scoped database connection is reused and always returned to the pool
+"""
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app, get_db_connection, get_db_cursor
+from fake_db import fake_pool
+
+
+# Row every query returns
+STORED = {'row': None}
+
+
+def stored_row(query, params):
+    return [STORED['row']] if STORED['row'] else []
+
+
+def with_fake_pool(test):
+    """Run a test against a leak-tracking pool of fake connections"""
+    def wrapper():
+        with fake_pool(stored_row, track_leaks=True) as pool:
+            return test(pool)
+    wrapper.__name__ = test.__name__
+    return wrapper
+
+
+@with_fake_pool
+def test_connection_reused_within_request(pool):
+    """Test every query in a request shares one connection, released at teardown"""
+    print("\n=== Test 1: One connection per request ===")
+
+    with app.test_request_context('/api/ingredients'):
+        conn = get_db_connection()
+        assert get_db_connection() is conn, "Expected the same connection within a request"
+        first = get_db_cursor(dictionary=True)
+        second = get_db_cursor()
+        assert pool.stats()['acquired_total'] == 1
+        assert len(pool.checked_out()) == 1
+        raw = conn._connection
+
+    assert first.closed and second.closed, "Expected cursors closed at teardown"
+    assert pool.checked_out() == [], "Connection leaked past teardown"
+    assert pool.stats()['in_use'] == 0
+    assert raw.rollbacks == 0, "No rollback expected for a successful request"
+
+    print("✓ PASS: Connection shared within the request and released")
+    return True
+
+
+@with_fake_pool
+def test_released_after_handler_error(pool):
+    """Test a handler exception rolls back and still returns the connection"""
+    print("\n=== Test 2: Release and rollback after a handler error ===")
+
+    STORED['row'] = {'images': '[]'}
+    try:
+        client = app.test_client()
+        # 'images' must be a list; iterating an int fails mid-handler
+        try:
+            response = client.put('/api/ingredients/1', json={'name': 'Lime', 'images': 5})
+            assert response.status_code == 500, f"Expected 500, got {response.status_code}"
+        except TypeError:
+            pass  # propagated in debug/testing mode
+    finally:
+        STORED['row'] = None
+
+    assert pool.checked_out() == [], f"Connection leaked: {pool.checked_out()}"
+    raw, _ = pool._idle[0]
+    assert raw.rollbacks >= 1, "Expected rollback after the failed request"
+
+    # Pool of one still serves the next request
+    response = app.test_client().get('/api/ingredients/1')
+    assert response.status_code == 404, f"Expected 404, got {response.status_code}"
+    assert pool.checked_out() == []
+
+    print("✓ PASS: Connection returned and rolled back after an error")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Request-Scoped Database Connections")
+    print("=" * 80)
+
+    tests = [
+        test_connection_reused_within_request,
+        test_released_after_handler_error,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Test the "next bottle to buy" suggestions (shelf_insights.py): ranking and
+greedy selection over the incidence bitsets, caching by the tables'
+fingerprint and GET /api/insights/next-bottles
+"""
+import sys
+import os
+import json
+import zlib
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app
+from fake_db import fake_pool
+from shelf_insights import ShelfIndex, NextBottlesCache, next_bottles_params
+
+INGREDIENTS = [
+    {'id': 1, 'name': 'Gin', 'bar_shelf_availability': 'Y'},
+    {'id': 2, 'name': 'Lime Juice', 'bar_shelf_availability': 'N'},
+    {'id': 3, 'name': 'Simple Syrup', 'bar_shelf_availability': 'Y'},
+    {'id': 4, 'name': 'Campari', 'bar_shelf_availability': 'N'},
+    {'id': 5, 'name': 'Sweet Vermouth', 'bar_shelf_availability': 'N'},
+    {'id': 6, 'name': 'Rum', 'bar_shelf_availability': 'N'},
+]
+
+
+def recipe(recipe_id, name, *ingredients):
+    return {'id': recipe_id, 'name': name, 'ingredients': json.dumps([{'name': i} for i in ingredients])}
+
+
+RECIPES = [
+    recipe(1, 'Gimlet', 'Gin', 'lime juice', 'Simple Syrup'),
+    recipe(2, 'Daiquiri', 'Rum', 'Lime Juice', 'Simple Syrup'),
+    recipe(3, 'Negroni', 'Gin', 'Campari', 'Sweet Vermouth'),
+    recipe(4, 'Americano', 'Campari', 'Sweet Vermouth', 'Soda Water'),
+    recipe(5, 'Gin Sour', 'Gin', 'Lime Juice'),
+    recipe(6, 'Martini', 'Gin'),
+    {'id': 7, 'name': 'Broken', 'ingredients': json.dumps([{'amount': 1}])},
+]
+
+
+QUERIES = []
+SHELF = {'checksum': 1}
+
+
+def recipe_checksum():
+    """BIT_XOR(CRC32(CONCAT_WS(':', id, name, ingredients))) over RECIPES"""
+    checksum = 0
+    for row in RECIPES:
+        checksum ^= zlib.crc32(f"{row['id']}:{row['name']}:{row['ingredients']}".encode('utf-8'))
+    return checksum
+
+
+def shelf_rows(query, params):
+    """Answers the shelf queries from the module-level tables"""
+    QUERIES.append(query)
+    if 'shelf_checksum' in query:
+        return [{'ingredient_count': len(INGREDIENTS), 'shelf_checksum': SHELF['checksum'],
+                 'recipe_count': len(RECIPES), 'recipe_checksum': recipe_checksum(),
+                 'recipes_updated': '2026-01-01 00:00:00'}]
+    if 'FROM ingredients' in query:
+        return INGREDIENTS
+    assert 'FROM recipes' in query, query
+    return RECIPES
+
+
+def test_rank_and_greedy():
+    """Test ranking by recipes unlocked alone vs choosing a set of bottles greedily"""
+    print("\n=== Test 1: rank and greedy ===")
+
+    index = ShelfIndex(INGREDIENTS, RECIPES)
+    assert len(index.recipe_names) == 6, "Expected the recipe without ingredient names skipped"
+    assert index.makeable == 1
+
+    ranked = index.suggest('rank', 3)
+    assert [(s['name'], s['unlocks'], s['recipes']) for s in ranked] == [('Lime Juice', 2, ['Gimlet', 'Gin Sour'])], \
+        f"Expected only bottles that unlock a recipe alone, got {ranked}"
+    assert ranked[0]['id'] == 2 and ranked[0]['makeable_after'] == 3
+
+    greedy = index.suggest('greedy', 4)
+    assert [(s['name'], s['unlocks'], s['makeable_after']) for s in greedy] == [
+        ('Lime Juice', 2, 3),
+        ('Rum', 1, 4),
+        ('Campari', 0, 4),
+        ('Sweet Vermouth', 1, 5),
+    ], greedy
+    assert greedy[3]['recipes'] == ['Negroni']
+
+    # Referenced by a recipe but not in the ingredients table
+    greedy = index.suggest('greedy', 10)
+    assert greedy[-1] == {'id': None, 'name': 'Soda Water', 'unlocks': 1,
+                          'recipes': ['Americano'], 'makeable_after': 6}, greedy[-1]
+    assert index.makeable == 1, "Expected greedy selection to leave the index unchanged"
+
+    print("✓ PASS: rank finds single unlocks; greedy plans a set of bottles")
+    return True
+
+
+def test_cache_until_fingerprint_changes():
+    """Test the index and answers are reused for the same fingerprint only"""
+    print("\n=== Test 2: Cache ===")
+
+    cache = NextBottlesCache()
+    assert cache.lookup(('a',), 'rank', 5) is None
+
+    index = ShelfIndex(INGREDIENTS, RECIPES)
+    _, stored = cache.store(('a',), index, 'rank', 5)
+    cached_index, cached = cache.lookup(('a',), 'rank', 5)
+    assert cached_index is index and cached is stored
+
+    cached_index, greedy = cache.lookup(('a',), 'greedy', 2)
+    assert cached_index is index and len(greedy) == 2, "Expected other modes answered from the cached index"
+
+    assert cache.lookup(('b',), 'rank', 5) is None, "Expected a new fingerprint to miss"
+    cache.clear()
+    assert cache.lookup(('a',), 'rank', 5) is None
+
+    assert next_bottles_params({}) == ('greedy', 10, None)
+    assert next_bottles_params({'mode': 'RANK', 'k': '3'}) == ('rank', 3, None)
+
+    print("✓ PASS: Cached until the fingerprint changes")
+    return True
+
+
+def test_next_bottles_endpoint():
+    """Test GET /api/insights/next-bottles answers from the cache until the shelf changes"""
+    print("\n=== Test 3: GET /api/insights/next-bottles ===")
+
+    app.extensions['next_bottles'].clear()
+    QUERIES.clear()
+    try:
+        with fake_pool(shelf_rows):
+            client = app.test_client()
+
+            response = client.get('/api/insights/next-bottles?k=2')
+            body = response.get_json()
+            assert response.status_code == 200, response.status_code
+            assert body['mode'] == 'greedy' and body['k'] == 2 and not body['cached']
+            assert body['recipes'] == 6 and body['makeable'] == 1
+            assert [s['name'] for s in body['suggestions']] == ['Lime Juice', 'Rum']
+            assert len(QUERIES) == 3
+
+            QUERIES.clear()
+            body = client.get('/api/insights/next-bottles?k=2&mode=rank').get_json()
+            assert body['cached'] and [s['name'] for s in body['suggestions']] == ['Lime Juice']
+            assert len(QUERIES) == 1, "Expected only the fingerprint query on a cache hit"
+
+            # Putting Lime Juice on the shelf changes the fingerprint
+            SHELF['checksum'] = 2
+            INGREDIENTS[1]['bar_shelf_availability'] = 'Y'
+            body = client.get('/api/insights/next-bottles?k=2&mode=rank').get_json()
+            assert not body['cached'] and body['makeable'] == 3
+            assert [s['name'] for s in body['suggestions']] == ['Rum']
+
+            for query in ('k=0', 'k=101', 'k=ten', 'mode=best'):
+                response = client.get('/api/insights/next-bottles?' + query)
+                assert response.status_code == 400, (query, response.status_code)
+    finally:
+        INGREDIENTS[1]['bar_shelf_availability'] = 'N'
+        SHELF['checksum'] = 1
+        app.extensions['next_bottles'].clear()
+
+    print("✓ PASS: Suggestions cached until the shelf changes; bad k and mode rejected")
+    return True
+
+
+def test_recipe_edit_changes_fingerprint():
+    """Test editing a recipe's ingredients invalidates the cache without a new count or timestamp"""
+    print("\n=== Test 4: Recipe edits change the fingerprint ===")
+
+    app.extensions['next_bottles'].clear()
+    martini = RECIPES[5]
+    try:
+        with fake_pool(shelf_rows):
+            client = app.test_client()
+            body = client.get('/api/insights/next-bottles?k=1&mode=rank').get_json()
+            assert body['makeable'] == 1 and [s['name'] for s in body['suggestions']] == ['Lime Juice']
+
+            # Same recipe count and updated_at, different ingredients
+            RECIPES[5] = recipe(6, 'Martini', 'Gin', 'Dry Vermouth')
+            body = client.get('/api/insights/next-bottles?k=1&mode=rank').get_json()
+            assert not body['cached'], "Expected the edited recipe to miss the cache"
+            assert body['makeable'] == 0, f"Expected the Martini no longer makeable, got {body['makeable']}"
+    finally:
+        RECIPES[5] = martini
+        app.extensions['next_bottles'].clear()
+
+    print("✓ PASS: Editing recipe ingredients invalidates cached suggestions")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Next Bottle Suggestions")
+    print("=" * 80)
+
+    tests = [
+        test_rank_and_greedy,
+        test_cache_until_fingerprint_changes,
+        test_next_bottles_endpoint,
+        test_recipe_edit_changes_fingerprint,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
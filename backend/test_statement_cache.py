@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test the per-connection prepared statement cache
+"""
+import sys
+import os
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+import statement_cache
+from statement_cache import prepared_cursor, execute_prepared, fetch_one_prepared
+from db_pool import ConnectionPool
+from fake_db import FakeCursor, connection_factory
+from mysql.connector.errors import OperationalError
+
+
+class FakePreparedCursor(FakeCursor):
+    """Records how often a statement would be prepared by mysql-connector"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepares = 0
+        self.statement = None
+        self.fail = False
+
+    def execute(self, operation, params=None):
+        if self.fail:
+            raise OperationalError("Lost connection")
+        # mysql-connector re-prepares unless it gets the same string object
+        if operation is not self.statement:
+            self.prepares += 1
+            self.statement = operation
+        super().execute(operation, params)
+
+
+def echo_id(query, params):
+    return [{'id': params[0]}]
+
+
+prepared_connection = connection_factory(echo_id, rowcount=1, cursor_class=FakePreparedCursor)
+
+
+def test_prepared_once_per_connection():
+    """Test a statement is prepared once and reused across pool checkouts"""
+    print("\n=== Test 1: Prepare once per pooled connection ===")
+
+    pool = ConnectionPool(prepared_connection, pool_size=1)
+    # Build the SQL at runtime so every call passes a different string object
+    table = 'recipes'
+    for recipe_id in (1, 2, 3):
+        conn = pool.get_connection()
+        row = fetch_one_prepared(conn, f"SELECT * FROM {table} WHERE id = %s", (recipe_id,))
+        assert row == {'id': recipe_id}
+        conn.close()
+
+    conn = pool.get_connection()
+    cursors = conn.raw_connection.cursors
+    assert all(kwargs.get('prepared') for kwargs in conn.raw_connection.cursor_kwargs), "Expected prepared cursors"
+    assert len(cursors) == 1, f"Expected one cached cursor, got {len(cursors)}"
+    assert cursors[0].prepares == 1, f"Expected one prepare, got {cursors[0].prepares}"
+    conn.close()
+
+    print("✓ PASS: Statement prepared once and reused")
+    return True
+
+
+def test_cache_bounded_and_error_evicts():
+    """Test the least recently used statement is closed and failing statements dropped"""
+    print("\n=== Test 2: LRU bound and eviction on error ===")
+
+    conn = prepared_connection()
+    original_max = statement_cache.MAX_PREPARED_STATEMENTS
+    statement_cache.MAX_PREPARED_STATEMENTS = 2
+    try:
+        first, _ = prepared_cursor(conn, "SELECT 1")
+        prepared_cursor(conn, "SELECT 2")
+        prepared_cursor(conn, "SELECT 1")  # now most recently used
+        prepared_cursor(conn, "SELECT 3")
+        assert not first.closed, "Recently used statement should stay cached"
+        assert conn.cursors[1].closed, "Least recently used statement should be closed"
+    finally:
+        statement_cache.MAX_PREPARED_STATEMENTS = original_max
+
+    first.fail = True
+    try:
+        execute_prepared(conn, "SELECT 1")
+        assert False, "Expected OperationalError"
+    except OperationalError:
+        pass
+    replacement, _ = prepared_cursor(conn, "SELECT 1")
+    assert replacement is not first, "Failed statement should be prepared again"
+
+    print("✓ PASS: Cache bounded and failed statements re-prepared")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Prepared Statement Cache")
+    print("=" * 80)
+
+    tests = [
+        test_prepared_once_per_connection,
+        test_cache_bounded_and_error_evicts,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
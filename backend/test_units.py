@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Test canonical recipe quantities (units.py): amount parsing, amount_ml on
+write and converting units at read time with GET /api/recipes?units=
+"""
+import sys
+import os
+import json
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app import app
+from api_core import recipe_params
+from fake_db import fake_pool
+from units import parse_amount, amount_ml, with_amount_ml, unit_rules, convert_recipe_units
+
+ROWS = [{
+    'id': 1, 'name': 'Gimlet', 'description': '', 'instructions': '', 'tags': '[]', 'images': '[]',
+    'ingredients': json.dumps([
+        {'name': 'Gin', 'amount': 60, 'units': 'ml', 'amount_ml': 60.0},
+        {'name': 'Lime Juice', 'amount': '3/4', 'units': 'oz'},
+        {'name': 'Bitters', 'amount': 2, 'units': 'dashes'},
+    ]),
+}]
+
+
+def recipe_rows(query, params):
+    assert query.startswith('SELECT * FROM recipes'), query
+    return ROWS
+
+
+def test_parse_amounts():
+    """Test amounts and units are parsed into millilitres"""
+    print("\n=== Test 1: Canonical quantities ===")
+
+    assert parse_amount('1 1/2') == 1.5
+    assert parse_amount('3/4') == 0.75
+    assert parse_amount('22,5') == 22.5
+    assert parse_amount('top up') is None
+    assert parse_amount(True) is None
+
+    assert amount_ml('1 1/2', 'Oz') == 45.0
+    assert amount_ml(2, 'cl') == 20.0
+    assert amount_ml('1', 'tablespoon') == 15.0
+    assert amount_ml(2, 'dashes') is None
+
+    ingredients = [{'name': 'Gin', 'amount': '1.5', 'units': 'oz'}, {'name': 'Mint', 'amount': 8, 'units': 'leaves'}]
+    stored = with_amount_ml(ingredients)
+    assert stored == [dict(ingredients[0], amount_ml=45.0), ingredients[1]], stored
+    assert 'amount_ml' not in ingredients[0], "Expected the request data left unchanged"
+
+    # The stored JSON keeps the original amount and unit next to the canonical quantity
+    stored_json = json.loads(recipe_params({'ingredients': ingredients}, [])[2])
+    assert stored_json[0] == {'name': 'Gin', 'amount': '1.5', 'units': 'oz', 'amount_ml': 45.0}
+
+    print("✓ PASS: Amounts parsed; amount_ml stored next to the originals")
+    return True
+
+
+def test_convert_with_rules():
+    """Test one conversion pass with configurable rounding and the special Oz table"""
+    print("\n=== Test 2: Rounding rules ===")
+
+    def recipes():
+        return [
+            {'ingredients': [{'amount': 20, 'units': 'ml', 'amount_ml': 20.0},
+                             {'amount': 50, 'units': 'ml', 'amount_ml': 50.0}]},
+            {'ingredients': [{'amount': '1 1/2', 'units': 'Oz'}, {'amount': 1, 'units': 'pinch'}]},
+            {'ingredients': None},
+        ]
+
+    converted = convert_recipe_units(recipes(), 'oz', unit_rules('oz=0.25'))
+    assert [i['amount'] for i in converted[0]['ingredients']] == [0.75, 1.75], converted[0]
+    assert converted[0]['ingredients'][0]['units'] == 'Oz'
+    assert converted[1]['ingredients'] == recipes()[1]['ingredients'], "Expected Oz and pinch left as stored"
+
+    converted = convert_recipe_units(recipes(), 'oz', unit_rules('oz=0.5', special_oz=False))
+    assert [i['amount'] for i in converted[0]['ingredients']] == [0.5, 1.5], converted[0]
+
+    converted = convert_recipe_units(recipes(), 'cl', unit_rules('cl=0'))
+    assert [i['amount'] for i in converted[1]['ingredients']][0] == 4.5
+    assert converted[0]['ingredients'][1] == {'amount': 5.0, 'units': 'cl', 'amount_ml': 50.0}
+
+    print("✓ PASS: Display rounding follows configuration")
+    return True
+
+
+def test_recipes_endpoint_units():
+    """Test GET /api/recipes?units= converts the response and rejects unknown units"""
+    print("\n=== Test 3: GET /api/recipes?units= ===")
+
+    with fake_pool(recipe_rows, rowcount=1):
+        client = app.test_client()
+
+        response = client.get('/api/recipes')
+        assert response.get_json()[0]['ingredients'][1]['amount'] == '3/4', "Expected stored values by default"
+
+        response = client.get('/api/recipes?units=ml')
+        ingredients = response.get_json()[0]['ingredients']
+        assert [(i['amount'], i['units']) for i in ingredients] == [(60, 'ml'), (22.5, 'ml'), (2, 'dashes')]
+
+        response = client.get('/api/recipes/1?units=OZ')
+        ingredients = response.get_json()['ingredients']
+        assert [(i['amount'], i['units']) for i in ingredients] == [(2.0, 'Oz'), ('3/4', 'oz'), (2, 'dashes')]
+
+        response = client.get('/api/recipes?units=gallons')
+        assert response.status_code == 400, response.status_code
+
+    print("✓ PASS: Recipes converted at read time; unknown units rejected")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Canonical Units")
+    print("=" * 80)
+
+    tests = [
+        test_parse_amounts,
+        test_convert_with_rules,
+        test_recipes_endpoint_units,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Test the sharded upload store and the migration of flat uploads
+"""
+import sys
+import os
+import tempfile
+
+# Add the backend directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_db import FakeCursor
+from upload_store import (
+    shard_prefix, sharded_path, is_sharded, resolve_upload, allocate_upload_path, delete_upload,
+)
+from shard_uploads import plan_moves, move_files, rewrite_references, update_database
+
+
+def write_file(path, data=b'image bytes'):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_shard_layout():
+    """Test shard paths are stable, two levels deep and recognised"""
+    print("\n=== Test 1: Shard layout ===")
+
+    prefix = shard_prefix('Margarita.jpg')
+    assert prefix == shard_prefix('Margarita.jpg'), "Shard prefix must be deterministic"
+    parts = prefix.split('/')
+    assert len(parts) == 2 and all(len(p) == 2 for p in parts), f"Unexpected prefix: {prefix}"
+
+    reference = sharded_path('Margarita.jpg')
+    assert reference == f"{prefix}/Margarita.jpg"
+    assert is_sharded(reference)
+    assert not is_sharded('Margarita.jpg')
+    assert not is_sharded('cocktail_images/Margarita.jpg')
+
+    print("✓ PASS: Shard paths are deterministic and recognised")
+    return True
+
+
+def test_allocate_resolve_delete():
+    """Test allocation avoids collisions and references resolve and delete"""
+    print("\n=== Test 2: Allocate, resolve and delete ===")
+
+    with tempfile.TemporaryDirectory() as upload_folder:
+        reference, filepath = allocate_upload_path(upload_folder, 'recipe_1.jpg')
+        assert reference == sharded_path('recipe_1.jpg')
+        assert os.path.isdir(os.path.dirname(filepath)), "Expected shard directory created"
+        write_file(filepath)
+
+        # Same name again gets a counter and its own shard
+        second, second_path = allocate_upload_path(upload_folder, 'recipe_1.jpg')
+        assert second == sharded_path('recipe_1_1.jpg'), f"Unexpected collision handling: {second}"
+        write_file(second_path)
+
+        # A legacy flat file still waiting to be moved into its shard is a collision too
+        write_file(os.path.join(upload_folder, 'legacy.jpg'))
+        third, _ = allocate_upload_path(upload_folder, 'legacy.jpg')
+        assert third == sharded_path('legacy_1.jpg'), f"Expected the flat file's shard path kept free, got {third}"
+
+        assert resolve_upload(upload_folder, reference) == reference
+        # A flat reference resolves to the file in its shard
+        assert resolve_upload(upload_folder, 'recipe_1.jpg') == reference
+        assert resolve_upload(upload_folder, 'missing.jpg') is None
+        assert resolve_upload(upload_folder, '../etc/passwd') is None
+
+        assert delete_upload(upload_folder, 'recipe_1.jpg'), "Expected flat reference to delete sharded file"
+        assert not os.path.exists(filepath)
+        assert not delete_upload(upload_folder, 'recipe_1.jpg'), "Nothing left to delete"
+
+    print("✓ PASS: Allocation, resolution and deletion work on sharded paths")
+    return True
+
+
+def test_migration_moves_and_rewrites():
+    """Test the migration moves flat files and rewrites their references"""
+    print("\n=== Test 3: Migration of flat uploads ===")
+
+    with tempfile.TemporaryDirectory() as upload_folder:
+        write_file(os.path.join(upload_folder, 'Mojito.jpg'))
+        write_file(os.path.join(upload_folder, 'cocktail_images', 'Negroni.jpg'))
+
+        moves = plan_moves(upload_folder)
+        assert moves == [('Mojito.jpg', sharded_path('Mojito.jpg'))], f"Unexpected plan: {moves}"
+
+        # Dry run changes nothing
+        move_files(upload_folder, moves, dry_run=True)
+        assert os.path.exists(os.path.join(upload_folder, 'Mojito.jpg'))
+
+        moved = move_files(upload_folder, moves)
+        assert moved == {'Mojito.jpg': sharded_path('Mojito.jpg')}
+        assert not os.path.exists(os.path.join(upload_folder, 'Mojito.jpg'))
+        assert resolve_upload(upload_folder, 'Mojito.jpg') == sharded_path('Mojito.jpg')
+
+        images, changed = rewrite_references(
+            ['Mojito.jpg', 'cocktail_images/Negroni.jpg', 'missing.jpg'], upload_folder
+        )
+        assert changed == 1, f"Expected 1 reference rewritten, got {changed}"
+        assert images == [sharded_path('Mojito.jpg'), 'cocktail_images/Negroni.jpg', 'missing.jpg']
+
+    print("✓ PASS: Flat uploads moved into shards and references rewritten")
+    return True
+
+
+def images_rows(rows):
+    """Serves images rows for every table"""
+    return lambda query, params: rows.get(query.split()[-1], [])
+
+
+def test_dry_run_counts_planned_rewrites():
+    """Test a dry run counts the rows the planned moves would rewrite"""
+    print("\n=== Test 4: Dry-run reference counts ===")
+
+    with tempfile.TemporaryDirectory() as upload_folder:
+        write_file(os.path.join(upload_folder, 'Mojito.jpg'))
+        write_file(os.path.join(upload_folder, 'Gimlet.jpg'))
+        rows = {
+            'recipes': [
+                {'id': 1, 'images': b'["Mojito.jpg"]'},
+                {'id': 2, 'images': '["Gimlet.jpg", "missing.jpg"]'},
+                {'id': 3, 'images': '["missing.jpg"]'},
+            ],
+        }
+
+        moved = move_files(upload_folder, plan_moves(upload_folder), dry_run=True)
+        cursor = FakeCursor(images_rows(rows))
+        assert update_database(cursor, None, upload_folder, dry_run=True) == 0, \
+            "Without the plan nothing looks moved"
+        assert update_database(cursor, None, upload_folder, dry_run=True, planned=set(moved)) == 2
+        assert all(query.startswith('SELECT') for query, _ in cursor.executed), "Expected no writes in a dry run"
+        assert os.path.exists(os.path.join(upload_folder, 'Mojito.jpg')), "Expected no files moved"
+
+        images, changed = rewrite_references(['Gimlet.jpg', 'missing.jpg'], upload_folder, set(moved))
+        assert changed == 1 and images == [sharded_path('Gimlet.jpg'), 'missing.jpg'], images
+
+    print("✓ PASS: Dry run reports the rows the migration would update")
+    return True
+
+
+def test_serve_legacy_flat_reference():
+    """Test the uploads endpoint serves a flat reference after the file moved into its shard"""
+    print("\n=== Test 5: Serving legacy flat references ===")
+
+    from app import app
+
+    upload_folder = app.config['UPLOAD_FOLDER']
+    filename = 'test_shard_legacy_upload.jpg'
+    path = os.path.join(upload_folder, *sharded_path(filename).split('/'))
+    write_file(path, b'legacy bytes')
+
+    try:
+        client = app.test_client()
+        response = client.get('/api/uploads/' + filename)
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+        assert response.data == b'legacy bytes'
+
+        response = client.get('/api/uploads/' + sharded_path(filename))
+        assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    finally:
+        os.remove(path)
+        for directory in (os.path.dirname(path), os.path.dirname(os.path.dirname(path))):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                pass
+
+    print("✓ PASS: Flat references served from their shard")
+    return True
+
+
+def main():
+    """Run all tests"""
+    print("=" * 80)
+    print("Testing Sharded Upload Store")
+    print("=" * 80)
+
+    tests = [
+        test_shard_layout,
+        test_allocate_resolve_delete,
+        test_migration_moves_and_rewrites,
+        test_dry_run_counts_planned_rewrites,
+        test_serve_legacy_flat_reference,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"✗ FAIL: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ ERROR: {e}")
+            failed += 1
+
+    print("\n" + "=" * 80)
+    print(f"Test Results: {passed} passed, {failed} failed")
+    print("=" * 80)
+
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Canonical recipe quantities and display unit conversion
+
+Recipe ingredients keep their original free-form 'amount' and 'units'. When a
+recipe is written, volume amounts also get a canonical 'amount_ml' (float),
+and GET /api/recipes?units=oz|ml|cl converts from that at read time. Rounding
+per display unit comes from configuration (UNIT_ROUNDING, UNIT_SPECIAL_OZ),
+so changing how amounts are shown never requires a data migration.
+"""
+
+import re
+
+# Millilitres per unit, by normalized unit name
+ML_PER_UNIT = {
+    'ml': 1.0,
+    'cl': 10.0,
+    'dl': 100.0,
+    'l': 1000.0,
+    'oz': 30.0,
+    'tsp': 5.0,
+    'tbsp': 15.0,
+}
+
+UNIT_ALIASES = {
+    'millilitre': 'ml', 'milliliter': 'ml', 'millilitres': 'ml', 'milliliters': 'ml',
+    'centilitre': 'cl', 'centiliter': 'cl', 'centilitres': 'cl', 'centiliters': 'cl',
+    'litre': 'l', 'liter': 'l', 'litres': 'l', 'liters': 'l',
+    'fl oz': 'oz', 'fl. oz': 'oz', 'ounce': 'oz', 'ounces': 'oz',
+    'teaspoon': 'tsp', 'teaspoons': 'tsp', 'tablespoon': 'tbsp', 'tablespoons': 'tbsp',
+}
+
+# Units GET /api/recipes can convert to, and how they are shown
+DISPLAY_UNITS = {'oz': 'Oz', 'ml': 'ml', 'cl': 'cl'}
+
+# Common ml measures shown as standard Oz increments instead of ml / 30
+SPECIAL_ML_TO_OZ = {
+    10: 0.25,
+    20: 0.75,
+}
+
+_FRACTION = re.compile(r'^(?:(\d+)\s+)?(\d+)\s*/\s*(\d+)$')
+
+
+def normalize_unit(units):
+    """Normalized unit name ('Oz' -> 'oz', 'ounces' -> 'oz'), or '' if missing"""
+    if not isinstance(units, str):
+        return ''
+    unit = units.strip().lower().rstrip('.')
+    return UNIT_ALIASES.get(unit, unit)
+
+
+def parse_amount(amount):
+    """
+    Parse an amount as a float.
+
+    Accepts numbers and strings like '1.5', '1,5', '3/4' and '1 1/2'.
+
+    Returns:
+        The amount, or None if it is not a plain quantity (e.g. 'top up')
+    """
+    if isinstance(amount, bool):
+        return None
+    if isinstance(amount, (int, float)):
+        return float(amount)
+    if not isinstance(amount, str):
+        return None
+    text = amount.strip()
+    match = _FRACTION.match(text)
+    if match:
+        whole, numerator, denominator = match.groups()
+        if int(denominator) == 0:
+            return None
+        return int(whole or 0) + int(numerator) / int(denominator)
+    try:
+        return float(text.replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def amount_ml(amount, units):
+    """Canonical quantity in millilitres, or None for non-volume units and unparsable amounts"""
+    ml_per_unit = ML_PER_UNIT.get(normalize_unit(units))
+    value = parse_amount(amount)
+    if ml_per_unit is None or value is None:
+        return None
+    return round(value * ml_per_unit, 4)
+
+
+def with_amount_ml(ingredients):
+    """Copy of a recipe's ingredients with 'amount_ml' set from each amount and unit (stored on write)"""
+    if not isinstance(ingredients, list):
+        return ingredients
+    result = []
+    for ingredient in ingredients:
+        if isinstance(ingredient, dict):
+            ingredient = dict(ingredient)
+            ingredient.pop('amount_ml', None)
+            ml = amount_ml(ingredient.get('amount'), ingredient.get('units'))
+            if ml is not None:
+                ingredient['amount_ml'] = ml
+        result.append(ingredient)
+    return result
+
+
+def parse_rounding(spec):
+    """
+    Parse a rounding spec like 'oz=0.25,cl=0.25,ml=0.5' into {unit: step}.
+
+    A step of 0 keeps two decimals.
+    """
+    steps = {}
+    for part in spec.split(','):
+        if '=' not in part:
+            continue
+        unit, step = part.split('=', 1)
+        steps[normalize_unit(unit)] = float(step)
+    return steps
+
+
+def unit_rules(rounding_spec, special_oz=True):
+    """
+    Display rules per unit from configuration.
+
+    Returns:
+        Dict of unit -> (rounding step, {ml: exact display amount})
+    """
+    steps = parse_rounding(rounding_spec)
+    return {
+        unit: (steps.get(unit, 0.0), SPECIAL_ML_TO_OZ if unit == 'oz' and special_oz else {})
+        for unit in DISPLAY_UNITS
+    }
+
+
+def round_to_step(value, step):
+    """Round to the nearest multiple of step (like the ml to Oz conversion), or two decimals if step is 0"""
+    if step:
+        value = round(value / step) * step
+    return round(value, 4 if step else 2)
+
+
+def from_ml(ml, unit, rules):
+    """Convert a quantity in millilitres to a display unit using its rules"""
+    step, special = rules[unit]
+    if ml in special:
+        return special[ml]
+    return round_to_step(ml / ML_PER_UNIT[unit], step)
+
+
+def convert_recipe_units(recipes, unit, rules):
+    """
+    Show every volume amount of the recipes in one unit, in place.
+
+    Collects all ingredient quantities first and converts them in a single
+    pass. Ingredients already in the unit, and amounts that are not volumes,
+    are left as stored. Uses the stored 'amount_ml', falling back to the
+    original amount and unit for recipes written before it existed.
+
+    Returns:
+        The recipes
+    """
+    entries = [
+        ingredient
+        for recipe in recipes
+        for ingredient in (recipe.get('ingredients') or [])
+        if isinstance(ingredient, dict) and normalize_unit(ingredient.get('units')) != unit
+    ]
+    quantities = [
+        ingredient['amount_ml'] if isinstance(ingredient.get('amount_ml'), (int, float))
+        else amount_ml(ingredient.get('amount'), ingredient.get('units'))
+        for ingredient in entries
+    ]
+    converted = [None if ml is None else from_ml(ml, unit, rules) for ml in quantities]
+
+    label = DISPLAY_UNITS[unit]
+    for ingredient, amount in zip(entries, converted):
+        if amount is not None:
+            ingredient['amount'] = amount
+            ingredient['units'] = label
+    return recipes
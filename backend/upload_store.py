@@ -0,0 +1,96 @@
+"""
+Sharded upload store for Neighborhood Sips
+New uploads are stored in a two-level directory layout derived from a hash of
+the filename, so no single directory grows without bound:
+
+    uploads/3f/a9/Margarita.jpg
+
+The returned reference ('3f/a9/Margarita.jpg') is what gets stored in the
+images JSON of ingredients, recipes and collections. References to files
+still stored flat ('Margarita.jpg') keep working: they resolve to the flat
+file if it exists, otherwise to the file's shard.
+"""
+
+import os
+import hashlib
+import posixpath
+from werkzeug.security import safe_join
+
+# Number of directory levels and hex characters per level
+SHARD_LEVELS = 2
+SHARD_WIDTH = 2
+
+
+def shard_prefix(filename):
+    """Return the shard directory of a filename, e.g. 'Margarita.jpg' -> '3f/a9'"""
+    digest = hashlib.md5(filename.encode('utf-8')).hexdigest()
+    return '/'.join(digest[i * SHARD_WIDTH:(i + 1) * SHARD_WIDTH] for i in range(SHARD_LEVELS))
+
+
+def sharded_path(filename):
+    """Return the sharded reference of a filename, e.g. 'Margarita.jpg' -> '3f/a9/Margarita.jpg'"""
+    return f"{shard_prefix(filename)}/{filename}"
+
+
+def is_sharded(reference):
+    """Check whether a reference already points into its shard"""
+    head, filename = posixpath.split(reference)
+    return bool(head) and head == shard_prefix(filename)
+
+
+def resolve_upload(upload_folder, reference):
+    """
+    Resolve an image reference to the path of an existing file, relative to upload_folder.
+
+    Returns:
+        Relative path of the file, or None if it does not exist
+    """
+    if not reference:
+        return None
+    path = safe_join(upload_folder, reference)
+    if path and os.path.isfile(path):
+        return reference
+
+    # Flat reference to a file that has been moved into its shard
+    filename = posixpath.basename(reference)
+    sharded = sharded_path(filename)
+    path = safe_join(upload_folder, sharded)
+    if path and os.path.isfile(path):
+        return sharded
+    return None
+
+
+def allocate_upload_path(upload_folder, filename):
+    """
+    Pick a free sharded reference for a new upload, adding a counter on collisions.
+
+    A flat file of the same name not yet moved into its shard also counts as
+    a collision, so shard_uploads.py can still move it there.
+    Creates the shard directory.
+
+    Returns:
+        Tuple of (reference, absolute file path)
+    """
+    name_part, ext_part = os.path.splitext(filename)
+    candidate = filename
+    counter = 1
+    while True:
+        reference = sharded_path(candidate)
+        filepath = os.path.join(upload_folder, *reference.split('/'))
+        if not os.path.exists(filepath) and not os.path.exists(os.path.join(upload_folder, candidate)):
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            return reference, filepath
+        candidate = f"{name_part}_{counter}{ext_part}"
+        counter += 1
+
+
+def delete_upload(upload_folder, reference):
+    """Delete an uploaded file given its reference. Returns True if a file was removed."""
+    resolved = resolve_upload(upload_folder, reference)
+    if not resolved:
+        return False
+    try:
+        os.remove(safe_join(upload_folder, resolved))
+        return True
+    except OSError:
+        return False
@@ -1,6 +1,12 @@
 """
 WSGI entry point for PythonAnywhere deployment
-This file is used by PythonAnywhere to run the Flask application
+This file is used by PythonAnywhere (and gunicorn/uWSGI) to run the Flask application
+
+Creating the app opens no database connections. Each worker process creates
+its own connection pool on its first query, so this is safe to load before
+forking (e.g. gunicorn --preload):
+
+    gunicorn --preload --workers 4 wsgi:application
 """
 import sys
 import os
@@ -18,8 +24,10 @@ env_path = os.path.join(project_home, '.env')
 if os.path.exists(env_path):
     load_dotenv(env_path)
 
-# Import the Flask app
-from app import app as application
+# Create the Flask app
+from app import create_app
+
+application = create_app()
 
 # For debugging purposes (remove in production)
 if __name__ == "__main__":